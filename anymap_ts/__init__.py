@@ -1,17 +1,38 @@
 """anymap-ts: Interactive maps with anywidget and TypeScript."""
 
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
 from anymap_ts._version import __version__
-from anymap_ts.maplibre import MapLibreMap
-from anymap_ts.mapbox import MapboxMap
-from anymap_ts.leaflet import LeafletMap
-from anymap_ts.deckgl import DeckGLMap
-from anymap_ts.openlayers import OpenLayersMap
-from anymap_ts.cesium import CesiumMap
-from anymap_ts.keplergl import KeplerGLMap
-from anymap_ts.potree import PotreeViewer
-
-# Default Map class is MapLibreMap
-Map = MapLibreMap
+
+if TYPE_CHECKING:
+    from anymap_ts.maplibre import MapLibreMap
+    from anymap_ts.mapbox import MapboxMap
+    from anymap_ts.leaflet import LeafletMap
+    from anymap_ts.deckgl import DeckGLMap
+    from anymap_ts.openlayers import OpenLayersMap
+    from anymap_ts.cesium import CesiumMap
+    from anymap_ts.keplergl import KeplerGLMap
+    from anymap_ts.potree import PotreeViewer
+
+    Map = MapLibreMap
+
+# Map classes are imported on first access (PEP 562), so using one backend
+# does not pay for importing the others.
+_LAZY_CLASSES = {
+    # Default Map class is MapLibreMap
+    "Map": ("anymap_ts.maplibre", "MapLibreMap"),
+    "MapLibreMap": ("anymap_ts.maplibre", "MapLibreMap"),
+    "MapboxMap": ("anymap_ts.mapbox", "MapboxMap"),
+    "LeafletMap": ("anymap_ts.leaflet", "LeafletMap"),
+    "DeckGLMap": ("anymap_ts.deckgl", "DeckGLMap"),
+    "OpenLayersMap": ("anymap_ts.openlayers", "OpenLayersMap"),
+    "CesiumMap": ("anymap_ts.cesium", "CesiumMap"),
+    "KeplerGLMap": ("anymap_ts.keplergl", "KeplerGLMap"),
+    "PotreeViewer": ("anymap_ts.potree", "PotreeViewer"),
+}
 
 __all__ = [
     "__version__",
@@ -25,3 +46,17 @@ __all__ = [
     "KeplerGLMap",
     "PotreeViewer",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import a map class on first access."""
+    if name not in _LAZY_CLASSES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, class_name = _LAZY_CLASSES[name]
+    value = getattr(importlib.import_module(module_name), class_name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -2,13 +2,572 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import itertools
 import json
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import anywidget
 import traitlets
 
+from .utils import (
+    _geoarrow_to_geojson,
+    _geoarrow_to_records,
+    compress_payload,
+    decompress_payload,
+    encode_payload,
+    is_compressed,
+    json_default,
+    pack_binary_attributes,
+    split_buffers,
+    wrap_payload,
+    zoom_precision,
+)
+
+# Row key of the geometry in the data of deck.gl layers built from GeoArrow
+# buffers; other layers take GeoArrow data as GeoJSON
+_GEOARROW_ROW_KEYS = {
+    "addScatterplotLayer": "coordinates",
+    "addPathLayer": "path",
+    "addPolygonLayer": "polygon",
+}
+
+# Seconds to wait for the frontend to answer a request
+DEFAULT_REQUEST_TIMEOUT = 10.0
+
+# Serialized size in bytes above which call payloads are zlib-compressed
+DEFAULT_COMPRESSION_THRESHOLD = 1_000_000
+
+# Most decimal places kept in vector coordinates by default: about 10 cm,
+# which resolves a pixel up to zoom 18
+DEFAULT_COORDINATE_PRECISION = 6
+
+# Number of most recent calls kept by perf_stats()
+PERF_STATS_LIMIT = 10_000
+
+# Columns of the perf_stats() table
+_PERF_STATS_COLUMNS = (
+    "id",
+    "method",
+    "bytes",
+    "serialize_ms",
+    "queued_ms",
+    "apply_ms",
+)
+
+# Calls that set the whole view and so replace every earlier view call;
+# setCenter and setZoom each only replace their own previous call.
+_FULL_VIEW_METHODS = frozenset({"flyTo", "fitBounds", "jumpTo"})
+_PARTIAL_VIEW_METHODS = frozenset({"setCenter", "setZoom"})
+
+# Setters where only the latest call matters, keyed by the target id and
+# (optionally) property name. Value is the number of leading positional args
+# that form the key; 0 marks map-wide setters keyed by the method alone.
+_LATEST_WINS_METHODS = {
+    "setPaintProperty": 2,
+    "setLayoutProperty": 2,
+    "setVisibility": 1,
+    "setOpacity": 1,
+    "setFilter": 1,
+    "moveLayer": 1,
+    "updateGeoJSONSource": 1,
+    "setProjection": 0,
+    "setPointBudget": 0,
+    "setPointSize": 0,
+    "setFOV": 0,
+    "setBackground": 0,
+}
+
+# Property setters folded into the call that created their layer in the
+# replay history: method -> kwarg of the creating call holding the properties
+_FOLDED_SETTERS = {"setPaintProperty": "paint", "setLayoutProperty": "layout"}
+
+# Calls that create a layer from a style given in their kwargs
+_LAYER_CREATORS = frozenset({"addLayer", "addGeoJSON"})
+
+# Dict traits kept in sync with "state_patch" messages after initialization
+_PATCHED_TRAITS = frozenset({"_layers", "_sources", "_controls", "_layer_dict"})
+
+# One-off reads that publish their result to Python; never replayed
+_QUERY_METHODS = frozenset(
+    {
+        "queryRenderedFeatures",
+        "querySourceFeatures",
+        "getVisibleFeatures",
+        "getLayerData",
+        "getDrawData",
+    }
+)
+
+# Streamed data batches: sent to the open views only and dropped once they
+# acknowledge them, so a streamed file is never held in memory in full
+_STREAMED_METHODS = frozenset({"appendGeoJSON"})
+
+# Removal methods that undo more than their symmetric "add" counterpart.
+_REMOVAL_SUPERSEDES = {
+    "removeLayer": ("addLayer", "addGeoJSON", "appendGeoJSON"),
+    "removeMarker": ("addMarker", "addMarkers"),
+}
+
+
+def _on_kernel_thread() -> bool:
+    """Check whether the caller runs on the thread that handles comm messages.
+
+    An IPython kernel handles messages from the frontend on its main thread,
+    one at a time, so code blocking that thread never sees a reply.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return False
+    ipython = sys.modules.get("IPython")
+    shell = ipython.get_ipython() if ipython is not None else None
+    return getattr(shell, "kernel", None) is not None
+
+
+def _call_target(call: Dict[str, Any]) -> Optional[str]:
+    """Return the layer/control id a JS call operates on, if any."""
+    args = call.get("args") or []
+    if args and isinstance(args[0], str):
+        return args[0]
+    kwargs = call.get("kwargs") or {}
+    for key in ("layerId", "id", "name", "sourceId"):
+        value = kwargs.get(key)
+        if isinstance(value, str):
+            return value
+    return None
+
+
+def _call_key(call: Dict[str, Any]) -> Optional[Tuple]:
+    """Return the key under which later calls supersede earlier ones."""
+    method = call["method"]
+    if method in _FULL_VIEW_METHODS:
+        return ("view",)
+    if method in _PARTIAL_VIEW_METHODS:
+        return ("view", method)
+    if method in _LATEST_WINS_METHODS:
+        n_args = _LATEST_WINS_METHODS[method]
+        if n_args == 0:
+            return (method,)
+        target = _call_target(call)
+        if target is None:
+            return None
+        return (method, target, *call["args"][1:n_args])
+    return None
+
+
+def _superseded_by_removal(removal: str, method: str) -> bool:
+    """Check whether ``removal`` undoes a previous call to ``method``."""
+    if method in _LATEST_WINS_METHODS:
+        return True
+    if method in _REMOVAL_SUPERSEDES.get(removal, ()):
+        return True
+    if removal == "removeDeckLayer":
+        return method.startswith("add") and method.endswith("Layer")
+    return method == "add" + removal[len("remove") :]
+
+
+class _CallLog:
+    """Ordered log of JS calls that collapses superseded calls.
+
+    Args:
+        keep_removals: Whether a removal stays in the log after cancelling
+            the calls that created its target. The sync queue keeps them
+            (the frontend may already have applied the add); the replay
+            history does not.
+        on_discard: Optional callback receiving each call that leaves the
+            log.
+        fold_setters: Whether paint and layout property setters are merged
+            into the call that created their layer, so that the log holds
+            one call per layer. Only valid for the replay history, whose
+            calls have not been applied anywhere yet.
+    """
+
+    # Prune stale ids from a target index once it grows past this size
+    _PRUNE_SIZE = 32
+
+    def __init__(
+        self,
+        keep_removals: bool,
+        on_discard: Optional[Callable[[Dict[str, Any]], None]] = None,
+        fold_setters: bool = False,
+    ) -> None:
+        self.keep_removals = keep_removals
+        self.on_discard = on_discard
+        self.fold_setters = fold_setters
+        self._calls: Dict[int, Dict[str, Any]] = {}
+        self._keys: Dict[Tuple, int] = {}
+        self._targets: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def calls(self) -> List[Dict[str, Any]]:
+        """Get the calls in the order they were made."""
+        return list(self._calls.values())
+
+    def add(self, call: Dict[str, Any]) -> bool:
+        """Append a call, dropping the calls it supersedes.
+
+        Args:
+            call: The JS call dict
+
+        Returns:
+            False if the call cancelled out or was folded into another one
+            and was not kept.
+        """
+        method = call["method"]
+        target = _call_target(call)
+
+        if self.fold_setters and method in _FOLDED_SETTERS and self._fold(call):
+            return False
+
+        if method.startswith("remove") and target is not None:
+            ids = [i for i in self._targets.pop(target, []) if i in self._calls]
+            cancelled = [
+                i
+                for i in ids
+                if _superseded_by_removal(method, self._calls[i]["method"])
+            ]
+            created = any(
+                not self._calls[i]["method"].startswith("set") for i in cancelled
+            )
+            for i in cancelled:
+                self._discard(i)
+            remaining = [i for i in ids if i in self._calls]
+            if remaining:
+                self._targets[target] = remaining
+            if created and not self.keep_removals:
+                return False
+            self._calls[call["id"]] = call
+            return True
+
+        key = _call_key(call)
+        if key is not None:
+            superseded = [key]
+            if method in _FULL_VIEW_METHODS:
+                superseded += [("view", m) for m in _PARTIAL_VIEW_METHODS]
+            for k in superseded:
+                previous = self._keys.get(k)
+                if previous is not None:
+                    self._discard(previous)
+            self._keys[key] = call["id"]
+
+        self._calls[call["id"]] = call
+        if target is not None:
+            ids = self._targets.setdefault(target, [])
+            if len(ids) >= self._PRUNE_SIZE:
+                ids[:] = [i for i in ids if i in self._calls]
+            ids.append(call["id"])
+        return True
+
+    def _fold(self, call: Dict[str, Any]) -> bool:
+        """Merge a property setter into the call that created its layer.
+
+        Args:
+            call: A ``setPaintProperty`` or ``setLayoutProperty`` call
+
+        Returns:
+            True if the property was merged.
+        """
+        target = _call_target(call)
+        args = call.get("args") or []
+        if target is None or len(args) < 3:
+            return False
+        group = _FOLDED_SETTERS[call["method"]]
+        for i in reversed(self._targets.get(target, [])):
+            creator = self._calls.get(i)
+            if creator is None or creator["method"] not in _LAYER_CREATORS:
+                continue
+            properties = creator["kwargs"].get(group)
+            if not isinstance(properties, dict):
+                return False
+            # Copy: the sync queue may hold the same call dict
+            kwargs = {**creator["kwargs"], group: {**properties, args[1]: args[2]}}
+            self._calls[i] = {**creator, "kwargs": kwargs}
+            return True
+        return False
+
+    def discard_through(self, call_id: int) -> bool:
+        """Drop all calls with an id up to and including ``call_id``.
+
+        Args:
+            call_id: Highest call id to drop
+
+        Returns:
+            True if any call was dropped.
+        """
+        dropped = False
+        for i in list(self._calls):
+            if i > call_id:
+                break
+            self._discard(i)
+            dropped = True
+        return dropped
+
+    def _discard(self, call_id: int) -> None:
+        call = self._calls.pop(call_id, None)
+        if call is None:
+            return
+        key = _call_key(call)
+        if key is not None and self._keys.get(key) == call_id:
+            del self._keys[key]
+        if self.on_discard is not None:
+            self.on_discard(call)
+
+
+class _DataStore:
+    """Content-addressed store for large call payloads.
+
+    Calls reference a payload by the digest of its JSON encoding, so data
+    added several times is held once and sent to each frontend view at most
+    once. Views fetch the payloads they lack with a ``blob_request``.
+    A payload is evicted when no logged call references it any more.
+    Payloads are kept as their JSON encoding, compressed when large, which
+    is both hashed and sent, so each payload is serialized once.
+    """
+
+    # Payloads whose JSON encoding is smaller than this are sent inline
+    MIN_SIZE = 1024
+
+    def __init__(self) -> None:
+        # Payload markers in the form they are sent, keyed by digest
+        self._blobs: Dict[str, Dict[str, Any]] = {}
+        self._refs: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self._blobs
+
+    def put(self, data: Any, compress_above: Optional[int] = None) -> Any:
+        """Register a payload.
+
+        Args:
+            data: JSON-serializable dict or list
+            compress_above: Encoded size in bytes from which the payload is
+                sent compressed. None disables compression.
+
+        Returns:
+            A ``{"__blob__": digest}`` reference, or ``data`` itself when it
+            is small or not JSON-serializable.
+        """
+        if not isinstance(data, (dict, list)):
+            return data
+        try:
+            encoded = encode_payload(data)
+        except (TypeError, ValueError):
+            return data
+        if len(encoded) < self.MIN_SIZE:
+            return data
+        digest = hashlib.sha256(encoded).hexdigest()
+        if digest not in self._blobs:
+            if compress_above is not None and len(encoded) >= compress_above:
+                self._blobs[digest] = compress_payload(encoded)
+            else:
+                self._blobs[digest] = wrap_payload(encoded)
+        return {"__blob__": digest}
+
+    def get(self, digest: str) -> Any:
+        """Get a payload by digest, or None if it was evicted."""
+        marker = self._blobs.get(digest)
+        return None if marker is None else decompress_payload(marker)
+
+    def payload(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Get a payload in the form it is sent to the frontend.
+
+        Args:
+            digest: Payload digest
+
+        Returns:
+            The payload's JSON encoding as a compressed or plain payload
+            marker, or None if it was evicted.
+        """
+        return self._blobs.get(digest)
+
+    def retain(self, call: Dict[str, Any]) -> None:
+        """Count the references a logged call holds.
+
+        Args:
+            call: The JS call dict
+        """
+        for digest in _blob_refs(call):
+            self._refs[digest] = self._refs.get(digest, 0) + 1
+
+    def release(self, call: Dict[str, Any]) -> List[str]:
+        """Drop the references of a call that left a log.
+
+        Args:
+            call: The JS call dict
+
+        Returns:
+            Digests of the payloads evicted as a result.
+        """
+        evicted = []
+        for digest in _blob_refs(call):
+            count = self._refs.get(digest, 0) - 1
+            if count > 0:
+                self._refs[digest] = count
+            else:
+                self._refs.pop(digest, None)
+                self._blobs.pop(digest, None)
+                evicted.append(digest)
+        return evicted
+
+    def resolve(self, call: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a copy of a call with references replaced by payloads.
+
+        Args:
+            call: The JS call dict
+
+        Returns:
+            The call, copied only if it references a payload.
+        """
+        if not _blob_refs(call):
+            return call
+        kwargs = {
+            key: self._resolve_value(value) for key, value in call["kwargs"].items()
+        }
+        return {**call, "kwargs": kwargs}
+
+    def _resolve_value(self, value: Any) -> Any:
+        """Replace the references in a kwarg value, as found by ``_blob_refs``."""
+        if _is_blob_ref(value):
+            return self.get(value["__blob__"])
+        if isinstance(value, list) and any(
+            isinstance(item, dict) and any(map(_is_blob_ref, item.values()))
+            for item in value
+        ):
+            return [
+                (
+                    {
+                        k: self.get(v["__blob__"]) if _is_blob_ref(v) else v
+                        for k, v in item.items()
+                    }
+                    if isinstance(item, dict)
+                    else item
+                )
+                for item in value
+            ]
+        return value
+
+
+def _is_blob_ref(value: Any) -> bool:
+    """Check whether a kwarg value is a data store reference."""
+    return isinstance(value, dict) and len(value) == 1 and "__blob__" in value
+
+
+def _inflate_call(call: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of a call with compressed kwargs decoded."""
+    kwargs = call.get("kwargs") or {}
+    if not any(is_compressed(value) for value in kwargs.values()):
+        return call
+    kwargs = {
+        key: decompress_payload(value) if is_compressed(value) else value
+        for key, value in kwargs.items()
+    }
+    return {**call, "kwargs": kwargs}
+
+
+def _decode_geoarrow_call(call: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of a call with GeoArrow data converted to plain JSON.
+
+    Deck.gl layers get the rows the frontend would build from the buffers;
+    other layers get a GeoJSON FeatureCollection.
+    """
+    kwargs = call.get("kwargs") or {}
+    data = kwargs.get("data")
+    if not (isinstance(data, dict) and "__geoarrow__" in data):
+        return call
+    key = _GEOARROW_ROW_KEYS.get(call.get("method"))
+    data = _geoarrow_to_records(data, key) if key else _geoarrow_to_geojson(data)
+    return {**call, "kwargs": {**kwargs, "data": data}}
+
+
+def _apply_state_op(
+    state: Dict[str, Any],
+    op: Dict[str, Any],
+    members: Optional[Dict[str, Tuple[List[Any], Set[Any]]]] = None,
+) -> None:
+    """Apply a state patch operation to a dict trait value in place.
+
+    Args:
+        state: The dict trait value
+        op: Operation: ``set``, ``merge`` or ``delete`` an entry, or
+            ``append``/``discard`` an item of a list entry
+        members: Index of the items of each list entry, kept next to the
+            ordered lists so that ``append`` and ``discard`` test membership
+            in constant time. Entries are rebuilt when their list was
+            replaced. Without an index, membership is tested on the list.
+    """
+    kind, key, value = op["op"], op["key"], op.get("value")
+    if kind == "set":
+        state[key] = value
+    elif kind == "merge":
+        # Replace rather than mutate: the entry may be shared with a call
+        state[key] = {**state.get(key, {}), **value}
+    elif kind == "delete":
+        state.pop(key, None)
+    elif kind in ("append", "discard"):
+        if members is None:
+            members = {}
+        items = state.get(key)
+        if items is None:
+            if kind == "discard":
+                return
+            items = state[key] = []
+        entry = members.get(key)
+        if entry is None or entry[0] is not items:
+            entry = members[key] = (items, set(items))
+        present = entry[1]
+        if kind == "append":
+            if value not in present:
+                items.append(value)
+                present.add(value)
+        else:
+            if value in present:
+                items.remove(value)
+                present.discard(value)
+            if not items:
+                state.pop(key, None)
+                members.pop(key, None)
+
+
+def _blob_refs(call: Dict[str, Any]) -> List[str]:
+    """Return the digests referenced by a call's kwargs.
+
+    A reference is either a kwarg value or a value of a dict in a list kwarg,
+    such as the ``data`` of each zoom level of a simplified layer.
+    """
+    digests = []
+    for value in (call.get("kwargs") or {}).values():
+        if _is_blob_ref(value):
+            digests.append(value["__blob__"])
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, dict):
+                    digests.extend(
+                        v["__blob__"] for v in item.values() if _is_blob_ref(v)
+                    )
+    return digests
+
 
 class MapWidget(anywidget.AnyWidget):
     """Base class for interactive map widgets.
@@ -26,12 +585,23 @@ class MapWidget(anywidget.AnyWidget):
     max_pitch = traitlets.Float(85.0).tag(sync=True)
     max_zoom = traitlets.Float(25.5).tag(sync=True)
 
-    # JavaScript method call queue
+    # JavaScript method call queue (only calls not yet acknowledged by JS)
     _js_calls = traitlets.List([]).tag(sync=True)
     _js_method_counter = traitlets.Int(0)
 
-    # Events from JavaScript
-    _js_events = traitlets.List([]).tag(sync=True)
+    # Highest call id the frontend has applied
+    _js_calls_ack = traitlets.Int(0).tag(sync=True)
+
+    # Events from JavaScript, resent until acknowledged: {view id: [event]}.
+    # Keyed by view so that views never overwrite each other's events
+    _js_events = traitlets.Dict({}).tag(sync=True)
+
+    # Highest event sequence number handled, per frontend view
+    _js_events_ack = traitlets.Dict({}).tag(sync=True)
+
+    # Delivery options per event type with a Python handler:
+    # {type: {throttle_ms, debounce_ms, coalesce}}
+    _event_options = traitlets.Dict({}).tag(sync=True)
 
     # State persistence for layers, sources, and controls
     _layers = traitlets.Dict({}).tag(sync=True)
@@ -53,6 +623,19 @@ class MapWidget(anywidget.AnyWidget):
     # Queried features (set by JS query methods)
     _queried_features = traitlets.Dict({}).tag(sync=True)
 
+    # Serialized size in bytes above which call payloads are sent
+    # zlib-compressed; None disables compression
+    compression_threshold: Optional[int] = DEFAULT_COMPRESSION_THRESHOLD
+
+    # Whether the frontend decodes binary arrays, compressed kwargs and data
+    # store references (the BaseMapRenderer frontends); other widgets get
+    # their kwargs as plain JSON
+    _packed_transport = True
+
+    # Decimal places kept in vector coordinates; None keeps the precision
+    # that resolves a pixel at max_zoom, capped at DEFAULT_COORDINATE_PRECISION
+    coordinate_precision: Optional[int] = None
+
     def __init__(self, **kwargs):
         """Initialize the MapWidget.
 
@@ -61,7 +644,41 @@ class MapWidget(anywidget.AnyWidget):
         """
         super().__init__(**kwargs)
         self._event_handlers: Dict[str, List[Callable]] = {}
+        # Large payloads referenced by calls in either log below
+        self._data_store = _DataStore()
+        # Snapshot of the current map state as a compacted call history,
+        # replayed into newly created views
+        self._call_history = _CallLog(
+            keep_removals=False,
+            on_discard=self._release_call_data,
+            fold_setters=True,
+        )
+        # Calls not yet acknowledged by the frontend (mirrors _js_calls)
+        self._pending_calls = _CallLog(
+            keep_removals=True, on_discard=self._release_call_data
+        )
+        # Guards both call logs: calls may come from background threads
+        self._calls_lock = threading.RLock()
+        self._batch_depth = 0
+        # State patch operations held back until the outermost batch exits
+        self._held_patches: List[Dict[str, Any]] = []
+        # Item sets of the list entries of state dict traits, by trait and key
+        self._state_members: Dict[str, Dict[str, Tuple[List[Any], Set[Any]]]] = {}
+        # Requests awaiting a response from the frontend, keyed by request id
+        self._pending_requests: Dict[int, Future] = {}
+        self._request_ids = itertools.count(1)
+        # Kernel vector tile sources, keyed by map source id
+        self._tile_sources: Dict[str, Any] = {}
+        # Stop flags of layers still being streamed in, keyed by layer id
+        self._streams: Dict[str, threading.Event] = {}
+        # File and precision of each streamed layer, re-read for HTML export
+        self._streamed_files: Dict[str, Tuple[Any, int]] = {}
+        # Per-call transport timings, keyed by call id (None when disabled)
+        self._perf_stats: Optional[Dict[int, Dict[str, Any]]] = None
+        self._perf_callback: Optional[Callable[[Dict[str, Any]], None]] = None
         self.observe(self._handle_js_events, names=["_js_events"])
+        self.observe(self._handle_js_calls_ack, names=["_js_calls_ack"])
+        self.on_msg(self._handle_custom_msg)
 
     def _handle_js_events(self, change: Dict[str, Any]) -> None:
         """Process events received from JavaScript.
@@ -69,8 +686,16 @@ class MapWidget(anywidget.AnyWidget):
         Args:
             change: Traitlet change dict
         """
-        events = change.get("new", [])
-        for event in events:
+        pending = change.get("new") or {}
+        cursors = dict(self._js_events_ack)
+        events = [(view, event) for view, queue in pending.items() for event in queue]
+        for view, event in events:
+            # Unacknowledged events are resent with later ones; skip repeats
+            seq = event.get("seq")
+            if seq is not None:
+                if seq <= cursors.get(view, 0):
+                    continue
+                cursors[view] = seq
             event_type = event.get("type")
             if event_type in self._event_handlers:
                 for handler in self._event_handlers[event_type]:
@@ -78,37 +703,562 @@ class MapWidget(anywidget.AnyWidget):
                         handler(event.get("data"))
                     except Exception as e:
                         print(f"Error in event handler for {event_type}: {e}")
-        # Clear processed events
-        self._js_events = []
+        if cursors != self._js_events_ack:
+            self._js_events_ack = cursors
+
+    def _handle_js_calls_ack(self, change: Dict[str, Any]) -> None:
+        """Drop calls the frontend has acknowledged from the sync queue.
+
+        Args:
+            change: Traitlet change dict
+        """
+        with self._calls_lock:
+            if self._pending_calls.discard_through(change.get("new", 0)):
+                self._js_calls = self._pending_calls.calls()
+
+    def _handle_custom_msg(self, widget: Any, content: Any, buffers: Any) -> None:
+        """Answer custom messages sent by the frontend.
+
+        Args:
+            widget: The widget receiving the message
+            content: Message content
+            buffers: Binary buffers attached to the message
+        """
+        if not isinstance(content, dict):
+            return
+        if content.get("type") == "replay_request":
+            self._send_with_buffers(
+                {"type": "replay", "calls": self._js_call_history()}
+            )
+        elif content.get("type") == "response":
+            self._handle_response(content)
+        elif content.get("type") == "blob_request":
+            digests = content.get("digests") or []
+            blobs = {d: self._data_store.payload(d) for d in digests}
+            self._send_with_buffers({"type": "blobs", "blobs": blobs})
+        elif content.get("type") == "state_patch":
+            for op in content.get("ops") or []:
+                if op.get("trait") in _PATCHED_TRAITS:
+                    self._apply_patch(op)
+        elif content.get("type") == "tile_request":
+            self._serve_tile(content)
+
+    def _serve_tile(self, content: Dict[str, Any]) -> None:
+        """Cut a requested vector tile on the thread pool and send it back.
+
+        Args:
+            content: Request with ``id``, ``view``, ``source``, ``z``, ``x``
+                and ``y``
+        """
+        reply = {"type": "tile", "id": content.get("id"), "view": content.get("view")}
+        source = self._tile_sources.get(content.get("source"))
+        if source is None:
+            self._send_with_buffers(
+                {**reply, "error": f"Unknown tile source: {content.get('source')}"}
+            )
+            return
+        future = source.submit(content["z"], content["x"], content["y"])
+        future.add_done_callback(lambda done: self._send_tile(reply, done))
+
+    def _send_tile(self, reply: Dict[str, Any], future: Future) -> None:
+        """Answer a tile request once its tile is cut.
+
+        The reply reaches every view of the widget; it carries the id of the
+        requesting view, since each view numbers its requests on its own.
+
+        Args:
+            reply: Reply header with the request and view ids
+            future: Future returned by the tile source
+        """
+        message: Dict[str, Any] = dict(reply)
+        if future.exception() is not None:
+            message["error"] = str(future.exception())
+        else:
+            message["data"] = future.result()
+        self._send_with_buffers(message)
+
+    def _store_data(self, data: Any) -> Any:
+        """Register a large payload in the widget's content-addressed store.
+
+        Pass the return value as the call's kwarg instead of the payload;
+        each frontend view then fetches the payload once per digest.
+
+        Args:
+            data: Payload to register (GeoJSON dict, list of records, ...)
+
+        Returns:
+            A reference to the stored payload, or ``data`` itself when it is
+            small or not JSON-serializable.
+        """
+        if not self._packed_transport:
+            return data
+        return self._data_store.put(data, compress_above=self.compression_threshold)
+
+    def _release_call_data(self, call: Dict[str, Any]) -> None:
+        """Release the payloads of a call that left a call log.
+
+        Args:
+            call: The JS call dict
+        """
+        evicted = self._data_store.release(call)
+        if evicted:
+            self.send({"type": "evict", "digests": evicted})
+
+    def _send_with_buffers(self, message: Dict[str, Any]) -> None:
+        """Send a custom message, moving binary values into comm buffers.
+
+        Args:
+            message: Message content
+        """
+        message, buffer_paths, buffers = split_buffers(message)
+        message["buffer_paths"] = buffer_paths
+        self.send(message, buffers)
+
+    def _handle_response(self, content: Dict[str, Any]) -> None:
+        """Resolve the pending request a frontend response belongs to.
+
+        Every view of the widget answers a request; the first answer wins.
+
+        Args:
+            content: Response message with ``id`` and ``result`` or ``error``
+        """
+        future = self._pending_requests.pop(content.get("id"), None)
+        if future is None or future.done():
+            return
+        if content.get("error"):
+            future.set_exception(RuntimeError(content["error"]))
+        else:
+            future.set_result(content.get("result"))
+
+    def send_request(self, method: str, *args, **kwargs) -> Future:
+        """Send a query to the frontend without waiting for the answer.
+
+        Unlike :meth:`call_js_method`, the call is not recorded or replayed.
+        Each request has its own id, so concurrent requests never overwrite
+        each other's results.
+
+        Args:
+            method: Name of the JavaScript query
+            *args: Positional arguments for the query
+            **kwargs: Keyword arguments for the query
+
+        Returns:
+            A future resolved with the query result. The future fails with
+            RuntimeError if the query raised an error in the browser.
+
+        Raises:
+            RuntimeError: If called inside :meth:`batch`, where the calls the
+                query may depend on have not been sent yet.
+        """
+        if self._batch_depth:
+            raise RuntimeError("Requests cannot be sent inside batch()")
+        request_id = next(self._request_ids)
+        future: Future = Future()
+        self._pending_requests[request_id] = future
+        # Forget the request once answered, timed out or cancelled
+        future.add_done_callback(lambda _: self._pending_requests.pop(request_id, None))
+        self._send_with_buffers(
+            {
+                "type": "request",
+                "id": request_id,
+                "method": method,
+                "args": list(args),
+                "kwargs": pack_binary_attributes(kwargs),
+            }
+        )
+        return future
+
+    def request(
+        self,
+        method: str,
+        *args,
+        timeout: Optional[float] = DEFAULT_REQUEST_TIMEOUT,
+        **kwargs,
+    ) -> Any:
+        """Query the frontend and block until it answers.
+
+        The answer is delivered by the kernel's comm handler, which runs on
+        the kernel's main thread, so this only works from other threads
+        (background threads, scripts driving a frontend). On the kernel's
+        main thread, e.g. in a notebook cell, it raises instead of hanging;
+        use :meth:`request_async` from a task or :meth:`send_request` there.
+
+        Args:
+            method: Name of the JavaScript query
+            *args: Positional arguments for the query
+            timeout: Seconds to wait for the answer, or None to wait forever
+            **kwargs: Keyword arguments for the query
+
+        Returns:
+            The query result.
+
+        Raises:
+            TimeoutError: If no view of the map answered in time.
+            RuntimeError: If the query failed in the browser, or if called on
+                the kernel's main thread.
+
+        Example:
+            >>> features = m.request("queryRenderedFeatures", layers=["states"])
+        """
+        if _on_kernel_thread():
+            raise RuntimeError(
+                f"Cannot wait for '{method}' on the kernel's main thread: the "
+                "map can only answer once the cell has finished. Use "
+                "send_request() and read the future later, or await "
+                "request_async() from a task."
+            )
+        future = self.send_request(method, *args, **kwargs)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutError(
+                f"No response to '{method}' within {timeout} seconds; "
+                "is the map displayed?"
+            ) from None
+
+    async def request_async(
+        self,
+        method: str,
+        *args,
+        timeout: Optional[float] = DEFAULT_REQUEST_TIMEOUT,
+        **kwargs,
+    ) -> Any:
+        """Query the frontend and await the answer.
+
+        The kernel handles the reply between message handlers, so in a
+        notebook run this in a task (e.g. ``asyncio.ensure_future``) rather
+        than awaiting it at the top level of a cell.
+
+        Args:
+            method: Name of the JavaScript query
+            *args: Positional arguments for the query
+            timeout: Seconds to wait for the answer, or None to wait forever
+            **kwargs: Keyword arguments for the query
+
+        Returns:
+            The query result.
+
+        Raises:
+            TimeoutError: If no view of the map answered in time.
+            RuntimeError: If the query failed in the browser.
+
+        Example:
+            >>> data = await m.request_async("getLayerData", sourceId="states")
+        """
+        future = self.send_request(method, *args, **kwargs)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            raise TimeoutError(
+                f"No response to '{method}' within {timeout} seconds; "
+                "is the map displayed?"
+            ) from None
+
+    def _js_call_history(self, resolve_data: bool = False) -> List[Dict[str, Any]]:
+        """Get the compacted call history needed to rebuild the map.
+
+        Args:
+            resolve_data: Replace data store references and compressed
+                kwargs with the payloads, and GeoArrow buffers with JSON
+                data, for consumers that cannot fetch or decode them (HTML
+                export).
+
+        Returns:
+            List of JS calls in the order they were made.
+        """
+        calls = self._call_history.calls()
+        if resolve_data:
+            calls = [
+                _decode_geoarrow_call(_inflate_call(self._data_store.resolve(call)))
+                for call in calls
+            ]
+        return calls
+
+    def _inline_tile_layers(
+        self,
+        calls: List[Dict[str, Any]],
+        method: str,
+        tile_kwargs: Tuple[str, ...],
+    ) -> List[Dict[str, Any]]:
+        """Replace the calls of kernel-tiled layers with ``addGeoJSON`` calls.
+
+        An exported map has no kernel to cut tiles, so the features of each
+        tile source are written into the file as GeoJSON instead.
+
+        Args:
+            calls: JS call history
+            method: Method that adds a kernel-tiled layer
+            tile_kwargs: Kwargs of that method that only apply to tiles
+
+        Returns:
+            The calls, with each tiled layer added from inline GeoJSON.
+        """
+        result = []
+        for call in calls:
+            kwargs = call.get("kwargs") or {}
+            source = self._tile_sources.get(
+                kwargs.get("source", f"{kwargs.get('name')}-source")
+            )
+            if call.get("method") == method and source is not None:
+                kwargs = {k: v for k, v in kwargs.items() if k not in tile_kwargs}
+                kwargs["data"] = source.to_geojson(self._coordinate_precision())
+                call = {**call, "method": "addGeoJSON", "kwargs": kwargs}
+            result.append(call)
+        return result
 
     def call_js_method(self, method: str, *args, **kwargs) -> None:
         """Queue a JavaScript method call.
 
+        Calls are kept until the frontend acknowledges them through
+        ``_js_calls_ack``. Calls made obsolete by later ones (a layer
+        that was removed again, repeated property updates) are collapsed.
+        For frontends that decode them, NumPy accessor arrays are sent as
+        binary buffers, and kwargs whose JSON encoding exceeds
+        ``compression_threshold`` bytes are sent zlib-compressed.
+
         Args:
             method: Name of the JavaScript method to call
             *args: Positional arguments for the method
             **kwargs: Keyword arguments for the method
         """
-        self._js_method_counter += 1
-        call = {
-            "id": self._js_method_counter,
-            "method": method,
-            "args": list(args),
-            "kwargs": kwargs,
-        }
-        self._js_calls = self._js_calls + [call]
+        start = time.perf_counter() if self._perf_stats is not None else None
+        if self._packed_transport:
+            kwargs = self._compress_kwargs(pack_binary_attributes(kwargs))
+        with self._calls_lock:
+            self._js_method_counter += 1
+            call = {
+                "id": self._js_method_counter,
+                "method": method,
+                "args": list(args),
+                "kwargs": kwargs,
+            }
+            if start is not None:
+                self._record_call_stats(call, start)
+            logs = [self._call_history, self._pending_calls]
+            if method in _QUERY_METHODS or method in _STREAMED_METHODS:
+                logs.remove(self._call_history)
+            for log in logs:
+                # Retain first: the calls this one supersedes may share its data
+                self._data_store.retain(call)
+                if not log.add(call):
+                    self._release_call_data(call)
+            if not self._batch_depth:
+                self._js_calls = self._pending_calls.calls()
+
+    def _compress_kwargs(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Compress the kwargs of a call whose payload is large.
+
+        Each dict or list kwarg is serialized once; when the encoding reaches
+        ``compression_threshold`` bytes it is replaced by a compressed
+        payload marker.
+
+        Args:
+            kwargs: Call kwargs
+
+        Returns:
+            The kwargs, copied only if a value was compressed.
+        """
+        threshold = self.compression_threshold
+        if threshold is None:
+            return kwargs
+        compressed = None
+        for key, value in kwargs.items():
+            if not isinstance(value, (dict, list)) or _is_blob_ref(value):
+                continue
+            try:
+                encoded = encode_payload(value)
+            except (TypeError, ValueError):
+                continue
+            if len(encoded) >= threshold:
+                if compressed is None:
+                    compressed = dict(kwargs)
+                compressed[key] = compress_payload(encoded)
+        return kwargs if compressed is None else compressed
+
+    def _coordinate_precision(self, precision: Optional[int] = None) -> int:
+        """Resolve the decimal places kept in vector coordinates.
 
-    def on_map_event(self, event_type: str, handler: Callable) -> None:
+        Args:
+            precision: Precision requested for a call, if any
+
+        Returns:
+            The call's precision, else ``coordinate_precision``, else the
+            precision that resolves a pixel at ``max_zoom``, at most
+            ``DEFAULT_COORDINATE_PRECISION``. The default ``max_zoom`` would
+            need 8 decimal places, which barely shortens the payload.
+        """
+        if precision is not None:
+            return precision
+        if self.coordinate_precision is not None:
+            return self.coordinate_precision
+        return min(zoom_precision(self.max_zoom), DEFAULT_COORDINATE_PRECISION)
+
+    @contextmanager
+    def batch(self) -> Iterator["MapWidget"]:
+        """Coalesce many map updates into a single sync with the frontend.
+
+        JS calls and trait changes made inside the block are sent as one
+        comm message when the outermost ``batch`` block exits, and the
+        frontend applies them in one pass. On MapLibre and Mapbox maps the
+        deck.gl overlay is then rebuilt once and the map repaints in a
+        single frame; sources that load data asynchronously (tiles, GeoJSON
+        parsed in a worker) may still appear in later frames. State patches
+        made inside the block follow in a single message.
+
+        Yields:
+            The map widget itself.
+
+        Example:
+            >>> with m.batch():
+            ...     for path in paths:
+            ...         m.add_vector(path, fit_bounds=False)
+        """
+        self._batch_depth += 1
+        try:
+            with self.hold_sync():
+                try:
+                    yield self
+                finally:
+                    if self._batch_depth == 1:
+                        self._js_calls = self._pending_calls.calls()
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._held_patches:
+                ops, self._held_patches = self._held_patches, []
+                self._send_with_buffers({"type": "state_patch", "ops": ops})
+
+    def _set_state(self, trait: str, key: str, value: Any) -> None:
+        """Set an entry of a state dict trait (``_layers``, ``_sources``, ...).
+
+        The trait is updated in place and only the change is sent to the
+        frontend, so the cost does not grow with the number of entries.
+
+        Args:
+            trait: Name of the dict trait
+            key: Entry key, e.g. the layer id
+            value: New entry value
+        """
+        self._patch_state({"trait": trait, "op": "set", "key": key, "value": value})
+
+    def _update_state(self, trait: str, key: str, changes: Dict[str, Any]) -> None:
+        """Update some fields of a state dict trait entry, if it exists.
+
+        Args:
+            trait: Name of the dict trait
+            key: Entry key
+            changes: Fields to set on the entry
+        """
+        if key in getattr(self, trait):
+            self._patch_state(
+                {"trait": trait, "op": "merge", "key": key, "value": changes}
+            )
+
+    def _remove_state(self, trait: str, key: str) -> None:
+        """Remove an entry from a state dict trait, if it exists.
+
+        Args:
+            trait: Name of the dict trait
+            key: Entry key
+        """
+        if key in getattr(self, trait):
+            self._patch_state({"trait": trait, "op": "delete", "key": key})
+
+    def _append_state(self, trait: str, key: str, item: Any) -> None:
+        """Append an item to a list entry of a state dict trait.
+
+        Args:
+            trait: Name of the dict trait
+            key: Entry key; the entry is created if missing
+            item: Item to append unless already present
+        """
+        self._patch_state({"trait": trait, "op": "append", "key": key, "value": item})
+
+    def _discard_state(self, trait: str, key: str, item: Any) -> None:
+        """Remove an item from a list entry, dropping the entry once empty.
+
+        Args:
+            trait: Name of the dict trait
+            key: Entry key
+            item: Item to remove
+        """
+        self._patch_state({"trait": trait, "op": "discard", "key": key, "value": item})
+
+    def _apply_patch(self, op: Dict[str, Any]) -> None:
+        """Apply a state patch operation to its dict trait in place.
+
+        Args:
+            op: Operation with ``trait``, ``op``, ``key`` and ``value``
+        """
+        members = self._state_members.setdefault(op["trait"], {})
+        _apply_state_op(getattr(self, op["trait"]), op, members)
+
+    def _patch_state(self, op: Dict[str, Any]) -> None:
+        """Apply a state patch operation and send it to the frontend.
+
+        Args:
+            op: Operation with ``trait``, ``op``, ``key`` and ``value``
+        """
+        self._apply_patch(op)
+        if self._batch_depth:
+            self._held_patches.append(op)
+        else:
+            self._send_with_buffers({"type": "state_patch", "ops": [op]})
+
+    def on_map_event(
+        self,
+        event_type: str,
+        handler: Callable,
+        throttle_ms: Optional[int] = None,
+        debounce_ms: Optional[int] = None,
+        coalesce: Optional[str] = None,
+    ) -> None:
         """Register an event handler.
 
+        Rate limits are enforced in the browser, so events that are dropped
+        never reach the kernel. They apply to the event type, for all of its
+        handlers; the most recent options given for a type win.
+
         Args:
-            event_type: Type of event (e.g., 'click', 'moveend')
+            event_type: Type of event (e.g., 'click', 'moveend', 'mousemove')
             handler: Callback function to handle the event
+            throttle_ms: Deliver at most one event per interval. Events in
+                between are held and sent when the interval ends.
+            debounce_ms: Deliver events only once none arrived for this long.
+            coalesce: ``"last"`` to keep only the newest held event,
+                ``"all"`` to deliver every held event in one batch. Defaults
+                to ``"last"`` when a rate limit is set.
+
+        Raises:
+            ValueError: If both throttle_ms and debounce_ms are given, or
+                coalesce is not "last" or "all".
+
+        Example:
+            >>> m.on_map_event("mousemove", show_coords, throttle_ms=100)
         """
+        if throttle_ms and debounce_ms:
+            raise ValueError("Use either throttle_ms or debounce_ms, not both")
+        if coalesce not in (None, "last", "all"):
+            raise ValueError(f"coalesce must be 'last' or 'all', got {coalesce!r}")
+
         if event_type not in self._event_handlers:
             self._event_handlers[event_type] = []
         self._event_handlers[event_type].append(handler)
 
+        options = dict(self._event_options.get(event_type, {}))
+        if throttle_ms or debounce_ms:
+            options = {
+                "throttle_ms": throttle_ms,
+                "debounce_ms": debounce_ms,
+                "coalesce": coalesce or "last",
+            }
+        elif coalesce:
+            options["coalesce"] = coalesce
+        options = {k: v for k, v in options.items() if v}
+        if self._event_options.get(event_type) != options:
+            self._event_options = {**self._event_options, event_type: options}
+
     def off_map_event(
         self, event_type: str, handler: Optional[Callable] = None
     ) -> None:
@@ -125,6 +1275,111 @@ class MapWidget(anywidget.AnyWidget):
                 self._event_handlers[event_type] = [
                     h for h in self._event_handlers[event_type] if h != handler
                 ]
+                if not self._event_handlers[event_type]:
+                    del self._event_handlers[event_type]
+        if event_type not in self._event_handlers and event_type in (
+            self._event_options
+        ):
+            self._event_options = {
+                k: v for k, v in self._event_options.items() if k != event_type
+            }
+
+    def enable_perf_stats(
+        self,
+        enabled: bool = True,
+        callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> None:
+        """Record transport timings for every JS call.
+
+        For each call this records the payload size and the Python
+        serialization time; the frontend reports how long the call waited
+        (e.g. for the map to load) and how long its handler ran.
+
+        Args:
+            enabled: Whether to record timings. Disabling clears the
+                recorded stats.
+            callback: Called with a call's record (see :meth:`perf_stats`)
+                each time the frontend reports its timings, e.g. to forward
+                them to a metrics system.
+
+        Example:
+            >>> m.enable_perf_stats(callback=lambda r: statsd.timing(
+            ...     f"map.{r['method']}", r["apply_ms"]))
+        """
+        if enabled:
+            if self._perf_stats is None:
+                self._perf_stats = {}
+                self.on_map_event("perf_stats", self._handle_perf_stats)
+            self._perf_callback = callback
+        else:
+            self._perf_stats = None
+            self._perf_callback = None
+            self.off_map_event("perf_stats", self._handle_perf_stats)
+
+    def perf_stats(self) -> Any:
+        """Get the recorded transport timings.
+
+        Columns: ``id``, ``method``, ``bytes`` (JSON and binary buffers sent
+        with the call), ``serialize_ms`` (packing, compression and JSON
+        encoding in Python), ``queued_ms`` (time the call waited in the
+        browser before running) and ``apply_ms`` (JS handler time). The
+        browser columns are None until the frontend reports them.
+
+        Returns:
+            A pandas DataFrame if pandas is installed, otherwise a list of
+            dicts. Empty if stats are not enabled.
+        """
+        rows = [dict(record) for record in (self._perf_stats or {}).values()]
+        try:
+            import pandas as pd
+        except ImportError:
+            return rows
+        return pd.DataFrame(rows, columns=list(_PERF_STATS_COLUMNS))
+
+    def _record_call_stats(self, call: Dict[str, Any], start: float) -> None:
+        """Record the size and serialization time of a call.
+
+        Args:
+            call: The JS call dict
+            start: ``time.perf_counter()`` value before the call was built
+        """
+        buffer_bytes = []
+
+        def default(obj: Any) -> Any:
+            if isinstance(obj, memoryview):
+                buffer_bytes.append(obj.nbytes)
+                return None
+            return json_default(obj)
+
+        size = len(json.dumps(call, separators=(",", ":"), default=default))
+        stats = self._perf_stats
+        stats[call["id"]] = {
+            "id": call["id"],
+            "method": call["method"],
+            "bytes": size + sum(buffer_bytes),
+            "serialize_ms": (time.perf_counter() - start) * 1000,
+            "queued_ms": None,
+            "apply_ms": None,
+        }
+        while len(stats) > PERF_STATS_LIMIT:
+            del stats[next(iter(stats))]
+
+    def _handle_perf_stats(self, data: Any) -> None:
+        """Merge call timings reported by the frontend.
+
+        Args:
+            data: List of ``{id, queued_ms, apply_ms}`` dicts
+        """
+        if self._perf_stats is None:
+            return
+        for timing in data or []:
+            record = self._perf_stats.get(timing.get("id"))
+            if record is None:
+                continue
+            record["queued_ms"] = timing.get("queued_ms")
+            record["apply_ms"] = timing.get("apply_ms")
+            if self._perf_callback is not None:
+                self._perf_callback(dict(record))
 
     def set_center(self, lng: float, lat: float) -> None:
         """Set the map center.
@@ -43,6 +43,9 @@ class CesiumMap(MapWidget):
     _esm = STATIC_DIR / "cesium.js"
     _css = STATIC_DIR / "cesium.css"
 
+    # The frontend reads kwargs as plain JSON
+    _packed_transport = False
+
     # Cesium-specific traits
     access_token = traitlets.Unicode("").tag(sync=True)
 
@@ -149,10 +152,7 @@ class CesiumMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "imagery"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "imagery"})
 
     def remove_imagery_layer(self, name: str) -> None:
         """Remove an imagery layer.
@@ -160,10 +160,7 @@ class CesiumMap(MapWidget):
         Args:
             name: Layer name to remove.
         """
-        if name in self._layers:
-            layers = dict(self._layers)
-            del layers[name]
-            self._layers = layers
+        self._remove_state("_layers", name)
         self.call_js_method("removeImageryLayer", name)
 
     # -------------------------------------------------------------------------
@@ -228,10 +225,7 @@ class CesiumMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "3dtiles"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "3dtiles"})
 
     def remove_3d_tileset(self, name: str) -> None:
         """Remove a 3D Tileset.
@@ -239,10 +233,7 @@ class CesiumMap(MapWidget):
         Args:
             name: Tileset name to remove.
         """
-        if name in self._layers:
-            layers = dict(self._layers)
-            del layers[name]
-            self._layers = layers
+        self._remove_state("_layers", name)
         self.call_js_method("remove3DTileset", name)
 
     # -------------------------------------------------------------------------
@@ -258,6 +249,7 @@ class CesiumMap(MapWidget):
         fill: str = "rgba(51, 136, 255, 0.5)",
         clamp_to_ground: bool = True,
         fly_to: bool = True,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add GeoJSON data.
@@ -270,9 +262,12 @@ class CesiumMap(MapWidget):
             fill: Fill color.
             clamp_to_ground: Whether to clamp features to terrain.
             fly_to: Whether to fly to the data after loading.
+            precision: Decimal places kept in coordinates. Defaults to the
+                map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional options.
         """
-        geojson = to_geojson(data)
+        precision = self._coordinate_precision(precision)
+        geojson = to_geojson(data, precision=precision)
         layer_id = name or f"geojson-{len(self._layers)}"
 
         self.call_js_method(
@@ -287,10 +282,7 @@ class CesiumMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "geojson"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "geojson"})
 
     def remove_data_source(self, name: str) -> None:
         """Remove a data source (GeoJSON, etc.).
@@ -298,10 +290,7 @@ class CesiumMap(MapWidget):
         Args:
             name: Data source name to remove.
         """
-        if name in self._layers:
-            layers = dict(self._layers)
-            del layers[name]
-            self._layers = layers
+        self._remove_state("_layers", name)
         self.call_js_method("removeDataSource", name)
 
     # -------------------------------------------------------------------------
@@ -431,7 +420,7 @@ class CesiumMap(MapWidget):
             "width": self.width,
             "height": self.height,
             "layers": self._layers,
-            "js_calls": self._js_calls,
+            "js_calls": self._js_call_history(resolve_data=True),
         }
 
         template = template.replace("{{state}}", json.dumps(state, indent=2))
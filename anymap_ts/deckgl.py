@@ -9,6 +9,13 @@ from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 import traitlets
 
 from .maplibre import MapLibreMap
+from .utils import (
+    is_arrow_data,
+    json_default,
+    quantize_geojson,
+    to_geoarrow,
+    to_geojson,
+)
 
 # Path to bundled static assets
 STATIC_DIR = Path(__file__).parent / "static"
@@ -99,6 +106,7 @@ class DeckGLMap(MapLibreMap):
         filled: bool = True,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a scatterplot layer for point visualization.
@@ -118,10 +126,12 @@ class DeckGLMap(MapLibreMap):
             filled: Whether to fill points.
             pickable: Whether layer responds to hover/click.
             opacity: Layer opacity.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional layer props.
         """
         layer_id = name or f"scatterplot-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision, geoarrow=True)
 
         self.call_js_method(
             "addScatterplotLayer",
@@ -129,8 +139,12 @@ class DeckGLMap(MapLibreMap):
             data=processed_data,
             getPosition=get_position,
             getRadius=get_radius,
-            getFillColor=get_fill_color or [51, 136, 255, 200],
-            getLineColor=get_line_color or [255, 255, 255, 255],
+            getFillColor=(
+                [51, 136, 255, 200] if get_fill_color is None else get_fill_color
+            ),
+            getLineColor=(
+                [255, 255, 255, 255] if get_line_color is None else get_line_color
+            ),
             radiusScale=radius_scale,
             radiusMinPixels=radius_min_pixels,
             radiusMaxPixels=radius_max_pixels,
@@ -142,10 +156,9 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "ScatterplotLayer", "id": layer_id},
-        }
+        self._set_state(
+            "_deck_layers", layer_id, {"type": "ScatterplotLayer", "id": layer_id}
+        )
 
     # -------------------------------------------------------------------------
     # DeckGL Arc Layer
@@ -162,6 +175,7 @@ class DeckGLMap(MapLibreMap):
         get_width: Union[float, str, Callable] = 1,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add an arc layer for origin-destination visualization.
@@ -176,10 +190,12 @@ class DeckGLMap(MapLibreMap):
             get_width: Accessor for arc width.
             pickable: Whether layer responds to hover/click.
             opacity: Layer opacity.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional layer props.
         """
         layer_id = name or f"arc-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addArcLayer",
@@ -187,18 +203,19 @@ class DeckGLMap(MapLibreMap):
             data=processed_data,
             getSourcePosition=get_source_position,
             getTargetPosition=get_target_position,
-            getSourceColor=get_source_color or [51, 136, 255, 255],
-            getTargetColor=get_target_color or [255, 136, 51, 255],
+            getSourceColor=(
+                [51, 136, 255, 255] if get_source_color is None else get_source_color
+            ),
+            getTargetColor=(
+                [255, 136, 51, 255] if get_target_color is None else get_target_color
+            ),
             getWidth=get_width,
             pickable=pickable,
             opacity=opacity,
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "ArcLayer", "id": layer_id},
-        }
+        self._set_state("_deck_layers", layer_id, {"type": "ArcLayer", "id": layer_id})
 
     # -------------------------------------------------------------------------
     # DeckGL Point Cloud Layer
@@ -217,6 +234,7 @@ class DeckGLMap(MapLibreMap):
         coordinate_origin: Optional[List[float]] = None,
         pickable: bool = True,
         opacity: float = 1.0,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a point cloud layer for 3D point visualization.
@@ -238,6 +256,8 @@ class DeckGLMap(MapLibreMap):
             coordinate_origin: Origin for offset coordinate systems [lng, lat, z].
             pickable: Whether layer responds to hover/click.
             opacity: Layer opacity (0-1).
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional PointCloudLayer props.
 
         Example:
@@ -253,13 +273,13 @@ class DeckGLMap(MapLibreMap):
             ... )
         """
         layer_id = name or f"pointcloud-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         layer_kwargs = {
             "id": layer_id,
             "data": processed_data,
             "getPosition": get_position,
-            "getColor": get_color or [255, 255, 255, 255],
+            "getColor": [255, 255, 255, 255] if get_color is None else get_color,
             "pointSize": point_size,
             "sizeUnits": size_units,
             "pickable": pickable,
@@ -278,10 +298,9 @@ class DeckGLMap(MapLibreMap):
         layer_kwargs.update(kwargs)
         self.call_js_method("addPointCloudLayer", **layer_kwargs)
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "PointCloudLayer", "id": layer_id},
-        }
+        self._set_state(
+            "_deck_layers", layer_id, {"type": "PointCloudLayer", "id": layer_id}
+        )
 
     # -------------------------------------------------------------------------
     # DeckGL Path Layer
@@ -298,6 +317,7 @@ class DeckGLMap(MapLibreMap):
         width_min_pixels: float = 1,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a path layer for polyline visualization.
@@ -312,17 +332,19 @@ class DeckGLMap(MapLibreMap):
             width_min_pixels: Minimum width in pixels.
             pickable: Whether layer responds to hover/click.
             opacity: Layer opacity.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional layer props.
         """
         layer_id = name or f"path-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision, geoarrow=True)
 
         self.call_js_method(
             "addPathLayer",
             id=layer_id,
             data=processed_data,
             getPath=get_path,
-            getColor=get_color or [51, 136, 255, 200],
+            getColor=[51, 136, 255, 200] if get_color is None else get_color,
             getWidth=get_width,
             widthScale=width_scale,
             widthMinPixels=width_min_pixels,
@@ -331,10 +353,7 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "PathLayer", "id": layer_id},
-        }
+        self._set_state("_deck_layers", layer_id, {"type": "PathLayer", "id": layer_id})
 
     # -------------------------------------------------------------------------
     # DeckGL Polygon Layer
@@ -356,6 +375,7 @@ class DeckGLMap(MapLibreMap):
         line_width_min_pixels: float = 1,
         pickable: bool = True,
         opacity: float = 0.5,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a polygon layer for filled polygon visualization.
@@ -375,18 +395,22 @@ class DeckGLMap(MapLibreMap):
             line_width_min_pixels: Minimum stroke width.
             pickable: Whether layer responds to hover/click.
             opacity: Layer opacity.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional layer props.
         """
         layer_id = name or f"polygon-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision, geoarrow=True)
 
         self.call_js_method(
             "addPolygonLayer",
             id=layer_id,
             data=processed_data,
             getPolygon=get_polygon,
-            getFillColor=get_fill_color or [51, 136, 255, 128],
-            getLineColor=get_line_color or [0, 0, 255, 255],
+            getFillColor=(
+                [51, 136, 255, 128] if get_fill_color is None else get_fill_color
+            ),
+            getLineColor=[0, 0, 255, 255] if get_line_color is None else get_line_color,
             getLineWidth=get_line_width,
             getElevation=get_elevation,
             extruded=extruded,
@@ -399,10 +423,9 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "PolygonLayer", "id": layer_id},
-        }
+        self._set_state(
+            "_deck_layers", layer_id, {"type": "PolygonLayer", "id": layer_id}
+        )
 
     # -------------------------------------------------------------------------
     # DeckGL Hexagon Layer
@@ -419,6 +442,7 @@ class DeckGLMap(MapLibreMap):
         color_range: Optional[List[List[int]]] = None,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a hexagon layer for hexbin aggregation visualization.
@@ -433,10 +457,12 @@ class DeckGLMap(MapLibreMap):
             color_range: Color gradient for aggregation [[r, g, b], ...].
             pickable: Whether layer responds to hover/click.
             opacity: Layer opacity.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional layer props.
         """
         layer_id = name or f"hexagon-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         default_color_range = [
             [1, 152, 189],
@@ -461,10 +487,9 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "HexagonLayer", "id": layer_id},
-        }
+        self._set_state(
+            "_deck_layers", layer_id, {"type": "HexagonLayer", "id": layer_id}
+        )
 
     # -------------------------------------------------------------------------
     # DeckGL Heatmap Layer
@@ -481,6 +506,7 @@ class DeckGLMap(MapLibreMap):
         threshold: float = 0.05,
         color_range: Optional[List[List[int]]] = None,
         opacity: float = 1,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a heatmap layer for density visualization.
@@ -495,10 +521,12 @@ class DeckGLMap(MapLibreMap):
             threshold: Minimum density threshold.
             color_range: Color gradient [[r, g, b, a], ...].
             opacity: Layer opacity.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional layer props.
         """
         layer_id = name or f"heatmap-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         default_color_range = [
             [255, 255, 178, 25],
@@ -523,10 +551,9 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "HeatmapLayer", "id": layer_id},
-        }
+        self._set_state(
+            "_deck_layers", layer_id, {"type": "HeatmapLayer", "id": layer_id}
+        )
 
     # -------------------------------------------------------------------------
     # DeckGL Grid Layer
@@ -543,6 +570,7 @@ class DeckGLMap(MapLibreMap):
         color_range: Optional[List[List[int]]] = None,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a grid layer for square grid aggregation visualization.
@@ -557,10 +585,12 @@ class DeckGLMap(MapLibreMap):
             color_range: Color gradient [[r, g, b], ...].
             pickable: Whether layer responds to hover/click.
             opacity: Layer opacity.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional layer props.
         """
         layer_id = name or f"grid-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         default_color_range = [
             [1, 152, 189],
@@ -585,10 +615,7 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "GridLayer", "id": layer_id},
-        }
+        self._set_state("_deck_layers", layer_id, {"type": "GridLayer", "id": layer_id})
 
     # -------------------------------------------------------------------------
     # DeckGL Icon Layer
@@ -606,6 +633,7 @@ class DeckGLMap(MapLibreMap):
         icon_mapping: Optional[Dict] = None,
         pickable: bool = True,
         opacity: float = 1,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add an icon layer for custom marker visualization.
@@ -621,10 +649,12 @@ class DeckGLMap(MapLibreMap):
             icon_mapping: Dict mapping icon names to atlas coordinates.
             pickable: Whether layer responds to hover/click.
             opacity: Layer opacity.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional layer props.
         """
         layer_id = name or f"icon-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addIconLayer",
@@ -633,7 +663,7 @@ class DeckGLMap(MapLibreMap):
             getPosition=get_position,
             getIcon=get_icon,
             getSize=get_size,
-            getColor=get_color or [255, 255, 255, 255],
+            getColor=[255, 255, 255, 255] if get_color is None else get_color,
             iconAtlas=icon_atlas,
             iconMapping=icon_mapping,
             pickable=pickable,
@@ -641,10 +671,7 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "IconLayer", "id": layer_id},
-        }
+        self._set_state("_deck_layers", layer_id, {"type": "IconLayer", "id": layer_id})
 
     # -------------------------------------------------------------------------
     # DeckGL Text Layer
@@ -663,6 +690,7 @@ class DeckGLMap(MapLibreMap):
         alignment_baseline: str = "center",
         pickable: bool = True,
         opacity: float = 1,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a text layer for label visualization.
@@ -679,10 +707,12 @@ class DeckGLMap(MapLibreMap):
             alignment_baseline: Vertical alignment ('top', 'center', 'bottom').
             pickable: Whether layer responds to hover/click.
             opacity: Layer opacity.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional layer props.
         """
         layer_id = name or f"text-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addTextLayer",
@@ -691,7 +721,7 @@ class DeckGLMap(MapLibreMap):
             getPosition=get_position,
             getText=get_text,
             getSize=get_size,
-            getColor=get_color or [0, 0, 0, 255],
+            getColor=[0, 0, 0, 255] if get_color is None else get_color,
             getAngle=get_angle,
             getTextAnchor=text_anchor,
             getAlignmentBaseline=alignment_baseline,
@@ -700,10 +730,7 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "TextLayer", "id": layer_id},
-        }
+        self._set_state("_deck_layers", layer_id, {"type": "TextLayer", "id": layer_id})
 
     # -------------------------------------------------------------------------
     # DeckGL GeoJSON Layer
@@ -726,6 +753,7 @@ class DeckGLMap(MapLibreMap):
         point_radius_min_pixels: float = 2,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a GeoJSON layer for rendering GeoJSON features.
@@ -746,17 +774,21 @@ class DeckGLMap(MapLibreMap):
             point_radius_min_pixels: Minimum point radius.
             pickable: Whether layer responds to hover/click.
             opacity: Layer opacity.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional layer props.
         """
         layer_id = name or f"geojson-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision, geoarrow=True)
 
         self.call_js_method(
             "addGeoJsonLayer",
             id=layer_id,
             data=processed_data,
-            getFillColor=get_fill_color or [51, 136, 255, 128],
-            getLineColor=get_line_color or [0, 0, 0, 255],
+            getFillColor=(
+                [51, 136, 255, 128] if get_fill_color is None else get_fill_color
+            ),
+            getLineColor=[0, 0, 0, 255] if get_line_color is None else get_line_color,
             getLineWidth=get_line_width,
             getPointRadius=get_point_radius,
             getElevation=get_elevation,
@@ -771,10 +803,9 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "GeoJsonLayer", "id": layer_id},
-        }
+        self._set_state(
+            "_deck_layers", layer_id, {"type": "GeoJsonLayer", "id": layer_id}
+        )
 
     # -------------------------------------------------------------------------
     # DeckGL Contour Layer
@@ -790,6 +821,7 @@ class DeckGLMap(MapLibreMap):
         contours: Optional[List[Dict]] = None,
         pickable: bool = True,
         opacity: float = 1,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a contour layer for isoline visualization.
@@ -803,10 +835,12 @@ class DeckGLMap(MapLibreMap):
             contours: Contour definitions [{threshold, color, strokeWidth}, ...].
             pickable: Whether layer responds to hover/click.
             opacity: Layer opacity.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional layer props.
         """
         layer_id = name or f"contour-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         default_contours = [
             {"threshold": 1, "color": [255, 255, 255], "strokeWidth": 1},
@@ -827,10 +861,9 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "ContourLayer", "id": layer_id},
-        }
+        self._set_state(
+            "_deck_layers", layer_id, {"type": "ContourLayer", "id": layer_id}
+        )
 
     # -------------------------------------------------------------------------
     # DeckGL Screen Grid Layer
@@ -846,6 +879,7 @@ class DeckGLMap(MapLibreMap):
         color_range: Optional[List[List[int]]] = None,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a screen grid layer for screen-space grid aggregation.
@@ -859,10 +893,12 @@ class DeckGLMap(MapLibreMap):
             color_range: Color gradient [[r, g, b, a], ...].
             pickable: Whether layer responds to hover/click.
             opacity: Layer opacity.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional layer props.
         """
         layer_id = name or f"screengrid-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         default_color_range = [
             [255, 255, 178, 25],
@@ -886,10 +922,9 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "ScreenGridLayer", "id": layer_id},
-        }
+        self._set_state(
+            "_deck_layers", layer_id, {"type": "ScreenGridLayer", "id": layer_id}
+        )
 
     # -------------------------------------------------------------------------
     # Generic DeckGL Layer
@@ -900,6 +935,7 @@ class DeckGLMap(MapLibreMap):
         layer_type: str,
         data: Any,
         name: Optional[str] = None,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a generic deck.gl layer to the map.
@@ -916,6 +952,8 @@ class DeckGLMap(MapLibreMap):
                 'PointCloudLayer', 'TripsLayer', 'LineLayer'.
             data: Array of data objects or GeoJSON.
             name: Layer ID. If None, auto-generated from layer_type.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Layer-specific properties passed directly to deck.gl.
                 Common properties include:
                 - opacity: Layer opacity (0-1)
@@ -947,7 +985,7 @@ class DeckGLMap(MapLibreMap):
         layer_type_clean = layer_type.replace("Layer", "")
         prefix = layer_type_clean.lower()
         layer_id = name or f"{prefix}-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addDeckGLLayer",
@@ -957,10 +995,7 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": layer_type, "id": layer_id},
-        }
+        self._set_state("_deck_layers", layer_id, {"type": layer_type, "id": layer_id})
 
     # -------------------------------------------------------------------------
     # DeckGL Trips Layer
@@ -978,6 +1013,7 @@ class DeckGLMap(MapLibreMap):
         current_time: float = 0,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a trips layer for animated path visualization.
@@ -997,6 +1033,8 @@ class DeckGLMap(MapLibreMap):
             current_time: Current animation time.
             pickable: Whether layer responds to hover/click.
             opacity: Layer opacity (0-1).
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional TripsLayer props.
 
         Example:
@@ -1014,7 +1052,7 @@ class DeckGLMap(MapLibreMap):
             ... )
         """
         layer_id = name or f"trips-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addTripsLayer",
@@ -1022,7 +1060,7 @@ class DeckGLMap(MapLibreMap):
             data=processed_data,
             getPath=get_path,
             getTimestamps=get_timestamps,
-            getColor=get_color or [253, 128, 93],
+            getColor=[253, 128, 93] if get_color is None else get_color,
             widthMinPixels=width_min_pixels,
             trailLength=trail_length,
             currentTime=current_time,
@@ -1031,10 +1069,9 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "TripsLayer", "id": layer_id},
-        }
+        self._set_state(
+            "_deck_layers", layer_id, {"type": "TripsLayer", "id": layer_id}
+        )
 
     # -------------------------------------------------------------------------
     # DeckGL Line Layer
@@ -1051,6 +1088,7 @@ class DeckGLMap(MapLibreMap):
         width_min_pixels: float = 1,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a line layer for simple line segment visualization.
@@ -1069,6 +1107,8 @@ class DeckGLMap(MapLibreMap):
             width_min_pixels: Minimum line width in pixels.
             pickable: Whether layer responds to hover/click.
             opacity: Layer opacity (0-1).
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional LineLayer props.
 
         Example:
@@ -1084,7 +1124,7 @@ class DeckGLMap(MapLibreMap):
             ... )
         """
         layer_id = name or f"line-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addLineLayer",
@@ -1092,7 +1132,7 @@ class DeckGLMap(MapLibreMap):
             data=processed_data,
             getSourcePosition=get_source_position,
             getTargetPosition=get_target_position,
-            getColor=get_color or [51, 136, 255, 200],
+            getColor=[51, 136, 255, 200] if get_color is None else get_color,
             getWidth=get_width,
             widthMinPixels=width_min_pixels,
             pickable=pickable,
@@ -1100,10 +1140,7 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "LineLayer", "id": layer_id},
-        }
+        self._set_state("_deck_layers", layer_id, {"type": "LineLayer", "id": layer_id})
 
     # -------------------------------------------------------------------------
     # DeckGL COG Layer
@@ -1167,10 +1204,9 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "COGLayer", "id": layer_id, "url": url},
-        }
+        self._set_state(
+            "_deck_layers", layer_id, {"type": "COGLayer", "id": layer_id, "url": url}
+        )
 
     # -------------------------------------------------------------------------
     # New DeckGL Layer Types
@@ -1219,10 +1255,9 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "BitmapLayer", "id": layer_id},
-        }
+        self._set_state(
+            "_deck_layers", layer_id, {"type": "BitmapLayer", "id": layer_id}
+        )
 
     def add_column_layer(
         self,
@@ -1242,6 +1277,7 @@ class DeckGLMap(MapLibreMap):
         wireframe: bool = False,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a column layer for 3D column/bar visualization.
@@ -1263,18 +1299,22 @@ class DeckGLMap(MapLibreMap):
             wireframe: Whether to render as wireframe.
             pickable: Whether layer responds to hover/click.
             opacity: Layer opacity.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional ColumnLayer props.
         """
         layer_id = name or f"column-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addColumnLayer",
             id=layer_id,
             data=processed_data,
             getPosition=get_position,
-            getFillColor=get_fill_color or [255, 140, 0, 200],
-            getLineColor=get_line_color or [0, 0, 0, 255],
+            getFillColor=(
+                [255, 140, 0, 200] if get_fill_color is None else get_fill_color
+            ),
+            getLineColor=[0, 0, 0, 255] if get_line_color is None else get_line_color,
             getElevation=get_elevation,
             radius=radius,
             diskResolution=disk_resolution,
@@ -1289,10 +1329,9 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "ColumnLayer", "id": layer_id},
-        }
+        self._set_state(
+            "_deck_layers", layer_id, {"type": "ColumnLayer", "id": layer_id}
+        )
 
     def add_grid_cell_layer(
         self,
@@ -1307,6 +1346,7 @@ class DeckGLMap(MapLibreMap):
         extruded: bool = True,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a grid cell layer for pre-aggregated grid visualization.
@@ -1323,17 +1363,19 @@ class DeckGLMap(MapLibreMap):
             extruded: Whether to extrude cells.
             pickable: Whether layer responds to hover/click.
             opacity: Layer opacity.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional GridCellLayer props.
         """
         layer_id = name or f"gridcell-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addGridCellLayer",
             id=layer_id,
             data=processed_data,
             getPosition=get_position,
-            getColor=get_color or [255, 140, 0, 200],
+            getColor=[255, 140, 0, 200] if get_color is None else get_color,
             getElevation=get_elevation,
             cellSize=cell_size,
             coverage=coverage,
@@ -1344,10 +1386,9 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "GridCellLayer", "id": layer_id},
-        }
+        self._set_state(
+            "_deck_layers", layer_id, {"type": "GridCellLayer", "id": layer_id}
+        )
 
     def add_solid_polygon_layer(
         self,
@@ -1363,6 +1404,7 @@ class DeckGLMap(MapLibreMap):
         elevation_scale: float = 1,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a solid polygon layer for filled polygon visualization.
@@ -1380,18 +1422,22 @@ class DeckGLMap(MapLibreMap):
             elevation_scale: Elevation multiplier.
             pickable: Whether layer responds to hover/click.
             opacity: Layer opacity.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional SolidPolygonLayer props.
         """
         layer_id = name or f"solidpolygon-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addSolidPolygonLayer",
             id=layer_id,
             data=processed_data,
             getPolygon=get_polygon,
-            getFillColor=get_fill_color or [51, 136, 255, 128],
-            getLineColor=get_line_color or [0, 0, 0, 255],
+            getFillColor=(
+                [51, 136, 255, 128] if get_fill_color is None else get_fill_color
+            ),
+            getLineColor=[0, 0, 0, 255] if get_line_color is None else get_line_color,
             getElevation=get_elevation,
             filled=filled,
             extruded=extruded,
@@ -1402,10 +1448,9 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "SolidPolygonLayer", "id": layer_id},
-        }
+        self._set_state(
+            "_deck_layers", layer_id, {"type": "SolidPolygonLayer", "id": layer_id}
+        )
 
     def add_tile_layer(
         self,
@@ -1447,10 +1492,7 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "TileLayer", "id": layer_id},
-        }
+        self._set_state("_deck_layers", layer_id, {"type": "TileLayer", "id": layer_id})
 
     def add_mvt_layer(
         self,
@@ -1498,8 +1540,10 @@ class DeckGLMap(MapLibreMap):
             minZoom=min_zoom,
             maxZoom=max_zoom,
             binary=binary,
-            getFillColor=get_fill_color or [51, 136, 255, 128],
-            getLineColor=get_line_color or [0, 0, 0, 255],
+            getFillColor=(
+                [51, 136, 255, 128] if get_fill_color is None else get_fill_color
+            ),
+            getLineColor=[0, 0, 0, 255] if get_line_color is None else get_line_color,
             getLineWidth=get_line_width,
             getPointRadius=get_point_radius,
             lineWidthMinPixels=line_width_min_pixels,
@@ -1510,10 +1554,7 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "MVTLayer", "id": layer_id},
-        }
+        self._set_state("_deck_layers", layer_id, {"type": "MVTLayer", "id": layer_id})
 
     def add_tile3d_layer(
         self,
@@ -1552,10 +1593,9 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "Tile3DLayer", "id": layer_id},
-        }
+        self._set_state(
+            "_deck_layers", layer_id, {"type": "Tile3DLayer", "id": layer_id}
+        )
 
     def add_terrain_layer(
         self,
@@ -1610,10 +1650,9 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "TerrainLayer", "id": layer_id},
-        }
+        self._set_state(
+            "_deck_layers", layer_id, {"type": "TerrainLayer", "id": layer_id}
+        )
 
     def add_great_circle_layer(
         self,
@@ -1628,6 +1667,7 @@ class DeckGLMap(MapLibreMap):
         width_max_pixels: float = 100,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a great circle layer for geodesic arc visualization.
@@ -1644,10 +1684,12 @@ class DeckGLMap(MapLibreMap):
             width_max_pixels: Maximum line width in pixels.
             pickable: Whether layer responds to hover/click.
             opacity: Layer opacity.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional GreatCircleLayer props.
         """
         layer_id = name or f"greatcircle-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addGreatCircleLayer",
@@ -1655,8 +1697,12 @@ class DeckGLMap(MapLibreMap):
             data=processed_data,
             getSourcePosition=get_source_position,
             getTargetPosition=get_target_position,
-            getSourceColor=get_source_color or [51, 136, 255, 255],
-            getTargetColor=get_target_color or [255, 136, 51, 255],
+            getSourceColor=(
+                [51, 136, 255, 255] if get_source_color is None else get_source_color
+            ),
+            getTargetColor=(
+                [255, 136, 51, 255] if get_target_color is None else get_target_color
+            ),
             getWidth=get_width,
             widthMinPixels=width_min_pixels,
             widthMaxPixels=width_max_pixels,
@@ -1665,10 +1711,9 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "GreatCircleLayer", "id": layer_id},
-        }
+        self._set_state(
+            "_deck_layers", layer_id, {"type": "GreatCircleLayer", "id": layer_id}
+        )
 
     def add_h3_hexagon_layer(
         self,
@@ -1687,6 +1732,7 @@ class DeckGLMap(MapLibreMap):
         high_precision: bool = False,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add an H3 hexagon layer for H3 spatial index visualization.
@@ -1707,18 +1753,22 @@ class DeckGLMap(MapLibreMap):
             high_precision: Use high precision rendering.
             pickable: Whether layer responds to hover/click.
             opacity: Layer opacity.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional H3HexagonLayer props.
         """
         layer_id = name or f"h3hexagon-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addH3HexagonLayer",
             id=layer_id,
             data=processed_data,
             getHexagon=get_hexagon,
-            getFillColor=get_fill_color or [51, 136, 255, 128],
-            getLineColor=get_line_color or [0, 0, 0, 255],
+            getFillColor=(
+                [51, 136, 255, 128] if get_fill_color is None else get_fill_color
+            ),
+            getLineColor=[0, 0, 0, 255] if get_line_color is None else get_line_color,
             getElevation=get_elevation,
             filled=filled,
             stroked=stroked,
@@ -1732,10 +1782,9 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "H3HexagonLayer", "id": layer_id},
-        }
+        self._set_state(
+            "_deck_layers", layer_id, {"type": "H3HexagonLayer", "id": layer_id}
+        )
 
     def add_h3_cluster_layer(
         self,
@@ -1751,6 +1800,7 @@ class DeckGLMap(MapLibreMap):
         elevation_scale: float = 1,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add an H3 cluster layer for grouped H3 cell visualization.
@@ -1768,18 +1818,22 @@ class DeckGLMap(MapLibreMap):
             elevation_scale: Elevation multiplier.
             pickable: Whether layer responds to hover/click.
             opacity: Layer opacity.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional H3ClusterLayer props.
         """
         layer_id = name or f"h3cluster-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addH3ClusterLayer",
             id=layer_id,
             data=processed_data,
             getHexagons=get_hexagons,
-            getFillColor=get_fill_color or [51, 136, 255, 128],
-            getLineColor=get_line_color or [0, 0, 0, 255],
+            getFillColor=(
+                [51, 136, 255, 128] if get_fill_color is None else get_fill_color
+            ),
+            getLineColor=[0, 0, 0, 255] if get_line_color is None else get_line_color,
             getLineWidth=get_line_width,
             filled=filled,
             stroked=stroked,
@@ -1790,10 +1844,9 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "H3ClusterLayer", "id": layer_id},
-        }
+        self._set_state(
+            "_deck_layers", layer_id, {"type": "H3ClusterLayer", "id": layer_id}
+        )
 
     def add_s2_layer(
         self,
@@ -1811,6 +1864,7 @@ class DeckGLMap(MapLibreMap):
         elevation_scale: float = 1,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add an S2 layer for S2 geometry cell visualization.
@@ -1830,18 +1884,22 @@ class DeckGLMap(MapLibreMap):
             elevation_scale: Elevation multiplier.
             pickable: Whether layer responds to hover/click.
             opacity: Layer opacity.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional S2Layer props.
         """
         layer_id = name or f"s2-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addS2Layer",
             id=layer_id,
             data=processed_data,
             getS2Token=get_s2_token,
-            getFillColor=get_fill_color or [51, 136, 255, 128],
-            getLineColor=get_line_color or [0, 0, 0, 255],
+            getFillColor=(
+                [51, 136, 255, 128] if get_fill_color is None else get_fill_color
+            ),
+            getLineColor=[0, 0, 0, 255] if get_line_color is None else get_line_color,
             getLineWidth=get_line_width,
             getElevation=get_elevation,
             filled=filled,
@@ -1854,10 +1912,7 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "S2Layer", "id": layer_id},
-        }
+        self._set_state("_deck_layers", layer_id, {"type": "S2Layer", "id": layer_id})
 
     def add_quadkey_layer(
         self,
@@ -1875,6 +1930,7 @@ class DeckGLMap(MapLibreMap):
         elevation_scale: float = 1,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a Quadkey layer for Bing Maps tile index visualization.
@@ -1894,18 +1950,22 @@ class DeckGLMap(MapLibreMap):
             elevation_scale: Elevation multiplier.
             pickable: Whether layer responds to hover/click.
             opacity: Layer opacity.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional QuadkeyLayer props.
         """
         layer_id = name or f"quadkey-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addQuadkeyLayer",
             id=layer_id,
             data=processed_data,
             getQuadkey=get_quadkey,
-            getFillColor=get_fill_color or [51, 136, 255, 128],
-            getLineColor=get_line_color or [0, 0, 0, 255],
+            getFillColor=(
+                [51, 136, 255, 128] if get_fill_color is None else get_fill_color
+            ),
+            getLineColor=[0, 0, 0, 255] if get_line_color is None else get_line_color,
             getLineWidth=get_line_width,
             getElevation=get_elevation,
             filled=filled,
@@ -1918,10 +1978,9 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "QuadkeyLayer", "id": layer_id},
-        }
+        self._set_state(
+            "_deck_layers", layer_id, {"type": "QuadkeyLayer", "id": layer_id}
+        )
 
     def add_geohash_layer(
         self,
@@ -1939,6 +1998,7 @@ class DeckGLMap(MapLibreMap):
         elevation_scale: float = 1,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a Geohash layer for geohash cell visualization.
@@ -1958,18 +2018,22 @@ class DeckGLMap(MapLibreMap):
             elevation_scale: Elevation multiplier.
             pickable: Whether layer responds to hover/click.
             opacity: Layer opacity.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional GeohashLayer props.
         """
         layer_id = name or f"geohash-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addGeohashLayer",
             id=layer_id,
             data=processed_data,
             getGeohash=get_geohash,
-            getFillColor=get_fill_color or [51, 136, 255, 128],
-            getLineColor=get_line_color or [0, 0, 0, 255],
+            getFillColor=(
+                [51, 136, 255, 128] if get_fill_color is None else get_fill_color
+            ),
+            getLineColor=[0, 0, 0, 255] if get_line_color is None else get_line_color,
             getLineWidth=get_line_width,
             getElevation=get_elevation,
             filled=filled,
@@ -1982,10 +2046,9 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "GeohashLayer", "id": layer_id},
-        }
+        self._set_state(
+            "_deck_layers", layer_id, {"type": "GeohashLayer", "id": layer_id}
+        )
 
     def add_wms_layer(
         self,
@@ -2027,10 +2090,7 @@ class DeckGLMap(MapLibreMap):
             **kwargs,
         )
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "WMSLayer", "id": layer_id},
-        }
+        self._set_state("_deck_layers", layer_id, {"type": "WMSLayer", "id": layer_id})
 
     def add_simple_mesh_layer(
         self,
@@ -2047,6 +2107,7 @@ class DeckGLMap(MapLibreMap):
         wireframe: bool = False,
         pickable: bool = True,
         opacity: float = 1.0,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a simple mesh layer for 3D mesh visualization.
@@ -2065,17 +2126,19 @@ class DeckGLMap(MapLibreMap):
             wireframe: Whether to render as wireframe.
             pickable: Whether layer responds to hover/click.
             opacity: Layer opacity (0-1).
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional SimpleMeshLayer props.
         """
         layer_id = name or f"simplemesh-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         layer_kwargs = {
             "id": layer_id,
             "data": processed_data,
             "mesh": mesh,
             "getPosition": get_position,
-            "getColor": get_color or [255, 255, 255, 255],
+            "getColor": [255, 255, 255, 255] if get_color is None else get_color,
             "sizeScale": size_scale,
             "wireframe": wireframe,
             "pickable": pickable,
@@ -2094,10 +2157,9 @@ class DeckGLMap(MapLibreMap):
         layer_kwargs.update(kwargs)
         self.call_js_method("addSimpleMeshLayer", **layer_kwargs)
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "SimpleMeshLayer", "id": layer_id},
-        }
+        self._set_state(
+            "_deck_layers", layer_id, {"type": "SimpleMeshLayer", "id": layer_id}
+        )
 
     def add_scenegraph_layer(
         self,
@@ -2114,6 +2176,7 @@ class DeckGLMap(MapLibreMap):
         size_max_pixels: float = 10000,
         pickable: bool = True,
         opacity: float = 1.0,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a scenegraph layer for glTF model visualization.
@@ -2132,17 +2195,19 @@ class DeckGLMap(MapLibreMap):
             size_max_pixels: Maximum model size in pixels.
             pickable: Whether layer responds to hover/click.
             opacity: Layer opacity (0-1).
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional ScenegraphLayer props.
         """
         layer_id = name or f"scenegraph-{len(self._deck_layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         layer_kwargs = {
             "id": layer_id,
             "data": processed_data,
             "scenegraph": scenegraph,
             "getPosition": get_position,
-            "getColor": get_color or [255, 255, 255, 255],
+            "getColor": [255, 255, 255, 255] if get_color is None else get_color,
             "sizeScale": size_scale,
             "sizeMinPixels": size_min_pixels,
             "sizeMaxPixels": size_max_pixels,
@@ -2160,10 +2225,9 @@ class DeckGLMap(MapLibreMap):
         layer_kwargs.update(kwargs)
         self.call_js_method("addScenegraphLayer", **layer_kwargs)
 
-        self._deck_layers = {
-            **self._deck_layers,
-            layer_id: {"type": "ScenegraphLayer", "id": layer_id},
-        }
+        self._set_state(
+            "_deck_layers", layer_id, {"type": "ScenegraphLayer", "id": layer_id}
+        )
 
     def remove_cog_layer(self, layer_id: str) -> None:
         """Remove a COG layer.
@@ -2183,10 +2247,7 @@ class DeckGLMap(MapLibreMap):
         Args:
             layer_id: Layer identifier to remove.
         """
-        if layer_id in self._deck_layers:
-            layers = dict(self._deck_layers)
-            del layers[layer_id]
-            self._deck_layers = layers
+        self._remove_state("_deck_layers", layer_id)
         self.call_js_method("removeDeckLayer", layer_id)
 
     def set_deck_layer_visibility(self, layer_id: str, visible: bool) -> None:
@@ -2202,37 +2263,58 @@ class DeckGLMap(MapLibreMap):
     # Data Processing Helpers
     # -------------------------------------------------------------------------
 
-    def _process_deck_data(self, data: Any) -> Any:
+    def _process_deck_data(
+        self, data: Any, precision: Optional[int] = None, geoarrow: bool = False
+    ) -> Any:
         """Process data for deck.gl layers.
 
-        Handles GeoDataFrame, GeoJSON, and list of dicts.
+        Handles Arrow data, GeoDataFrame, GeoJSON, and list of dicts.
 
         Args:
             data: Input data in various formats.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults
+                to the map's ``coordinate_precision`` (6 decimal places by
+                default).
+            geoarrow: Send Arrow data and GeoParquet files as GeoArrow
+                buffers. Only layers whose renderer reads GeoArrow set
+                this; others receive GeoJSON.
 
         Returns:
-            Processed data suitable for deck.gl.
+            Processed data suitable for deck.gl. Large GeoJSON and record
+            lists are replaced by a data store reference.
         """
+        precision = self._coordinate_precision(precision)
+
+        # Handle Arrow tables and GeoParquet files
+        if is_arrow_data(data):
+            if geoarrow:
+                table = to_geoarrow(data, precision=precision)
+                # Mixed geometry types come back as GeoJSON
+                if "__geoarrow__" in table:
+                    return table
+                return self._store_data(table)
+            return self._store_data(to_geojson(data, precision=precision))
+
         # Handle GeoDataFrame
         if hasattr(data, "__geo_interface__"):
-            return json.loads(data.to_json())
+            return self._store_data(to_geojson(data, precision=precision))
 
         # Handle file path
         if isinstance(data, (str, Path)):
             path = Path(data)
             if path.exists() and path.suffix.lower() in [".geojson", ".json"]:
                 with open(path) as f:
-                    return json.load(f)
+                    return self._store_data(quantize_geojson(json.load(f), precision))
             # Could be URL, return as-is
             return str(data)
 
         # Handle dict (GeoJSON or config)
         if isinstance(data, dict):
-            return data
+            return self._store_data(quantize_geojson(data, precision))
 
         # Handle list of dicts
         if isinstance(data, list):
-            return data
+            return self._store_data(data)
 
         return data
 
@@ -2262,8 +2344,10 @@ class DeckGLMap(MapLibreMap):
             "sources": self._sources,
             "controls": self._controls,
             "deckLayers": self._deck_layers,
-            "js_calls": self._js_calls,
+            "js_calls": self._js_call_history(resolve_data=True),
         }
 
-        template = template.replace("{{state}}", json.dumps(state, indent=2))
+        template = template.replace(
+            "{{state}}", json.dumps(state, indent=2, default=json_default)
+        )
         return template
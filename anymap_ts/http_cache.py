@@ -0,0 +1,357 @@
+"""Persistent on-disk cache for remote files.
+
+Responses are stored under the SHA-256 digest of their URL, with their
+``ETag`` and ``Last-Modified`` validators. A cached URL is revalidated with
+a conditional request on every fetch, so an unchanged file costs one round
+trip instead of a download. The least recently used files are evicted once
+the cache outgrows its size limit (1 GB by default).
+
+Remote inputs are cached by default, in ``~/.cache/anymap-ts/http``. Set
+``ANYMAP_TS_CACHE_DIR`` to another directory, or to an empty string to
+turn the cache off.
+
+Requests go through ``http_get``, which keeps one keep-alive connection per
+host and thread, so fetching many files from the same server does not pay
+for a new TCP and TLS handshake each time.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import http.client
+import json
+import os
+import tempfile
+import threading
+from email.message import Message
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+from urllib.error import HTTPError, URLError
+from urllib.parse import urljoin, urlsplit
+from urllib.request import Request, getproxies, proxy_bypass, urlopen
+
+# Default size limit of the cache in bytes
+DEFAULT_MAX_SIZE = 1 << 30
+
+_MAX_REDIRECTS = 5
+_REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+# Keep-alive connections of each thread, keyed by (scheme, host)
+_local = threading.local()
+
+
+def _connection(scheme: str, netloc: str, timeout: float) -> http.client.HTTPConnection:
+    """Get this thread's open connection to a host, creating it if needed."""
+    pool = getattr(_local, "connections", None)
+    if pool is None:
+        pool = _local.connections = {}
+    conn = pool.get((scheme, netloc))
+    if conn is None:
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(netloc, timeout=timeout)
+        else:
+            conn = http.client.HTTPConnection(netloc, timeout=timeout)
+        pool[(scheme, netloc)] = conn
+    conn.timeout = timeout
+    if conn.sock is not None:
+        conn.sock.settimeout(timeout)
+    return conn
+
+
+def _drop_connection(scheme: str, netloc: str) -> None:
+    conn = getattr(_local, "connections", {}).pop((scheme, netloc), None)
+    if conn is not None:
+        conn.close()
+
+
+def _proxied(scheme: str, host: str) -> bool:
+    """Check whether urllib would send a request through a proxy."""
+    return scheme in getproxies() and not proxy_bypass(host)
+
+
+def http_get(
+    url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 30
+) -> Tuple[bytes, Message]:
+    """Download a URL over a pooled keep-alive connection.
+
+    Redirects are followed and gzip-encoded responses are decompressed.
+    Requests that must go through a proxy fall back to ``urlopen``.
+
+    Args:
+        url: URL to fetch
+        headers: Request headers
+        timeout: Seconds to wait for the server
+
+    Returns:
+        The response body and headers.
+
+    Raises:
+        HTTPError: If the server answers with a status other than 200,
+            including 304 Not Modified
+        URLError: If the server cannot be reached
+    """
+    headers = {"User-Agent": "anymap-ts", "Accept-Encoding": "gzip", **(headers or {})}
+    for _ in range(_MAX_REDIRECTS + 1):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or _proxied(
+            parts.scheme, parts.hostname or ""
+        ):
+            headers.pop("Accept-Encoding", None)
+            request = Request(url, headers=headers)
+            with urlopen(request, timeout=timeout) as response:
+                return response.read(), response.headers
+
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        # A kept-alive connection may have been closed by the server since
+        # its last use, so a failed request is retried once on a new one
+        for attempt in range(2):
+            try:
+                conn = _connection(parts.scheme, parts.netloc, timeout)
+                conn.request("GET", target, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+                break
+            except (http.client.HTTPException, OSError) as e:
+                _drop_connection(parts.scheme, parts.netloc)
+                if attempt:
+                    raise URLError(e) from e
+        if response.will_close:
+            _drop_connection(parts.scheme, parts.netloc)
+
+        location = response.headers.get("Location")
+        if response.status in _REDIRECT_CODES and location:
+            url = urljoin(url, location)
+            continue
+        if response.status != 200:
+            raise HTTPError(
+                url, response.status, response.reason, response.headers, None
+            )
+        if response.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        return body, response.headers
+
+    raise HTTPError(url, response.status, "Too many redirects", response.headers, None)
+
+
+def default_cache_dir() -> Path:
+    """Get the default cache directory.
+
+    Returns:
+        ``$ANYMAP_TS_CACHE_DIR`` if set and not empty, else ``anymap-ts/http``
+        in the user cache directory (``$XDG_CACHE_HOME`` or ``~/.cache``).
+    """
+    directory = os.environ.get("ANYMAP_TS_CACHE_DIR")
+    if directory:
+        return Path(directory)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "anymap-ts" / "http"
+
+
+class HTTPCache:
+    """Size-bounded on-disk cache of HTTP responses.
+
+    Each URL is stored as a ``<digest>.body`` file with a ``<digest>.json``
+    file holding its validators. The modification time of the body file
+    records the last use, for LRU eviction.
+
+    Args:
+        directory: Cache directory. Defaults to ``default_cache_dir()``.
+        max_size: Maximum total size of the cached bodies in bytes.
+
+    Example:
+        >>> cache = HTTPCache("/tmp/anymap-cache", max_size=500_000_000)
+        >>> data = cache.fetch("https://example.com/countries.geojson")
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Union[str, Path]] = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+    ) -> None:
+        self.directory = Path(directory) if directory else default_cache_dir()
+        self.max_size = max_size
+        self._lock = threading.Lock()
+
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.body", self.directory / f"{digest}.json"
+
+    def _read_meta(self, meta_path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def fetch(self, url: str, timeout: float = 30) -> bytes:
+        """Get the body of a URL, from the cache when it is still valid.
+
+        A cached copy is revalidated with ``If-None-Match`` and
+        ``If-Modified-Since``; it is used when the server answers 304 Not
+        Modified, fails with a 5xx error, or cannot be reached.
+
+        Args:
+            url: URL to fetch
+            timeout: Seconds to wait for the server
+
+        Returns:
+            The response body.
+
+        Raises:
+            URLError: If the URL cannot be fetched and is not cached
+        """
+        body_path, meta_path = self._paths(url)
+        meta = self._read_meta(meta_path) if body_path.exists() else None
+
+        headers = {}
+        if meta is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        try:
+            data, response_headers = http_get(url, headers, timeout)
+        except HTTPError as e:
+            if meta is None or (e.code != 304 and e.code < 500):
+                raise
+            data = self._hit(body_path)
+            if data is None and e.code == 304:
+                # Evicted since the lookup: download it again
+                return self.fetch(url, timeout)
+            if data is None:
+                raise
+            # Not modified, or a server error: the cached copy beats no data
+            return data
+        except URLError:
+            # Offline: the last downloaded copy beats no data
+            data = self._hit(body_path) if meta is not None else None
+            if data is None:
+                raise
+            return data
+
+        etag = response_headers.get("ETag")
+        last_modified = response_headers.get("Last-Modified")
+        if etag or last_modified:
+            self._store(url, data, etag, last_modified)
+        return data
+
+    def _hit(self, body_path: Path) -> Optional[bytes]:
+        """Read a cached body and mark it as recently used.
+
+        Returns:
+            The body, or None if it is no longer cached.
+        """
+        try:
+            data = body_path.read_bytes()
+            os.utime(body_path)
+        except OSError:
+            return None
+        return data
+
+    def _store(
+        self,
+        url: str,
+        data: bytes,
+        etag: Optional[str],
+        last_modified: Optional[str],
+    ) -> None:
+        """Write a response to the cache, then evict down to ``max_size``.
+
+        Files are written to a temporary name and renamed, so concurrent
+        readers never see a partial body. Bodies larger than the whole
+        cache are not stored.
+        """
+        if len(data) > self.max_size:
+            return
+        body_path, meta_path = self._paths(url)
+        meta = {"url": url, "etag": etag, "last_modified": last_modified}
+        with self._lock:
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                for path, content in (
+                    (body_path, data),
+                    (meta_path, json.dumps(meta).encode("utf-8")),
+                ):
+                    fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+                    with os.fdopen(fd, "wb") as f:
+                        f.write(content)
+                    os.replace(tmp, path)
+            except OSError:
+                # A read-only or full disk only costs the cache
+                return
+            self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits."""
+        entries = []
+        for path in self.directory.glob("*.body"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            for stale in (path, path.with_suffix(".json")):
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+            total -= size
+
+    def size(self) -> int:
+        """Get the total size of the cached bodies in bytes."""
+        return sum(p.stat().st_size for p in self.directory.glob("*.body"))
+
+    def clear(self) -> None:
+        """Remove all cached files."""
+        with self._lock:
+            for pattern in ("*.body", "*.json"):
+                for path in self.directory.glob(pattern):
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+
+
+_cache: Optional[HTTPCache] = None
+_cache_configured = False
+
+
+def get_http_cache() -> Optional[HTTPCache]:
+    """Get the cache used for remote inputs.
+
+    Returns:
+        The cache set with ``set_http_cache``, else a cache in
+        ``default_cache_dir()``. None if caching was disabled, with
+        ``set_http_cache(None)`` or by setting ``ANYMAP_TS_CACHE_DIR`` to an
+        empty string.
+    """
+    global _cache, _cache_configured
+    if not _cache_configured:
+        if os.environ.get("ANYMAP_TS_CACHE_DIR") == "":
+            _cache = None
+        else:
+            _cache = HTTPCache()
+        _cache_configured = True
+    return _cache
+
+
+def set_http_cache(cache: Optional[HTTPCache]) -> None:
+    """Set the cache used for remote inputs.
+
+    Args:
+        cache: Cache to use, or None to download remote inputs every time.
+
+    Example:
+        >>> from anymap_ts.http_cache import HTTPCache, set_http_cache
+        >>> set_http_cache(HTTPCache("/data/cache", max_size=5_000_000_000))
+    """
+    global _cache, _cache_configured
+    _cache = cache
+    _cache_configured = True
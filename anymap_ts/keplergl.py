@@ -44,6 +44,9 @@ class KeplerGLMap(MapWidget):
     # ESM module for frontend
     _esm = STATIC_DIR / "keplergl.js"
 
+    # The frontend reads kwargs as plain JSON
+    _packed_transport = False
+
     # KeplerGL-specific traits
     config = traitlets.Dict({}).tag(sync=True)
     datasets = traitlets.Dict({}).tag(sync=True)
@@ -381,7 +384,7 @@ class KeplerGLMap(MapWidget):
             "mapbox_token": self.mapbox_token,
             "width": self.width,
             "height": self.height,
-            "js_calls": self._js_calls,
+            "js_calls": self._js_call_history(resolve_data=True),
         }
 
         template = template.replace("{{state}}", json.dumps(state, indent=2))
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import importlib
 import json
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
@@ -10,7 +11,16 @@ import traitlets
 
 from .base import MapWidget
 from .basemaps import get_basemap_url
-from .utils import to_geojson, get_bounds, infer_layer_type
+from .utils import (
+    to_geojson,
+    get_bounds,
+    infer_layer_type,
+    json_default,
+    marker_columns,
+    to_binary_array,
+    cluster_hierarchy,
+)
+from .vector_tiles import CanvasTileSource
 
 STATIC_DIR = Path(__file__).parent / "static"
 
@@ -182,12 +192,7 @@ class LeafletMap(MapWidget):
             **kwargs,
         )
 
-        basemaps = self._layer_dict.get("Basemaps", [])
-        if basemap not in basemaps:
-            self._layer_dict = {
-                **self._layer_dict,
-                "Basemaps": basemaps + [basemap],
-            }
+        self._append_state("_layer_dict", "Basemaps", basemap)
 
     # -------------------------------------------------------------------------
     # Vector Data Methods
@@ -201,6 +206,8 @@ class LeafletMap(MapWidget):
         fit_bounds: bool = True,
         popup_properties: Optional[Union[List[str], bool]] = None,
         tooltip_property: Optional[str] = None,
+        precision: Optional[int] = None,
+        tiled: bool = False,
         **kwargs,
     ) -> None:
         """Add vector data to the map.
@@ -215,9 +222,29 @@ class LeafletMap(MapWidget):
             popup_properties: List of property names to show in popups,
                 or True to show all properties.
             tooltip_property: Property name to use as tooltip text.
+            precision: Decimal places kept in coordinates. Defaults to the
+                map's ``coordinate_precision`` (6 decimal places by default).
+            tiled: Keep the data in the kernel and draw it on canvas tiles
+                cut on demand, instead of one SVG path per feature. Use this
+                for layers with more than a few thousand features. Popups
+                and tooltips are found by hit-testing the tiles. Requires
+                shapely.
             **kwargs: Additional layer options.
         """
-        geojson = to_geojson(data)
+        if tiled:
+            self._add_canvas_tiles(
+                data,
+                name or f"vector-{len(self._layers)}",
+                style,
+                fit_bounds,
+                popup_properties,
+                tooltip_property,
+                **kwargs,
+            )
+            return
+
+        precision = self._coordinate_precision(precision)
+        geojson = to_geojson(data, precision=precision)
 
         if geojson.get("type") == "url":
             self.add_geojson(
@@ -240,7 +267,7 @@ class LeafletMap(MapWidget):
         bounds = get_bounds(data) if fit_bounds else None
 
         js_kwargs: Dict[str, Any] = {
-            "data": geojson,
+            "data": self._store_data(geojson),
             "name": layer_id,
             "style": style,
             "fitBounds": fit_bounds,
@@ -253,10 +280,68 @@ class LeafletMap(MapWidget):
 
         self.call_js_method("addGeoJSON", **js_kwargs, **kwargs)
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "geojson", "style": style},
+        self._set_state(
+            "_layers", layer_id, {"id": layer_id, "type": "geojson", "style": style}
+        )
+
+    def _add_canvas_tiles(
+        self,
+        data: Any,
+        layer_id: str,
+        style: Optional[Dict],
+        fit_bounds: bool,
+        popup_properties: Optional[Union[List[str], bool]],
+        tooltip_property: Optional[str],
+        **kwargs,
+    ) -> None:
+        """Add vector data drawn on canvas tiles cut in the kernel.
+
+        Args:
+            data: GeoDataFrame, GeoJSON dict, or path or URL to a vector file.
+            layer_id: Layer identifier.
+            style: Leaflet style properties; inferred from the data if None.
+            fit_bounds: Whether to fit map to data bounds.
+            popup_properties: List of property names to show in popups,
+                or True to show all properties.
+            tooltip_property: Property name to use as tooltip text.
+            **kwargs: Additional layer options.
+        """
+        # Only the properties shown in popups and tooltips are sent
+        if popup_properties is True:
+            properties = None
+        else:
+            properties = list(popup_properties or [])
+            if tooltip_property and tooltip_property not in properties:
+                properties.append(tooltip_property)
+        source = CanvasTileSource(data, properties=properties)
+        source_id = f"{layer_id}-source"
+        self._tile_sources[source_id] = source
+
+        if style is None:
+            style = _get_default_style(
+                _infer_leaflet_type({"type": source.geometry_type})
+            )
+
+        js_kwargs: Dict[str, Any] = {
+            "name": layer_id,
+            "source": source_id,
+            "style": style,
+            "maxNativeZoom": source.maxzoom,
+            "fitBounds": fit_bounds,
+            "bounds": source.bounds if fit_bounds else None,
         }
+        if popup_properties is not None:
+            js_kwargs["popupProperties"] = popup_properties
+        if tooltip_property is not None:
+            js_kwargs["tooltipProperty"] = tooltip_property
+
+        self.call_js_method("addCanvasTileLayer", **js_kwargs, **kwargs)
+
+        self._set_state(
+            "_layers",
+            layer_id,
+            {"id": layer_id, "type": "geojson", "style": style, "source": source_id},
+        )
 
     def add_geojson(
         self,
@@ -266,6 +351,7 @@ class LeafletMap(MapWidget):
         fit_bounds: bool = True,
         popup_properties: Optional[Union[List[str], bool]] = None,
         tooltip_property: Optional[str] = None,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add GeoJSON data to the map.
@@ -278,6 +364,8 @@ class LeafletMap(MapWidget):
             popup_properties: List of property names to show in popups,
                 or True to show all properties.
             tooltip_property: Property name to use as tooltip text.
+            precision: Decimal places kept in coordinates. Defaults to the
+                map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional layer options.
         """
         self.add_vector(
@@ -287,6 +375,7 @@ class LeafletMap(MapWidget):
             fit_bounds=fit_bounds,
             popup_properties=popup_properties,
             tooltip_property=tooltip_property,
+            precision=precision,
             **kwargs,
         )
 
@@ -328,10 +417,7 @@ class LeafletMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "tile"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "tile"})
 
     def add_wms_layer(
         self,
@@ -379,10 +465,7 @@ class LeafletMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "wms"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "wms"})
 
     def remove_wms_layer(self, layer_id: str) -> None:
         """Remove a WMS layer.
@@ -402,10 +485,8 @@ class LeafletMap(MapWidget):
         Args:
             layer_id: Layer identifier to remove.
         """
-        if layer_id in self._layers:
-            layers = dict(self._layers)
-            del layers[layer_id]
-            self._layers = layers
+        self._remove_state("_layers", layer_id)
+        self._tile_sources.pop(f"{layer_id}-source", None)
         self.call_js_method("removeLayer", layer_id)
 
     def set_visibility(self, layer_id: str, visible: bool) -> None:
@@ -454,10 +535,9 @@ class LeafletMap(MapWidget):
         pos = position_map.get(position, position)
 
         self.call_js_method("addControl", control_type, position=pos, **kwargs)
-        self._controls = {
-            **self._controls,
-            control_type: {"type": control_type, "position": pos, **kwargs},
-        }
+        self._set_state(
+            "_controls", control_type, {"type": control_type, "position": pos, **kwargs}
+        )
 
     def remove_control(self, control_type: str) -> None:
         """Remove a map control.
@@ -466,10 +546,7 @@ class LeafletMap(MapWidget):
             control_type: Type of control to remove.
         """
         self.call_js_method("removeControl", control_type)
-        if control_type in self._controls:
-            controls = dict(self._controls)
-            del controls[control_type]
-            self._controls = controls
+        self._remove_state("_controls", control_type)
 
     def add_layer_control(
         self,
@@ -533,25 +610,110 @@ class LeafletMap(MapWidget):
 
     def add_markers(
         self,
-        data: List[Dict[str, Any]],
+        data: Any,
         name: Optional[str] = None,
+        lng_column: Optional[str] = None,
+        lat_column: Optional[str] = None,
+        popup_column: Optional[str] = "popup",
+        tooltip_column: Optional[str] = "tooltip",
+        cluster: bool = False,
+        cluster_radius: int = 60,
+        cluster_max_zoom: int = 16,
     ) -> None:
         """Add multiple markers as a layer group.
 
-        Each item in *data* should be a dict with at least ``lng`` and
+        Each item in a list of dicts should have at least ``lng`` and
         ``lat`` keys.  Optional keys: ``popup``, ``tooltip``, ``iconUrl``,
-        ``iconSize``.
+        ``iconSize``.  Positions and labels are sent as parallel arrays
+        (see ``marker_columns``); lists with custom icons are sent as-is.
 
         Args:
-            data: List of marker dicts.
+            data: List of marker dicts, DataFrame, GeoDataFrame with Point
+                geometries, or GeoJSON FeatureCollection with Point features.
             name: Layer group name.
+            lng_column: Column name for longitude (auto-detected if None).
+            lat_column: Column name for latitude (auto-detected if None).
+            popup_column: Column name for popup content.
+            tooltip_column: Column name for tooltip content.
+            cluster: Group nearby markers into clusters labelled with their
+                size. The clusters of every zoom level are computed up
+                front (see ``cluster_hierarchy``), and only the markers and
+                clusters in view are drawn. Clicking a cluster zooms in
+                until it splits.
+            cluster_radius: Cluster radius in pixels.
+            cluster_max_zoom: Highest zoom level markers are clustered at.
+
+        Raises:
+            ValueError: If ``cluster`` is set for markers with custom icons.
         """
         layer_id = name or f"markers-{len(self._layers)}"
-        self.call_js_method("addMarkers", data=data, name=layer_id)
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "markers"},
-        }
+        if isinstance(data, list) and any(
+            isinstance(item, dict) and ("iconUrl" in item or "iconSize" in item)
+            for item in data
+        ):
+            if cluster:
+                raise ValueError("cluster=True does not support custom icons")
+            self.call_js_method("addMarkers", data=data, name=layer_id)
+        else:
+            self._add_marker_columns(
+                data,
+                layer_id,
+                lng_column,
+                lat_column,
+                popup_column,
+                tooltip_column,
+                cluster and (cluster_radius, cluster_max_zoom),
+            )
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "markers"})
+
+    def _add_marker_columns(
+        self,
+        data: Any,
+        layer_id: str,
+        lng_column: Optional[str],
+        lat_column: Optional[str],
+        popup_column: Optional[str],
+        tooltip_column: Optional[str],
+        cluster: Union[Tuple[int, int], bool],
+        **kwargs,
+    ) -> None:
+        """Send markers as parallel arrays, with their clusters if requested.
+
+        Args:
+            data: Marker data accepted by ``marker_columns``.
+            layer_id: Layer group name.
+            lng_column: Column name for longitude.
+            lat_column: Column name for latitude.
+            popup_column: Column name for popup content.
+            tooltip_column: Column name for tooltip content.
+            cluster: ``(radius, max_zoom)`` to cluster the markers, or False.
+            **kwargs: Additional options for the ``addMarkers`` call.
+        """
+        columns = marker_columns(
+            data, lng_column, lat_column, popup_column, tooltip_column
+        )
+        if cluster:
+            radius, max_zoom = cluster
+            hierarchy = cluster_hierarchy(
+                columns["lngLat"], radius=radius, max_zoom=max_zoom
+            )
+            kwargs["clusters"] = {
+                "solo": to_binary_array(hierarchy["solo"], "uint8"),
+                "offsets": to_binary_array(hierarchy["offsets"], "int32"),
+                "lngLat": to_binary_array(hierarchy["lngLat"], "float32"),
+                "counts": to_binary_array(hierarchy["counts"], "uint32"),
+                "expand": to_binary_array(hierarchy["expand"], "uint8"),
+                "minZoom": hierarchy["minZoom"],
+                "maxZoom": hierarchy["maxZoom"],
+            }
+        self.call_js_method(
+            "addMarkers",
+            lngLat=to_binary_array(columns["lngLat"].reshape(-1), "float64"),
+            popups=columns["popup"],
+            tooltips=columns["tooltip"],
+            name=layer_id,
+            **kwargs,
+        )
 
     def remove_marker(self, marker_id: str) -> None:
         """Remove a marker from the map.
@@ -609,10 +771,68 @@ class LeafletMap(MapWidget):
             popup=popup,
             tooltip=tooltip,
         )
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "circle_marker"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "circle_marker"})
+
+    def add_circle_markers(
+        self,
+        data: Any,
+        name: Optional[str] = None,
+        lng_column: Optional[str] = None,
+        lat_column: Optional[str] = None,
+        popup_column: Optional[str] = "popup",
+        tooltip_column: Optional[str] = "tooltip",
+        radius: int = 6,
+        color: str = "#3388ff",
+        fill_color: Optional[str] = None,
+        fill_opacity: float = 0.5,
+        weight: int = 2,
+        opacity: float = 1.0,
+        cluster: bool = False,
+        cluster_radius: int = 60,
+        cluster_max_zoom: int = 16,
+    ) -> None:
+        """Add many circle markers (fixed pixel radius) as one layer.
+
+        The circles are drawn on a canvas rather than as SVG paths.
+
+        Args:
+            data: List of dicts, DataFrame, GeoDataFrame with Point
+                geometries, or GeoJSON FeatureCollection with Point features.
+            name: Layer name.
+            lng_column: Column name for longitude (auto-detected if None).
+            lat_column: Column name for latitude (auto-detected if None).
+            popup_column: Column name for popup content.
+            tooltip_column: Column name for tooltip content.
+            radius: Radius in pixels.
+            color: Stroke color.
+            fill_color: Fill color (defaults to stroke color).
+            fill_opacity: Fill opacity.
+            weight: Stroke weight in pixels.
+            opacity: Stroke opacity.
+            cluster: Group nearby circles into clusters, as in
+                :meth:`add_markers`.
+            cluster_radius: Cluster radius in pixels.
+            cluster_max_zoom: Highest zoom level circles are clustered at.
+        """
+        layer_id = name or f"circle-markers-{len(self._layers)}"
+        self._add_marker_columns(
+            data,
+            layer_id,
+            lng_column,
+            lat_column,
+            popup_column,
+            tooltip_column,
+            cluster and (cluster_radius, cluster_max_zoom),
+            circle={
+                "radius": radius,
+                "color": color,
+                "fillColor": fill_color or color,
+                "fillOpacity": fill_opacity,
+                "weight": weight,
+                "opacity": opacity,
+            },
+        )
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "circle_markers"})
 
     def add_circle(
         self,
@@ -658,10 +878,7 @@ class LeafletMap(MapWidget):
             popup=popup,
             tooltip=tooltip,
         )
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "circle"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "circle"})
 
     def add_polyline(
         self,
@@ -705,10 +922,7 @@ class LeafletMap(MapWidget):
             kw["tooltip"] = tooltip
 
         self.call_js_method("addPolyline", **kw)
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "polyline"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "polyline"})
 
     def add_polygon(
         self,
@@ -751,10 +965,7 @@ class LeafletMap(MapWidget):
             tooltip=tooltip,
             fitBounds=fit_bounds,
         )
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "polygon"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "polygon"})
 
     def add_rectangle(
         self,
@@ -794,10 +1005,7 @@ class LeafletMap(MapWidget):
             popup=popup,
             tooltip=tooltip,
         )
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "rectangle"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "rectangle"})
 
     # -------------------------------------------------------------------------
     # Overlays (Image, Video)
@@ -829,10 +1037,7 @@ class LeafletMap(MapWidget):
             opacity=opacity,
             interactive=interactive,
         )
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "image_overlay"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "image_overlay"})
 
     def add_video_overlay(
         self,
@@ -866,10 +1071,7 @@ class LeafletMap(MapWidget):
             loop=loop,
             muted=muted,
         )
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "video_overlay"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "video_overlay"})
 
     # -------------------------------------------------------------------------
     # Heatmap
@@ -893,7 +1095,8 @@ class LeafletMap(MapWidget):
 
         Accepts a list of ``[lng, lat]`` or ``[lng, lat, intensity]``
         arrays, a GeoJSON FeatureCollection of Points, or a pandas/
-        geopandas DataFrame.
+        geopandas DataFrame. Points are read into NumPy arrays and sent
+        as a flat float32 buffer of ``lng, lat, intensity`` triples.
 
         Args:
             data: Heat data – list of [lng, lat, intensity?] arrays,
@@ -916,7 +1119,7 @@ class LeafletMap(MapWidget):
         )
 
         kw: Dict[str, Any] = {
-            "data": heat_data,
+            "points": to_binary_array(heat_data.reshape(-1), "float32"),
             "name": layer_id,
             "radius": radius,
             "blur": blur,
@@ -928,10 +1131,7 @@ class LeafletMap(MapWidget):
             kw["gradient"] = {str(k): v for k, v in gradient.items()}
 
         self.call_js_method("addHeatmap", **kw)
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "heatmap"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "heatmap"})
 
     def remove_heatmap(self, name: str) -> None:
         """Remove a heatmap layer.
@@ -947,55 +1147,65 @@ class LeafletMap(MapWidget):
         value_column: Optional[str] = None,
         lat_column: str = "lat",
         lng_column: str = "lng",
-    ) -> List[List[float]]:
-        """Convert various data formats to [[lng, lat, intensity], …]."""
-        # Already a list of lists/tuples
-        if isinstance(data, (list, tuple)) and len(data) > 0:
-            first = data[0]
-            if isinstance(first, (list, tuple)):
-                return [list(p) for p in data]
-
-        # GeoJSON FeatureCollection
-        if isinstance(data, dict):
-            if data.get("type") == "FeatureCollection":
-                result = []
-                for f in data.get("features", []):
-                    geom = f.get("geometry", {})
-                    if geom.get("type") == "Point":
-                        coords = geom["coordinates"]
-                        intensity = 1.0
-                        if value_column and f.get("properties"):
-                            val = f["properties"].get(value_column)
-                            if val is not None:
-                                intensity = float(val)
-                        result.append([coords[0], coords[1], intensity])
-                return result
-
-        # DataFrame / GeoDataFrame
-        try:
-            import pandas as pd
-
-            if isinstance(data, pd.DataFrame):
-                has_geometry = hasattr(data, "geometry") and hasattr(data.geometry, "x")
-                result = []
-                for _, row in data.iterrows():
-                    if has_geometry:
-                        lng_val = row.geometry.x
-                        lat_val = row.geometry.y
-                    else:
-                        lng_val = row[lng_column]
-                        lat_val = row[lat_column]
-                    intensity = float(row[value_column]) if value_column else 1.0
-                    result.append([float(lng_val), float(lat_val), intensity])
-                return result
-        except ImportError:
-            pass
-
-        raise ValueError(
-            "Unsupported data type for heatmap. Use a list of [lng, lat] "
-            "or [lng, lat, intensity] arrays, a GeoJSON FeatureCollection, "
-            "or a pandas/geopandas DataFrame."
-        )
+    ) -> Any:
+        """Convert various data formats to an (n, 3) array of lng, lat, intensity.
+
+        DataFrame columns and GeoDataFrame point coordinates are read in
+        bulk. Rows with a missing coordinate are dropped and a missing
+        intensity defaults to 1.0.
+        """
+        import numpy as np
+
+        if hasattr(data, "columns") and hasattr(data, "to_numpy"):
+            if hasattr(data, "geometry") and hasattr(data.geometry, "x"):
+                shapely = importlib.import_module("shapely")
+                geometry = np.asarray(data.geometry.values)
+                keep = shapely.get_type_id(geometry) == 0
+                lng = shapely.get_x(geometry[keep])
+                lat = shapely.get_y(geometry[keep])
+            else:
+                keep = slice(None)
+                lng = data[lng_column].to_numpy(dtype=float)
+                lat = data[lat_column].to_numpy(dtype=float)
+            if value_column:
+                values = data[value_column].to_numpy(dtype=float)[keep]
+            else:
+                values = np.ones(len(lng))
+            points = np.column_stack([lng, lat, values])
+        elif isinstance(data, dict) and data.get("type") == "FeatureCollection":
+            rows = []
+            for f in data.get("features", []):
+                geom = f.get("geometry") or {}
+                if geom.get("type") == "Point":
+                    props = f.get("properties") or {}
+                    value = props.get(value_column) if value_column else None
+                    rows.append((*geom["coordinates"][:2], value))
+            points = np.array(rows, dtype=float).reshape(-1, 3)
+        elif (
+            isinstance(data, (list, tuple))
+            and len(data) > 0
+            and isinstance(data[0], (list, tuple))
+        ) or (isinstance(data, np.ndarray) and data.ndim == 2):
+            try:
+                points = np.asarray(data, dtype=float)
+            except ValueError:
+                # Mixed [lng, lat] and [lng, lat, intensity] rows
+                points = np.array(
+                    [(*p[:3], *(None,) * (3 - len(p))) for p in data], dtype=float
+                )
+            if points.shape[1] == 2:
+                points = np.column_stack([points, np.ones(len(points))])
+            points = points[:, :3]
+        else:
+            raise ValueError(
+                "Unsupported data type for heatmap. Use a list of [lng, lat] "
+                "or [lng, lat, intensity] arrays, a GeoJSON FeatureCollection, "
+                "or a pandas/geopandas DataFrame."
+            )
+
+        points = points[np.isfinite(points[:, :2]).all(axis=1)]
+        points[np.isnan(points[:, 2]), 2] = 1.0
+        return points
 
     # -------------------------------------------------------------------------
     # Choropleth
@@ -1018,6 +1228,7 @@ class LeafletMap(MapWidget):
         fit_bounds: bool = True,
         legend_title: Optional[str] = None,
         legend_position: str = "bottomright",
+        precision: Optional[int] = None,
     ) -> None:
         """Add an interactive choropleth layer.
 
@@ -1042,8 +1253,11 @@ class LeafletMap(MapWidget):
             fit_bounds: Whether to fit map to data bounds.
             legend_title: Title for the legend (shows legend if provided).
             legend_position: Legend position on the map.
+            precision: Decimal places kept in coordinates. Defaults to the
+                map's ``coordinate_precision`` (6 decimal places by default).
         """
-        geojson = to_geojson(data)
+        precision = self._coordinate_precision(precision)
+        geojson = to_geojson(data, precision=precision)
         layer_id = name or f"choropleth-{len(self._layers)}"
 
         if colors is None:
@@ -1064,7 +1278,7 @@ class LeafletMap(MapWidget):
             thresholds = _compute_thresholds(values, n)
 
         kw: Dict[str, Any] = {
-            "data": geojson,
+            "data": self._store_data(geojson),
             "name": layer_id,
             "valueProperty": value_column,
             "colors": colors,
@@ -1084,10 +1298,7 @@ class LeafletMap(MapWidget):
             kw["legendPosition"] = legend_position
 
         self.call_js_method("addChoropleth", **kw)
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "choropleth"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "choropleth"})
 
     # -------------------------------------------------------------------------
     # Popups
@@ -1185,10 +1396,16 @@ class LeafletMap(MapWidget):
             "height": self.height,
             "layers": self._layers,
             "controls": self._controls,
-            "js_calls": self._js_calls,
+            "js_calls": self._inline_tile_layers(
+                self._js_call_history(resolve_data=True),
+                "addCanvasTileLayer",
+                ("source", "maxNativeZoom"),
+            ),
         }
 
-        template = template.replace("{{state}}", json.dumps(state, indent=2))
+        template = template.replace(
+            "{{state}}", json.dumps(state, indent=2, default=json_default)
+        )
         return template
 
     def _get_default_template(self) -> str:
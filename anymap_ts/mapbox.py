@@ -5,7 +5,7 @@ from __future__ import annotations
 import json
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 from urllib.parse import urlencode
 
 import traitlets
@@ -18,6 +18,15 @@ from .utils import (
     infer_layer_type,
     get_default_paint,
     fetch_geojson,
+    json_default,
+    quantize_geojson,
+    simplify_pyramid,
+    is_arrow_data,
+    to_geoarrow,
+    marker_columns,
+    to_binary_array,
+    load_vectors,
+    _is_geodataframe,
 )
 
 # Path to bundled static assets
@@ -64,6 +73,10 @@ class MapboxMap(MapWidget):
     # Layer tracking
     _layer_dict = traitlets.Dict({}).tag(sync=True)
 
+    # Marker count above which add_markers draws a GPU circle layer
+    # instead of one DOM element per marker; None always uses DOM markers
+    marker_layer_threshold: Optional[int] = 2000
+
     def __init__(
         self,
         center: Tuple[float, float] = (0.0, 0.0),
@@ -116,6 +129,8 @@ class MapboxMap(MapWidget):
 
         # Initialize layer dictionary
         self._layer_dict = {"Background": []}
+        # Categories of each layer in _layer_dict, for O(1) lookups
+        self._layer_categories: Dict[str, List[str]] = {}
 
         # Storage for auto-discovered PMTiles layer styles
         self._pmtiles_styles: Dict[str, List[Dict[str, Any]]] = {}
@@ -144,24 +159,15 @@ class MapboxMap(MapWidget):
 
     def _add_to_layer_dict(self, layer_id: str, category: str = "Overlays") -> None:
         """Add a layer to the layer dictionary for UI tracking."""
-        layers = self._layer_dict.get(category, [])
-        if layer_id not in layers:
-            self._layer_dict = {
-                **self._layer_dict,
-                category: layers + [layer_id],
-            }
+        categories = self._layer_categories.setdefault(layer_id, [])
+        if category not in categories:
+            categories.append(category)
+            self._append_state("_layer_dict", category, layer_id)
 
     def _remove_from_layer_dict(self, layer_id: str) -> None:
         """Remove a layer from the layer dictionary."""
-        new_dict = {}
-        for category, layers in self._layer_dict.items():
-            if layer_id in layers:
-                new_layers = [lid for lid in layers if lid != layer_id]
-                if new_layers:
-                    new_dict[category] = new_layers
-            else:
-                new_dict[category] = layers
-        self._layer_dict = new_dict
+        for category in self._layer_categories.pop(layer_id, []):
+            self._discard_state("_layer_dict", category, layer_id)
 
     def _validate_opacity(self, opacity: float, param_name: str = "opacity") -> float:
         """Validate opacity value is between 0 and 1."""
@@ -180,10 +186,7 @@ class MapboxMap(MapWidget):
 
     def _remove_layer_internal(self, layer_id: str, js_method: str) -> None:
         """Internal helper to remove a layer."""
-        if layer_id in self._layers:
-            layers = dict(self._layers)
-            del layers[layer_id]
-            self._layers = layers
+        self._remove_state("_layers", layer_id)
         self._remove_from_layer_dict(layer_id)
         self.call_js_method(js_method, layer_id)
 
@@ -235,12 +238,7 @@ class MapboxMap(MapWidget):
         )
 
         # Track in layer dict
-        basemaps = self._layer_dict.get("Basemaps", [])
-        if basemap not in basemaps:
-            self._layer_dict = {
-                **self._layer_dict,
-                "Basemaps": basemaps + [basemap],
-            }
+        self._add_to_layer_dict(basemap, "Basemaps")
 
     # -------------------------------------------------------------------------
     # Vector Data Methods
@@ -253,28 +251,46 @@ class MapboxMap(MapWidget):
         paint: Optional[Dict] = None,
         name: Optional[str] = None,
         fit_bounds: bool = True,
+        precision: Optional[int] = None,
+        simplify: Optional[Sequence[float]] = None,
         **kwargs,
     ) -> None:
         """Add vector data to the map.
 
-        Supports GeoJSON, GeoDataFrame, or file paths to vector formats.
+        Supports GeoJSON, GeoDataFrame, Arrow tables, or file paths to vector
+        formats.
 
         Args:
-            data: GeoJSON dict, GeoDataFrame, or path to vector file.
+            data: GeoJSON dict, GeoDataFrame, pyarrow Table, or path to a
+                vector or GeoParquet file. Arrow data is sent as GeoArrow
+                buffers instead of GeoJSON.
             layer_type: Mapbox layer type ('circle', 'line', 'fill', 'symbol').
             paint: Mapbox paint properties.
             name: Layer name.
             fit_bounds: Whether to fit map to data bounds.
+            precision: Decimal places kept in coordinates. Defaults to the
+                map's ``coordinate_precision`` (6 decimal places by default).
+            simplify: Zoom levels at which the layer switches to more
+                detailed data, e.g. ``[4, 8]``. Below each level the map shows
+                a copy simplified to one pixel at that zoom; from the last
+                level on it shows the full-resolution data. Requires shapely.
             **kwargs: Additional layer options.
         """
-        geojson = to_geojson(data)
+        precision = self._coordinate_precision(precision)
+        if is_arrow_data(data):
+            if simplify:
+                raise ValueError("simplify is not supported for Arrow data")
+            # Sent as GeoArrow buffers; the browser builds the GeoJSON
+            geojson = to_geoarrow(data, precision=precision)
+        else:
+            geojson = to_geojson(data, precision=precision)
 
         layer_id = name or f"vector-{len(self._layers)}"
 
         # Handle URL data - fetch GeoJSON to get bounds and infer layer type
         if geojson.get("type") == "url":
             url = geojson["url"]
-            geojson = fetch_geojson(url)
+            geojson = quantize_geojson(fetch_geojson(url), precision)
 
         # Infer layer type if not specified
         if layer_type is None:
@@ -285,12 +301,26 @@ class MapboxMap(MapWidget):
             paint = get_default_paint(layer_type)
 
         # Get bounds (use geojson dict, not original data which may be a URL)
-        bounds = get_bounds(geojson) if fit_bounds else None
+        bounds = (
+            get_bounds(data if _is_geodataframe(data) else geojson)
+            if fit_bounds
+            else None
+        )
+
+        if simplify:
+            # Simplify the GeoDataFrame's geometries directly rather than
+            # rebuilding them from the GeoJSON
+            levels = simplify_pyramid(
+                data if _is_geodataframe(data) else geojson, simplify, precision
+            )
+            kwargs["levels"] = [
+                {**level, "data": self._store_data(level["data"])} for level in levels
+            ]
 
         # Call JavaScript
         self.call_js_method(
             "addGeoJSON",
-            data=geojson,
+            data=self._store_data(geojson),
             name=layer_id,
             layerType=layer_type,
             paint=paint,
@@ -300,17 +330,65 @@ class MapboxMap(MapWidget):
         )
 
         # Track layer
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": layer_type,
                 "source": f"{layer_id}-source",
                 "paint": paint,
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Vector")
 
+    def add_vectors(
+        self,
+        data: Sequence[Any],
+        names: Optional[Sequence[str]] = None,
+        fit_bounds: bool = True,
+        max_workers: Optional[int] = None,
+        **kwargs,
+    ) -> None:
+        """Add many vector datasets to the map at once.
+
+        URLs are fetched and parsed concurrently (see ``load_vectors``), and
+        the layers are added in a single ``batch`` sync, so adding many
+        remote layers takes about as long as the slowest download.
+
+        Args:
+            data: GeoJSON dicts, GeoDataFrames, file paths, or URLs
+            names: Layer names, one per item
+            fit_bounds: Whether to fit the map to the bounds of all the data
+            max_workers: Number of download threads. Defaults to one per
+                item, up to 16.
+            **kwargs: Options passed to ``add_vector`` for every layer
+
+        Example:
+            >>> m.add_vectors([url1, url2, url3], names=["a", "b", "c"])
+        """
+        if names is not None and len(names) != len(data):
+            raise ValueError("names must have one name per item of data")
+        items = load_vectors(data, max_workers)
+
+        bounds = []
+        with self.batch():
+            for i, item in enumerate(items):
+                name = names[i] if names is not None else None
+                self.add_vector(item, name=name, fit_bounds=False, **kwargs)
+                if fit_bounds:
+                    bounds.append(get_bounds(item))
+            bounds = [b for b in bounds if b]
+            if bounds:
+                self.fit_bounds(
+                    [
+                        min(b[0] for b in bounds),
+                        min(b[1] for b in bounds),
+                        max(b[2] for b in bounds),
+                        max(b[3] for b in bounds),
+                    ]
+                )
+
     def add_geojson(
         self,
         data: Union[str, Dict],
@@ -318,6 +396,8 @@ class MapboxMap(MapWidget):
         paint: Optional[Dict] = None,
         name: Optional[str] = None,
         fit_bounds: bool = True,
+        precision: Optional[int] = None,
+        simplify: Optional[Sequence[float]] = None,
         **kwargs,
     ) -> None:
         """Add GeoJSON data to the map.
@@ -328,6 +408,12 @@ class MapboxMap(MapWidget):
             paint: Mapbox paint properties.
             name: Layer name.
             fit_bounds: Whether to fit map to data bounds.
+            precision: Decimal places kept in coordinates. Defaults to the
+                map's ``coordinate_precision`` (6 decimal places by default).
+            simplify: Zoom levels at which the layer switches to more
+                detailed data, e.g. ``[4, 8]``. Below each level the map shows
+                a copy simplified to one pixel at that zoom; from the last
+                level on it shows the full-resolution data. Requires shapely.
             **kwargs: Additional layer options.
         """
         self.add_vector(
@@ -336,6 +422,8 @@ class MapboxMap(MapWidget):
             paint=paint,
             name=name,
             fit_bounds=fit_bounds,
+            precision=precision,
+            simplify=simplify,
             **kwargs,
         )
 
@@ -375,14 +463,15 @@ class MapboxMap(MapWidget):
         )
 
         # Track layer
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "raster",
                 "source": f"{layer_id}-source",
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Raster")
 
     def add_raster(
@@ -561,7 +650,11 @@ class MapboxMap(MapWidget):
         if weight_property:
             paint["heatmap-weight"] = ["get", weight_property]
 
-        bounds = get_bounds(geojson) if fit_bounds else None
+        bounds = (
+            get_bounds(data if _is_geodataframe(data) else geojson)
+            if fit_bounds
+            else None
+        )
 
         self.call_js_method(
             "addGeoJSON",
@@ -574,15 +667,16 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "heatmap",
                 "source": f"{layer_id}-source",
                 "paint": paint,
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Heatmap")
 
     def add_cog_layer(
@@ -641,14 +735,15 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "cog",
                 "url": url,
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Raster")
 
     def remove_cog_layer(self, layer_id: str) -> None:
@@ -693,15 +788,16 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "zarr",
                 "url": url,
                 "variable": variable,
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Raster")
 
     def remove_zarr_layer(self, layer_id: str) -> None:
@@ -801,15 +897,16 @@ class MapboxMap(MapWidget):
 
             self.on_map_event("pmtiles_layers_discovered", _on_discovered)
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "pmtiles",
                 "url": url,
                 "source_type": source_type,
             },
-        }
+        )
         category = "Vector" if source_type == "vector" else "Raster"
         self._add_to_layer_dict(layer_id, category)
 
@@ -848,6 +945,7 @@ class MapboxMap(MapWidget):
         great_circle: bool = False,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add an arc layer for origin-destination visualization using deck.gl.
@@ -872,6 +970,8 @@ class MapboxMap(MapWidget):
             great_circle: Whether to draw arcs along great circles.
             pickable: Whether layer responds to hover/click events.
             opacity: Layer opacity (0-1).
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional ArcLayer props.
 
         Example:
@@ -884,7 +984,7 @@ class MapboxMap(MapWidget):
             >>> m.add_arc_layer(arcs, name="flights")
         """
         layer_id = name or f"arc-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addArcLayer",
@@ -892,8 +992,12 @@ class MapboxMap(MapWidget):
             data=processed_data,
             getSourcePosition=get_source_position,
             getTargetPosition=get_target_position,
-            getSourceColor=get_source_color or [51, 136, 255, 255],
-            getTargetColor=get_target_color or [255, 136, 51, 255],
+            getSourceColor=(
+                [51, 136, 255, 255] if get_source_color is None else get_source_color
+            ),
+            getTargetColor=(
+                [255, 136, 51, 255] if get_target_color is None else get_target_color
+            ),
             getWidth=get_width,
             getHeight=get_height,
             greatCircle=great_circle,
@@ -902,13 +1006,14 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "arc",
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     def remove_arc_layer(self, layer_id: str) -> None:
@@ -933,6 +1038,7 @@ class MapboxMap(MapWidget):
         material: bool = True,
         coordinate_system: Optional[int] = None,
         coordinate_origin: Optional[List[float]] = None,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a point cloud layer for 3D point visualization using deck.gl.
@@ -957,6 +1063,8 @@ class MapboxMap(MapWidget):
             material: Whether to enable lighting effects.
             coordinate_system: Coordinate system for positions.
             coordinate_origin: Origin for coordinate system [x, y, z].
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional PointCloudLayer props.
 
         Example:
@@ -969,14 +1077,14 @@ class MapboxMap(MapWidget):
             >>> m.add_point_cloud_layer(points, point_size=5)
         """
         layer_id = name or f"pointcloud-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addPointCloudLayer",
             id=layer_id,
             data=processed_data,
             getPosition=get_position,
-            getColor=get_color or [255, 255, 255, 255],
+            getColor=[255, 255, 255, 255] if get_color is None else get_color,
             getNormal=get_normal,
             pointSize=point_size,
             sizeUnits=size_units,
@@ -988,13 +1096,14 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "pointcloud",
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     def remove_point_cloud_layer(self, layer_id: str) -> None:
@@ -1017,11 +1126,12 @@ class MapboxMap(MapWidget):
         filled: bool = True,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a scatterplot layer using deck.gl."""
         layer_id = name or f"scatterplot-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision, geoarrow=True)
 
         self.call_js_method(
             "addScatterplotLayer",
@@ -1029,8 +1139,12 @@ class MapboxMap(MapWidget):
             data=processed_data,
             getPosition=get_position,
             getRadius=get_radius,
-            getFillColor=get_fill_color or [51, 136, 255, 200],
-            getLineColor=get_line_color or [255, 255, 255, 255],
+            getFillColor=(
+                [51, 136, 255, 200] if get_fill_color is None else get_fill_color
+            ),
+            getLineColor=(
+                [255, 255, 255, 255] if get_line_color is None else get_line_color
+            ),
             radiusScale=radius_scale,
             radiusMinPixels=radius_min_pixels,
             radiusMaxPixels=radius_max_pixels,
@@ -1042,10 +1156,7 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "scatterplot"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "scatterplot"})
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     def add_path_layer(
@@ -1059,18 +1170,19 @@ class MapboxMap(MapWidget):
         width_min_pixels: float = 1,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a path layer using deck.gl."""
         layer_id = name or f"path-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision, geoarrow=True)
 
         self.call_js_method(
             "addPathLayer",
             id=layer_id,
             data=processed_data,
             getPath=get_path,
-            getColor=get_color or [51, 136, 255, 200],
+            getColor=[51, 136, 255, 200] if get_color is None else get_color,
             getWidth=get_width,
             widthScale=width_scale,
             widthMinPixels=width_min_pixels,
@@ -1079,7 +1191,7 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {**self._layers, layer_id: {"id": layer_id, "type": "path"}}
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "path"})
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     def add_polygon_layer(
@@ -1098,19 +1210,22 @@ class MapboxMap(MapWidget):
         line_width_min_pixels: float = 1,
         pickable: bool = True,
         opacity: float = 0.5,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a polygon layer using deck.gl."""
         layer_id = name or f"polygon-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision, geoarrow=True)
 
         self.call_js_method(
             "addPolygonLayer",
             id=layer_id,
             data=processed_data,
             getPolygon=get_polygon,
-            getFillColor=get_fill_color or [51, 136, 255, 128],
-            getLineColor=get_line_color or [0, 0, 255, 255],
+            getFillColor=(
+                [51, 136, 255, 128] if get_fill_color is None else get_fill_color
+            ),
+            getLineColor=[0, 0, 255, 255] if get_line_color is None else get_line_color,
             getLineWidth=get_line_width,
             getElevation=get_elevation,
             extruded=extruded,
@@ -1123,7 +1238,7 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {**self._layers, layer_id: {"id": layer_id, "type": "polygon"}}
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "polygon"})
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     def add_hexagon_layer(
@@ -1137,11 +1252,12 @@ class MapboxMap(MapWidget):
         color_range: Optional[List[List[int]]] = None,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a hexagon layer using deck.gl."""
         layer_id = name or f"hexagon-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         default_color_range = [
             [1, 152, 189],
@@ -1166,7 +1282,7 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {**self._layers, layer_id: {"id": layer_id, "type": "hexagon"}}
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "hexagon"})
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     def add_deck_heatmap_layer(
@@ -1180,11 +1296,12 @@ class MapboxMap(MapWidget):
         threshold: float = 0.05,
         color_range: Optional[List[List[int]]] = None,
         opacity: float = 1,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a GPU-accelerated heatmap layer using deck.gl."""
         layer_id = name or f"deck-heatmap-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         default_color_range = [
             [255, 255, 178, 25],
@@ -1209,10 +1326,7 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "deck-heatmap"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "deck-heatmap"})
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     def add_grid_layer(
@@ -1226,11 +1340,12 @@ class MapboxMap(MapWidget):
         color_range: Optional[List[List[int]]] = None,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a grid layer using deck.gl."""
         layer_id = name or f"grid-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         default_color_range = [
             [1, 152, 189],
@@ -1255,7 +1370,7 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {**self._layers, layer_id: {"id": layer_id, "type": "grid"}}
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "grid"})
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     def add_icon_layer(
@@ -1270,11 +1385,12 @@ class MapboxMap(MapWidget):
         icon_mapping: Optional[Dict] = None,
         pickable: bool = True,
         opacity: float = 1,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add an icon layer using deck.gl."""
         layer_id = name or f"icon-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addIconLayer",
@@ -1283,7 +1399,7 @@ class MapboxMap(MapWidget):
             getPosition=get_position,
             getIcon=get_icon,
             getSize=get_size,
-            getColor=get_color or [255, 255, 255, 255],
+            getColor=[255, 255, 255, 255] if get_color is None else get_color,
             iconAtlas=icon_atlas,
             iconMapping=icon_mapping,
             pickable=pickable,
@@ -1291,7 +1407,7 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {**self._layers, layer_id: {"id": layer_id, "type": "icon"}}
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "icon"})
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     def add_text_layer(
@@ -1307,11 +1423,12 @@ class MapboxMap(MapWidget):
         alignment_baseline: str = "center",
         pickable: bool = True,
         opacity: float = 1,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a text layer using deck.gl."""
         layer_id = name or f"text-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addTextLayer",
@@ -1320,7 +1437,7 @@ class MapboxMap(MapWidget):
             getPosition=get_position,
             getText=get_text,
             getSize=get_size,
-            getColor=get_color or [0, 0, 0, 255],
+            getColor=[0, 0, 0, 255] if get_color is None else get_color,
             getAngle=get_angle,
             getTextAnchor=text_anchor,
             getAlignmentBaseline=alignment_baseline,
@@ -1329,7 +1446,7 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {**self._layers, layer_id: {"id": layer_id, "type": "text"}}
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "text"})
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     def add_geojson_layer(
@@ -1349,18 +1466,21 @@ class MapboxMap(MapWidget):
         point_radius_min_pixels: float = 2,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a GeoJSON layer with auto-styling using deck.gl."""
         layer_id = name or f"geojson-deck-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision, geoarrow=True)
 
         self.call_js_method(
             "addGeoJsonLayer",
             id=layer_id,
             data=processed_data,
-            getFillColor=get_fill_color or [51, 136, 255, 128],
-            getLineColor=get_line_color or [0, 0, 0, 255],
+            getFillColor=(
+                [51, 136, 255, 128] if get_fill_color is None else get_fill_color
+            ),
+            getLineColor=[0, 0, 0, 255] if get_line_color is None else get_line_color,
             getLineWidth=get_line_width,
             getPointRadius=get_point_radius,
             getElevation=get_elevation,
@@ -1375,10 +1495,7 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "geojson-deck"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "geojson-deck"})
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     def add_contour_layer(
@@ -1391,11 +1508,12 @@ class MapboxMap(MapWidget):
         contours: Optional[List[Dict]] = None,
         pickable: bool = True,
         opacity: float = 1,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a contour layer using deck.gl."""
         layer_id = name or f"contour-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         default_contours = [
             {"threshold": 1, "color": [255, 255, 255], "strokeWidth": 1},
@@ -1416,7 +1534,7 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {**self._layers, layer_id: {"id": layer_id, "type": "contour"}}
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "contour"})
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     def add_screen_grid_layer(
@@ -1429,11 +1547,12 @@ class MapboxMap(MapWidget):
         color_range: Optional[List[List[int]]] = None,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a screen grid layer using deck.gl."""
         layer_id = name or f"screengrid-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         default_color_range = [
             [255, 255, 178, 25],
@@ -1457,10 +1576,7 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "screengrid"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "screengrid"})
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     def add_trips_layer(
@@ -1475,11 +1591,12 @@ class MapboxMap(MapWidget):
         current_time: float = 0,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a trips layer using deck.gl."""
         layer_id = name or f"trips-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addTripsLayer",
@@ -1487,7 +1604,7 @@ class MapboxMap(MapWidget):
             data=processed_data,
             getPath=get_path,
             getTimestamps=get_timestamps,
-            getColor=get_color or [253, 128, 93],
+            getColor=[253, 128, 93] if get_color is None else get_color,
             widthMinPixels=width_min_pixels,
             trailLength=trail_length,
             currentTime=current_time,
@@ -1496,7 +1613,7 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {**self._layers, layer_id: {"id": layer_id, "type": "trips"}}
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "trips"})
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     def add_line_layer(
@@ -1510,11 +1627,12 @@ class MapboxMap(MapWidget):
         width_min_pixels: float = 1,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a line layer using deck.gl."""
         layer_id = name or f"line-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addLineLayer",
@@ -1522,7 +1640,7 @@ class MapboxMap(MapWidget):
             data=processed_data,
             getSourcePosition=get_source_position,
             getTargetPosition=get_target_position,
-            getColor=get_color or [51, 136, 255, 200],
+            getColor=[51, 136, 255, 200] if get_color is None else get_color,
             getWidth=get_width,
             widthMinPixels=width_min_pixels,
             pickable=pickable,
@@ -1530,7 +1648,7 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {**self._layers, layer_id: {"id": layer_id, "type": "line"}}
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "line"})
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     def add_deckgl_layer(
@@ -1538,13 +1656,14 @@ class MapboxMap(MapWidget):
         layer_type: str,
         data: Any,
         name: Optional[str] = None,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a generic deck.gl layer to the map."""
         layer_type_clean = layer_type.replace("Layer", "")
         prefix = layer_type_clean.lower()
         layer_id = name or f"{prefix}-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addDeckGLLayer",
@@ -1554,7 +1673,7 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {**self._layers, layer_id: {"id": layer_id, "type": layer_type}}
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": layer_type})
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     def remove_deck_layer(self, layer_id: str) -> None:
@@ -1579,19 +1698,22 @@ class MapboxMap(MapWidget):
         wireframe: bool = False,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a column layer using deck.gl."""
         layer_id = name or f"column-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addColumnLayer",
             id=layer_id,
             data=processed_data,
             getPosition=get_position,
-            getFillColor=get_fill_color or [255, 140, 0, 200],
-            getLineColor=get_line_color or [0, 0, 0, 255],
+            getFillColor=(
+                [255, 140, 0, 200] if get_fill_color is None else get_fill_color
+            ),
+            getLineColor=[0, 0, 0, 255] if get_line_color is None else get_line_color,
             getElevation=get_elevation,
             radius=radius,
             diskResolution=disk_resolution,
@@ -1606,7 +1728,7 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {**self._layers, layer_id: {"id": layer_id, "type": "column"}}
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "column"})
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     def add_bitmap_layer(
@@ -1639,7 +1761,7 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {**self._layers, layer_id: {"id": layer_id, "type": "bitmap"}}
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "bitmap"})
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     def add_solid_polygon_layer(
@@ -1656,19 +1778,22 @@ class MapboxMap(MapWidget):
         elevation_scale: float = 1,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a solid polygon layer using deck.gl."""
         layer_id = name or f"solidpolygon-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addSolidPolygonLayer",
             id=layer_id,
             data=processed_data,
             getPolygon=get_polygon,
-            getFillColor=get_fill_color or [51, 136, 255, 128],
-            getLineColor=get_line_color or [0, 0, 0, 255],
+            getFillColor=(
+                [51, 136, 255, 128] if get_fill_color is None else get_fill_color
+            ),
+            getLineColor=[0, 0, 0, 255] if get_line_color is None else get_line_color,
             getElevation=get_elevation,
             filled=filled,
             extruded=extruded,
@@ -1679,10 +1804,7 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "solidpolygon"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "solidpolygon"})
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     def add_grid_cell_layer(
@@ -1698,18 +1820,19 @@ class MapboxMap(MapWidget):
         extruded: bool = True,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a grid cell layer using deck.gl."""
         layer_id = name or f"gridcell-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addGridCellLayer",
             id=layer_id,
             data=processed_data,
             getPosition=get_position,
-            getColor=get_color or [255, 140, 0, 200],
+            getColor=[255, 140, 0, 200] if get_color is None else get_color,
             getElevation=get_elevation,
             cellSize=cell_size,
             coverage=coverage,
@@ -1720,10 +1843,7 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "gridcell"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "gridcell"})
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     # -------------------------------------------------------------------------
@@ -1787,10 +1907,9 @@ class MapboxMap(MapWidget):
             streamingPointBudget=streaming_point_budget,
             **kwargs,
         )
-        self._controls = {
-            **self._controls,
-            "lidar-control": {"position": position, "collapsed": collapsed},
-        }
+        self._set_state(
+            "_controls", "lidar-control", {"position": position, "collapsed": collapsed}
+        )
 
     def add_lidar_layer(
         self,
@@ -1878,14 +1997,15 @@ class MapboxMap(MapWidget):
                 **kwargs,
             )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "lidar",
                 "source": str(source),
             },
-        }
+        )
 
     def remove_lidar_layer(self, layer_id: Optional[str] = None) -> None:
         """Remove a LiDAR layer.
@@ -1894,15 +2014,13 @@ class MapboxMap(MapWidget):
             layer_id: Layer identifier to remove. If None, removes all LiDAR layers.
         """
         if layer_id:
-            if layer_id in self._layers:
-                layers = dict(self._layers)
-                del layers[layer_id]
-                self._layers = layers
+            self._remove_state("_layers", layer_id)
             self.call_js_method("removeLidarLayer", id=layer_id)
         else:
             # Remove all lidar layers
-            layers = dict(self._layers)
-            self._layers = {k: v for k, v in layers.items() if v.get("type") != "lidar"}
+            for key, layer in list(self._layers.items()):
+                if layer.get("type") == "lidar":
+                    self._remove_state("_layers", key)
             self.call_js_method("removeLidarLayer")
 
     def set_lidar_color_scheme(self, color_scheme: str) -> None:
@@ -1929,20 +2047,42 @@ class MapboxMap(MapWidget):
         """
         self.call_js_method("setLidarOpacity", opacity=opacity)
 
-    def _process_deck_data(self, data: Any) -> Any:
+    def _process_deck_data(
+        self, data: Any, precision: Optional[int] = None, geoarrow: bool = False
+    ) -> Any:
         """Process data for deck.gl layers.
 
-        Handles GeoDataFrame, file paths, GeoJSON, and list of dicts.
+        Handles Arrow data, GeoDataFrame, file paths, GeoJSON, and list of
+        dicts.
 
         Args:
             data: Input data in various formats.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults
+                to the map's ``coordinate_precision`` (6 decimal places by
+                default).
+            geoarrow: Send Arrow data and GeoParquet files as GeoArrow
+                buffers. Only layers whose renderer reads GeoArrow set
+                this; others receive GeoJSON.
 
         Returns:
-            Processed data suitable for deck.gl layers.
+            Processed data suitable for deck.gl layers. Large GeoJSON and
+            record lists are replaced by a data store reference.
         """
+        precision = self._coordinate_precision(precision)
+
+        # Handle Arrow tables and GeoParquet files
+        if is_arrow_data(data):
+            if geoarrow:
+                table = to_geoarrow(data, precision=precision)
+                # Mixed geometry types come back as GeoJSON
+                if "__geoarrow__" in table:
+                    return table
+                return self._store_data(table)
+            return self._store_data(to_geojson(data, precision=precision))
+
         # Handle GeoDataFrame
         if hasattr(data, "__geo_interface__"):
-            return data.__geo_interface__
+            return self._store_data(to_geojson(data, precision=precision))
 
         # Handle file paths
         if isinstance(data, (str, Path)):
@@ -1952,12 +2092,16 @@ class MapboxMap(MapWidget):
                     import geopandas as gpd
 
                     gdf = gpd.read_file(path)
-                    return gdf.__geo_interface__
+                    return self._store_data(to_geojson(gdf, precision=precision))
                 except ImportError:
                     pass
 
+        # Round GeoJSON coordinates; records are sent as-is
+        if isinstance(data, dict):
+            data = quantize_geojson(data, precision)
+
         # Return as-is for lists, dicts, etc.
-        return data
+        return self._store_data(data)
 
     # -------------------------------------------------------------------------
     # Terrain Methods (Mapbox-specific)
@@ -2021,21 +2165,18 @@ class MapboxMap(MapWidget):
             layer_config["source"] = source
         else:
             source_id = f"{layer_id}-source"
-            self._sources = {**self._sources, source_id: source}
+            self._set_state("_sources", source_id, source)
             self.call_js_method("addSource", source_id, **source)
             layer_config["source"] = source_id
 
-        self._layers = {**self._layers, layer_id: layer_config}
+        self._set_state("_layers", layer_id, layer_config)
         self.call_js_method("addLayer", beforeId=before_id, **layer_config)
         lt = layer_config.get("type", "")
         self._add_to_layer_dict(layer_id, "Raster" if lt == "raster" else "Vector")
 
     def remove_layer(self, layer_id: str) -> None:
         """Remove a layer from the map."""
-        if layer_id in self._layers:
-            layers = dict(self._layers)
-            del layers[layer_id]
-            self._layers = layers
+        self._remove_state("_layers", layer_id)
         self._remove_from_layer_dict(layer_id)
         self.call_js_method("removeLayer", layer_id)
 
@@ -2109,18 +2250,16 @@ class MapboxMap(MapWidget):
             **kwargs: Control-specific options.
         """
         self.call_js_method("addControl", control_type, position=position, **kwargs)
-        self._controls = {
-            **self._controls,
-            control_type: {"type": control_type, "position": position, **kwargs},
-        }
+        self._set_state(
+            "_controls",
+            control_type,
+            {"type": control_type, "position": position, **kwargs},
+        )
 
     def remove_control(self, control_type: str) -> None:
         """Remove a map control."""
         self.call_js_method("removeControl", control_type)
-        if control_type in self._controls:
-            controls = dict(self._controls)
-            del controls[control_type]
-            self._controls = controls
+        self._remove_state("_controls", control_type)
 
     def add_layer_control(
         self,
@@ -2138,14 +2277,15 @@ class MapboxMap(MapWidget):
             position=position,
             collapsed=collapsed,
         )
-        self._controls = {
-            **self._controls,
-            "layer-control": {
+        self._set_state(
+            "_controls",
+            "layer-control",
+            {
                 "layers": layers,
                 "position": position,
                 "collapsed": collapsed,
             },
-        }
+        )
 
     def add_colorbar(
         self,
@@ -2193,9 +2333,10 @@ class MapboxMap(MapWidget):
 
         self.call_js_method("addColorbar", **js_kwargs)
 
-        self._controls = {
-            **self._controls,
-            cbar_id: {
+        self._set_state(
+            "_controls",
+            cbar_id,
+            {
                 "type": "colorbar",
                 "colormap": colormap,
                 "vmin": vmin,
@@ -2205,7 +2346,7 @@ class MapboxMap(MapWidget):
                 "orientation": orientation,
                 "position": position,
             },
-        }
+        )
 
     def remove_colorbar(self, colorbar_id: Optional[str] = None) -> None:
         """Remove a colorbar from the map."""
@@ -2213,15 +2354,11 @@ class MapboxMap(MapWidget):
             cbar_keys = [k for k in self._controls.keys() if k.startswith("colorbar")]
             for key in cbar_keys:
                 self.call_js_method("removeColorbar", colorbarId=key)
-            self._controls = {
-                k: v for k, v in self._controls.items() if not k.startswith("colorbar")
-            }
+            for key in cbar_keys:
+                self._remove_state("_controls", key)
         else:
             self.call_js_method("removeColorbar", colorbarId=colorbar_id)
-            if colorbar_id in self._controls:
-                controls = dict(self._controls)
-                del controls[colorbar_id]
-                self._controls = controls
+            self._remove_state("_controls", colorbar_id)
 
     def update_colorbar(self, colorbar_id: Optional[str] = None, **kwargs) -> None:
         """Update an existing colorbar's properties."""
@@ -2264,22 +2401,20 @@ class MapboxMap(MapWidget):
             markerColor=marker_color,
             **kwargs,
         )
-        self._controls = {
-            **self._controls,
-            "search-control": {
+        self._set_state(
+            "_controls",
+            "search-control",
+            {
                 "type": "search-control",
                 "position": position,
                 "collapsed": collapsed,
             },
-        }
+        )
 
     def remove_search_control(self) -> None:
         """Remove the search/geocoder control."""
         self.call_js_method("removeSearchControl")
-        if "search-control" in self._controls:
-            controls = dict(self._controls)
-            del controls["search-control"]
-            self._controls = controls
+        self._remove_state("_controls", "search-control")
 
     def add_measure_control(
         self,
@@ -2305,22 +2440,20 @@ class MapboxMap(MapWidget):
             fillColor=fill_color,
             **kwargs,
         )
-        self._controls = {
-            **self._controls,
-            "measure-control": {
+        self._set_state(
+            "_controls",
+            "measure-control",
+            {
                 "type": "measure-control",
                 "position": position,
                 "collapsed": collapsed,
             },
-        }
+        )
 
     def remove_measure_control(self) -> None:
         """Remove the measurement control."""
         self.call_js_method("removeMeasureControl")
-        if "measure-control" in self._controls:
-            controls = dict(self._controls)
-            del controls["measure-control"]
-            self._controls = controls
+        self._remove_state("_controls", "measure-control")
 
     def add_print_control(
         self,
@@ -2344,22 +2477,20 @@ class MapboxMap(MapWidget):
             includeScaleBar=include_scale_bar,
             **kwargs,
         )
-        self._controls = {
-            **self._controls,
-            "print-control": {
+        self._set_state(
+            "_controls",
+            "print-control",
+            {
                 "type": "print-control",
                 "position": position,
                 "collapsed": collapsed,
             },
-        }
+        )
 
     def remove_print_control(self) -> None:
         """Remove the print/export control."""
         self.call_js_method("removePrintControl")
-        if "print-control" in self._controls:
-            controls = dict(self._controls)
-            del controls["print-control"]
-            self._controls = controls
+        self._remove_state("_controls", "print-control")
 
     def add_coordinates_control(
         self,
@@ -2466,10 +2597,11 @@ class MapboxMap(MapWidget):
             defaultPickable=default_pickable,
             **kwargs,
         )
-        self._controls = {
-            **self._controls,
-            "pmtiles-control": {"position": position, "collapsed": collapsed},
-        }
+        self._set_state(
+            "_controls",
+            "pmtiles-control",
+            {"position": position, "collapsed": collapsed},
+        )
 
     def add_cog_control(
         self,
@@ -2498,10 +2630,9 @@ class MapboxMap(MapWidget):
             defaultRescaleMax=default_rescale_max,
             **kwargs,
         )
-        self._controls = {
-            **self._controls,
-            "cog-control": {"position": position, "collapsed": collapsed},
-        }
+        self._set_state(
+            "_controls", "cog-control", {"position": position, "collapsed": collapsed}
+        )
 
     def add_zarr_control(
         self,
@@ -2526,10 +2657,9 @@ class MapboxMap(MapWidget):
             defaultClim=list(default_clim) if default_clim else [0, 1],
             **kwargs,
         )
-        self._controls = {
-            **self._controls,
-            "zarr-control": {"position": position, "collapsed": collapsed},
-        }
+        self._set_state(
+            "_controls", "zarr-control", {"position": position, "collapsed": collapsed}
+        )
 
     def add_vector_control(
         self,
@@ -2556,10 +2686,11 @@ class MapboxMap(MapWidget):
             fitBounds=fit_bounds,
             **kwargs,
         )
-        self._controls = {
-            **self._controls,
-            "vector-control": {"position": position, "collapsed": collapsed},
-        }
+        self._set_state(
+            "_controls",
+            "vector-control",
+            {"position": position, "collapsed": collapsed},
+        )
 
     def add_control_grid(
         self,
@@ -2602,14 +2733,15 @@ class MapboxMap(MapWidget):
             js_kwargs["excludeLayers"] = exclude_layers
 
         self.call_js_method("addControlGrid", **js_kwargs)
-        self._controls = {
-            **self._controls,
-            "control-grid": {
+        self._set_state(
+            "_controls",
+            "control-grid",
+            {
                 "position": position,
                 "collapsed": collapsed,
                 "collapsible": collapsible,
             },
-        }
+        )
 
     def add_legend(
         self,
@@ -2652,9 +2784,10 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._controls = {
-            **self._controls,
-            legend_id: {
+        self._set_state(
+            "_controls",
+            legend_id,
+            {
                 "type": "legend",
                 "title": title,
                 "labels": labels,
@@ -2662,7 +2795,7 @@ class MapboxMap(MapWidget):
                 "position": position,
                 "opacity": opacity,
             },
-        }
+        )
 
     def remove_legend(self, legend_id: Optional[str] = None) -> None:
         """Remove a legend control from the map."""
@@ -2670,15 +2803,11 @@ class MapboxMap(MapWidget):
             legend_keys = [k for k in self._controls.keys() if k.startswith("legend")]
             for key in legend_keys:
                 self.call_js_method("removeLegend", key)
-            self._controls = {
-                k: v for k, v in self._controls.items() if not k.startswith("legend")
-            }
+            for key in legend_keys:
+                self._remove_state("_controls", key)
         else:
             self.call_js_method("removeLegend", legend_id)
-            if legend_id in self._controls:
-                controls = dict(self._controls)
-                del controls[legend_id]
-                self._controls = controls
+            self._remove_state("_controls", legend_id)
 
     def update_legend(
         self,
@@ -2694,10 +2823,11 @@ class MapboxMap(MapWidget):
             raise ValueError(f"Legend '{legend_id}' not found")
 
         update_params = {"id": legend_id}
+        changes: Dict[str, Any] = {}
 
         if title is not None:
             update_params["title"] = title
-            self._controls[legend_id]["title"] = title
+            changes["title"] = title
 
         if labels is not None and colors is not None:
             if len(labels) != len(colors):
@@ -2707,16 +2837,18 @@ class MapboxMap(MapWidget):
                 {"label": label, "color": color} for label, color in zip(labels, colors)
             ]
             update_params["items"] = legend_items
-            self._controls[legend_id]["labels"] = labels
-            self._controls[legend_id]["colors"] = colors
+            changes["labels"] = labels
+            changes["colors"] = colors
 
         elif labels is not None or colors is not None:
             raise ValueError("Both labels and colors must be provided together")
 
         if opacity is not None:
             update_params["opacity"] = opacity
-            self._controls[legend_id]["opacity"] = opacity
+            changes["opacity"] = opacity
 
+        if changes:
+            self._update_state("_controls", legend_id, changes)
         update_params.update(kwargs)
         self.call_js_method("updateLegend", **update_params)
 
@@ -2760,22 +2892,20 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "flatgeobuf",
                 "url": url,
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Vector")
 
     def remove_flatgeobuf(self, name: str) -> None:
         """Remove a FlatGeobuf layer from the map."""
-        if name in self._layers:
-            layers = dict(self._layers)
-            del layers[name]
-            self._layers = layers
+        self._remove_state("_layers", name)
         self._remove_from_layer_dict(name)
         self.call_js_method("removeFlatGeobuf", name=name)
 
@@ -2815,14 +2945,15 @@ class MapboxMap(MapWidget):
             collapsed=collapsed,
             **kwargs,
         )
-        self._controls = {
-            **self._controls,
-            "draw-control": {
+        self._set_state(
+            "_controls",
+            "draw-control",
+            {
                 "position": position,
                 "drawModes": draw_modes,
                 "editModes": edit_modes,
             },
-        }
+        )
 
     def get_draw_data(self) -> Dict:
         """Get the current drawn features as GeoJSON."""
@@ -2918,11 +3049,15 @@ class MapboxMap(MapWidget):
             url = geojson["url"]
             geojson = fetch_geojson(url)
 
-        bounds = get_bounds(geojson) if fit_bounds else None
+        bounds = (
+            get_bounds(data if _is_geodataframe(data) else geojson)
+            if fit_bounds
+            else None
+        )
 
         self.call_js_method(
             "addClusterLayer",
-            data=geojson,
+            data=self._store_data(geojson),
             name=layer_id,
             clusterRadius=cluster_radius,
             clusterMaxZoom=cluster_max_zoom,
@@ -2939,14 +3074,15 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "cluster",
                 "source": f"{layer_id}-source",
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Vector")
         return layer_id
 
@@ -2970,6 +3106,7 @@ class MapboxMap(MapWidget):
         hover: bool = True,
         layer_id: Optional[str] = None,
         fit_bounds: bool = True,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a choropleth (thematic) map layer."""
@@ -2981,11 +3118,12 @@ class MapboxMap(MapWidget):
 
         layer_name = layer_id or f"choropleth-{len(self._layers)}"
 
-        geojson = to_geojson(data)
+        precision = self._coordinate_precision(precision)
+        geojson = to_geojson(data, precision=precision)
 
         if geojson.get("type") == "url":
             url = geojson["url"]
-            geojson = fetch_geojson(url)
+            geojson = quantize_geojson(fetch_geojson(url), precision)
 
         features = geojson.get("features", [])
         values = []
@@ -3003,15 +3141,19 @@ class MapboxMap(MapWidget):
 
         computed_breaks = compute_breaks(values, classification, k, breaks)
 
-        colors = get_choropleth_colors(cmap, k)
+        colors = get_choropleth_colors(cmap, len(computed_breaks) - 1)
 
         step_expr = build_step_expression(column, computed_breaks, colors)
 
-        bounds = get_bounds(geojson) if fit_bounds else None
+        bounds = (
+            get_bounds(data if _is_geodataframe(data) else geojson)
+            if fit_bounds
+            else None
+        )
 
         self.call_js_method(
             "addChoropleth",
-            data=geojson,
+            data=self._store_data(geojson),
             name=layer_name,
             column=column,
             stepExpression=step_expr,
@@ -3024,15 +3166,16 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_name: {
+        self._set_state(
+            "_layers",
+            layer_name,
+            {
                 "id": layer_name,
                 "type": "choropleth",
                 "source": f"{layer_name}-source",
                 "column": column,
             },
-        }
+        )
         self._add_to_layer_dict(layer_name, "Vector")
 
         if legend:
@@ -3076,13 +3219,14 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_name: {
+        self._set_state(
+            "_layers",
+            layer_name,
+            {
                 "id": layer_name,
                 "type": "fill-extrusion",
             },
-        }
+        )
         self._add_to_layer_dict(layer_name, "Vector")
 
     def animate_along_route(
@@ -3162,22 +3306,20 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            anim_id: {
+        self._set_state(
+            "_layers",
+            anim_id,
+            {
                 "id": anim_id,
                 "type": "animation",
             },
-        }
+        )
         return anim_id
 
     def stop_animation(self, animation_id: str) -> None:
         """Stop a running animation."""
         self.call_js_method("stopAnimation", animation_id)
-        if animation_id in self._layers:
-            layers = dict(self._layers)
-            del layers[animation_id]
-            self._layers = layers
+        self._remove_state("_layers", animation_id)
 
     def pause_animation(self, animation_id: str) -> None:
         """Pause a running animation."""
@@ -3260,15 +3402,16 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "image",
                 "url": url,
                 "coordinates": coordinates,
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Raster")
 
     def add_video_layer(
@@ -3298,22 +3441,20 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "video",
                 "source": f"{layer_id}-source",
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Raster")
 
     def remove_video_layer(self, name: str) -> None:
         """Remove a video layer from the map."""
-        if name in self._layers:
-            layers = dict(self._layers)
-            del layers[name]
-            self._layers = layers
+        self._remove_state("_layers", name)
         self._remove_from_layer_dict(name)
         self.call_js_method("removeVideoLayer", id=name)
 
@@ -3396,6 +3537,7 @@ class MapboxMap(MapWidget):
         geometry: Optional[Any] = None,
         layers: Optional[List[str]] = None,
         filter_expression: Optional[List] = None,
+        timeout: Optional[float] = None,
     ) -> Dict:
         """Query features currently rendered on the map."""
         kwargs: Dict[str, Any] = {}
@@ -3406,6 +3548,8 @@ class MapboxMap(MapWidget):
         if filter_expression is not None:
             kwargs["filter"] = filter_expression
 
+        if timeout is not None:
+            return self.request("queryRenderedFeatures", timeout=timeout, **kwargs)
         self.call_js_method("queryRenderedFeatures", **kwargs)
         return self._queried_features
 
@@ -3414,6 +3558,7 @@ class MapboxMap(MapWidget):
         source_id: str,
         source_layer: Optional[str] = None,
         filter_expression: Optional[List] = None,
+        timeout: Optional[float] = None,
     ) -> Dict:
         """Query features from a source."""
         kwargs: Dict[str, Any] = {"sourceId": source_id}
@@ -3422,6 +3567,8 @@ class MapboxMap(MapWidget):
         if filter_expression is not None:
             kwargs["filter"] = filter_expression
 
+        if timeout is not None:
+            return self.request("querySourceFeatures", timeout=timeout, **kwargs)
         self.call_js_method("querySourceFeatures", **kwargs)
         return self._queried_features
 
@@ -3433,8 +3580,14 @@ class MapboxMap(MapWidget):
     def get_visible_features(
         self,
         layers: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
     ) -> Optional[Dict]:
         """Get all features currently visible in the viewport."""
+        if timeout is not None:
+            features = self.request(
+                "getVisibleFeatures", timeout=timeout, layers=layers
+            )
+            return features["data"] if features else None
         if layers is not None:
             self.call_js_method("getVisibleFeatures", layers=layers)
         features = self._queried_features
@@ -3442,8 +3595,13 @@ class MapboxMap(MapWidget):
             return features["data"]
         return None
 
-    def to_geojson(self, layer_id: Optional[str] = None) -> Optional[Dict]:
+    def to_geojson(
+        self, layer_id: Optional[str] = None, timeout: Optional[float] = None
+    ) -> Optional[Dict]:
         """Get layer data as GeoJSON."""
+        if layer_id and timeout is not None:
+            features = self.request("getLayerData", timeout=timeout, sourceId=layer_id)
+            return features["data"] if features else None
         if layer_id:
             self.call_js_method("getLayerData", sourceId=layer_id)
         features = self._queried_features
@@ -3451,9 +3609,11 @@ class MapboxMap(MapWidget):
             return features["data"]
         return None
 
-    def to_geopandas(self, layer_id: Optional[str] = None) -> Any:
+    def to_geopandas(
+        self, layer_id: Optional[str] = None, timeout: Optional[float] = None
+    ) -> Any:
         """Get layer data as a GeoDataFrame."""
-        geojson = self.to_geojson(layer_id)
+        geojson = self.to_geojson(layer_id, timeout=timeout)
         if geojson is None:
             return None
         try:
@@ -3499,14 +3659,15 @@ class MapboxMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            marker_id: {
+        self._set_state(
+            "_layers",
+            marker_id,
+            {
                 "id": marker_id,
                 "type": "marker",
                 "lngLat": [lng, lat],
             },
-        }
+        )
         self._add_to_layer_dict(marker_id, "Markers")
         return marker_id
 
@@ -3527,88 +3688,39 @@ class MapboxMap(MapWidget):
     ) -> str:
         """Add multiple markers from data."""
         layer_id = name or f"markers-{len(self._layers)}"
-        markers = []
-
-        if hasattr(data, "geometry"):
-            for _, row in data.iterrows():
-                geom = row.geometry
-                if geom.geom_type == "Point":
-                    marker = {"lngLat": [geom.x, geom.y]}
-                    if popup_column and popup_column in row:
-                        marker["popup"] = str(row[popup_column])
-                    if tooltip_column and tooltip_column in row:
-                        marker["tooltip"] = str(row[tooltip_column])
-                    markers.append(marker)
-        elif isinstance(data, dict) and data.get("type") == "FeatureCollection":
-            for feature in data.get("features", []):
-                geom = feature.get("geometry", {})
-                if geom.get("type") == "Point":
-                    coords = geom.get("coordinates", [])
-                    marker = {"lngLat": coords[:2]}
-                    props = feature.get("properties", {})
-                    if popup_column and popup_column in props:
-                        marker["popup"] = str(props[popup_column])
-                    if tooltip_column and tooltip_column in props:
-                        marker["tooltip"] = str(props[tooltip_column])
-                    markers.append(marker)
-        elif isinstance(data, list):
-            lng_keys = ["lng", "lon", "longitude", "x"]
-            lat_keys = ["lat", "latitude", "y"]
-
-            for item in data:
-                if not isinstance(item, dict):
-                    continue
-
-                lng_val = None
-                lat_val = None
-
-                if lng_column and lng_column in item:
-                    lng_val = item[lng_column]
-                else:
-                    for key in lng_keys:
-                        if key in item:
-                            lng_val = item[key]
-                            break
-
-                if lat_column and lat_column in item:
-                    lat_val = item[lat_column]
-                else:
-                    for key in lat_keys:
-                        if key in item:
-                            lat_val = item[key]
-                            break
-
-                if lng_val is not None and lat_val is not None:
-                    marker = {"lngLat": [float(lng_val), float(lat_val)]}
-                    if popup_column and popup_column in item:
-                        marker["popup"] = str(item[popup_column])
-                    if tooltip_column and tooltip_column in item:
-                        marker["tooltip"] = str(item[tooltip_column])
-                    markers.append(marker)
-
-        if not markers:
+        columns = marker_columns(
+            data, lng_column, lat_column, popup_column, tooltip_column
+        )
+        count = len(columns["lngLat"])
+        if not count:
             raise ValueError("No valid point data found in input")
+        threshold = self.marker_layer_threshold
+        as_layer = threshold is not None and count > threshold
 
         self.call_js_method(
             "addMarkers",
             id=layer_id,
-            markers=markers,
+            lngLat=to_binary_array(columns["lngLat"].reshape(-1), "float64"),
+            popups=columns["popup"],
+            tooltips=columns["tooltip"],
             color=color,
             scale=scale,
             popupMaxWidth=popup_max_width,
             tooltipMaxWidth=tooltip_max_width,
             draggable=draggable,
+            asLayer=as_layer,
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "markers",
-                "count": len(markers),
+                "count": count,
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Markers")
         return layer_id
 
@@ -3641,11 +3753,13 @@ class MapboxMap(MapWidget):
             "layers": self._layers,
             "sources": self._sources,
             "controls": self._controls,
-            "js_calls": self._js_calls,
+            "js_calls": self._js_call_history(resolve_data=True),
             "access_token": self.access_token,
         }
 
-        template = template.replace("{{state}}", json.dumps(state, indent=2))
+        template = template.replace(
+            "{{state}}", json.dumps(state, indent=2, default=json_default)
+        )
         return template
 
     def _get_default_template(self) -> str:
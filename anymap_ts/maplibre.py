@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import threading
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 from urllib.parse import urlencode
 
 import traitlets
@@ -17,7 +20,19 @@ from .utils import (
     infer_layer_type,
     get_default_paint,
     fetch_geojson,
+    json_default,
+    quantize_geojson,
+    simplify_pyramid,
+    is_arrow_data,
+    to_geoarrow,
+    marker_columns,
+    to_binary_array,
+    read_vector_batches,
+    vector_file_bounds,
+    load_vectors,
+    _is_geodataframe,
 )
+from .vector_tiles import KernelTileSource
 
 # Path to bundled static assets
 STATIC_DIR = Path(__file__).parent / "static"
@@ -50,6 +65,10 @@ class MapLibreMap(MapWidget):
     # Layer tracking
     _layer_dict = traitlets.Dict({}).tag(sync=True)
 
+    # Marker count above which add_markers draws a GPU circle layer
+    # instead of one DOM element per marker; None always uses DOM markers
+    marker_layer_threshold: Optional[int] = 2000
+
     def __init__(
         self,
         center: Tuple[float, float] = (0.0, 0.0),
@@ -109,6 +128,8 @@ class MapLibreMap(MapWidget):
 
         # Initialize layer dictionary
         self._layer_dict = {"Background": []}
+        # Categories of each layer in _layer_dict, for O(1) lookups
+        self._layer_categories: Dict[str, List[str]] = {}
 
         # Storage for auto-discovered PMTiles layer styles
         self._pmtiles_styles: Dict[str, List[Dict[str, Any]]] = {}
@@ -146,12 +167,10 @@ class MapLibreMap(MapWidget):
             layer_id: The layer identifier.
             category: The category to add the layer to (e.g., "Overlays", "Raster").
         """
-        layers = self._layer_dict.get(category, [])
-        if layer_id not in layers:
-            self._layer_dict = {
-                **self._layer_dict,
-                category: layers + [layer_id],
-            }
+        categories = self._layer_categories.setdefault(layer_id, [])
+        if category not in categories:
+            categories.append(category)
+            self._append_state("_layer_dict", category, layer_id)
 
     def _remove_from_layer_dict(self, layer_id: str) -> None:
         """Remove a layer from the layer dictionary.
@@ -159,15 +178,8 @@ class MapLibreMap(MapWidget):
         Args:
             layer_id: The layer identifier to remove.
         """
-        new_dict = {}
-        for category, layers in self._layer_dict.items():
-            if layer_id in layers:
-                new_layers = [lid for lid in layers if lid != layer_id]
-                if new_layers:  # Only keep category if it still has layers
-                    new_dict[category] = new_layers
-            else:
-                new_dict[category] = layers
-        self._layer_dict = new_dict
+        for category in self._layer_categories.pop(layer_id, []):
+            self._discard_state("_layer_dict", category, layer_id)
 
     # -------------------------------------------------------------------------
     # Validation Helpers
@@ -216,10 +228,7 @@ class MapLibreMap(MapWidget):
             layer_id: The layer identifier to remove.
             js_method: The JavaScript method to call for removal.
         """
-        if layer_id in self._layers:
-            layers = dict(self._layers)
-            del layers[layer_id]
-            self._layers = layers
+        self._remove_state("_layers", layer_id)
         self._remove_from_layer_dict(layer_id)
         self.call_js_method(js_method, layer_id)
 
@@ -297,12 +306,7 @@ class MapLibreMap(MapWidget):
         self.call_js_method("addBasemap", url, **js_kwargs)
 
         # Track in layer dict
-        basemaps = self._layer_dict.get("Basemaps", [])
-        if name not in basemaps:
-            self._layer_dict = {
-                **self._layer_dict,
-                "Basemaps": basemaps + [name],
-            }
+        self._add_to_layer_dict(name, "Basemaps")
 
     # -------------------------------------------------------------------------
     # Vector Data Methods
@@ -315,29 +319,78 @@ class MapLibreMap(MapWidget):
         paint: Optional[Dict] = None,
         name: Optional[str] = None,
         fit_bounds: bool = True,
+        precision: Optional[int] = None,
+        simplify: Optional[Sequence[float]] = None,
+        tiled: bool = False,
+        stream: bool = False,
+        batch_size: int = 10_000,
         **kwargs,
     ) -> None:
         """Add vector data to the map.
 
-        Supports GeoJSON, GeoDataFrame, or file paths to vector formats.
+        Supports GeoJSON, GeoDataFrame, Arrow tables, or file paths to vector
+        formats.
 
         Args:
-            data: GeoJSON dict, GeoDataFrame, or path to vector file
+            data: GeoJSON dict, GeoDataFrame, pyarrow Table, or path to a
+                vector or GeoParquet file. Arrow data is sent as GeoArrow
+                buffers instead of GeoJSON.
             layer_type: MapLibre layer type ('circle', 'line', 'fill', 'symbol')
             paint: MapLibre paint properties
             name: Layer name
             fit_bounds: Whether to fit map to data bounds
+            precision: Decimal places kept in coordinates. Defaults to the
+                map's ``coordinate_precision`` (6 decimal places by default).
+            simplify: Zoom levels at which the layer switches to more
+                detailed data, e.g. ``[4, 8]``. Below each level the map shows
+                a copy simplified to one pixel at that zoom; from the last
+                level on it shows the full-resolution data. Requires shapely.
+            tiled: Keep the data in the kernel and send it to the map as
+                vector tiles, cut on demand over the widget comm. Use this for
+                layers with millions of features. Requires shapely.
+            stream: Read a local vector file in batches of ``batch_size``
+                features. The layer is created from the first batch; the
+                others are read in a background thread and appended as they
+                arrive, so large files show up progressively. The kernel
+                drops each batch once the map has it, so views opened later
+                show the first batch only; ``to_html()`` reads the file
+                again to export the whole layer. Requires pyogrio.
+            batch_size: Number of features per batch when streaming
             **kwargs: Additional layer options
         """
-        geojson = to_geojson(data)
-
         layer_id = name or f"vector-{len(self._layers)}"
+        if tiled:
+            self._add_kernel_tiles(
+                data, layer_id, layer_type, paint, fit_bounds, **kwargs
+            )
+            return
+
+        precision = self._coordinate_precision(precision)
+        batches = None
+        if stream:
+            if simplify:
+                raise ValueError("simplify is not supported with stream=True")
+            if not isinstance(data, (str, Path)) or str(data).startswith(
+                ("http://", "https://")
+            ):
+                raise ValueError("stream=True requires the path of a local file")
+            path = data
+            batches = read_vector_batches(path, batch_size, to_crs="EPSG:4326")
+            data = next(batches)
+
+        if is_arrow_data(data):
+            if simplify:
+                raise ValueError("simplify is not supported for Arrow data")
+            # Sent as GeoArrow buffers; the browser builds the GeoJSON
+            geojson = to_geoarrow(data, precision=precision)
+        else:
+            geojson = to_geojson(data, precision=precision)
 
         # Handle URL data - fetch GeoJSON to get bounds and infer layer type
         if geojson.get("type") == "url":
             url = geojson["url"]
             # Fetch the actual GeoJSON data from URL
-            geojson = fetch_geojson(url)
+            geojson = quantize_geojson(fetch_geojson(url), precision)
 
         # Infer layer type if not specified
         if layer_type is None:
@@ -348,12 +401,28 @@ class MapLibreMap(MapWidget):
             paint = get_default_paint(layer_type)
 
         # Get bounds (use geojson dict, not original data which may be a URL)
-        bounds = get_bounds(geojson) if fit_bounds else None
+        bounds = (
+            get_bounds(data if _is_geodataframe(data) else geojson)
+            if fit_bounds
+            else None
+        )
+        if batches is not None and fit_bounds:
+            bounds = vector_file_bounds(path) or bounds
+
+        if simplify:
+            # Simplify the GeoDataFrame's geometries directly rather than
+            # rebuilding them from the GeoJSON
+            levels = simplify_pyramid(
+                data if _is_geodataframe(data) else geojson, simplify, precision
+            )
+            kwargs["levels"] = [
+                {**level, "data": self._store_data(level["data"])} for level in levels
+            ]
 
         # Call JavaScript
         self.call_js_method(
             "addGeoJSON",
-            data=geojson,
+            data=self._store_data(geojson),
             name=layer_id,
             layerType=layer_type,
             paint=paint,
@@ -363,17 +432,215 @@ class MapLibreMap(MapWidget):
         )
 
         # Track layer
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": layer_type,
                 "source": f"{layer_id}-source",
                 "paint": paint,
             },
-        }
+        )
+        self._add_to_layer_dict(layer_id, "Vector")
+
+        if batches is not None:
+            self._streamed_files[layer_id] = (path, precision)
+            self._stream_batches(layer_id, batches, precision)
+        else:
+            self._streamed_files.pop(layer_id, None)
+
+    def _stream_batches(
+        self, layer_id: str, batches: Iterator[Any], precision: int
+    ) -> None:
+        """Append the remaining batches of a streamed layer in the background.
+
+        Batches are read and converted on a background thread. Each is then
+        sent as an ``appendGeoJSON`` call from the kernel's event loop, since
+        the call logs and traits are not thread-safe, and the next batch is
+        read once it has been sent. Without a running event loop (outside a
+        kernel) the batches are sent right away. Removing the layer stops
+        the stream.
+
+        Args:
+            layer_id: Layer identifier
+            batches: Iterator over the remaining GeoDataFrame batches
+            precision: Decimal places kept in coordinates
+        """
+        stop = threading.Event()
+        self._streams[layer_id] = stop
+
+        def send(geojson: Dict[str, Any]) -> None:
+            if not stop.is_set():
+                self.call_js_method(
+                    "appendGeoJSON", name=layer_id, data=self._store_data(geojson)
+                )
+
+        def finish() -> None:
+            if self._streams.get(layer_id) is stop:
+                del self._streams[layer_id]
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            for batch in batches:
+                send(to_geojson(batch, precision=precision))
+            finish()
+            return
+
+        def run() -> None:
+            try:
+                for batch in batches:
+                    if stop.is_set():
+                        return
+                    geojson = to_geojson(batch, precision=precision)
+                    sent: Future = Future()
+
+                    def deliver() -> None:
+                        try:
+                            send(geojson)
+                        finally:
+                            sent.set_result(None)
+
+                    loop.call_soon_threadsafe(deliver)
+                    sent.result()
+            finally:
+                loop.call_soon_threadsafe(finish)
+
+        threading.Thread(
+            target=run, name=f"anymap-stream-{layer_id}", daemon=True
+        ).start()
+
+    def _inline_streamed_layers(
+        self, calls: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Add each streamed layer from its whole file, for HTML export.
+
+        Streamed batches are not kept in the call history, so the file is
+        read again and all its features are written into the layer's
+        ``addGeoJSON`` call.
+
+        Args:
+            calls: JS call history with resolved data
+
+        Returns:
+            The calls, with each streamed layer added from all its features.
+        """
+        result: List[Dict[str, Any]] = []
+        for call in calls:
+            kwargs = call.get("kwargs") or {}
+            name = kwargs.get("name")
+            if call.get("method") == "addGeoJSON" and name in self._streamed_files:
+                path, precision = self._streamed_files[name]
+                features = [
+                    feature
+                    for batch in read_vector_batches(path, to_crs="EPSG:4326")
+                    for feature in to_geojson(batch, precision=precision)["features"]
+                ]
+                data = {**kwargs["data"], "features": features}
+                call = {**call, "kwargs": {**kwargs, "data": data}}
+            result.append(call)
+        return result
+
+    def _add_kernel_tiles(
+        self,
+        data: Any,
+        layer_id: str,
+        layer_type: Optional[str],
+        paint: Optional[Dict],
+        fit_bounds: bool,
+        **kwargs,
+    ) -> None:
+        """Add vector data served as vector tiles cut in the kernel.
+
+        Args:
+            data: GeoDataFrame, GeoJSON dict, or path or URL to a vector file
+            layer_id: Layer identifier
+            layer_type: MapLibre layer type; inferred from the data if None
+            paint: MapLibre paint properties
+            fit_bounds: Whether to fit map to data bounds
+            **kwargs: Additional layer options
+        """
+        source = KernelTileSource(data)
+        source_id = f"{layer_id}-source"
+        self._tile_sources[source_id] = source
+
+        if layer_type is None:
+            layer_type = infer_layer_type({"type": source.geometry_type})
+        if paint is None:
+            paint = get_default_paint(layer_type)
+
+        self.call_js_method(
+            "addKernelTileLayer",
+            name=layer_id,
+            sourceLayer=source.layer,
+            layerType=layer_type,
+            paint=paint,
+            maxzoom=source.maxzoom,
+            fitBounds=fit_bounds,
+            bounds=source.bounds if fit_bounds else None,
+            **kwargs,
+        )
+
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
+                "id": layer_id,
+                "type": layer_type,
+                "source": source_id,
+                "paint": paint,
+            },
+        )
         self._add_to_layer_dict(layer_id, "Vector")
 
+    def add_vectors(
+        self,
+        data: Sequence[Any],
+        names: Optional[Sequence[str]] = None,
+        fit_bounds: bool = True,
+        max_workers: Optional[int] = None,
+        **kwargs,
+    ) -> None:
+        """Add many vector datasets to the map at once.
+
+        URLs are fetched and parsed concurrently (see ``load_vectors``), and
+        the layers are added in a single ``batch`` sync, so adding many
+        remote layers takes about as long as the slowest download.
+
+        Args:
+            data: GeoJSON dicts, GeoDataFrames, file paths, or URLs
+            names: Layer names, one per item
+            fit_bounds: Whether to fit the map to the bounds of all the data
+            max_workers: Number of download threads. Defaults to one per
+                item, up to 16.
+            **kwargs: Options passed to ``add_vector`` for every layer
+
+        Example:
+            >>> m.add_vectors([url1, url2, url3], names=["a", "b", "c"])
+        """
+        if names is not None and len(names) != len(data):
+            raise ValueError("names must have one name per item of data")
+        items = load_vectors(data, max_workers)
+
+        bounds = []
+        with self.batch():
+            for i, item in enumerate(items):
+                name = names[i] if names is not None else None
+                self.add_vector(item, name=name, fit_bounds=False, **kwargs)
+                if fit_bounds:
+                    bounds.append(get_bounds(item))
+            bounds = [b for b in bounds if b]
+            if bounds:
+                self.fit_bounds(
+                    [
+                        min(b[0] for b in bounds),
+                        min(b[1] for b in bounds),
+                        max(b[2] for b in bounds),
+                        max(b[3] for b in bounds),
+                    ]
+                )
+
     def add_geojson(
         self,
         data: Union[str, Dict],
@@ -381,6 +648,8 @@ class MapLibreMap(MapWidget):
         paint: Optional[Dict] = None,
         name: Optional[str] = None,
         fit_bounds: bool = True,
+        precision: Optional[int] = None,
+        simplify: Optional[Sequence[float]] = None,
         **kwargs,
     ) -> None:
         """Add GeoJSON data to the map.
@@ -391,6 +660,12 @@ class MapLibreMap(MapWidget):
             paint: MapLibre paint properties
             name: Layer name
             fit_bounds: Whether to fit map to data bounds
+            precision: Decimal places kept in coordinates. Defaults to the
+                map's ``coordinate_precision`` (6 decimal places by default).
+            simplify: Zoom levels at which the layer switches to more
+                detailed data, e.g. ``[4, 8]``. Below each level the map shows
+                a copy simplified to one pixel at that zoom; from the last
+                level on it shows the full-resolution data. Requires shapely.
             **kwargs: Additional layer options
         """
         self.add_vector(
@@ -399,6 +674,8 @@ class MapLibreMap(MapWidget):
             paint=paint,
             name=name,
             fit_bounds=fit_bounds,
+            precision=precision,
+            simplify=simplify,
             **kwargs,
         )
 
@@ -461,14 +738,15 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            marker_id: {
+        self._set_state(
+            "_layers",
+            marker_id,
+            {
                 "id": marker_id,
                 "type": "marker",
                 "lngLat": [lng, lat],
             },
-        }
+        )
         self._add_to_layer_dict(marker_id, "Markers")
         return marker_id
 
@@ -492,8 +770,14 @@ class MapLibreMap(MapWidget):
         Args:
             data: Data source - can be:
                 - List of dicts with 'lng'/'lon'/'longitude' and 'lat'/'latitude' keys
+                - DataFrame with longitude and latitude columns
                 - GeoDataFrame with Point geometries
                 - GeoJSON FeatureCollection with Point features
+                Positions and labels are sent as parallel arrays, so
+                hundreds of thousands of markers are read in bulk.
+                Above ``marker_layer_threshold`` points the markers are
+                drawn as a circle layer, with popups, tooltips and
+                dragging handled by feature picking.
             lng_column: Column name for longitude (auto-detected if None).
             lat_column: Column name for latitude (auto-detected if None).
             popup_column: Column name for popup content (shown on click).
@@ -519,92 +803,39 @@ class MapLibreMap(MapWidget):
             >>> m.add_markers(cities, popup_column="name", tooltip_column="info", scale=1.5)
         """
         layer_id = name or f"markers-{len(self._layers)}"
-        markers = []
-
-        # Handle GeoDataFrame
-        if hasattr(data, "geometry"):
-            for _, row in data.iterrows():
-                geom = row.geometry
-                if geom.geom_type == "Point":
-                    marker = {"lngLat": [geom.x, geom.y]}
-                    if popup_column and popup_column in row:
-                        marker["popup"] = str(row[popup_column])
-                    if tooltip_column and tooltip_column in row:
-                        marker["tooltip"] = str(row[tooltip_column])
-                    markers.append(marker)
-        # Handle GeoJSON
-        elif isinstance(data, dict) and data.get("type") == "FeatureCollection":
-            for feature in data.get("features", []):
-                geom = feature.get("geometry", {})
-                if geom.get("type") == "Point":
-                    coords = geom.get("coordinates", [])
-                    marker = {"lngLat": coords[:2]}
-                    props = feature.get("properties", {})
-                    if popup_column and popup_column in props:
-                        marker["popup"] = str(props[popup_column])
-                    if tooltip_column and tooltip_column in props:
-                        marker["tooltip"] = str(props[tooltip_column])
-                    markers.append(marker)
-        # Handle list of dicts
-        elif isinstance(data, list):
-            lng_keys = ["lng", "lon", "longitude", "x"]
-            lat_keys = ["lat", "latitude", "y"]
-
-            for item in data:
-                if not isinstance(item, dict):
-                    continue
-
-                # Find lng/lat values
-                lng_val = None
-                lat_val = None
-
-                if lng_column and lng_column in item:
-                    lng_val = item[lng_column]
-                else:
-                    for key in lng_keys:
-                        if key in item:
-                            lng_val = item[key]
-                            break
-
-                if lat_column and lat_column in item:
-                    lat_val = item[lat_column]
-                else:
-                    for key in lat_keys:
-                        if key in item:
-                            lat_val = item[key]
-                            break
-
-                if lng_val is not None and lat_val is not None:
-                    marker = {"lngLat": [float(lng_val), float(lat_val)]}
-                    if popup_column and popup_column in item:
-                        marker["popup"] = str(item[popup_column])
-                    if tooltip_column and tooltip_column in item:
-                        marker["tooltip"] = str(item[tooltip_column])
-                    markers.append(marker)
-
-        if not markers:
+        columns = marker_columns(
+            data, lng_column, lat_column, popup_column, tooltip_column
+        )
+        count = len(columns["lngLat"])
+        if not count:
             raise ValueError("No valid point data found in input")
+        threshold = self.marker_layer_threshold
+        as_layer = threshold is not None and count > threshold
 
         self.call_js_method(
             "addMarkers",
             id=layer_id,
-            markers=markers,
+            lngLat=to_binary_array(columns["lngLat"].reshape(-1), "float64"),
+            popups=columns["popup"],
+            tooltips=columns["tooltip"],
             color=color,
             scale=scale,
             popupMaxWidth=popup_max_width,
             tooltipMaxWidth=tooltip_max_width,
             draggable=draggable,
+            asLayer=as_layer,
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "markers",
-                "count": len(markers),
+                "count": count,
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Markers")
         return layer_id
 
@@ -704,7 +935,11 @@ class MapLibreMap(MapWidget):
             paint["heatmap-weight"] = ["get", weight_property]
 
         # Get bounds
-        bounds = get_bounds(geojson) if fit_bounds else None
+        bounds = (
+            get_bounds(data if _is_geodataframe(data) else geojson)
+            if fit_bounds
+            else None
+        )
 
         self.call_js_method(
             "addGeoJSON",
@@ -717,15 +952,16 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "heatmap",
                 "source": f"{layer_id}-source",
                 "paint": paint,
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Heatmap")
 
     # -------------------------------------------------------------------------
@@ -830,14 +1066,15 @@ class MapLibreMap(MapWidget):
         )
 
         # Track layer
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "raster",
                 "source": f"{layer_id}-source",
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Raster")
 
     def add_stac_layer(
@@ -946,15 +1183,16 @@ class MapLibreMap(MapWidget):
         )
 
         # Update layer info to mark as STAC
-        if layer_name in self._layers:
-            self._layers[layer_name].update(
-                {
-                    "stac_url": stac_url,
-                    "stac_assets": assets,
-                    "colormap": colormap,
-                    "rescale": rescale,
-                }
-            )
+        self._update_state(
+            "_layers",
+            layer_name,
+            {
+                "stac_url": stac_url,
+                "stac_assets": assets,
+                "colormap": colormap,
+                "rescale": rescale,
+            },
+        )
 
         # Try to fit bounds if requested and we have an item object
         if fit_bounds and item is not None:
@@ -1025,14 +1263,15 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "cog",
                 "url": url,
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Raster")
 
     def remove_cog_layer(self, layer_id: str) -> None:
@@ -1122,15 +1361,16 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "zarr",
                 "url": url,
                 "variable": variable,
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Raster")
 
     def remove_zarr_layer(self, layer_id: str) -> None:
@@ -1310,15 +1550,16 @@ class MapLibreMap(MapWidget):
 
             self.on_map_event("pmtiles_layers_discovered", _on_discovered)
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "pmtiles",
                 "url": url,
                 "source_type": source_type,
             },
-        }
+        )
         category = "Vector" if source_type == "vector" else "Raster"
         self._add_to_layer_dict(layer_id, category)
 
@@ -1373,6 +1614,7 @@ class MapLibreMap(MapWidget):
         great_circle: bool = False,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add an arc layer for origin-destination visualization using deck.gl.
@@ -1397,6 +1639,8 @@ class MapLibreMap(MapWidget):
             great_circle: Whether to draw arcs along great circles.
             pickable: Whether layer responds to hover/click events.
             opacity: Layer opacity (0-1).
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional ArcLayer props.
 
         Example:
@@ -1409,7 +1653,7 @@ class MapLibreMap(MapWidget):
             >>> m.add_arc_layer(arcs, name="flights")
         """
         layer_id = name or f"arc-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addArcLayer",
@@ -1417,8 +1661,12 @@ class MapLibreMap(MapWidget):
             data=processed_data,
             getSourcePosition=get_source_position,
             getTargetPosition=get_target_position,
-            getSourceColor=get_source_color or [51, 136, 255, 255],
-            getTargetColor=get_target_color or [255, 136, 51, 255],
+            getSourceColor=(
+                [51, 136, 255, 255] if get_source_color is None else get_source_color
+            ),
+            getTargetColor=(
+                [255, 136, 51, 255] if get_target_color is None else get_target_color
+            ),
             getWidth=get_width,
             getHeight=get_height,
             greatCircle=great_circle,
@@ -1427,13 +1675,14 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "arc",
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     def remove_arc_layer(self, layer_id: str) -> None:
@@ -1462,6 +1711,7 @@ class MapLibreMap(MapWidget):
         material: bool = True,
         coordinate_system: Optional[int] = None,
         coordinate_origin: Optional[List[float]] = None,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a point cloud layer for 3D point visualization using deck.gl.
@@ -1486,6 +1736,8 @@ class MapLibreMap(MapWidget):
             material: Whether to enable lighting effects.
             coordinate_system: Coordinate system for positions.
             coordinate_origin: Origin for coordinate system [x, y, z].
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional PointCloudLayer props.
 
         Example:
@@ -1499,14 +1751,14 @@ class MapLibreMap(MapWidget):
             >>> m.add_point_cloud_layer(points, point_size=5)
         """
         layer_id = name or f"pointcloud-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addPointCloudLayer",
             id=layer_id,
             data=processed_data,
             getPosition=get_position,
-            getColor=get_color or [255, 255, 255, 255],
+            getColor=[255, 255, 255, 255] if get_color is None else get_color,
             getNormal=get_normal,
             pointSize=point_size,
             sizeUnits=size_units,
@@ -1518,13 +1770,14 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "pointcloud",
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     def remove_point_cloud_layer(self, layer_id: str) -> None:
@@ -1555,6 +1808,7 @@ class MapLibreMap(MapWidget):
         filled: bool = True,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a scatterplot layer for sized/colored point visualization using deck.gl.
@@ -1580,6 +1834,8 @@ class MapLibreMap(MapWidget):
             filled: Whether to fill points.
             pickable: Whether layer responds to hover/click events.
             opacity: Layer opacity (0-1).
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional ScatterplotLayer props.
 
         Example:
@@ -1592,7 +1848,7 @@ class MapLibreMap(MapWidget):
             >>> m.add_scatterplot_layer(points, get_radius="size")
         """
         layer_id = name or f"scatterplot-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision, geoarrow=True)
 
         self.call_js_method(
             "addScatterplotLayer",
@@ -1600,8 +1856,12 @@ class MapLibreMap(MapWidget):
             data=processed_data,
             getPosition=get_position,
             getRadius=get_radius,
-            getFillColor=get_fill_color or [51, 136, 255, 200],
-            getLineColor=get_line_color or [255, 255, 255, 255],
+            getFillColor=(
+                [51, 136, 255, 200] if get_fill_color is None else get_fill_color
+            ),
+            getLineColor=(
+                [255, 255, 255, 255] if get_line_color is None else get_line_color
+            ),
             radiusScale=radius_scale,
             radiusMinPixels=radius_min_pixels,
             radiusMaxPixels=radius_max_pixels,
@@ -1613,13 +1873,14 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "scatterplot",
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     # -------------------------------------------------------------------------
@@ -1637,6 +1898,7 @@ class MapLibreMap(MapWidget):
         width_min_pixels: float = 1,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a path layer for route/trajectory rendering using deck.gl.
@@ -1656,6 +1918,8 @@ class MapLibreMap(MapWidget):
             width_min_pixels: Minimum width in pixels.
             pickable: Whether layer responds to hover/click events.
             opacity: Layer opacity (0-1).
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional PathLayer props.
 
         Example:
@@ -1667,14 +1931,14 @@ class MapLibreMap(MapWidget):
             >>> m.add_path_layer(routes, get_color=[255, 0, 0], get_width=3)
         """
         layer_id = name or f"path-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision, geoarrow=True)
 
         self.call_js_method(
             "addPathLayer",
             id=layer_id,
             data=processed_data,
             getPath=get_path,
-            getColor=get_color or [51, 136, 255, 200],
+            getColor=[51, 136, 255, 200] if get_color is None else get_color,
             getWidth=get_width,
             widthScale=width_scale,
             widthMinPixels=width_min_pixels,
@@ -1683,13 +1947,14 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "path",
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     # -------------------------------------------------------------------------
@@ -1712,6 +1977,7 @@ class MapLibreMap(MapWidget):
         line_width_min_pixels: float = 1,
         pickable: bool = True,
         opacity: float = 0.5,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a polygon layer for filled polygon visualization using deck.gl.
@@ -1737,6 +2003,8 @@ class MapLibreMap(MapWidget):
             line_width_min_pixels: Minimum stroke width in pixels.
             pickable: Whether layer responds to hover/click events.
             opacity: Layer opacity (0-1).
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional PolygonLayer props.
 
         Example:
@@ -1748,15 +2016,17 @@ class MapLibreMap(MapWidget):
             >>> m.add_polygon_layer(polygons, extruded=True, get_elevation="height")
         """
         layer_id = name or f"polygon-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision, geoarrow=True)
 
         self.call_js_method(
             "addPolygonLayer",
             id=layer_id,
             data=processed_data,
             getPolygon=get_polygon,
-            getFillColor=get_fill_color or [51, 136, 255, 128],
-            getLineColor=get_line_color or [0, 0, 255, 255],
+            getFillColor=(
+                [51, 136, 255, 128] if get_fill_color is None else get_fill_color
+            ),
+            getLineColor=[0, 0, 255, 255] if get_line_color is None else get_line_color,
             getLineWidth=get_line_width,
             getElevation=get_elevation,
             extruded=extruded,
@@ -1769,13 +2039,14 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "polygon",
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     # -------------------------------------------------------------------------
@@ -1793,6 +2064,7 @@ class MapLibreMap(MapWidget):
         color_range: Optional[List[List[int]]] = None,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a hexagon layer for hexagonal binning/aggregation using deck.gl.
@@ -1810,6 +2082,8 @@ class MapLibreMap(MapWidget):
             color_range: Color gradient for aggregation [[r, g, b], ...].
             pickable: Whether layer responds to hover/click events.
             opacity: Layer opacity (0-1).
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional HexagonLayer props.
 
         Example:
@@ -1822,7 +2096,7 @@ class MapLibreMap(MapWidget):
             >>> m.add_hexagon_layer(points, radius=500, elevation_scale=10)
         """
         layer_id = name or f"hexagon-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         default_color_range = [
             [1, 152, 189],
@@ -1847,13 +2121,14 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "hexagon",
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     # -------------------------------------------------------------------------
@@ -1871,6 +2146,7 @@ class MapLibreMap(MapWidget):
         threshold: float = 0.05,
         color_range: Optional[List[List[int]]] = None,
         opacity: float = 1,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a GPU-accelerated heatmap layer using deck.gl.
@@ -1888,6 +2164,8 @@ class MapLibreMap(MapWidget):
             threshold: Minimum density threshold (0-1).
             color_range: Color gradient [[r, g, b, a], ...].
             opacity: Layer opacity (0-1).
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional HeatmapLayer props.
 
         Example:
@@ -1900,7 +2178,7 @@ class MapLibreMap(MapWidget):
             >>> m.add_deck_heatmap_layer(points, get_weight="weight")
         """
         layer_id = name or f"deck-heatmap-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         default_color_range = [
             [255, 255, 178, 25],
@@ -1925,13 +2203,14 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "deck-heatmap",
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     # -------------------------------------------------------------------------
@@ -1949,6 +2228,7 @@ class MapLibreMap(MapWidget):
         color_range: Optional[List[List[int]]] = None,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a grid layer for square grid aggregation using deck.gl.
@@ -1966,6 +2246,8 @@ class MapLibreMap(MapWidget):
             color_range: Color gradient [[r, g, b], ...].
             pickable: Whether layer responds to hover/click events.
             opacity: Layer opacity (0-1).
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional GridLayer props.
 
         Example:
@@ -1978,7 +2260,7 @@ class MapLibreMap(MapWidget):
             >>> m.add_grid_layer(points, cell_size=500)
         """
         layer_id = name or f"grid-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         default_color_range = [
             [1, 152, 189],
@@ -2003,13 +2285,14 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "grid",
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     # -------------------------------------------------------------------------
@@ -2028,6 +2311,7 @@ class MapLibreMap(MapWidget):
         icon_mapping: Optional[Dict] = None,
         pickable: bool = True,
         opacity: float = 1,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add an icon layer for custom icon markers at scale using deck.gl.
@@ -2047,6 +2331,8 @@ class MapLibreMap(MapWidget):
             icon_mapping: Dict mapping icon names to atlas coordinates.
             pickable: Whether layer responds to hover/click events.
             opacity: Layer opacity (0-1).
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional IconLayer props.
 
         Example:
@@ -2058,7 +2344,7 @@ class MapLibreMap(MapWidget):
             >>> m.add_icon_layer(markers, get_size="size")
         """
         layer_id = name or f"icon-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addIconLayer",
@@ -2067,7 +2353,7 @@ class MapLibreMap(MapWidget):
             getPosition=get_position,
             getIcon=get_icon,
             getSize=get_size,
-            getColor=get_color or [255, 255, 255, 255],
+            getColor=[255, 255, 255, 255] if get_color is None else get_color,
             iconAtlas=icon_atlas,
             iconMapping=icon_mapping,
             pickable=pickable,
@@ -2075,13 +2361,14 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "icon",
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     # -------------------------------------------------------------------------
@@ -2101,6 +2388,7 @@ class MapLibreMap(MapWidget):
         alignment_baseline: str = "center",
         pickable: bool = True,
         opacity: float = 1,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a text layer for label placement using deck.gl.
@@ -2121,6 +2409,8 @@ class MapLibreMap(MapWidget):
             alignment_baseline: Vertical alignment ('top', 'center', 'bottom').
             pickable: Whether layer responds to hover/click events.
             opacity: Layer opacity (0-1).
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional TextLayer props.
 
         Example:
@@ -2133,7 +2423,7 @@ class MapLibreMap(MapWidget):
             >>> m.add_text_layer(labels, get_size=16)
         """
         layer_id = name or f"text-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addTextLayer",
@@ -2142,7 +2432,7 @@ class MapLibreMap(MapWidget):
             getPosition=get_position,
             getText=get_text,
             getSize=get_size,
-            getColor=get_color or [0, 0, 0, 255],
+            getColor=[0, 0, 0, 255] if get_color is None else get_color,
             getAngle=get_angle,
             getTextAnchor=text_anchor,
             getAlignmentBaseline=alignment_baseline,
@@ -2151,13 +2441,14 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "text",
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     # -------------------------------------------------------------------------
@@ -2181,6 +2472,7 @@ class MapLibreMap(MapWidget):
         point_radius_min_pixels: float = 2,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a GeoJSON layer with auto-styling using deck.gl.
@@ -2206,6 +2498,8 @@ class MapLibreMap(MapWidget):
             point_radius_min_pixels: Minimum point radius in pixels.
             pickable: Whether layer responds to hover/click events.
             opacity: Layer opacity (0-1).
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional GeoJsonLayer props.
 
         Example:
@@ -2217,14 +2511,16 @@ class MapLibreMap(MapWidget):
             ... )
         """
         layer_id = name or f"geojson-deck-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision, geoarrow=True)
 
         self.call_js_method(
             "addGeoJsonLayer",
             id=layer_id,
             data=processed_data,
-            getFillColor=get_fill_color or [51, 136, 255, 128],
-            getLineColor=get_line_color or [0, 0, 0, 255],
+            getFillColor=(
+                [51, 136, 255, 128] if get_fill_color is None else get_fill_color
+            ),
+            getLineColor=[0, 0, 0, 255] if get_line_color is None else get_line_color,
             getLineWidth=get_line_width,
             getPointRadius=get_point_radius,
             getElevation=get_elevation,
@@ -2239,13 +2535,14 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "geojson-deck",
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     # -------------------------------------------------------------------------
@@ -2262,6 +2559,7 @@ class MapLibreMap(MapWidget):
         contours: Optional[List[Dict]] = None,
         pickable: bool = True,
         opacity: float = 1,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a contour layer for isoline/isoband generation using deck.gl.
@@ -2278,6 +2576,8 @@ class MapLibreMap(MapWidget):
             contours: Contour definitions [{threshold, color, strokeWidth}, ...].
             pickable: Whether layer responds to hover/click events.
             opacity: Layer opacity (0-1).
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional ContourLayer props.
 
         Example:
@@ -2293,7 +2593,7 @@ class MapLibreMap(MapWidget):
             ... ])
         """
         layer_id = name or f"contour-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         default_contours = [
             {"threshold": 1, "color": [255, 255, 255], "strokeWidth": 1},
@@ -2314,13 +2614,14 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "contour",
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     # -------------------------------------------------------------------------
@@ -2337,6 +2638,7 @@ class MapLibreMap(MapWidget):
         color_range: Optional[List[List[int]]] = None,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a screen grid layer for screen-space grid aggregation using deck.gl.
@@ -2353,6 +2655,8 @@ class MapLibreMap(MapWidget):
             color_range: Color gradient [[r, g, b, a], ...].
             pickable: Whether layer responds to hover/click events.
             opacity: Layer opacity (0-1).
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional ScreenGridLayer props.
 
         Example:
@@ -2365,7 +2669,7 @@ class MapLibreMap(MapWidget):
             >>> m.add_screen_grid_layer(points, cell_size_pixels=30)
         """
         layer_id = name or f"screengrid-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         default_color_range = [
             [255, 255, 178, 25],
@@ -2389,13 +2693,14 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "screengrid",
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     # -------------------------------------------------------------------------
@@ -2414,6 +2719,7 @@ class MapLibreMap(MapWidget):
         current_time: float = 0,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a trips layer for animated trip/trajectory playback using deck.gl.
@@ -2433,6 +2739,8 @@ class MapLibreMap(MapWidget):
             current_time: Current animation time.
             pickable: Whether layer responds to hover/click events.
             opacity: Layer opacity (0-1).
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional TripsLayer props.
 
         Example:
@@ -2447,7 +2755,7 @@ class MapLibreMap(MapWidget):
             >>> m.add_trips_layer(trips, trail_length=200, current_time=50)
         """
         layer_id = name or f"trips-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addTripsLayer",
@@ -2455,7 +2763,7 @@ class MapLibreMap(MapWidget):
             data=processed_data,
             getPath=get_path,
             getTimestamps=get_timestamps,
-            getColor=get_color or [253, 128, 93],
+            getColor=[253, 128, 93] if get_color is None else get_color,
             widthMinPixels=width_min_pixels,
             trailLength=trail_length,
             currentTime=current_time,
@@ -2464,13 +2772,14 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "trips",
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     # -------------------------------------------------------------------------
@@ -2488,6 +2797,7 @@ class MapLibreMap(MapWidget):
         width_min_pixels: float = 1,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a line layer for origin-destination line visualization using deck.gl.
@@ -2506,6 +2816,8 @@ class MapLibreMap(MapWidget):
             width_min_pixels: Minimum line width in pixels.
             pickable: Whether layer responds to hover/click events.
             opacity: Layer opacity (0-1).
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional LineLayer props.
 
         Example:
@@ -2517,7 +2829,7 @@ class MapLibreMap(MapWidget):
             >>> m.add_line_layer(lines, get_color=[0, 128, 255], get_width=2)
         """
         layer_id = name or f"line-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addLineLayer",
@@ -2525,7 +2837,7 @@ class MapLibreMap(MapWidget):
             data=processed_data,
             getSourcePosition=get_source_position,
             getTargetPosition=get_target_position,
-            getColor=get_color or [51, 136, 255, 200],
+            getColor=[51, 136, 255, 200] if get_color is None else get_color,
             getWidth=get_width,
             widthMinPixels=width_min_pixels,
             pickable=pickable,
@@ -2533,13 +2845,14 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "line",
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     # -------------------------------------------------------------------------
@@ -2551,6 +2864,7 @@ class MapLibreMap(MapWidget):
         layer_type: str,
         data: Any,
         name: Optional[str] = None,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a generic deck.gl layer to the map.
@@ -2564,6 +2878,8 @@ class MapLibreMap(MapWidget):
                 'ArcLayer', 'HexagonLayer').
             data: Array of data objects or GeoJSON.
             name: Layer ID. If None, auto-generated from layer_type.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Layer-specific properties passed directly to deck.gl.
 
         Example:
@@ -2580,7 +2896,7 @@ class MapLibreMap(MapWidget):
         layer_type_clean = layer_type.replace("Layer", "")
         prefix = layer_type_clean.lower()
         layer_id = name or f"{prefix}-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addDeckGLLayer",
@@ -2590,13 +2906,14 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": layer_type,
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     def remove_deck_layer(self, layer_id: str) -> None:
@@ -2629,6 +2946,7 @@ class MapLibreMap(MapWidget):
         wireframe: bool = False,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a column layer for 3D bar chart visualization using deck.gl.
@@ -2653,6 +2971,8 @@ class MapLibreMap(MapWidget):
             wireframe: Whether to render as wireframe.
             pickable: Whether layer responds to hover/click events.
             opacity: Layer opacity (0-1).
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional ColumnLayer props.
 
         Example:
@@ -2665,15 +2985,17 @@ class MapLibreMap(MapWidget):
             >>> m.add_column_layer(data, get_elevation="value", radius=500)
         """
         layer_id = name or f"column-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addColumnLayer",
             id=layer_id,
             data=processed_data,
             getPosition=get_position,
-            getFillColor=get_fill_color or [255, 140, 0, 200],
-            getLineColor=get_line_color or [0, 0, 0, 255],
+            getFillColor=(
+                [255, 140, 0, 200] if get_fill_color is None else get_fill_color
+            ),
+            getLineColor=[0, 0, 0, 255] if get_line_color is None else get_line_color,
             getElevation=get_elevation,
             radius=radius,
             diskResolution=disk_resolution,
@@ -2688,10 +3010,7 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "column"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "column"})
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     # -------------------------------------------------------------------------
@@ -2749,10 +3068,7 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "bitmap"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "bitmap"})
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     # -------------------------------------------------------------------------
@@ -2773,6 +3089,7 @@ class MapLibreMap(MapWidget):
         elevation_scale: float = 1,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a solid polygon layer for extruded 3D polygon visualization using deck.gl.
@@ -2790,6 +3107,8 @@ class MapLibreMap(MapWidget):
             elevation_scale: Elevation multiplier.
             pickable: Whether layer responds to hover/click events.
             opacity: Layer opacity (0-1).
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional SolidPolygonLayer props.
 
         Example:
@@ -2801,15 +3120,17 @@ class MapLibreMap(MapWidget):
             >>> m.add_solid_polygon_layer(data, extruded=True, get_elevation="height")
         """
         layer_id = name or f"solidpolygon-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addSolidPolygonLayer",
             id=layer_id,
             data=processed_data,
             getPolygon=get_polygon,
-            getFillColor=get_fill_color or [51, 136, 255, 128],
-            getLineColor=get_line_color or [0, 0, 0, 255],
+            getFillColor=(
+                [51, 136, 255, 128] if get_fill_color is None else get_fill_color
+            ),
+            getLineColor=[0, 0, 0, 255] if get_line_color is None else get_line_color,
             getElevation=get_elevation,
             filled=filled,
             extruded=extruded,
@@ -2820,10 +3141,7 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "solidpolygon"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "solidpolygon"})
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     # -------------------------------------------------------------------------
@@ -2843,6 +3161,7 @@ class MapLibreMap(MapWidget):
         extruded: bool = True,
         pickable: bool = True,
         opacity: float = 0.8,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a grid cell layer for pre-aggregated grid visualization using deck.gl.
@@ -2859,6 +3178,8 @@ class MapLibreMap(MapWidget):
             extruded: Whether to extrude cells.
             pickable: Whether layer responds to hover/click events.
             opacity: Layer opacity (0-1).
+            precision: Decimal places kept in GeoJSON coordinates. Defaults to
+                the map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional GridCellLayer props.
 
         Example:
@@ -2870,14 +3191,14 @@ class MapLibreMap(MapWidget):
             >>> m.add_grid_cell_layer(data, get_elevation="value")
         """
         layer_id = name or f"gridcell-{len(self._layers)}"
-        processed_data = self._process_deck_data(data)
+        processed_data = self._process_deck_data(data, precision)
 
         self.call_js_method(
             "addGridCellLayer",
             id=layer_id,
             data=processed_data,
             getPosition=get_position,
-            getColor=get_color or [255, 140, 0, 200],
+            getColor=[255, 140, 0, 200] if get_color is None else get_color,
             getElevation=get_elevation,
             cellSize=cell_size,
             coverage=coverage,
@@ -2888,10 +3209,7 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "gridcell"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "gridcell"})
         self._add_to_layer_dict(layer_id, "Deck.gl")
 
     # -------------------------------------------------------------------------
@@ -2958,10 +3276,9 @@ class MapLibreMap(MapWidget):
             panelMaxHeight=panel_max_height,
             **kwargs,
         )
-        self._controls = {
-            **self._controls,
-            "lidar-control": {"position": position, "collapsed": collapsed},
-        }
+        self._set_state(
+            "_controls", "lidar-control", {"position": position, "collapsed": collapsed}
+        )
 
     def add_lidar_layer(
         self,
@@ -3049,14 +3366,15 @@ class MapLibreMap(MapWidget):
                 **kwargs,
             )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "lidar",
                 "source": str(source),
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "LiDAR")
 
     def remove_lidar_layer(self, layer_id: Optional[str] = None) -> None:
@@ -3066,15 +3384,13 @@ class MapLibreMap(MapWidget):
             layer_id: Layer identifier to remove. If None, removes all LiDAR layers.
         """
         if layer_id:
-            if layer_id in self._layers:
-                layers = dict(self._layers)
-                del layers[layer_id]
-                self._layers = layers
+            self._remove_state("_layers", layer_id)
             self.call_js_method("removeLidarLayer", id=layer_id)
         else:
             # Remove all lidar layers
-            layers = dict(self._layers)
-            self._layers = {k: v for k, v in layers.items() if v.get("type") != "lidar"}
+            for key, layer in list(self._layers.items()):
+                if layer.get("type") == "lidar":
+                    self._remove_state("_layers", key)
             self.call_js_method("removeLidarLayer")
 
     def set_lidar_color_scheme(self, color_scheme: str) -> None:
@@ -3153,10 +3469,11 @@ class MapLibreMap(MapWidget):
             defaultPickable=default_pickable,
             **kwargs,
         )
-        self._controls = {
-            **self._controls,
-            "pmtiles-control": {"position": position, "collapsed": collapsed},
-        }
+        self._set_state(
+            "_controls",
+            "pmtiles-control",
+            {"position": position, "collapsed": collapsed},
+        )
 
     def add_cog_control(
         self,
@@ -3209,10 +3526,9 @@ class MapLibreMap(MapWidget):
             defaultRescaleMax=default_rescale_max,
             **kwargs,
         )
-        self._controls = {
-            **self._controls,
-            "cog-control": {"position": position, "collapsed": collapsed},
-        }
+        self._set_state(
+            "_controls", "cog-control", {"position": position, "collapsed": collapsed}
+        )
 
     def add_zarr_control(
         self,
@@ -3259,10 +3575,9 @@ class MapLibreMap(MapWidget):
             defaultClim=list(default_clim) if default_clim else [0, 1],
             **kwargs,
         )
-        self._controls = {
-            **self._controls,
-            "zarr-control": {"position": position, "collapsed": collapsed},
-        }
+        self._set_state(
+            "_controls", "zarr-control", {"position": position, "collapsed": collapsed}
+        )
 
     def add_vector_control(
         self,
@@ -3312,10 +3627,11 @@ class MapLibreMap(MapWidget):
             fitBounds=fit_bounds,
             **kwargs,
         )
-        self._controls = {
-            **self._controls,
-            "vector-control": {"position": position, "collapsed": collapsed},
-        }
+        self._set_state(
+            "_controls",
+            "vector-control",
+            {"position": position, "collapsed": collapsed},
+        )
 
     def add_control_grid(
         self,
@@ -3430,10 +3746,7 @@ class MapLibreMap(MapWidget):
             control_config["excludeLayers"] = exclude_layers
         if bookmark_options is not None:
             control_config["bookmarkOptions"] = bookmark_options
-        self._controls = {
-            **self._controls,
-            "control-grid": control_config,
-        }
+        self._set_state("_controls", "control-grid", control_config)
 
     # -------------------------------------------------------------------------
     # Colorbar
@@ -3517,9 +3830,10 @@ class MapLibreMap(MapWidget):
 
         self.call_js_method("addColorbar", **js_kwargs)
 
-        self._controls = {
-            **self._controls,
-            cbar_id: {
+        self._set_state(
+            "_controls",
+            cbar_id,
+            {
                 "type": "colorbar",
                 "colormap": colormap,
                 "vmin": vmin,
@@ -3529,7 +3843,7 @@ class MapLibreMap(MapWidget):
                 "orientation": orientation,
                 "position": position,
             },
-        }
+        )
 
     def remove_colorbar(self, colorbar_id: Optional[str] = None) -> None:
         """Remove a colorbar from the map.
@@ -3542,15 +3856,11 @@ class MapLibreMap(MapWidget):
             cbar_keys = [k for k in self._controls.keys() if k.startswith("colorbar")]
             for key in cbar_keys:
                 self.call_js_method("removeColorbar", colorbarId=key)
-            self._controls = {
-                k: v for k, v in self._controls.items() if not k.startswith("colorbar")
-            }
+            for key in cbar_keys:
+                self._remove_state("_controls", key)
         else:
             self.call_js_method("removeColorbar", colorbarId=colorbar_id)
-            if colorbar_id in self._controls:
-                controls = dict(self._controls)
-                del controls[colorbar_id]
-                self._controls = controls
+            self._remove_state("_controls", colorbar_id)
 
     def update_colorbar(self, colorbar_id: Optional[str] = None, **kwargs) -> None:
         """Update an existing colorbar's properties.
@@ -3581,9 +3891,13 @@ class MapLibreMap(MapWidget):
 
         self.call_js_method("updateColorbar", **js_kwargs)
 
-        for key, value in kwargs.items():
-            if key in self._controls.get(colorbar_id, {}):
-                self._controls[colorbar_id][key] = value
+        changes = {
+            key: value
+            for key, value in kwargs.items()
+            if key in self._controls.get(colorbar_id, {})
+        }
+        if changes:
+            self._update_state("_controls", colorbar_id, changes)
 
     # -------------------------------------------------------------------------
     # Search / Geocoder Control
@@ -3629,22 +3943,20 @@ class MapLibreMap(MapWidget):
             markerColor=marker_color,
             **kwargs,
         )
-        self._controls = {
-            **self._controls,
-            "search-control": {
+        self._set_state(
+            "_controls",
+            "search-control",
+            {
                 "type": "search-control",
                 "position": position,
                 "collapsed": collapsed,
             },
-        }
+        )
 
     def remove_search_control(self) -> None:
         """Remove the search/geocoder control from the map."""
         self.call_js_method("removeSearchControl")
-        if "search-control" in self._controls:
-            controls = dict(self._controls)
-            del controls["search-control"]
-            self._controls = controls
+        self._remove_state("_controls", "search-control")
 
     # -------------------------------------------------------------------------
     # Measurement Tools
@@ -3698,22 +4010,20 @@ class MapLibreMap(MapWidget):
             fillColor=fill_color,
             **kwargs,
         )
-        self._controls = {
-            **self._controls,
-            "measure-control": {
+        self._set_state(
+            "_controls",
+            "measure-control",
+            {
                 "type": "measure-control",
                 "position": position,
                 "collapsed": collapsed,
             },
-        }
+        )
 
     def remove_measure_control(self) -> None:
         """Remove the measurement control from the map."""
         self.call_js_method("removeMeasureControl")
-        if "measure-control" in self._controls:
-            controls = dict(self._controls)
-            del controls["measure-control"]
-            self._controls = controls
+        self._remove_state("_controls", "measure-control")
 
     # -------------------------------------------------------------------------
     # Print / Export Control
@@ -3763,22 +4073,20 @@ class MapLibreMap(MapWidget):
             includeScaleBar=include_scale_bar,
             **kwargs,
         )
-        self._controls = {
-            **self._controls,
-            "print-control": {
+        self._set_state(
+            "_controls",
+            "print-control",
+            {
                 "type": "print-control",
                 "position": position,
                 "collapsed": collapsed,
             },
-        }
+        )
 
     def remove_print_control(self) -> None:
         """Remove the print/export control from the map."""
         self.call_js_method("removePrintControl")
-        if "print-control" in self._controls:
-            controls = dict(self._controls)
-            del controls["print-control"]
-            self._controls = controls
+        self._remove_state("_controls", "print-control")
 
     # -------------------------------------------------------------------------
     # GeoPhoto Control (Street-level imagery viewer)
@@ -3857,22 +4165,20 @@ class MapLibreMap(MapWidget):
             js_kwargs["preloadUrl"] = preload_url
 
         self.call_js_method("addGeoPhotoControl", **js_kwargs, **kwargs)
-        self._controls = {
-            **self._controls,
-            "geophoto-control": {
+        self._set_state(
+            "_controls",
+            "geophoto-control",
+            {
                 "type": "geophoto-control",
                 "position": position,
                 "collapsed": collapsed,
             },
-        }
+        )
 
     def remove_geophoto_control(self) -> None:
         """Remove the GeoPhoto control from the map."""
         self.call_js_method("removeGeoPhotoControl")
-        if "geophoto-control" in self._controls:
-            controls = dict(self._controls)
-            del controls["geophoto-control"]
-            self._controls = controls
+        self._remove_state("_controls", "geophoto-control")
 
     def load_geophoto_zip(self, url: str) -> None:
         """Load GeoPhoto data from a ZIP file URL.
@@ -3986,14 +4292,15 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "flatgeobuf",
                 "url": url,
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Vector")
 
     def remove_flatgeobuf(self, name: str) -> None:
@@ -4002,27 +4309,46 @@ class MapLibreMap(MapWidget):
         Args:
             name: The layer identifier to remove.
         """
-        if name in self._layers:
-            layers = dict(self._layers)
-            del layers[name]
-            self._layers = layers
+        self._remove_state("_layers", name)
         self._remove_from_layer_dict(name)
         self.call_js_method("removeFlatGeobuf", name=name)
 
-    def _process_deck_data(self, data: Any) -> Any:
+    def _process_deck_data(
+        self, data: Any, precision: Optional[int] = None, geoarrow: bool = False
+    ) -> Any:
         """Process data for deck.gl layers.
 
-        Handles GeoDataFrame, file paths, GeoJSON, and list of dicts.
+        Handles Arrow data, GeoDataFrame, file paths, GeoJSON, and list of
+        dicts.
 
         Args:
             data: Input data in various formats.
+            precision: Decimal places kept in GeoJSON coordinates. Defaults
+                to the map's ``coordinate_precision`` (6 decimal places by
+                default).
+            geoarrow: Send Arrow data and GeoParquet files as GeoArrow
+                buffers. Only layers whose renderer reads GeoArrow set
+                this; others receive GeoJSON.
 
         Returns:
-            Processed data suitable for deck.gl layers.
+            Processed data suitable for deck.gl layers. Large GeoJSON and
+            record lists are replaced by a data store reference.
         """
+        precision = self._coordinate_precision(precision)
+
+        # Handle Arrow tables and GeoParquet files
+        if is_arrow_data(data):
+            if geoarrow:
+                table = to_geoarrow(data, precision=precision)
+                # Mixed geometry types come back as GeoJSON
+                if "__geoarrow__" in table:
+                    return table
+                return self._store_data(table)
+            return self._store_data(to_geojson(data, precision=precision))
+
         # Handle GeoDataFrame
         if hasattr(data, "__geo_interface__"):
-            return data.__geo_interface__
+            return self._store_data(to_geojson(data, precision=precision))
 
         # Handle file paths
         if isinstance(data, (str, Path)):
@@ -4032,12 +4358,16 @@ class MapLibreMap(MapWidget):
                     import geopandas as gpd
 
                     gdf = gpd.read_file(path)
-                    return gdf.__geo_interface__
+                    return self._store_data(to_geojson(gdf, precision=precision))
                 except ImportError:
                     pass
 
+        # Round GeoJSON coordinates; records are sent as-is
+        if isinstance(data, dict):
+            data = quantize_geojson(data, precision)
+
         # Return as-is for lists, dicts, etc.
-        return data
+        return self._store_data(data)
 
     # -------------------------------------------------------------------------
     # Layer Management
@@ -4076,11 +4406,11 @@ class MapLibreMap(MapWidget):
             layer_config["source"] = source
         else:
             source_id = f"{layer_id}-source"
-            self._sources = {**self._sources, source_id: source}
+            self._set_state("_sources", source_id, source)
             self.call_js_method("addSource", source_id, **source)
             layer_config["source"] = source_id
 
-        self._layers = {**self._layers, layer_id: layer_config}
+        self._set_state("_layers", layer_id, layer_config)
         self.call_js_method("addLayer", beforeId=before_id, **layer_config)
         # Determine category based on layer type
         layer_type = layer_config.get("type", "")
@@ -4095,11 +4425,13 @@ class MapLibreMap(MapWidget):
         Args:
             layer_id: Layer identifier to remove
         """
-        if layer_id in self._layers:
-            layers = dict(self._layers)
-            del layers[layer_id]
-            self._layers = layers
+        self._remove_state("_layers", layer_id)
         self._remove_from_layer_dict(layer_id)
+        self._tile_sources.pop(f"{layer_id}-source", None)
+        self._streamed_files.pop(layer_id, None)
+        stop = self._streams.pop(layer_id, None)
+        if stop is not None:
+            stop.set()
         self.call_js_method("removeLayer", layer_id)
 
     def set_visibility(self, layer_id: str, visible: bool) -> None:
@@ -4316,15 +4648,16 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "image",
                 "url": url,
                 "coordinates": coordinates,
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Raster")
 
     # -------------------------------------------------------------------------
@@ -4345,10 +4678,11 @@ class MapLibreMap(MapWidget):
             **kwargs: Control-specific options
         """
         self.call_js_method("addControl", control_type, position=position, **kwargs)
-        self._controls = {
-            **self._controls,
-            control_type: {"type": control_type, "position": position, **kwargs},
-        }
+        self._set_state(
+            "_controls",
+            control_type,
+            {"type": control_type, "position": position, **kwargs},
+        )
 
     def remove_control(self, control_type: str) -> None:
         """Remove a map control.
@@ -4357,10 +4691,7 @@ class MapLibreMap(MapWidget):
             control_type: Type of control to remove
         """
         self.call_js_method("removeControl", control_type)
-        if control_type in self._controls:
-            controls = dict(self._controls)
-            del controls[control_type]
-            self._controls = controls
+        self._remove_state("_controls", control_type)
 
     def add_layer_control(
         self,
@@ -4386,14 +4717,15 @@ class MapLibreMap(MapWidget):
             position=position,
             collapsed=collapsed,
         )
-        self._controls = {
-            **self._controls,
-            "layer-control": {
+        self._set_state(
+            "_controls",
+            "layer-control",
+            {
                 "layers": layers,
                 "position": position,
                 "collapsed": collapsed,
             },
-        }
+        )
 
     def add_legend(
         self,
@@ -4469,9 +4801,10 @@ class MapLibreMap(MapWidget):
         )
 
         # Track legend control
-        self._controls = {
-            **self._controls,
-            legend_id: {
+        self._set_state(
+            "_controls",
+            legend_id,
+            {
                 "type": "legend",
                 "title": title,
                 "labels": labels,
@@ -4479,7 +4812,7 @@ class MapLibreMap(MapWidget):
                 "position": position,
                 "opacity": opacity,
             },
-        }
+        )
 
     def remove_legend(self, legend_id: Optional[str] = None) -> None:
         """Remove a legend control from the map.
@@ -4492,16 +4825,11 @@ class MapLibreMap(MapWidget):
             legend_keys = [k for k in self._controls.keys() if k.startswith("legend")]
             for key in legend_keys:
                 self.call_js_method("removeLegend", key)
-            # Rebuild controls dict without legend keys
-            self._controls = {
-                k: v for k, v in self._controls.items() if not k.startswith("legend")
-            }
+            for key in legend_keys:
+                self._remove_state("_controls", key)
         else:
             self.call_js_method("removeLegend", legend_id)
-            if legend_id in self._controls:
-                controls = dict(self._controls)
-                del controls[legend_id]
-                self._controls = controls
+            self._remove_state("_controls", legend_id)
 
     def update_legend(
         self,
@@ -4526,10 +4854,11 @@ class MapLibreMap(MapWidget):
             raise ValueError(f"Legend '{legend_id}' not found")
 
         update_params = {"id": legend_id}
+        changes: Dict[str, Any] = {}
 
         if title is not None:
             update_params["title"] = title
-            self._controls[legend_id]["title"] = title
+            changes["title"] = title
 
         if labels is not None and colors is not None:
             if len(labels) != len(colors):
@@ -4539,16 +4868,18 @@ class MapLibreMap(MapWidget):
                 {"label": label, "color": color} for label, color in zip(labels, colors)
             ]
             update_params["items"] = legend_items
-            self._controls[legend_id]["labels"] = labels
-            self._controls[legend_id]["colors"] = colors
+            changes["labels"] = labels
+            changes["colors"] = colors
 
         elif labels is not None or colors is not None:
             raise ValueError("Both labels and colors must be provided together")
 
         if opacity is not None:
             update_params["opacity"] = opacity
-            self._controls[legend_id]["opacity"] = opacity
+            changes["opacity"] = opacity
 
+        if changes:
+            self._update_state("_controls", legend_id, changes)
         update_params.update(kwargs)
         self.call_js_method("updateLegend", **update_params)
 
@@ -4600,15 +4931,16 @@ class MapLibreMap(MapWidget):
             collapsed=collapsed,
             **kwargs,
         )
-        self._controls = {
-            **self._controls,
-            "draw-control": {
+        self._set_state(
+            "_controls",
+            "draw-control",
+            {
                 "position": position,
                 "drawModes": draw_modes,
                 "editModes": edit_modes,
                 "collapsed": collapsed,
             },
-        }
+        )
 
     def get_draw_data(self) -> Dict:
         """Get the current drawn features as GeoJSON.
@@ -4767,11 +5099,15 @@ class MapLibreMap(MapWidget):
             geojson = fetch_geojson(url)
 
         # Get bounds
-        bounds = get_bounds(geojson) if fit_bounds else None
+        bounds = (
+            get_bounds(data if _is_geodataframe(data) else geojson)
+            if fit_bounds
+            else None
+        )
 
         self.call_js_method(
             "addClusterLayer",
-            data=geojson,
+            data=self._store_data(geojson),
             name=layer_id,
             clusterRadius=cluster_radius,
             clusterMaxZoom=cluster_max_zoom,
@@ -4788,14 +5124,15 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "cluster",
                 "source": f"{layer_id}-source",
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Vector")
         return layer_id
 
@@ -4827,6 +5164,7 @@ class MapLibreMap(MapWidget):
         hover: bool = True,
         layer_id: Optional[str] = None,
         fit_bounds: bool = True,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a choropleth (thematic) map layer with automatic classification.
@@ -4848,8 +5186,13 @@ class MapLibreMap(MapWidget):
             classification: Classification method:
                 - 'quantile': Equal number of features per class
                 - 'equal_interval': Equal value ranges
-                - 'natural_breaks': Jenks natural breaks (requires jenkspy)
+                - 'natural_breaks': Fisher-Jenks natural breaks
+                - 'std_mean': Classes one standard deviation wide around the mean
+                - 'head_tail': Head/tail breaks for heavy-tailed data
+                - 'geometric': Classes growing by a constant ratio
+                - 'pretty': Round-number breaks
                 - 'manual': Use custom breaks
+                'head_tail' and 'pretty' may return fewer than k classes.
             k: Number of classes (ignored if classification='manual').
             breaks: Custom break values for 'manual' classification.
                 Must have k+1 values defining class boundaries.
@@ -4861,6 +5204,8 @@ class MapLibreMap(MapWidget):
             hover: Whether to enable hover highlight effect.
             layer_id: Layer identifier. If None, auto-generated.
             fit_bounds: Whether to fit map to data bounds.
+            precision: Decimal places kept in coordinates. Defaults to the
+                map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional layer options.
 
         Example:
@@ -4884,12 +5229,13 @@ class MapLibreMap(MapWidget):
         layer_name = layer_id or f"choropleth-{len(self._layers)}"
 
         # Convert data to GeoJSON
-        geojson = to_geojson(data)
+        precision = self._coordinate_precision(precision)
+        geojson = to_geojson(data, precision=precision)
 
         # Handle URL data - fetch GeoJSON
         if geojson.get("type") == "url":
             url = geojson["url"]
-            geojson = fetch_geojson(url)
+            geojson = quantize_geojson(fetch_geojson(url), precision)
 
         # Extract values for classification
         features = geojson.get("features", [])
@@ -4910,17 +5256,21 @@ class MapLibreMap(MapWidget):
         computed_breaks = compute_breaks(values, classification, k, breaks)
 
         # Get colors
-        colors = get_choropleth_colors(cmap, k)
+        colors = get_choropleth_colors(cmap, len(computed_breaks) - 1)
 
         # Build step expression for MapLibre
         step_expr = build_step_expression(column, computed_breaks, colors)
 
         # Get bounds
-        bounds = get_bounds(geojson) if fit_bounds else None
+        bounds = (
+            get_bounds(data if _is_geodataframe(data) else geojson)
+            if fit_bounds
+            else None
+        )
 
         self.call_js_method(
             "addChoropleth",
-            data=geojson,
+            data=self._store_data(geojson),
             name=layer_name,
             column=column,
             stepExpression=step_expr,
@@ -4933,15 +5283,16 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_name: {
+        self._set_state(
+            "_layers",
+            layer_name,
+            {
                 "id": layer_name,
                 "type": "choropleth",
                 "source": f"{layer_name}-source",
                 "column": column,
             },
-        }
+        )
         self._add_to_layer_dict(layer_name, "Vector")
 
         # Add legend
@@ -5036,13 +5387,14 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_name: {
+        self._set_state(
+            "_layers",
+            layer_name,
+            {
                 "id": layer_name,
                 "type": "fill-extrusion",
             },
-        }
+        )
         self._add_to_layer_dict(layer_name, "Vector")
 
     # -------------------------------------------------------------------------
@@ -5156,13 +5508,14 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            anim_id: {
+        self._set_state(
+            "_layers",
+            anim_id,
+            {
                 "id": anim_id,
                 "type": "animation",
             },
-        }
+        )
         return anim_id
 
     def stop_animation(self, animation_id: str) -> None:
@@ -5172,10 +5525,7 @@ class MapLibreMap(MapWidget):
             animation_id: Animation identifier to stop.
         """
         self.call_js_method("stopAnimation", animation_id)
-        if animation_id in self._layers:
-            layers = dict(self._layers)
-            del layers[animation_id]
-            self._layers = layers
+        self._remove_state("_layers", animation_id)
 
     def pause_animation(self, animation_id: str) -> None:
         """Pause a running animation.
@@ -5335,10 +5685,13 @@ class MapLibreMap(MapWidget):
         geometry: Optional[Any] = None,
         layers: Optional[List[str]] = None,
         filter_expression: Optional[List] = None,
+        timeout: Optional[float] = None,
     ) -> Dict:
         """Query features currently rendered on the map.
 
-        Results are stored in the `queried_features` property.
+        Results are stored in the `queried_features` property. With a
+        ``timeout``, the query waits for the frontend and returns its own
+        result instead (see :meth:`request`).
 
         Args:
             geometry: Optional point {x, y} or bounding box [[x1, y1], [x2, y2]]
@@ -5347,14 +5700,20 @@ class MapLibreMap(MapWidget):
                 layers.
             filter_expression: Optional MapLibre filter expression to further
                 filter results.
+            timeout: Seconds to wait for the result. If None, the query
+                result arrives later in the `queried_features` property.
+                Waiting only works off the kernel's main thread, so not
+                in a notebook cell (see :meth:`request`).
 
         Returns:
-            The current queried features dict (may not yet reflect this query
-            if called immediately; use the `queried_features` property).
+            The query result when ``timeout`` is given, otherwise the current
+            queried features dict (may not yet reflect this query if called
+            immediately; use the `queried_features` property).
 
         Example:
             >>> m.query_rendered_features(layers=["states-layer"])
             >>> features = m.queried_features
+            >>> features = m.query_rendered_features(layers=["states"], timeout=5)
         """
         kwargs: Dict[str, Any] = {}
         if geometry is not None:
@@ -5364,6 +5723,8 @@ class MapLibreMap(MapWidget):
         if filter_expression is not None:
             kwargs["filter"] = filter_expression
 
+        if timeout is not None:
+            return self.request("queryRenderedFeatures", timeout=timeout, **kwargs)
         self.call_js_method("queryRenderedFeatures", **kwargs)
         return self._queried_features
 
@@ -5372,18 +5733,25 @@ class MapLibreMap(MapWidget):
         source_id: str,
         source_layer: Optional[str] = None,
         filter_expression: Optional[List] = None,
+        timeout: Optional[float] = None,
     ) -> Dict:
         """Query features from a source, including features not currently visible.
 
-        Results are stored in the `queried_features` property.
+        Results are stored in the `queried_features` property, or returned
+        directly when a ``timeout`` is given.
 
         Args:
             source_id: The source to query.
             source_layer: Optional source layer for vector tile sources.
             filter_expression: Optional MapLibre filter expression.
+            timeout: Seconds to wait for the result. If None, the query
+                result arrives later in the `queried_features` property.
+                Waiting only works off the kernel's main thread, so not
+                in a notebook cell (see :meth:`request`).
 
         Returns:
-            The current queried features dict.
+            The query result when ``timeout`` is given, otherwise the current
+            queried features dict.
 
         Example:
             >>> m.query_source_features("states-source")
@@ -5395,6 +5763,8 @@ class MapLibreMap(MapWidget):
         if filter_expression is not None:
             kwargs["filter"] = filter_expression
 
+        if timeout is not None:
+            return self.request("querySourceFeatures", timeout=timeout, **kwargs)
         self.call_js_method("querySourceFeatures", **kwargs)
         return self._queried_features
 
@@ -5459,14 +5829,15 @@ class MapLibreMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {
+        self._set_state(
+            "_layers",
+            layer_id,
+            {
                 "id": layer_id,
                 "type": "video",
                 "source": f"{layer_id}-source",
             },
-        }
+        )
         self._add_to_layer_dict(layer_id, "Raster")
 
     def remove_video_layer(self, name: str) -> None:
@@ -5475,10 +5846,7 @@ class MapLibreMap(MapWidget):
         Args:
             name: The layer identifier to remove.
         """
-        if name in self._layers:
-            layers = dict(self._layers)
-            del layers[name]
-            self._layers = layers
+        self._remove_state("_layers", name)
         self._remove_from_layer_dict(name)
         self.call_js_method("removeVideoLayer", id=name)
 
@@ -5855,6 +6223,7 @@ class MapLibreMap(MapWidget):
     def get_visible_features(
         self,
         layers: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
     ) -> Optional[Dict]:
         """Get all features currently visible in the viewport.
 
@@ -5865,10 +6234,13 @@ class MapLibreMap(MapWidget):
         because the JavaScript side has not yet responded. Run this
         method in one notebook cell, then read the result in the next
         cell (the event loop processes the response between cells).
+        With a ``timeout``, the call waits for the response instead
+        (see :meth:`request`).
 
         Args:
             layers: Optional list of layer IDs to query. If ``None``,
                 queries all visible layers.
+            timeout: Seconds to wait for the response.
 
         Returns:
             GeoJSON FeatureCollection dict if results are available from
@@ -5880,6 +6252,11 @@ class MapLibreMap(MapWidget):
             >>> # Cell 2 – read the result
             >>> m.get_visible_features()
         """
+        if timeout is not None:
+            features = self.request(
+                "getVisibleFeatures", timeout=timeout, layers=layers
+            )
+            return features["data"] if features else None
         if layers is not None:
             self.call_js_method("getVisibleFeatures", layers=layers)
         features = self._queried_features
@@ -5887,7 +6264,9 @@ class MapLibreMap(MapWidget):
             return features["data"]
         return None
 
-    def to_geojson(self, layer_id: Optional[str] = None) -> Optional[Dict]:
+    def to_geojson(
+        self, layer_id: Optional[str] = None, timeout: Optional[float] = None
+    ) -> Optional[Dict]:
         """Get layer data as GeoJSON.
 
         This triggers a query to the JavaScript side. The result is
@@ -5896,11 +6275,15 @@ class MapLibreMap(MapWidget):
         On the first call with a ``layer_id``, the query is sent and
         ``None`` is returned. Run this method in one notebook cell,
         then call ``to_geojson()`` (without arguments) in the next cell
-        to read the result.
+        to read the result. With a ``timeout``, the call waits for the
+        response instead (see :meth:`request`).
 
         Args:
             layer_id: Source/layer ID to export. If ``None``, returns
                 previously queried features.
+            timeout: Seconds to wait for the response. Requires a
+                ``layer_id``. Waiting only works off the kernel's main
+                thread, so not in a notebook cell (see :meth:`request`).
 
         Returns:
             GeoJSON FeatureCollection dict, or ``None`` if not yet
@@ -5912,6 +6295,9 @@ class MapLibreMap(MapWidget):
             >>> # Cell 2 – read the result
             >>> result = m.to_geojson()
         """
+        if layer_id and timeout is not None:
+            features = self.request("getLayerData", timeout=timeout, sourceId=layer_id)
+            return features["data"] if features else None
         if layer_id:
             self.call_js_method("getLayerData", sourceId=layer_id)
         features = self._queried_features
@@ -5919,7 +6305,9 @@ class MapLibreMap(MapWidget):
             return features["data"]
         return None
 
-    def to_geopandas(self, layer_id: Optional[str] = None) -> Any:
+    def to_geopandas(
+        self, layer_id: Optional[str] = None, timeout: Optional[float] = None
+    ) -> Any:
         """Get layer data as a GeoDataFrame.
 
         Requires geopandas to be installed. Works the same as
@@ -5929,6 +6317,7 @@ class MapLibreMap(MapWidget):
         Args:
             layer_id: Source/layer ID to export. If ``None``, returns
                 previously queried features.
+            timeout: Seconds to wait for the response.
 
         Returns:
             GeoDataFrame, or ``None`` if data not available.
@@ -5939,7 +6328,7 @@ class MapLibreMap(MapWidget):
             >>> # Cell 2 – read the result
             >>> gdf = m.to_geopandas()
         """
-        geojson = self.to_geojson(layer_id)
+        geojson = self.to_geojson(layer_id, timeout=timeout)
         if geojson is None:
             return None
         try:
@@ -6120,8 +6509,16 @@ class MapLibreMap(MapWidget):
             "sources": self._sources,
             "controls": self._controls,
             "max_pitch": self.max_pitch,
-            "js_calls": self._js_calls,
+            "js_calls": self._inline_streamed_layers(
+                self._inline_tile_layers(
+                    self._js_call_history(resolve_data=True),
+                    "addKernelTileLayer",
+                    ("sourceLayer", "maxzoom"),
+                )
+            ),
         }
 
-        template = template.replace("{{state}}", json.dumps(state, indent=2))
+        template = template.replace(
+            "{{state}}", json.dumps(state, indent=2, default=json_default)
+        )
         return template
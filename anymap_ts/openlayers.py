@@ -125,12 +125,7 @@ class OpenLayersMap(MapWidget):
             **kwargs,
         )
 
-        basemaps = self._layer_dict.get("Basemaps", [])
-        if basemap not in basemaps:
-            self._layer_dict = {
-                **self._layer_dict,
-                "Basemaps": basemaps + [basemap],
-            }
+        self._append_state("_layer_dict", "Basemaps", basemap)
 
     # -------------------------------------------------------------------------
     # Tile Layer Methods
@@ -170,10 +165,7 @@ class OpenLayersMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "tile"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "tile"})
 
     # -------------------------------------------------------------------------
     # Vector Data Methods
@@ -187,6 +179,7 @@ class OpenLayersMap(MapWidget):
         fit_bounds: bool = True,
         popup: Optional[str] = None,
         popup_properties: Optional[List[str]] = None,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add vector data to the map.
@@ -199,9 +192,12 @@ class OpenLayersMap(MapWidget):
             fit_bounds: Whether to fit map to data bounds.
             popup: HTML template for popups, with {property} placeholders.
             popup_properties: List of property names to show in popup table.
+            precision: Decimal places kept in coordinates. Defaults to the
+                map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional layer options.
         """
-        geojson = to_geojson(data)
+        precision = self._coordinate_precision(precision)
+        geojson = to_geojson(data, precision=precision)
 
         if geojson.get("type") == "url":
             self.add_geojson_from_url(
@@ -220,7 +216,7 @@ class OpenLayersMap(MapWidget):
 
         self.call_js_method(
             "addGeoJSON",
-            data=geojson,
+            data=self._store_data(geojson),
             name=layer_id,
             style=style,
             fitBounds=fit_bounds,
@@ -229,10 +225,7 @@ class OpenLayersMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "vector"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "vector"})
 
     def add_geojson(
         self,
@@ -242,6 +235,7 @@ class OpenLayersMap(MapWidget):
         fit_bounds: bool = True,
         popup: Optional[str] = None,
         popup_properties: Optional[List[str]] = None,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add GeoJSON data to the map.
@@ -253,6 +247,8 @@ class OpenLayersMap(MapWidget):
             fit_bounds: Whether to fit map to data bounds.
             popup: HTML template for popups.
             popup_properties: List of property names to show in popup.
+            precision: Decimal places kept in coordinates. Defaults to the
+                map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional layer options.
         """
         self.add_vector(
@@ -262,6 +258,7 @@ class OpenLayersMap(MapWidget):
             fit_bounds=fit_bounds,
             popup=popup,
             popup_properties=popup_properties,
+            precision=precision,
             **kwargs,
         )
 
@@ -301,10 +298,7 @@ class OpenLayersMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "vector-url"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "vector-url"})
 
     def _get_default_style(self, geojson: Dict) -> Dict:
         """Get default style based on geometry type."""
@@ -384,10 +378,7 @@ class OpenLayersMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "heatmap"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "heatmap"})
 
     # -------------------------------------------------------------------------
     # Clustering
@@ -423,7 +414,7 @@ class OpenLayersMap(MapWidget):
 
         self.call_js_method(
             "addClusterLayer",
-            data=geojson,
+            data=self._store_data(geojson),
             name=layer_id,
             distance=distance,
             minDistance=min_distance,
@@ -434,10 +425,7 @@ class OpenLayersMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "cluster"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "cluster"})
 
     def remove_cluster_layer(self, name: str) -> None:
         """Remove a cluster layer.
@@ -465,6 +453,7 @@ class OpenLayersMap(MapWidget):
         fit_bounds: bool = True,
         legend: bool = True,
         manual_breaks: Optional[List[float]] = None,
+        precision: Optional[int] = None,
         **kwargs,
     ) -> None:
         """Add a choropleth (thematic) map layer.
@@ -475,7 +464,8 @@ class OpenLayersMap(MapWidget):
             cmap: Colormap name (e.g., 'YlOrRd', 'Blues', 'viridis').
             k: Number of classes.
             classification: Classification method ('quantile', 'equal_interval',
-                'natural_breaks', 'manual').
+                'natural_breaks', 'std_mean', 'head_tail', 'geometric',
+                'pretty', 'manual'). See ``compute_breaks``.
             name: Layer name.
             stroke_color: Outline color.
             stroke_width: Outline width.
@@ -483,9 +473,12 @@ class OpenLayersMap(MapWidget):
             fit_bounds: Whether to fit map to data bounds.
             legend: Whether to show a legend.
             manual_breaks: Custom break values for 'manual' classification.
+            precision: Decimal places kept in coordinates. Defaults to the
+                map's ``coordinate_precision`` (6 decimal places by default).
             **kwargs: Additional options.
         """
-        geojson = to_geojson(data)
+        precision = self._coordinate_precision(precision)
+        geojson = to_geojson(data, precision=precision)
         layer_id = name or f"choropleth-{len(self._layers)}"
 
         features = geojson.get("features", [])
@@ -501,12 +494,12 @@ class OpenLayersMap(MapWidget):
         if not values:
             raise ValueError(f"No numeric values found for column '{column}'")
 
-        colors = get_choropleth_colors(cmap, k)
         breaks = compute_breaks(values, classification, k, manual_breaks)
+        colors = get_choropleth_colors(cmap, len(breaks) - 1)
 
         self.call_js_method(
             "addChoropleth",
-            data=geojson,
+            data=self._store_data(geojson),
             name=layer_id,
             column=column,
             breaks=breaks,
@@ -519,10 +512,7 @@ class OpenLayersMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "choropleth"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "choropleth"})
 
     # -------------------------------------------------------------------------
     # WMS/WMTS Methods
@@ -565,10 +555,7 @@ class OpenLayersMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "wms"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "wms"})
 
     def add_image_wms_layer(
         self,
@@ -607,10 +594,7 @@ class OpenLayersMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "imagewms"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "imagewms"})
 
     def add_wmts_layer(
         self,
@@ -655,10 +639,7 @@ class OpenLayersMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "wmts"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "wmts"})
 
     # -------------------------------------------------------------------------
     # Vector Tiles
@@ -698,10 +679,7 @@ class OpenLayersMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "vectortile"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "vectortile"})
 
     # -------------------------------------------------------------------------
     # Image Overlay
@@ -735,10 +713,7 @@ class OpenLayersMap(MapWidget):
             **kwargs,
         )
 
-        self._layers = {
-            **self._layers,
-            layer_id: {"id": layer_id, "type": "image"},
-        }
+        self._set_state("_layers", layer_id, {"id": layer_id, "type": "image"})
 
     # -------------------------------------------------------------------------
     # Layer Management
@@ -750,10 +725,7 @@ class OpenLayersMap(MapWidget):
         Args:
             layer_id: Layer identifier to remove.
         """
-        if layer_id in self._layers:
-            layers = dict(self._layers)
-            del layers[layer_id]
-            self._layers = layers
+        self._remove_state("_layers", layer_id)
         self.call_js_method("removeLayer", layer_id)
 
     def set_visibility(self, layer_id: str, visible: bool) -> None:
@@ -821,10 +793,11 @@ class OpenLayersMap(MapWidget):
             **kwargs: Control-specific options.
         """
         self.call_js_method("addControl", control_type, position=position, **kwargs)
-        self._controls = {
-            **self._controls,
-            control_type: {"type": control_type, "position": position, **kwargs},
-        }
+        self._set_state(
+            "_controls",
+            control_type,
+            {"type": control_type, "position": position, **kwargs},
+        )
 
     def remove_control(self, control_type: str) -> None:
         """Remove a map control.
@@ -833,10 +806,7 @@ class OpenLayersMap(MapWidget):
             control_type: Type of control to remove.
         """
         self.call_js_method("removeControl", control_type)
-        if control_type in self._controls:
-            controls = dict(self._controls)
-            del controls[control_type]
-            self._controls = controls
+        self._remove_state("_controls", control_type)
 
     def add_layer_control(self, collapsed: bool = True) -> None:
         """Add a layer visibility control panel.
@@ -1130,7 +1100,7 @@ class OpenLayersMap(MapWidget):
             "height": self.height,
             "layers": self._layers,
             "controls": self._controls,
-            "js_calls": self._js_calls,
+            "js_calls": self._js_call_history(resolve_data=True),
         }
 
         template = template.replace("{{state}}", json.dumps(state, indent=2))
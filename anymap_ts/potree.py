@@ -35,6 +35,9 @@ class PotreeViewer(MapWidget):
     # ESM module for frontend
     _esm = STATIC_DIR / "potree.js"
 
+    # The frontend reads kwargs as plain JSON
+    _packed_transport = False
+
     # Potree-specific traits
     point_budget = traitlets.Int(1000000).tag(sync=True)
     point_size = traitlets.Float(1.0).tag(sync=True)
@@ -308,7 +311,7 @@ class PotreeViewer(MapWidget):
             "camera_target": self.camera_target,
             "width": self.width,
             "height": self.height,
-            "js_calls": self._js_calls,
+            "js_calls": self._js_call_history(resolve_data=True),
         }
 
         template = template.replace("{{state}}", json.dumps(state, indent=2))
@@ -2,33 +2,197 @@
 
 from __future__ import annotations
 
+import base64
+import functools
+import importlib
+import itertools
 import json
+import math
+import os
+import sys
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
-from urllib.request import urlopen
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 from urllib.error import URLError
 
-# Check for optional dependencies
-try:
-    import geopandas as gpd
+from .http_cache import get_http_cache, http_get
+
+# Optional dependencies are imported on first use, since importing them takes
+# far longer than importing anymap_ts itself. The HAS_* flags are resolved
+# lazily by the module __getattr__ below.
+_OPTIONAL_DEPENDENCIES = {
+    "HAS_GEOPANDAS": "geopandas",
+    "HAS_SHAPELY": "shapely.geometry",
+    "HAS_MATPLOTLIB": "matplotlib",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _optional_import(name: str) -> Any:
+    """Import an optional dependency, or return None if it is not installed."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def __getattr__(name: str) -> Any:
+    """Probe optional dependencies on first access of a HAS_* flag."""
+    if name in _OPTIONAL_DEPENDENCIES:
+        return _optional_import(_OPTIONAL_DEPENDENCIES[name]) is not None
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-    HAS_GEOPANDAS = True
-except ImportError:
-    HAS_GEOPANDAS = False
 
-try:
-    import shapely.geometry
+def _is_geodataframe(data: Any) -> bool:
+    """Check for a GeoDataFrame without importing geopandas."""
+    gpd = sys.modules.get("geopandas")
+    return gpd is not None and isinstance(data, gpd.GeoDataFrame)
 
-    HAS_SHAPELY = True
-except ImportError:
-    HAS_SHAPELY = False
 
+def _json_loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON with orjson when it is installed, else the stdlib parser."""
+    orjson = _optional_import("orjson")
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# GeoJSON type of each shapely geometry type id built from coordinate arrays;
+# other types (LinearRing, GeometryCollection) are rare and mapped one by one
+_GEOJSON_GEOMETRY_TYPES = {
+    0: "Point",
+    1: "LineString",
+    3: "Polygon",
+    4: "MultiPoint",
+    5: "MultiLineString",
+    6: "MultiPolygon",
+}
+
+
+def _geometries_to_geojson(
+    geometries: Any, precision: Optional[int] = None
+) -> List[Optional[Dict[str, Any]]]:
+    """Convert an array of shapely geometries to GeoJSON geometry dicts.
+
+    Coordinates of all geometries of a type are extracted in one vectorized
+    call and split into nested lists using the ragged array offsets.
+
+    Args:
+        geometries: Array of shapely geometries (None for missing)
+        precision: Decimal places to round coordinates to. None keeps full
+            precision.
 
-def to_geojson(data: Any) -> Dict:
+    Returns:
+        GeoJSON geometries; None for missing and empty geometries, like
+        ``GeoDataFrame.to_json()``.
+    """
+    import numpy as np
+
+    shapely = importlib.import_module("shapely")
+    geometries = np.asarray(geometries, dtype=object)
+    result: List[Optional[Dict[str, Any]]] = [None] * len(geometries)
+    type_ids = shapely.get_type_id(geometries)
+    type_ids[shapely.is_empty(geometries)] = -1
+
+    has_z = shapely.has_z(geometries)
+    for (type_id, geometry_type), include_z in itertools.product(
+        _GEOJSON_GEOMETRY_TYPES.items(), (False, True)
+    ):
+        (index,) = np.nonzero((type_ids == type_id) & (has_z == include_z))
+        if not len(index):
+            continue
+        _, coords, offsets = shapely.to_ragged_array(
+            geometries[index], include_z=include_z
+        )
+        if precision is not None:
+            coords = np.round(coords, precision)
+        parts = coords.tolist()
+        for level in offsets:
+            bounds = level.tolist()
+            parts = [parts[start:end] for start, end in zip(bounds, bounds[1:])]
+        for i, coordinates in zip(index.tolist(), parts):
+            result[i] = {"type": geometry_type, "coordinates": coordinates}
+
+    (index,) = np.nonzero(
+        (type_ids >= 0) & ~np.isin(type_ids, list(_GEOJSON_GEOMETRY_TYPES))
+    )
+    for i in index.tolist():
+        geometry = _json_loads(shapely.to_geojson(geometries[i]))
+        if precision is not None:
+            geometry = quantize_geojson(geometry, precision)
+        result[i] = geometry
+    return result
+
+
+def _geodataframe_to_geojson(
+    gdf: Any, precision: Optional[int] = None
+) -> Dict[str, Any]:
+    """Convert a GeoDataFrame to a GeoJSON FeatureCollection dict.
+
+    Builds the same features as ``json.loads(gdf.to_json())`` without
+    serializing to a string and parsing it back.
+
+    Args:
+        gdf: GeoDataFrame
+        precision: Decimal places to round coordinates to. None keeps full
+            precision.
+
+    Returns:
+        GeoJSON FeatureCollection dict
+    """
+    if gdf.crs is not None and not gdf.crs.equals("EPSG:4326"):
+        # Keep the "crs" member that to_json() writes for other CRSs
+        geojson = _json_loads(gdf.to_json())
+        return geojson if precision is None else quantize_geojson(geojson, precision)
+
+    geometries = _geometries_to_geojson(gdf.geometry.values, precision)
+    ids = [str(i) for i in gdf.index]
+    rows = _geodataframe_properties(gdf)
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {"id": fid, "type": "Feature", "properties": row, "geometry": geometry}
+            for fid, row, geometry in zip(ids, rows, geometries)
+        ],
+    }
+
+
+def _geodataframe_properties(gdf: Any) -> List[Dict[str, Any]]:
+    """Get the GeoJSON properties of each row of a GeoDataFrame.
+
+    Args:
+        gdf: GeoDataFrame
+
+    Returns:
+        One dict of JSON-serializable values per row; missing values are
+        None and datetimes ISO 8601 strings.
+    """
+    pd = importlib.import_module("pandas")
+    columns = gdf.columns.drop(gdf.geometry.name)
+    if not len(columns):
+        return [{} for _ in range(len(gdf))]
+    properties = gdf[columns].to_numpy(dtype=object, copy=True)
+    for position, column in enumerate(columns):
+        if pd.api.types.is_datetime64_any_dtype(gdf[column]):
+            properties[:, position] = [
+                value.isoformat() if value is not pd.NaT else None
+                for value in gdf[column]
+            ]
+    properties[pd.isna(gdf[columns]).to_numpy()] = None
+    return [dict(zip(columns, row)) for row in properties.tolist()]
+
+
+def to_geojson(data: Any, precision: Optional[int] = None) -> Dict:
     """Convert various data formats to GeoJSON.
 
+    GeoDataFrames are converted directly from their coordinate arrays rather
+    than through ``GeoDataFrame.to_json()``.
+
     Args:
-        data: GeoJSON dict, GeoDataFrame, file path, or URL
+        data: GeoJSON dict, GeoDataFrame, Arrow table, file path, or URL
+        precision: Decimal places to round coordinates to. None keeps full
+            precision. URLs are returned as-is.
 
     Returns:
         GeoJSON dict
@@ -39,11 +203,15 @@ def to_geojson(data: Any) -> Dict:
     """
     # Already a dict (GeoJSON)
     if isinstance(data, dict):
-        return data
+        return data if precision is None else quantize_geojson(data, precision)
 
     # GeoDataFrame
-    if HAS_GEOPANDAS and isinstance(data, gpd.GeoDataFrame):
-        return json.loads(data.to_json())
+    if _is_geodataframe(data):
+        return _geodataframe_to_geojson(data, precision)
+
+    # Arrow data and GeoParquet files
+    if is_arrow_data(data):
+        return _geoarrow_to_geojson(data, precision)
 
     # File path or URL
     if isinstance(data, (str, Path)):
@@ -54,14 +222,15 @@ def to_geojson(data: Any) -> Dict:
             return {"type": "url", "url": path_str}
 
         # Read file with geopandas
-        if not HAS_GEOPANDAS:
+        gpd = _optional_import("geopandas")
+        if gpd is None:
             raise ImportError(
                 "geopandas is required to read vector files. "
                 "Install with: pip install anymap-ts[vector]"
             )
 
         gdf = gpd.read_file(path_str)
-        return json.loads(gdf.to_json())
+        return _geodataframe_to_geojson(gdf, precision)
 
     # Has __geo_interface__ (shapely geometry, etc.)
     if hasattr(data, "__geo_interface__"):
@@ -75,15 +244,147 @@ def to_geojson(data: Any) -> Dict:
             "MultiPolygon",
             "GeometryCollection",
         ):
-            return {"type": "Feature", "geometry": geo, "properties": {}}
-        return geo
+            geo = {"type": "Feature", "geometry": geo, "properties": {}}
+        return geo if precision is None else quantize_geojson(geo, precision)
 
     raise ValueError(f"Cannot convert {type(data)} to GeoJSON")
 
 
+def _require_pyogrio() -> Any:
+    """Import pyogrio, with an install hint if it is missing."""
+    pyogrio = _optional_import("pyogrio")
+    if pyogrio is None:
+        raise ImportError(
+            "pyogrio is required to stream vector files. "
+            "Install with: pip install anymap-ts[vector]"
+        )
+    return pyogrio
+
+
+def read_vector_batches(
+    path: Union[str, Path],
+    batch_size: int = 10_000,
+    columns: Optional[List[str]] = None,
+    to_crs: Optional[Any] = None,
+) -> Iterator[Any]:
+    """Read a vector file in batches of features.
+
+    The file is read one batch at a time, so reading never needs memory for
+    the whole file; batches the caller keeps stay in memory. With pyarrow,
+    the batches come from one sequential GDAL Arrow stream. Without it, each
+    batch is read with a feature offset: formats with random access
+    (GeoPackage, Shapefile, FlatGeobuf, ...) seek to it directly, others are
+    re-scanned up to it.
+
+    Args:
+        path: Path to a vector file readable by GDAL
+        batch_size: Maximum number of features per batch
+        columns: Attribute columns to read. None reads all.
+        to_crs: CRS to reproject each batch to. None keeps the file's CRS.
+
+    Yields:
+        GeoDataFrames of at most ``batch_size`` features, in file order,
+        indexed by the position of each feature in the file. A file without
+        features yields one empty GeoDataFrame.
+
+    Raises:
+        ImportError: If pyogrio is not installed
+        ValueError: If batch_size is not positive
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive")
+    pyogrio = _require_pyogrio()
+    if _optional_import("pyarrow") is not None:
+        batches = _read_arrow_batches(pyogrio, path, batch_size, columns)
+    else:
+        batches = _read_offset_batches(pyogrio, path, batch_size, columns)
+    for gdf in batches:
+        if to_crs is not None and gdf.crs is not None:
+            gdf = gdf.to_crs(to_crs)
+        yield gdf
+
+
+def _read_arrow_batches(
+    pyogrio: Any, path: Union[str, Path], batch_size: int, columns: Optional[List]
+) -> Iterator[Any]:
+    """Read a vector file in batches from a GDAL Arrow stream."""
+    gpd = importlib.import_module("geopandas")
+    offset = 0
+    with pyogrio.open_arrow(
+        str(path), columns=columns, batch_size=batch_size, use_pyarrow=True
+    ) as (meta, reader):
+        geometry = meta["geometry_name"] or "wkb_geometry"
+        for batch in reader:
+            if not batch.num_rows:
+                continue
+            names = [name for name in batch.schema.names if name != geometry]
+            frame = batch.select(names).to_pandas()
+            frame.index = range(offset, offset + batch.num_rows)
+            geometries = gpd.GeoSeries.from_wkb(
+                batch.column(geometry).to_numpy(zero_copy_only=False),
+                index=frame.index,
+                crs=meta["crs"],
+            )
+            yield gpd.GeoDataFrame(frame, geometry=geometries)
+            offset += batch.num_rows
+    if not offset:
+        yield pyogrio.read_dataframe(str(path), columns=columns, use_arrow=True)
+
+
+def _read_offset_batches(
+    pyogrio: Any, path: Union[str, Path], batch_size: int, columns: Optional[List]
+) -> Iterator[Any]:
+    """Read a vector file in batches, skipping to each batch's first feature."""
+    # -1 when the driver cannot count features without a full scan
+    count = pyogrio.read_info(str(path))["features"]
+    offset = 0
+    while True:
+        gdf = pyogrio.read_dataframe(
+            str(path),
+            columns=columns,
+            skip_features=offset,
+            max_features=batch_size,
+        )
+        if len(gdf) or not offset:
+            gdf.index = range(offset, offset + len(gdf))
+            yield gdf
+        offset += len(gdf)
+        if len(gdf) < batch_size or offset == count:
+            return
+
+
+def vector_file_bounds(path: Union[str, Path]) -> Optional[List[float]]:
+    """Get the bounds of a vector file in EPSG:4326 from its metadata.
+
+    Args:
+        path: Path to a vector file readable by GDAL
+
+    Returns:
+        [west, south, east, north] bounds, or None when the driver cannot
+        report them without reading every feature.
+    """
+    info = _require_pyogrio().read_info(str(path))
+    bounds = info.get("total_bounds")
+    if bounds is None or any(math.isnan(b) for b in bounds):
+        return None
+    if info.get("crs") and info["crs"] != "EPSG:4326":
+        pyproj = importlib.import_module("pyproj")
+        transformer = pyproj.Transformer.from_crs(
+            info["crs"], "EPSG:4326", always_xy=True
+        )
+        bounds = transformer.transform_bounds(*bounds)
+    return [float(b) for b in bounds]
+
+
 def fetch_geojson(url: str) -> Dict:
     """Fetch GeoJSON data from a URL.
 
+    Downloads go through the on-disk HTTP cache (see
+    ``anymap_ts.http_cache``), so an unchanged file is not downloaded again.
+    The cache is on by default and keeps up to 1 GB in
+    ``~/.cache/anymap-ts/http``; set ``ANYMAP_TS_CACHE_DIR`` to an empty
+    string to turn it off.
+
     Args:
         url: URL to fetch GeoJSON from
 
@@ -94,10 +395,12 @@ def fetch_geojson(url: str) -> Dict:
         ValueError: If the URL cannot be fetched or parsed
     """
     try:
-        with urlopen(url, timeout=30) as response:
-            charset = response.headers.get_content_charset() or "utf-8"
-            data = response.read().decode(charset)
-            return json.loads(data)
+        cache = get_http_cache()
+        if cache is not None:
+            return _json_loads(cache.fetch(url, timeout=30))
+        body, headers = http_get(url, timeout=30)
+        charset = headers.get_content_charset() or "utf-8"
+        return _json_loads(body.decode(charset))
     except URLError as e:
         raise ValueError(f"Failed to fetch GeoJSON from URL: {e}") from e
     except UnicodeDecodeError as e:
@@ -106,21 +409,967 @@ def fetch_geojson(url: str) -> Dict:
         raise ValueError(f"Invalid JSON at URL: {e}") from e
 
 
+def _load_vector(data: Any) -> Any:
+    """Fetch a URL or read a local vector file; return other data as-is."""
+    if isinstance(data, (str, Path)) and not is_arrow_data(data):
+        path = str(data)
+        if path.startswith(("http://", "https://")):
+            return fetch_geojson(path)
+        gpd = _optional_import("geopandas")
+        if gpd is None:
+            raise ImportError(
+                "geopandas is required to read vector files. "
+                "Install with: pip install anymap-ts[vector]"
+            )
+        return gpd.read_file(path)
+    return data
+
+
+def load_vectors(data: Sequence[Any], max_workers: Optional[int] = None) -> List[Any]:
+    """Fetch and read many vector datasets concurrently.
+
+    URLs are downloaded and parsed on a thread pool, sharing the keep-alive
+    connections of ``http_get`` and the on-disk HTTP cache, so the total
+    time approaches that of the slowest download. Local vector files are
+    read on the same pool.
+
+    Args:
+        data: GeoJSON dicts, GeoDataFrames, file paths, or URLs
+        max_workers: Number of threads. Defaults to one per item, up to 16.
+
+    Returns:
+        GeoJSON dicts for URLs and GeoDataFrames for local files, in the
+        order given. Other items, including GeoParquet paths, are returned
+        unchanged.
+
+    Raises:
+        ValueError: If a URL cannot be fetched or parsed
+    """
+    data = list(data)
+    if len(data) < 2:
+        return [_load_vector(item) for item in data]
+    workers = max_workers or min(16, len(data))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_load_vector, data))
+
+
+def zoom_precision(zoom: float) -> int:
+    """Get the decimal places of degrees that resolve a pixel at a zoom level.
+
+    Args:
+        zoom: Web map zoom level (256 px tiles)
+
+    Returns:
+        Number of decimal places, e.g. 6 (about 10 cm) at zoom 18
+    """
+    pixels_per_degree = 256 * 2**zoom / 360
+    return max(0, math.ceil(math.log10(pixels_per_degree)))
+
+
+def _round_coordinates(coordinates: Any, precision: int) -> Any:
+    """Round one GeoJSON coordinates array, leaving integer arrays as they are."""
+    import numpy as np
+
+    try:
+        array = np.asarray(coordinates)
+    except ValueError:
+        array = None
+    if array is not None and array.dtype.kind in "iu":
+        return coordinates
+    if array is not None and array.dtype.kind == "f":
+        return np.round(array, precision).tolist()
+    if isinstance(coordinates, list):
+        # Ragged, e.g. polygon rings of different lengths: round each part
+        return [_round_coordinates(part, precision) for part in coordinates]
+    return coordinates
+
+
+def _round_geometries(geometries: List[Dict], depth: int, precision: int) -> None:
+    """Round the coordinates of GeoJSON geometries of one type in place.
+
+    The coordinates of all geometries are flattened into one array, rounded
+    with a single ``np.round()`` call and split back by their offsets.
+    Integer coordinates are left unchanged.
+
+    Args:
+        geometries: GeoJSON geometry dicts of the same type
+        depth: Nesting depth of the type's coordinates array
+        precision: Decimal places to keep
+    """
+    import numpy as np
+
+    parts = [geometry["coordinates"] for geometry in geometries]
+    counts = []
+    try:
+        for _ in range(depth):
+            counts.append([len(part) for part in parts])
+            parts = list(itertools.chain.from_iterable(parts))
+        coords = np.array(parts)
+    except (TypeError, ValueError):
+        coords = None
+    if coords is not None and coords.dtype.kind in "iu":
+        return
+    if coords is None or coords.dtype.kind != "f" or coords.ndim != 2:
+        # Mixed 2D/3D or malformed coordinates: round each geometry
+        for geometry in geometries:
+            geometry["coordinates"] = _round_coordinates(
+                geometry["coordinates"], precision
+            )
+        return
+
+    parts = np.round(coords, precision).tolist()
+    for level in reversed(counts):
+        bounds = [0, *itertools.accumulate(level)]
+        parts = [parts[start:end] for start, end in zip(bounds, bounds[1:])]
+    for geometry, coordinates in zip(geometries, parts):
+        geometry["coordinates"] = coordinates
+
+
+def _copy_geojson(geojson: Dict, groups: Dict[str, List[Dict]]) -> Dict:
+    """Copy the containers of a GeoJSON object, collecting its geometries by type."""
+    kind = geojson.get("type")
+    if kind == "FeatureCollection":
+        features = [_copy_geojson(f, groups) for f in geojson.get("features", [])]
+        return {**geojson, "features": features}
+    if kind == "Feature":
+        geometry = geojson.get("geometry")
+        if geometry:
+            geometry = _copy_geojson(geometry, groups)
+        return {**geojson, "geometry": geometry}
+    if kind == "GeometryCollection":
+        geometries = [_copy_geojson(g, groups) for g in geojson.get("geometries", [])]
+        return {**geojson, "geometries": geometries}
+    if kind in _GEOJSON_COORDINATE_DEPTH and "coordinates" in geojson:
+        geometry = dict(geojson)
+        groups.setdefault(kind, []).append(geometry)
+        return geometry
+    return geojson
+
+
+def quantize_geojson(geojson: Dict, precision: int) -> Dict:
+    """Round the coordinates of a GeoJSON object.
+
+    Fewer decimal places shorten every number in the serialized payload;
+    precision beyond what a pixel can show at the map's maximum zoom only
+    costs bytes. The coordinates of all geometries of a type are rounded
+    in one vectorized call; integer coordinates are left unchanged.
+
+    Args:
+        geojson: GeoJSON FeatureCollection, Feature or geometry
+        precision: Decimal places to keep
+
+    Returns:
+        A new GeoJSON object; the input is not modified.
+    """
+    groups: Dict[str, List[Dict]] = {}
+    result = _copy_geojson(geojson, groups)
+    for geometry_type, geometries in groups.items():
+        _round_geometries(
+            geometries, _GEOJSON_COORDINATE_DEPTH[geometry_type], precision
+        )
+    return result
+
+
+def _simplify_geometries(geometries: Any, tolerance: float) -> Any:
+    """Simplify shapely geometries in parallel, keeping them valid.
+
+    ``shapely.simplify`` releases the GIL, so chunks of the array are
+    simplified on a thread pool.
+
+    Args:
+        geometries: Array of shapely geometries
+        tolerance: Simplification tolerance in coordinate units
+
+    Returns:
+        Array of simplified geometries.
+    """
+    import numpy as np
+
+    shapely = importlib.import_module("shapely")
+    workers = min(os.cpu_count() or 1, max(1, len(geometries) // 1000))
+    if workers == 1:
+        return shapely.simplify(geometries, tolerance, preserve_topology=True)
+    chunks = np.array_split(geometries, workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        simplified = executor.map(
+            lambda chunk: shapely.simplify(chunk, tolerance, preserve_topology=True),
+            chunks,
+        )
+        return np.concatenate(list(simplified))
+
+
+# Nesting depth of the coordinates array of each GeoJSON geometry type
+_GEOJSON_COORDINATE_DEPTH = {
+    "Point": 0,
+    "LineString": 1,
+    "Polygon": 2,
+    "MultiPoint": 1,
+    "MultiLineString": 2,
+    "MultiPolygon": 3,
+}
+
+
+def _geometries_from_geojson(geometries: List[Optional[Dict]]) -> Any:
+    """Build shapely geometries from GeoJSON geometry dicts.
+
+    Geometries of each type are flattened into one coordinate array and
+    built with a single ``shapely.from_ragged_array()`` call.
+
+    Args:
+        geometries: GeoJSON geometries (None for missing)
+
+    Returns:
+        Object array of shapely geometries (None for missing).
+    """
+    import numpy as np
+
+    shapely = importlib.import_module("shapely")
+    result = np.full(len(geometries), None, dtype=object)
+    groups: Dict[str, List[int]] = {}
+    for i, geometry in enumerate(geometries):
+        if geometry:
+            groups.setdefault(geometry.get("type"), []).append(i)
+
+    for geometry_type, index in groups.items():
+        depth = _GEOJSON_COORDINATE_DEPTH.get(geometry_type)
+        try:
+            if depth is None:
+                raise ValueError(geometry_type)
+            parts = [geometries[i]["coordinates"] for i in index]
+            if depth == 0:
+                result[index] = shapely.points(np.array(parts, dtype=float))
+                continue
+            counts = []
+            for _ in range(depth):
+                counts.append([len(part) for part in parts])
+                parts = list(itertools.chain.from_iterable(parts))
+            coords = np.array(parts, dtype=float)
+            offsets = tuple(
+                np.concatenate([[0], np.cumsum(c)]).astype(np.int64)
+                for c in reversed(counts)
+            )
+            result[index] = shapely.from_ragged_array(
+                shapely.GeometryType[geometry_type.upper()], coords, offsets
+            )
+        except ValueError:
+            # Mixed 2D/3D coordinates or geometry collections
+            result[index] = [shapely.geometry.shape(geometries[i]) for i in index]
+    return result
+
+
+def simplify_pyramid(
+    data: Any, zooms: Sequence[float], precision: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Build simplified versions of vector data for zoom bands.
+
+    The bands are ``[0, zooms[0])``, ``[zooms[0], zooms[1])``, and so on.
+    Each band's data is simplified with a tolerance of one pixel at the
+    band's highest zoom, so the simplification is never visible. From the
+    last zoom on, the full-resolution data is used.
+
+    Args:
+        data: GeoJSON FeatureCollection or Feature, or a GeoDataFrame
+        zooms: Zoom levels at which a more detailed version is used
+        precision: Decimal places to round simplified coordinates to
+
+    Returns:
+        One ``{"minzoom", "maxzoom", "data"}`` dict per band below
+        ``zooms[-1]``, ordered by zoom. Features whose geometry collapses,
+        and polygons smaller than a pixel, are left out.
+
+    Raises:
+        ImportError: If shapely is not installed
+    """
+    shapely = _optional_import("shapely")
+    if shapely is None:
+        raise ImportError(
+            "shapely is required to simplify vector data. "
+            "Install with: pip install anymap-ts[vector]"
+        )
+    import numpy as np
+
+    if _is_geodataframe(data):
+        geometries = np.asarray(data.geometry.values)
+        features = [
+            {"id": str(fid), "type": "Feature", "properties": properties}
+            for fid, properties in zip(data.index, _geodataframe_properties(data))
+        ]
+    else:
+        if data.get("type") == "FeatureCollection":
+            features = data.get("features", [])
+        else:
+            features = [data]
+        geometries = _geometries_from_geojson([f.get("geometry") for f in features])
+
+    levels = []
+    edges = [0.0, *sorted(zooms)]
+    # Coarser bands are simplified from the next finer one, which is cheaper
+    # and adds at most a fraction of a pixel to the error
+    for minzoom, maxzoom in reversed(list(zip(edges, edges[1:]))):
+        if maxzoom <= minzoom:
+            continue
+        tolerance = 360 / (256 * 2**maxzoom)
+        geometries = _simplify_geometries(geometries, tolerance)
+        # Topology-preserving simplification never collapses polygons, so
+        # drop the ones smaller than a pixel explicitly
+        bounds = shapely.bounds(geometries)
+        small = (bounds[:, 2] - bounds[:, 0] < tolerance) & (
+            bounds[:, 3] - bounds[:, 1] < tolerance
+        )
+        geometries = np.where(
+            small & np.isin(shapely.get_type_id(geometries), (3, 6)),
+            None,
+            geometries,
+        )
+        band = {
+            "type": "FeatureCollection",
+            "features": [
+                {**feature, "geometry": geometry}
+                for feature, geometry in zip(
+                    features, _geometries_to_geojson(geometries, precision)
+                )
+                if geometry is not None
+            ],
+        }
+        levels.append({"minzoom": minzoom, "maxzoom": maxzoom, "data": band})
+    return levels[::-1]
+
+
+# Nesting depth of the offsets of each native GeoArrow geometry encoding
+_GEOARROW_DEPTH = {
+    "point": 0,
+    "linestring": 1,
+    "polygon": 2,
+    "multipoint": 1,
+    "multilinestring": 2,
+    "multipolygon": 3,
+}
+
+# GeoJSON name of each GeoArrow geometry type
+_GEOARROW_TYPES = {
+    "point": "Point",
+    "linestring": "LineString",
+    "polygon": "Polygon",
+    "multipoint": "MultiPoint",
+    "multilinestring": "MultiLineString",
+    "multipolygon": "MultiPolygon",
+}
+
+
+def _require_pyarrow(name: str = "pyarrow") -> Any:
+    """Import a pyarrow module, with an install hint if it is missing."""
+    module = _optional_import(name)
+    if module is None:
+        raise ImportError(
+            "pyarrow is required for Arrow and GeoParquet data. "
+            "Install with: pip install anymap-ts[vector]"
+        )
+    return module
+
+
+def is_arrow_data(data: Any) -> bool:
+    """Check whether data is Arrow data or a GeoParquet file.
+
+    Args:
+        data: Data passed to a vector or deck.gl layer method
+
+    Returns:
+        True for pyarrow tables, record batches and arrays, and for local
+        ``.parquet`` and ``.geoparquet`` paths.
+    """
+    if isinstance(data, (str, Path)):
+        path = str(data)
+        return not path.startswith(("http://", "https://")) and path.lower().endswith(
+            (".parquet", ".geoparquet")
+        )
+    return type(data).__module__.split(".")[0] == "pyarrow"
+
+
+def _geoparquet_geometry_column(schema: Any) -> Tuple[str, str]:
+    """Find the geometry column of an Arrow schema and its encoding.
+
+    Args:
+        schema: pyarrow Schema
+
+    Returns:
+        The column name and its lowercase encoding: ``wkb``, ``wkt`` or a
+        native GeoArrow type such as ``polygon``.
+
+    Raises:
+        ValueError: If the schema has no geometry column
+    """
+    metadata = schema.metadata or {}
+    if b"geo" in metadata:
+        geo = json.loads(metadata[b"geo"])
+        name = geo.get("primary_column", "geometry")
+        encoding = geo.get("columns", {}).get(name, {}).get("encoding", "WKB")
+        return name, encoding.lower()
+    for field in schema:
+        extension = getattr(field.type, "extension_name", None)
+        if extension is None and field.metadata:
+            extension = field.metadata.get(b"ARROW:extension:name", b"").decode()
+        if extension and extension.startswith("geoarrow."):
+            return field.name, extension.split(".", 1)[1]
+    for name in ("geometry", "geom"):
+        if name in schema.names:
+            return name, "wkb"
+    raise ValueError("No geometry column found in the Arrow data")
+
+
+def _geoarrow_crs(schema: Any, name: str) -> Any:
+    """Get the CRS of an Arrow geometry column from its metadata.
+
+    The CRS is read from the GeoParquet ``geo`` metadata, or else from the
+    GeoArrow extension metadata of the column.
+
+    Args:
+        schema: pyarrow Schema
+        name: Name of the geometry column
+
+    Returns:
+        The CRS as PROJJSON dict or string, or None if the metadata names
+        none (longitude/latitude by the GeoParquet and GeoArrow specs).
+    """
+    metadata = schema.metadata or {}
+    if b"geo" in metadata:
+        return json.loads(metadata[b"geo"]).get("columns", {}).get(name, {}).get("crs")
+    field = schema.field(name)
+    serialize = getattr(field.type, "__arrow_ext_serialize__", None)
+    if serialize is not None:
+        extension = serialize()
+    else:
+        extension = (field.metadata or {}).get(b"ARROW:extension:metadata")
+    try:
+        return json.loads(extension).get("crs") if extension else None
+    except (ValueError, AttributeError):
+        return None
+
+
+def _coords_to_lng_lat(coords: Any, crs: Any) -> Any:
+    """Reproject ``(n, dims)`` coordinates to longitude/latitude.
+
+    Args:
+        coords: Coordinate array; dimensions beyond x and y are kept
+        crs: CRS of the coordinates in any form pyproj accepts, or None
+            for longitude/latitude
+
+    Returns:
+        The coordinates in EPSG:4326 axis order (longitude, latitude).
+
+    Raises:
+        ImportError: If the data must be reprojected and pyproj is missing
+    """
+    import numpy as np
+
+    if crs is None:
+        return coords
+    pyproj = _optional_import("pyproj")
+    if pyproj is None:
+        raise ImportError(
+            "pyproj is required to reproject Arrow data. "
+            "Install with: pip install anymap-ts[vector]"
+        )
+    crs = pyproj.CRS.from_user_input(crs)
+    if crs.equals("EPSG:4326", ignore_axis_order=True):
+        return coords
+    transformer = pyproj.Transformer.from_crs(crs, "EPSG:4326", always_xy=True)
+    x, y = transformer.transform(coords[:, 0], coords[:, 1])
+    return np.column_stack([x, y, coords[:, 2:]])
+
+
+def read_geoparquet(
+    path: Union[str, Path],
+    columns: Optional[List[str]] = None,
+    row_groups: Optional[List[int]] = None,
+) -> Any:
+    """Read a GeoParquet file into a pyarrow Table.
+
+    Only the requested columns and row groups are read from disk, so a
+    layer can be built from part of a large file.
+
+    Args:
+        path: Path to the GeoParquet file
+        columns: Columns to read. The geometry column is always read.
+            None reads all columns.
+        row_groups: Indices of the row groups to read. None reads all.
+
+    Returns:
+        pyarrow Table, with the GeoParquet metadata.
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    pq = _require_pyarrow("pyarrow.parquet")
+    parquet = pq.ParquetFile(str(path))
+    if columns is not None:
+        geometry, _ = _geoparquet_geometry_column(parquet.schema_arrow)
+        columns = list(columns) + ([geometry] if geometry not in columns else [])
+    if row_groups is not None:
+        return parquet.read_row_groups(row_groups, columns=columns)
+    return parquet.read(columns=columns)
+
+
+class _MixedGeometryTypes(ValueError):
+    """Geometries that do not fit in a single GeoArrow array."""
+
+
+def _ragged_array(geometries: Any) -> Tuple[str, Any, Tuple[Any, ...]]:
+    """Run ``shapely.to_ragged_array`` on geometries of one type.
+
+    Args:
+        geometries: Array of shapely geometries
+
+    Returns:
+        Lowercase geometry type, coordinates and offsets.
+
+    Raises:
+        _MixedGeometryTypes: If the geometries mix types (such as points and
+            polygons) or include geometry collections
+    """
+    shapely = importlib.import_module("shapely")
+    try:
+        geometry_type, coords, offsets = shapely.to_ragged_array(geometries)
+    except ValueError as e:
+        raise _MixedGeometryTypes(str(e)) from e
+    return geometry_type.name.lower(), coords, offsets
+
+
+def _parse_geometries(column: Any, encoding: str) -> Any:
+    """Parse a WKB or WKT geometry column into shapely geometries.
+
+    Args:
+        column: pyarrow Array or ChunkedArray of geometries, or the shapely
+            geometries of a GeoDataFrame for the ``"shapely"`` encoding
+        encoding: ``"wkb"``, ``"wkt"`` or ``"shapely"``
+
+    Returns:
+        Array of shapely geometries.
+    """
+    if encoding == "shapely":
+        return column
+    pa = _require_pyarrow()
+    array = column.combine_chunks() if isinstance(column, pa.ChunkedArray) else column
+    if isinstance(array.type, pa.ExtensionType):
+        array = array.storage
+    shapely = _optional_import("shapely")
+    if shapely is None:
+        raise ImportError(
+            f"shapely is required to read {encoding.upper()} geometries. "
+            "Install with: pip install anymap-ts[vector]"
+        )
+    values = array.to_numpy(zero_copy_only=False)
+    return shapely.from_wkt(values) if encoding == "wkt" else shapely.from_wkb(values)
+
+
+def _geoarrow_ragged(column: Any, encoding: str) -> Tuple[str, Any, Tuple[Any, ...]]:
+    """Get the coordinates and offsets of an Arrow geometry column.
+
+    Native GeoArrow columns are read without copying their layout; WKB and
+    WKT are parsed with shapely.
+
+    Args:
+        column: pyarrow Array or ChunkedArray of geometries, or the shapely
+            geometries of a GeoDataFrame
+        encoding: Encoding returned by ``_geoparquet_geometry_column``, or
+            ``"shapely"``
+
+    Returns:
+        Lowercase geometry type, ``(n, dims)`` coordinates, and offsets from
+        the innermost level out, as from ``shapely.to_ragged_array``.
+
+    Raises:
+        _MixedGeometryTypes: If a WKB, WKT or shapely column mixes geometry
+            types
+    """
+    import numpy as np
+
+    if encoding not in _GEOARROW_DEPTH:
+        return _ragged_array(_parse_geometries(column, encoding))
+
+    pa = _require_pyarrow()
+    array = column.combine_chunks() if isinstance(column, pa.ChunkedArray) else column
+    if isinstance(array.type, pa.ExtensionType):
+        array = array.storage
+    offsets = []
+    for _ in range(_GEOARROW_DEPTH[encoding]):
+        level = array.offsets.to_numpy()
+        offsets.append(level - level[0])
+        array = array.flatten()
+    if pa.types.is_struct(array.type):
+        # Separated layout: one array per dimension
+        coords = np.column_stack(
+            [child.to_numpy(zero_copy_only=False) for child in array.flatten()]
+        )
+    else:
+        size = array.type.list_size
+        coords = array.flatten().to_numpy(zero_copy_only=False).reshape(-1, size)
+    return encoding, coords, tuple(reversed(offsets))
+
+
+def _read_geoarrow_columns(
+    data: Any,
+    columns: Optional[List[str]] = None,
+    row_groups: Optional[List[int]] = None,
+) -> Tuple[Any, str, Any, Dict[str, Any]]:
+    """Read the geometry column and the property columns of Arrow data.
+
+    Args:
+        data: pyarrow Table, RecordBatch or GeoArrow array, path to a
+            GeoParquet file, or GeoDataFrame
+        columns: Columns to read from a GeoParquet file
+        row_groups: Row groups to read from a GeoParquet file
+
+    Returns:
+        The geometry column, its encoding (``"shapely"`` for a
+        GeoDataFrame), its CRS (None for longitude/latitude) and the
+        property columns: NumPy arrays for numbers, JSON-serializable lists
+        for everything else.
+
+    Raises:
+        ImportError: If pyarrow is missing
+    """
+    if _is_geodataframe(data):
+        if data.crs is not None and not data.crs.equals("EPSG:4326"):
+            data = data.to_crs(epsg=4326)
+        rows = None
+        properties: Dict[str, Any] = {}
+        for name in data.columns.drop(data.geometry.name):
+            values = data[name].to_numpy()
+            if values.dtype.kind in "iuf":
+                properties[name] = values
+            else:
+                rows = rows or _geodataframe_properties(data)
+                properties[name] = [row[name] for row in rows]
+        return data.geometry.values, "shapely", None, properties
+
+    pa = _require_pyarrow()
+    if isinstance(data, (str, Path)):
+        data = read_geoparquet(data, columns=columns, row_groups=row_groups)
+    elif isinstance(data, pa.RecordBatch):
+        data = pa.Table.from_batches([data])
+    elif not isinstance(data, pa.Table):
+        data = pa.table({"geometry": data})
+    name, encoding = _geoparquet_geometry_column(data.schema)
+    properties = {}
+    for column_name, column in zip(data.column_names, data.columns):
+        if column_name == name:
+            continue
+        if pa.types.is_integer(column.type) or pa.types.is_floating(column.type):
+            properties[column_name] = column.to_numpy()
+        elif pa.types.is_temporal(column.type):
+            properties[column_name] = column.cast(pa.string()).to_pylist()
+        else:
+            properties[column_name] = column.to_pylist()
+    return data.column(name), encoding, _geoarrow_crs(data.schema, name), properties
+
+
+def _read_geoarrow(
+    data: Any,
+    columns: Optional[List[str]] = None,
+    row_groups: Optional[List[int]] = None,
+) -> Tuple[str, Any, Tuple[Any, ...], Dict[str, Any]]:
+    """Read the geometry and property columns of Arrow data.
+
+    Args:
+        data: pyarrow Table, RecordBatch or GeoArrow array, path to a
+            GeoParquet file, or GeoDataFrame
+        columns: Columns to read from a GeoParquet file
+        row_groups: Row groups to read from a GeoParquet file
+
+    Returns:
+        Lowercase geometry type, ``(n, dims)`` longitude/latitude
+        coordinates, offsets from the innermost level out, and the property
+        columns: NumPy arrays for numbers, JSON-serializable lists for
+        everything else.
+
+    Raises:
+        ImportError: If pyarrow, or pyproj for projected data, is missing
+        _MixedGeometryTypes: If the data mixes geometry types
+    """
+    column, encoding, crs, properties = _read_geoarrow_columns(
+        data, columns, row_groups
+    )
+    geometry_type, coords, offsets = _geoarrow_ragged(column, encoding)
+    return geometry_type, _coords_to_lng_lat(coords, crs), offsets, properties
+
+
+def _read_geoarrow_shapes(
+    data: Any,
+    columns: Optional[List[str]] = None,
+    row_groups: Optional[List[int]] = None,
+) -> Tuple[Any, Dict[str, Any]]:
+    """Read the geometries of Arrow data as shapely objects.
+
+    Unlike ``_read_geoarrow``, this also reads data that mixes geometry
+    types.
+
+    Args:
+        data: As for ``_read_geoarrow``
+        columns: Columns to read from a GeoParquet file
+        row_groups: Row groups to read from a GeoParquet file
+
+    Returns:
+        Array of shapely geometries in longitude/latitude, and the property
+        columns as returned by ``_read_geoarrow``.
+    """
+    import numpy as np
+
+    shapely = importlib.import_module("shapely")
+    column, encoding, crs, properties = _read_geoarrow_columns(
+        data, columns, row_groups
+    )
+    if encoding in _GEOARROW_DEPTH:
+        geometry_type, coords, offsets = _geoarrow_ragged(column, encoding)
+        geometries = shapely.from_ragged_array(
+            shapely.GeometryType[geometry_type.upper()],
+            _coords_to_lng_lat(coords, crs),
+            offsets or None,
+        )
+        return geometries, properties
+
+    geometries = np.array(_parse_geometries(column, encoding), dtype=object)
+    if crs is not None:
+        has_z = shapely.has_z(geometries)
+        for include_z in (False, True):
+            (index,) = np.nonzero(has_z == include_z)
+            if not len(index):
+                continue
+            coords = shapely.get_coordinates(geometries[index], include_z=include_z)
+            geometries[index] = shapely.set_coordinates(
+                geometries[index], _coords_to_lng_lat(coords, crs)
+            )
+    return geometries, properties
+
+
+def to_geoarrow(
+    data: Any,
+    precision: Optional[int] = None,
+    columns: Optional[List[str]] = None,
+    row_groups: Optional[List[int]] = None,
+) -> Dict[str, Any]:
+    """Convert Arrow data to GeoArrow buffers for the browser.
+
+    Coordinates and offsets keep the GeoArrow memory layout. They are sent
+    as binary widget buffers, and the browser builds layer data from the
+    typed arrays without a GeoJSON or JSON parsing step. Numeric properties
+    are sent the same way.
+
+    Args:
+        data: pyarrow Table, RecordBatch or GeoArrow array, path to a
+            GeoParquet file, or GeoDataFrame
+        precision: Decimal places to round coordinates to. None keeps full
+            precision.
+        columns: Columns to read from a GeoParquet file
+        row_groups: Row groups to read from a GeoParquet file
+
+    Returns:
+        Dict with the geometry type, ``coords`` and ``offsets`` binary arrays
+        (offsets from the innermost level out), the property columns and the
+        ``bounds`` of the data. Data that mixes geometry types, which one
+        GeoArrow array cannot hold, is returned as a GeoJSON
+        FeatureCollection instead.
+
+    Raises:
+        ImportError: If pyarrow (or shapely, for WKB geometries) is missing
+        ValueError: If the data has no geometry column
+    """
+    import numpy as np
+
+    try:
+        geometry_type, coords, offsets, properties = _read_geoarrow(
+            data, columns, row_groups
+        )
+    except _MixedGeometryTypes:
+        return _geoarrow_to_geojson(data, precision, columns, row_groups)
+    if precision is not None:
+        coords = np.round(coords, precision)
+    valid = coords[~np.isnan(coords).any(axis=1)]
+    bounds = (
+        [
+            float(valid[:, 0].min()),
+            float(valid[:, 1].min()),
+            float(valid[:, 0].max()),
+            float(valid[:, 1].max()),
+        ]
+        if len(valid)
+        else None
+    )
+    return {
+        "__geoarrow__": geometry_type,
+        "length": len(offsets[-1]) - 1 if offsets else len(coords),
+        "dims": coords.shape[1],
+        "coords": to_binary_array(coords, "float64"),
+        "offsets": {
+            str(level): to_binary_array(values, "int32")
+            for level, values in enumerate(offsets)
+        },
+        "properties": {
+            name: to_binary_array(values) if hasattr(values, "dtype") else values
+            for name, values in properties.items()
+        },
+        "bounds": bounds,
+    }
+
+
+def _geoarrow_table(table: Dict[str, Any]) -> Tuple[str, Any, Tuple[Any, ...], Dict]:
+    """Decode the buffers of a ``to_geoarrow`` dict.
+
+    Args:
+        table: Dict returned by ``to_geoarrow``
+
+    Returns:
+        The geometry type, coordinates, offsets and property columns, as
+        returned by ``_read_geoarrow``.
+    """
+    import numpy as np
+
+    def decode(value: Dict[str, Any]) -> Any:
+        return np.frombuffer(value["buffer"], dtype=value["dtype"]).reshape(
+            value["shape"]
+        )
+
+    offsets = tuple(
+        decode(table["offsets"][level]) for level in sorted(table["offsets"], key=int)
+    )
+    properties = {
+        name: decode(values) if isinstance(values, dict) else values
+        for name, values in table["properties"].items()
+    }
+    return table["__geoarrow__"], decode(table["coords"]), offsets, properties
+
+
+def _geoarrow_rows(properties: Dict[str, Any], length: int) -> List[Dict[str, Any]]:
+    """Turn property columns into one JSON-serializable dict per row."""
+    import numpy as np
+
+    columns = {}
+    for name, values in properties.items():
+        if not hasattr(values, "dtype"):
+            columns[name] = list(values)
+        elif values.dtype.kind == "f":
+            columns[name] = np.where(np.isnan(values), None, values).tolist()
+        else:
+            columns[name] = values.tolist()
+    return [dict(zip(columns, row)) for row in zip(*columns.values())] or [
+        {} for _ in range(length)
+    ]
+
+
+def _geoarrow_geometries(
+    data: Any,
+    columns: Optional[List[str]] = None,
+    row_groups: Optional[List[int]] = None,
+) -> Tuple[Any, List[Dict[str, Any]]]:
+    """Build shapely geometries and property rows from Arrow data.
+
+    Args:
+        data: Arrow data or GeoParquet path as for ``_read_geoarrow``, or a
+            ``to_geoarrow`` dict
+        columns: Columns to read from a GeoParquet file
+        row_groups: Row groups to read from a GeoParquet file
+
+    Returns:
+        Array of shapely geometries and the properties of each.
+    """
+    shapely = _optional_import("shapely")
+    if shapely is None:
+        raise ImportError(
+            "shapely is required to convert Arrow data to GeoJSON. "
+            "Install with: pip install anymap-ts[vector]"
+        )
+    if isinstance(data, dict) and "__geoarrow__" in data:
+        geometry_type, coords, offsets, properties = _geoarrow_table(data)
+        geometries = shapely.from_ragged_array(
+            shapely.GeometryType[geometry_type.upper()], coords, offsets or None
+        )
+    else:
+        geometries, properties = _read_geoarrow_shapes(data, columns, row_groups)
+    return geometries, _geoarrow_rows(properties, len(geometries))
+
+
+def _geoarrow_to_geojson(
+    data: Any,
+    precision: Optional[int] = None,
+    columns: Optional[List[str]] = None,
+    row_groups: Optional[List[int]] = None,
+) -> Dict:
+    """Convert Arrow data or a GeoParquet file to a GeoJSON FeatureCollection.
+
+    Args:
+        data: pyarrow Table, RecordBatch or GeoArrow array, path to a
+            GeoParquet file, GeoDataFrame, or ``to_geoarrow`` dict
+        precision: Decimal places to round coordinates to
+        columns: Columns to read from a GeoParquet file
+        row_groups: Row groups to read from a GeoParquet file
+
+    Returns:
+        GeoJSON FeatureCollection dict
+    """
+    geometries, rows = _geoarrow_geometries(data, columns, row_groups)
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {"id": str(i), "type": "Feature", "properties": row, "geometry": geometry}
+            for i, (row, geometry) in enumerate(
+                zip(rows, _geometries_to_geojson(geometries, precision))
+            )
+        ],
+    }
+
+
+def _geoarrow_to_records(table: Dict[str, Any], key: str) -> List[Dict[str, Any]]:
+    """Convert a ``to_geoarrow`` dict to deck.gl row objects.
+
+    Builds the rows the frontend builds from GeoArrow buffers, for
+    consumers that cannot decode them (HTML export): one row per single
+    geometry, with multi-geometries exploded and empty ones left out.
+
+    Args:
+        table: Dict returned by ``to_geoarrow``
+        key: Row key of the geometry's GeoJSON coordinates, e.g.
+            ``"coordinates"``, ``"path"`` or ``"polygon"``
+
+    Returns:
+        List of property dicts, each with the coordinates under ``key``.
+    """
+    shapely = importlib.import_module("shapely")
+    geometries, rows = _geoarrow_geometries(table)
+    parts, index = shapely.get_parts(geometries, return_index=True)
+    return [
+        {**rows[i], key: geometry["coordinates"]}
+        for i, geometry in zip(index.tolist(), _geometries_to_geojson(parts))
+        if geometry is not None
+    ]
+
+
 def get_bounds(data: Any) -> Optional[List[float]]:
-    """Calculate bounds from GeoJSON or GeoDataFrame.
+    """Calculate bounds from GeoJSON, GeoArrow buffers or GeoDataFrame.
+
+    Prefer passing a GeoDataFrame over the GeoJSON made from it: its
+    bounds are read from the geometry array without building geometries.
 
     Args:
-        data: GeoJSON dict or GeoDataFrame
+        data: GeoJSON dict, ``to_geoarrow`` dict, or GeoDataFrame
 
     Returns:
         [west, south, east, north] bounds or None
     """
-    if HAS_GEOPANDAS and isinstance(data, gpd.GeoDataFrame):
+    if _is_geodataframe(data):
         bounds = data.total_bounds
-        return [bounds[0], bounds[1], bounds[2], bounds[3]]
+        if data.crs is not None and not data.crs.equals("EPSG:4326"):
+            from pyproj import Transformer
+
+            bounds = Transformer.from_crs(
+                data.crs, "EPSG:4326", always_xy=True
+            ).transform_bounds(*bounds)
+        return [float(b) for b in bounds]
+
+    # GeoArrow buffers carry their bounds
+    if isinstance(data, dict) and "__geoarrow__" in data:
+        return data["bounds"]
 
     if isinstance(data, dict):
-        if HAS_SHAPELY:
+        if _optional_import("shapely.geometry") is not None:
             return _get_geojson_bounds_shapely(data)
         return _get_geojson_bounds_simple(data)
 
@@ -129,23 +1378,18 @@ def get_bounds(data: Any) -> Optional[List[float]]:
 
 def _get_geojson_bounds_shapely(geojson: Dict) -> Optional[List[float]]:
     """Get bounds using shapely."""
+    import numpy as np
+
+    shapely = importlib.import_module("shapely")
     try:
         features = geojson.get("features", [geojson])
-        if not features:
-            return None
-
-        geometries = []
-        for f in features:
-            geom = f.get("geometry") if "geometry" in f else f
-            if geom:
-                geometries.append(shapely.geometry.shape(geom))
-
-        if not geometries:
+        geometries = _geometries_from_geojson(
+            [f.get("geometry") if "geometry" in f else f for f in features]
+        )
+        bounds = shapely.total_bounds(geometries)
+        if np.isnan(bounds).any():
             return None
-
-        collection = shapely.geometry.GeometryCollection(geometries)
-        bounds = collection.bounds
-        return list(bounds)  # (minx, miny, maxx, maxy)
+        return [float(b) for b in bounds]
     except Exception:
         return None
 
@@ -195,14 +1439,16 @@ def infer_layer_type(geojson: Dict) -> str:
     """Infer MapLibre layer type from GeoJSON geometry.
 
     Args:
-        geojson: GeoJSON dict
+        geojson: GeoJSON dict or ``to_geoarrow`` dict
 
     Returns:
         Layer type ('circle', 'line', 'fill')
     """
     geometry_type = None
 
-    if geojson.get("type") == "FeatureCollection":
+    if "__geoarrow__" in geojson:
+        geometry_type = _GEOARROW_TYPES.get(geojson["__geoarrow__"])
+    elif geojson.get("type") == "FeatureCollection":
         features = geojson.get("features", [])
         if features:
             geometry_type = features[0].get("geometry", {}).get("type")
@@ -270,15 +1516,6 @@ def get_default_paint(layer_type: str) -> Dict[str, Any]:
 # Choropleth Utilities
 # -------------------------------------------------------------------------
 
-# Check for matplotlib
-try:
-    import matplotlib.pyplot as plt
-
-    HAS_MATPLOTLIB = True
-except ImportError:
-    HAS_MATPLOTLIB = False
-    plt = None  # type: ignore
-
 # Fallback colormaps when matplotlib is not available
 _FALLBACK_COLORMAPS = {
     "viridis": ["#440154", "#31688e", "#26838f", "#6cce5a", "#fde725"],
@@ -329,10 +1566,11 @@ def get_choropleth_colors(cmap: str, k: int) -> List[str]:
         >>> colors
         ['#440154', '#3b528b', '#21918c', '#5ec962', '#fde725']
     """
-    if HAS_MATPLOTLIB:
+    matplotlib = _optional_import("matplotlib")
+    if matplotlib is not None:
         try:
             # Get the colormap from matplotlib
-            colormap = plt.get_cmap(cmap)
+            colormap = matplotlib.colormaps[cmap]
 
             # Sample k colors evenly from the colormap
             colors = []
@@ -344,7 +1582,7 @@ def get_choropleth_colors(cmap: str, k: int) -> List[str]:
 
             return colors
 
-        except ValueError:
+        except KeyError:
             raise ValueError(
                 f"Unknown colormap '{cmap}'. See matplotlib colormap documentation "
                 "for available options: https://matplotlib.org/stable/gallery/color/colormap_reference.html"
@@ -375,27 +1613,131 @@ def get_choropleth_colors(cmap: str, k: int) -> List[str]:
             return colors[:k]
 
 
+# Classification methods accepted by compute_breaks
+_CLASSIFICATIONS = (
+    "quantile",
+    "equal_interval",
+    "natural_breaks",
+    "std_mean",
+    "head_tail",
+    "geometric",
+    "pretty",
+    "manual",
+)
+
+
+def _fisher_jenks(values: Any, k: int) -> List[float]:
+    """Exact Fisher-Jenks natural breaks of sorted values.
+
+    Dynamic programming over the optimal partitions of every prefix. The
+    within-class sums of squares come from cumulative sums and are computed
+    in blocks of rows, each block shared by all the class counts.
+
+    Args:
+        values: Sorted 1-D float array
+        k: Number of classes, at most ``len(values)``
+
+    Returns:
+        k+1 breaks: the minimum, then the maximum of each class.
+    """
+    import numpy as np
+
+    n = len(values)
+    # Centering keeps the sums of squares from cancelling out
+    x = values - values.mean()
+    s1 = np.concatenate(([0.0], np.cumsum(x)))
+    s2 = np.concatenate(([0.0], np.cumsum(x * x)))
+    ends = np.arange(n)
+
+    # cost[c, i]: least sum of squares of values[:i + 1] in c + 1 classes,
+    # start[c, i]: index of the first value of the last of those classes
+    cost = np.full((k, n), np.inf)
+    cost[0] = s2[1:] - s1[1:] ** 2 / (ends + 1)
+    start = np.zeros((k, n), dtype=np.intp)
+    rows = max(1, (1 << 20) // n)
+    for a in range(0, n, rows):
+        i = ends[a : a + rows, None]
+        m = ends[None, 1 : a + rows]
+        # Sum of squares of values[m:i + 1] for every last class start m
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ssd = s2[i + 1] - s2[m] - (s1[i + 1] - s1[m]) ** 2 / (i + 1 - m)
+        ssd[m > i] = np.inf
+        picked = np.arange(len(i))
+        for c in range(1, k):
+            total = cost[c - 1, m - 1] + ssd
+            best = np.argmin(total, axis=1)
+            cost[c, a : a + rows] = total[picked, best]
+            start[c, a : a + rows] = best + 1
+
+    breaks = [float(values[-1])]
+    end = n - 1
+    for c in range(k - 1, 0, -1):
+        end = start[c, end] - 1
+        breaks.append(float(values[end]))
+    breaks.append(float(values[0]))
+    return breaks[::-1]
+
+
+def _pretty_breaks(low: float, high: float, k: int) -> List[float]:
+    """Round-number breaks covering [low, high] in at most k classes.
+
+    The step is the smallest of 1, 2, 2.5 or 5 times a power of ten that
+    needs no more than k classes.
+    """
+    import numpy as np
+
+    if high == low:
+        return [low, high]
+    magnitude = 10 ** math.floor(math.log10((high - low) / k))
+    for factor in (1, 2, 2.5, 5, 10, 20):
+        step = factor * magnitude
+        first = math.floor(low / step)
+        last = math.ceil(high / step)
+        if last - first <= k:
+            break
+    return [float(b) for b in np.arange(first, last + 1) * step]
+
+
 def compute_breaks(
-    values: List[float],
+    values: Any,
     classification: str,
     k: int,
     manual_breaks: Optional[List[float]] = None,
+    sample_size: int = 1000,
 ) -> List[float]:
     """Compute classification breaks for choropleth maps.
 
+    Breaks are computed with NumPy, so millions of values classify in
+    milliseconds.
+
     Args:
-        values: List of numeric values to classify.
-        classification: Classification method ('quantile', 'equal_interval',
-            'natural_breaks', 'manual').
+        values: Numeric values to classify (list, NumPy array, or Series).
+            NaN values are ignored.
+        classification: Classification method:
+            - 'quantile': Equal number of features per class
+            - 'equal_interval': Equal value ranges
+            - 'natural_breaks': Fisher-Jenks natural breaks
+            - 'std_mean': Classes one standard deviation wide, centered on
+              the mean; may return fewer than k classes for skewed data
+            - 'head_tail': Head/tail breaks for heavy-tailed data; may
+              return fewer than k classes
+            - 'geometric': Classes growing by a constant ratio (positive
+              values only)
+            - 'pretty': Round-number breaks; may return fewer than k classes
+            - 'manual': Use custom breaks
         k: Number of classes.
         manual_breaks: Custom break values for 'manual' classification.
+        sample_size: Natural breaks are exact up to this many values, and
+            computed on an evenly spaced sample of the sorted values above it.
 
     Returns:
-        List of break values (k+1 values defining class boundaries).
+        List of break values (one more than the number of classes).
 
     Raises:
         ValueError: If classification method is invalid or breaks are incorrect.
     """
+    import numpy as np
+
     if classification == "manual":
         if manual_breaks is None:
             raise ValueError("manual_breaks required for 'manual' classification")
@@ -403,43 +1745,77 @@ def compute_breaks(
             raise ValueError(f"manual_breaks must have {k + 1} values for {k} classes")
         return manual_breaks
 
-    sorted_values = sorted(values)
-    min_val = sorted_values[0]
-    max_val = sorted_values[-1]
+    if classification not in _CLASSIFICATIONS:
+        raise ValueError(
+            f"Unknown classification method '{classification}'. "
+            f"Options: {', '.join(repr(c) for c in _CLASSIFICATIONS)}"
+        )
+
+    values = np.asarray(values, dtype=float).ravel()
+    nan = np.isnan(values)
+    if nan.any():
+        values = values[~nan]
+    if not len(values):
+        raise ValueError("No values to classify")
+    min_val = float(values.min())
+    max_val = float(values.max())
 
     if classification == "quantile":
         # Equal number of features per class
-        breaks = [min_val]
-        for i in range(1, k):
-            idx = int(len(sorted_values) * i / k)
-            breaks.append(sorted_values[idx])
-        breaks.append(max_val)
-        return breaks
+        # (a full sort beats np.partition with several kth values)
+        indices = [len(values) * i // k for i in range(1, k)]
+        inner = np.sort(values)[indices]
+        return [min_val, *(float(b) for b in inner), max_val]
 
     elif classification == "equal_interval":
         # Equal value ranges
         interval = (max_val - min_val) / k
-        breaks = [min_val + i * interval for i in range(k + 1)]
-        return breaks
+        return [min_val + i * interval for i in range(k + 1)]
 
     elif classification == "natural_breaks":
-        # Jenks natural breaks - requires jenkspy
-        try:
-            import jenkspy
-
-            breaks = jenkspy.jenks_breaks(values, n_classes=k)
-            return breaks
-        except ImportError:
-            raise ImportError(
-                "jenkspy is required for natural_breaks classification. "
-                "Install with: pip install jenkspy"
+        values = np.sort(values)
+        if len(values) > sample_size:
+            # Evenly spaced order statistics keep both ends of the data
+            values = values[np.linspace(0, len(values) - 1, sample_size).astype(int)]
+        if len(values) < k:
+            raise ValueError(
+                f"natural_breaks needs at least {k} values for {k} classes"
             )
+        return _fisher_jenks(values, k)
+
+    elif classification == "std_mean":
+        mean = float(values.mean())
+        std = float(values.std())
+        inner = mean + std * (np.arange(1, k) - k / 2)
+        # Breaks past either end of skewed data would repeat min or max, and
+        # step expressions need strictly increasing inputs
+        inner = inner[(inner > min_val) & (inner < max_val)]
+        return [min_val, *(float(b) for b in inner), max_val]
+
+    elif classification == "head_tail":
+        # Split at the mean while the head is a small minority of the data
+        breaks = [min_val]
+        data = values
+        while len(breaks) < k:
+            mean = float(data.mean())
+            head = data[data > mean]
+            if not len(head):
+                break
+            breaks.append(mean)
+            if len(head) < 2 or len(head) / len(data) >= 0.4:
+                break
+            data = head
+        breaks.append(max_val)
+        return breaks
 
-    else:
-        raise ValueError(
-            f"Unknown classification method '{classification}'. "
-            "Options: 'quantile', 'equal_interval', 'natural_breaks', 'manual'"
-        )
+    elif classification == "geometric":
+        if min_val <= 0:
+            raise ValueError("geometric classification needs positive values")
+        breaks = [float(b) for b in np.geomspace(min_val, max_val, k + 1)]
+        breaks[0], breaks[-1] = min_val, max_val
+        return breaks
+
+    return _pretty_breaks(min_val, max_val, k)
 
 
 def build_step_expression(column: str, breaks: List[float], colors: List[str]) -> List:
@@ -468,3 +1844,527 @@ def build_step_expression(column: str, breaks: List[float], colors: List[str]) -
         expr.append(colors[-1])
 
     return expr
+
+
+# -------------------------------------------------------------------------
+# Binary Array Utilities
+# -------------------------------------------------------------------------
+
+# NumPy dtypes that map directly onto JavaScript typed arrays
+_TYPED_ARRAY_DTYPES = {
+    "int8",
+    "uint8",
+    "int16",
+    "uint16",
+    "int32",
+    "uint32",
+    "float32",
+    "float64",
+}
+
+# Accessors whose float64 values are kept at full precision (deck.gl splits
+# 64-bit positions into high/low parts on the GPU)
+_FP64_ACCESSORS = ("Position", "Path", "Polygon")
+
+
+def to_binary_array(values: Any, dtype: Optional[str] = None) -> Dict[str, Any]:
+    """Encode a NumPy array for binary transfer to the browser.
+
+    The array bytes are sent as a widget buffer (no JSON encoding) and
+    decoded into a JavaScript typed array on the frontend.
+
+    Args:
+        values: NumPy array or array-like.
+        dtype: Optional target dtype. Types without a JavaScript typed
+            array equivalent (int64, bool, ...) are converted automatically.
+
+    Returns:
+        Dict with ``dtype``, ``shape`` and a ``buffer`` memoryview.
+    """
+    import numpy as np
+
+    array = np.asarray(values)
+    if dtype is None:
+        dtype = array.dtype.name
+        if dtype not in _TYPED_ARRAY_DTYPES:
+            if array.dtype.kind == "b":
+                dtype = "uint8"
+            elif (
+                array.dtype.kind in "iu"
+                and array.size
+                and (
+                    array.min() >= np.iinfo(np.int32).min
+                    and array.max() <= np.iinfo(np.int32).max
+                )
+            ):
+                dtype = "int32"
+            else:
+                dtype = "float64"
+    array = np.ascontiguousarray(array, dtype=dtype)
+    return {
+        "__ndarray__": True,
+        "dtype": dtype,
+        "shape": list(array.shape),
+        "buffer": memoryview(array).cast("B"),
+    }
+
+
+def _attribute_array(key: str, array: Any) -> Dict[str, Any]:
+    """Encode one deck.gl binary attribute."""
+    import numpy as np
+
+    array = np.asarray(array)
+    dtype = None
+    if array.dtype.kind == "f" and not key.endswith(_FP64_ACCESSORS):
+        dtype = "float32"
+    elif "Color" in key and array.dtype.kind in "iub":
+        dtype = "uint8"
+    size = 1 if array.ndim == 1 else int(np.prod(array.shape[1:]))
+    return {"value": to_binary_array(array.reshape(-1), dtype=dtype), "size": size}
+
+
+def pack_binary_attributes(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Move NumPy accessor values into a deck.gl binary data table.
+
+    Accessor kwargs (``getPosition``, ``getFillColor``, ...) given as NumPy
+    arrays, or as column names of a ``data`` dict of arrays / DataFrame,
+    become ``data.attributes`` entries that deck.gl reads directly on the
+    GPU. Lists of arrays (one per path or trip) are concatenated and share
+    ``data.startIndices``.
+
+    Args:
+        kwargs: Keyword arguments of a JS method call.
+
+    Returns:
+        The kwargs, with binary attributes packed into ``data`` when any
+        accessor is array-valued.
+
+    Raises:
+        ValueError: If array accessors disagree on the number of objects.
+    """
+    np = sys.modules.get("numpy")
+    if np is None:
+        # No NumPy loaded means no value can be an ndarray
+        return kwargs
+
+    data = kwargs.get("data")
+    columns = data if isinstance(data, dict) or hasattr(data, "columns") else None
+
+    arrays: Dict[str, Any] = {}
+    for key, value in kwargs.items():
+        if not key.startswith("get"):
+            continue
+        if isinstance(value, np.ndarray) and value.ndim >= 1:
+            arrays[key] = value
+        elif (
+            isinstance(value, (list, tuple))
+            and value
+            and all(isinstance(v, np.ndarray) for v in value)
+        ):
+            arrays[key] = list(value)
+        elif (
+            isinstance(value, str)
+            and columns is not None
+            and value in columns
+            and isinstance(columns[value], np.ndarray)
+        ):
+            arrays[key] = columns[value]
+        elif (
+            isinstance(value, str)
+            and columns is not None
+            and hasattr(columns, "columns")
+            and value in columns.columns
+        ):
+            arrays[key] = columns[value].to_numpy()
+
+    if not arrays:
+        return kwargs
+
+    length = None
+    offsets = None
+    attributes: Dict[str, Any] = {}
+    for key, array in arrays.items():
+        if isinstance(array, list):
+            counts = np.array([len(a) for a in array])
+            key_offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+            if offsets is not None and not np.array_equal(offsets, key_offsets):
+                raise ValueError(f"Vertex counts of '{key}' do not match other paths")
+            offsets = key_offsets
+            n = len(array)
+            array = np.concatenate(array)
+        else:
+            n = len(array)
+        if length is not None and n != length:
+            raise ValueError(
+                f"Accessor '{key}' has {n} values, expected {length} to match "
+                "the other array accessors"
+            )
+        length = n
+        attributes[key] = _attribute_array(key, array)
+
+    table: Dict[str, Any] = {"length": length, "attributes": attributes}
+    if offsets is not None:
+        table["startIndices"] = to_binary_array(offsets, dtype="uint32")
+
+    packed = {k: v for k, v in kwargs.items() if k not in arrays}
+    packed["data"] = table
+    return packed
+
+
+def split_buffers(
+    message: Any, path: Optional[List[Any]] = None
+) -> Tuple[Any, List[List[Any]], List[memoryview]]:
+    """Take the binary values out of a comm message.
+
+    ``bytes``, ``bytearray`` and ``memoryview`` values nested in dicts and
+    lists are removed from a copy of the message and returned separately,
+    with their paths, in the form the widget comm sends them. Containers
+    without binary values are shared with the input, not copied.
+
+    Args:
+        message: JSON-like message content
+        path: Path of ``message`` within the outer message
+
+    Returns:
+        The message without its binary values, the path of each removed
+        value, and the values themselves.
+    """
+    path = path or []
+    buffer_paths: List[List[Any]] = []
+    buffers: List[memoryview] = []
+    if isinstance(message, dict):
+        items = message.items()
+    elif isinstance(message, (list, tuple)):
+        items = enumerate(message)
+    else:
+        return message, buffer_paths, buffers
+
+    result: Any = None
+    for key, value in items:
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            buffer_paths.append([*path, key])
+            buffers.append(memoryview(value))
+            replaced: Any = _BUFFER
+        else:
+            replaced, paths, values = split_buffers(value, [*path, key])
+            if not paths:
+                continue
+            buffer_paths.extend(paths)
+            buffers.extend(values)
+        if result is None:
+            result = dict(message) if isinstance(message, dict) else list(message)
+        if replaced is not _BUFFER:
+            result[key] = replaced
+        elif isinstance(result, dict):
+            del result[key]
+        else:
+            result[key] = None
+    return (message if result is None else result), buffer_paths, buffers
+
+
+# Placeholder for a binary value taken out by split_buffers
+_BUFFER = object()
+
+
+# Keys probed for marker coordinates, in order
+_LNG_KEYS = ("lng", "lon", "longitude", "x")
+_LAT_KEYS = ("lat", "latitude", "y")
+
+
+def _row_values(rows: List[Dict], keys: Sequence[str]) -> List[Any]:
+    """Get the first of ``keys`` found in each row, or None.
+
+    The key found in the first row is tried first, so uniform rows are
+    read with one lookup each.
+    """
+    first = next((k for k in keys if k in rows[0]), keys[0])
+
+    def probe(row: Dict) -> Any:
+        return next((row[k] for k in keys if k in row), None)
+
+    return [row[first] if first in row else probe(row) for row in rows]
+
+
+def marker_columns(
+    data: Any,
+    lng_column: Optional[str] = None,
+    lat_column: Optional[str] = None,
+    popup_column: Optional[str] = None,
+    tooltip_column: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Extract marker positions and labels as parallel arrays.
+
+    GeoDataFrame coordinates are read from the geometry array and DataFrame
+    columns are cast in bulk, without building a dict per marker. Rows
+    without a valid point are dropped.
+
+    Args:
+        data: GeoDataFrame with Point geometries, DataFrame, GeoJSON
+            FeatureCollection with Point features, or list of dicts
+        lng_column: Longitude column; 'lng', 'lon', 'longitude' or 'x'
+            if None or missing
+        lat_column: Latitude column; 'lat', 'latitude' or 'y' if None or
+            missing
+        popup_column: Column with popup content
+        tooltip_column: Column with tooltip content
+
+    Returns:
+        Dict with ``lngLat``, an (n, 2) float64 array, and ``popup`` and
+        ``tooltip`` lists of strings (None for missing values), or None
+        when the column is not given or not found.
+    """
+    import numpy as np
+
+    lng_keys = (lng_column, *_LNG_KEYS) if lng_column else _LNG_KEYS
+    lat_keys = (lat_column, *_LAT_KEYS) if lat_column else _LAT_KEYS
+    labels: Dict[str, Any] = {"popup": None, "tooltip": None}
+
+    if _is_geodataframe(data):
+        shapely = importlib.import_module("shapely")
+        geometry = np.asarray(data.geometry.values)
+        points = shapely.get_type_id(geometry) == 0
+        lng_lat = np.column_stack(
+            [shapely.get_x(geometry[points]), shapely.get_y(geometry[points])]
+        )
+        for key, column in (("popup", popup_column), ("tooltip", tooltip_column)):
+            if column and column in data.columns:
+                labels[key] = data[column].to_numpy()[points]
+    elif hasattr(data, "columns") and hasattr(data, "to_numpy"):
+        # pandas DataFrame
+        lng = next((k for k in lng_keys if k in data.columns), None)
+        lat = next((k for k in lat_keys if k in data.columns), None)
+        if lng is None or lat is None:
+            lng_lat = np.empty((0, 2))
+        else:
+            lng_lat = data[[lng, lat]].to_numpy(dtype=float)
+        for key, column in (("popup", popup_column), ("tooltip", tooltip_column)):
+            if column and column in data.columns:
+                labels[key] = data[column].to_numpy()
+    elif isinstance(data, dict) and data.get("type") == "FeatureCollection":
+        coords = []
+        props = []
+        for feature in data.get("features", []):
+            geom = feature.get("geometry") or {}
+            position = geom.get("coordinates") or []
+            if geom.get("type") == "Point" and len(position) >= 2:
+                coords.append(position[:2])
+                props.append(feature.get("properties") or {})
+        lng_lat = np.array(coords, dtype=float).reshape(-1, 2)
+        for key, column in (("popup", popup_column), ("tooltip", tooltip_column)):
+            if column and any(column in p for p in props):
+                labels[key] = [p.get(column) for p in props]
+    elif isinstance(data, list):
+        rows = [item for item in data if isinstance(item, dict)]
+        if rows:
+            lng_lat = np.column_stack(
+                [
+                    np.array(_row_values(rows, lng_keys), dtype=float),
+                    np.array(_row_values(rows, lat_keys), dtype=float),
+                ]
+            )
+        else:
+            lng_lat = np.empty((0, 2))
+        for key, column in (("popup", popup_column), ("tooltip", tooltip_column)):
+            if column and any(column in row for row in rows):
+                labels[key] = [row.get(column) for row in rows]
+    else:
+        lng_lat = np.empty((0, 2))
+
+    valid = ~np.isnan(lng_lat).any(axis=1)
+    result: Dict[str, Any] = {"lngLat": lng_lat[valid]}
+    for key, values in labels.items():
+        if values is None:
+            result[key] = None
+            continue
+        # One bulk str() cast; None stays None
+        values = np.asarray(values, dtype=object)[valid]
+        strings = values.astype(str).astype(object)
+        strings[np.equal(values, None)] = None
+        result[key] = strings.tolist()
+    return result
+
+
+def cluster_hierarchy(
+    lng_lat: Any,
+    radius: float = 60,
+    min_zoom: int = 0,
+    max_zoom: int = 16,
+) -> Dict[str, Any]:
+    """Precompute marker clusters for every zoom level.
+
+    Points are merged bottom-up: at each zoom from ``max_zoom`` down to
+    ``min_zoom``, the clusters of the zoom above are grouped on a grid of
+    ``radius`` screen pixels and each group becomes a cluster at its
+    weighted center. The result is a tree, so a cluster never splits
+    when zooming out.
+
+    Args:
+        lng_lat: (n, 2) array of longitudes and latitudes
+        radius: Cluster radius in pixels, for 256-pixel tiles
+        min_zoom: Lowest zoom level clusters are computed for
+        max_zoom: Highest zoom level points are clustered at; above it
+            every point is shown on its own
+
+    Returns:
+        Dict of arrays. ``solo`` is, for each point, the lowest zoom at
+        which it is shown on its own. The clusters of more than one point
+        are stored by zoom level, from ``min_zoom`` up: those of zoom ``z``
+        are ``offsets[z - min_zoom]`` to ``offsets[z - min_zoom + 1]`` in
+        ``lngLat`` (interleaved), ``counts`` (number of points) and
+        ``expand`` (zoom at which the cluster splits).
+    """
+    import numpy as np
+
+    lng_lat = np.asarray(lng_lat, dtype=float).reshape(-1, 2)
+    n = len(lng_lat)
+    # Web Mercator, scaled to the unit square
+    lat = np.clip(lng_lat[:, 1], -85.0511287798066, 85.0511287798066)
+    x = lng_lat[:, 0] / 360 + 0.5
+    sin = np.sin(np.radians(lat))
+    y = 0.5 - np.log((1 + sin) / (1 - sin)) / (4 * np.pi)
+
+    counts = np.ones(n)
+    expand = np.full(n, max_zoom + 1, dtype=np.uint8)
+    cluster = np.arange(n)  # cluster of each point at the current zoom
+    solo = np.full(n, max_zoom + 1, dtype=np.uint8)
+    alone = np.ones(n, dtype=bool)
+    levels = []
+
+    for z in range(max_zoom, min_zoom - 1, -1):
+        cell = radius / (256 * 2**z)
+        cells = np.floor(x / cell) * np.ceil(1 / cell + 1) + np.floor(y / cell)
+        _, parent = np.unique(cells, return_inverse=True)
+        parent = parent.reshape(-1)
+        size = parent.max() + 1 if len(parent) else 0
+        weights = np.bincount(parent, weights=counts, minlength=size)
+        x = np.bincount(parent, weights=x * counts, minlength=size) / weights
+        y = np.bincount(parent, weights=y * counts, minlength=size) / weights
+
+        # A cluster with a single child splits where that child does
+        children = np.bincount(parent, minlength=size)
+        only_child = np.zeros(size, dtype=np.intp)
+        only_child[parent] = np.arange(len(parent))
+        expand = np.where(children > 1, z + 1, expand[only_child]).astype(np.uint8)
+        counts = weights
+
+        cluster = parent[cluster]
+        alone &= counts[cluster] == 1
+        solo[alone] = z
+
+        multi = counts > 1
+        levels.append((x[multi], y[multi], counts[multi], expand[multi]))
+
+    levels.reverse()
+    x = np.concatenate([level[0] for level in levels])
+    y = np.concatenate([level[1] for level in levels])
+    lng = (x - 0.5) * 360
+    lat = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * y))))
+    return {
+        "solo": solo,
+        "offsets": np.concatenate([[0], np.cumsum([len(l[0]) for l in levels])]),
+        "lngLat": np.column_stack([lng, lat]).reshape(-1),
+        "counts": np.concatenate([level[2] for level in levels]),
+        "expand": np.concatenate([level[3] for level in levels]),
+        "minZoom": min_zoom,
+        "maxZoom": max_zoom,
+    }
+
+
+def json_default(obj: Any) -> Any:
+    """JSON fallback for binary payloads in exported HTML.
+
+    Buffers are written as base64 strings, which the HTML templates decode
+    back into typed arrays.
+
+    Args:
+        obj: Object the default JSON encoder cannot handle.
+
+    Returns:
+        A JSON-serializable replacement.
+
+    Raises:
+        TypeError: If the object is not a supported binary type.
+    """
+    if isinstance(obj, (memoryview, bytes, bytearray)):
+        return base64.b64encode(bytes(obj)).decode("ascii")
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# -------------------------------------------------------------------------
+# Payload Compression Utilities
+# -------------------------------------------------------------------------
+
+# zlib level for call payloads: low levels are several times faster than the
+# default and lose little ratio on coordinate-heavy JSON
+_COMPRESSION_LEVEL = 3
+
+
+def encode_payload(data: Any) -> bytes:
+    """Serialize a payload to compact JSON bytes.
+
+    Args:
+        data: JSON-serializable payload.
+
+    Returns:
+        UTF-8 encoded JSON.
+
+    Raises:
+        TypeError: If the payload is not JSON-serializable.
+        ValueError: If the payload contains NaN or infinite floats, which
+            the browser's JSON parser rejects.
+    """
+    return json.dumps(data, separators=(",", ":"), allow_nan=False).encode()
+
+
+def compress_payload(encoded: bytes) -> Dict[str, Any]:
+    """Compress a JSON-encoded payload for transfer to the browser.
+
+    The frontend inflates the buffer with ``DecompressionStream("deflate")``
+    and parses the JSON before running the call that uses it.
+
+    Args:
+        encoded: Payload as returned by :func:`encode_payload`.
+
+    Returns:
+        A ``{"__compressed__": "deflate", "buffer": memoryview}`` marker.
+    """
+    return {
+        "__compressed__": "deflate",
+        "buffer": memoryview(zlib.compress(encoded, _COMPRESSION_LEVEL)),
+    }
+
+
+def wrap_payload(encoded: bytes) -> Dict[str, Any]:
+    """Wrap a JSON-encoded payload for transfer to the browser as is.
+
+    The encoding travels as a binary buffer, so the comm does not serialize
+    the payload again; the frontend parses the JSON.
+
+    Args:
+        encoded: Payload as returned by :func:`encode_payload`.
+
+    Returns:
+        A ``{"__compressed__": "identity", "buffer": memoryview}`` marker.
+    """
+    return {"__compressed__": "identity", "buffer": memoryview(encoded)}
+
+
+def is_compressed(value: Any) -> bool:
+    """Check whether a value is a compressed payload marker."""
+    return isinstance(value, dict) and "__compressed__" in value
+
+
+def decompress_payload(value: Dict[str, Any]) -> Any:
+    """Restore a payload from :func:`compress_payload` or :func:`wrap_payload`.
+
+    Args:
+        value: Compressed payload marker.
+
+    Returns:
+        The decoded payload.
+    """
+    if value["__compressed__"] == "identity":
+        return _json_loads(bytes(value["buffer"]))
+    return _json_loads(zlib.decompress(value["buffer"]))
@@ -3,13 +3,81 @@
  * Handles anywidget model communication and state management.
  */
 
-import type { MapWidgetModel, JsCall, JsEvent } from '../types/anywidget';
+import type {
+  MapWidgetModel,
+  JsCall,
+  JsEvent,
+  EventOptions,
+  StatePatchOp,
+} from '../types/anywidget';
+import { applyStatePatch } from './StateManager';
+import {
+  decodeBinaryArrays,
+  inflateValues,
+  isCompressed,
+  putBuffers,
+} from '../utils/binary';
 
 /**
  * Method handler function type.
  */
 export type MethodHandler = (args: unknown[], kwargs: Record<string, unknown>) => void;
 
+/**
+ * Query handler function type. Returns the result sent back to Python.
+ */
+export type QueryHandler = (args: unknown[], kwargs: Record<string, unknown>) => unknown;
+
+/**
+ * Custom message sent from Python over the widget comm.
+ */
+export interface CustomMessage {
+  type?: string;
+  calls?: JsCall[];
+  buffer_paths?: (string | number)[][];
+  id?: number;
+  method?: string;
+  args?: unknown[];
+  kwargs?: Record<string, unknown>;
+  blobs?: Record<string, unknown>;
+  digests?: string[];
+  ops?: StatePatchOp[];
+  data?: unknown;
+  error?: string;
+  view?: string;
+}
+
+/**
+ * Reference to a payload in Python's content-addressed data store.
+ */
+interface BlobRef {
+  __blob__: string;
+}
+
+function isBlobRef(value: unknown): value is BlobRef {
+  return (
+    typeof value === 'object' &&
+    value !== null &&
+    typeof (value as Record<string, unknown>).__blob__ === 'string'
+  );
+}
+
+/**
+ * Data store references in a kwarg value: the value itself, or values of the
+ * objects in an array (e.g. the data of each zoom level of a layer).
+ */
+function blobRefsIn(value: unknown): BlobRef[] {
+  if (isBlobRef(value)) return [value];
+  if (!Array.isArray(value)) return [];
+  const refs: BlobRef[] = [];
+  for (const item of value) {
+    if (typeof item === 'object' && item !== null && !Array.isArray(item)) {
+      refs.push(...Object.values(item).filter(isBlobRef));
+    }
+  }
+  return refs;
+}
+
 /**
  * Abstract base class for map renderers.
  */
@@ -23,8 +91,43 @@ export abstract class BaseMapRenderer<TMap> {
   protected eventQueue: JsEvent[] = [];
   protected isMapReady: boolean = false;
   protected methodHandlers: Map<string, MethodHandler> = new Map();
+  protected queryHandlers: Map<string, QueryHandler> = new Map();
+  protected pendingRequests: CustomMessage[] = [];
   protected modelListeners: Array<() => void> = [];
 
+  // History replay for views created after Python trimmed acknowledged calls
+  protected static readonly REPLAY_TIMEOUT_MS = 1000;
+  protected awaitingReplay: boolean = false;
+  protected firstSeenCallId: number = Infinity;
+  private replayTimer: number | null = null;
+  // The replayed history rebuilds every layer, making restoreState redundant
+  protected snapshotReplayed: boolean = false;
+  private restoreDeferred: boolean = false;
+
+  // Payloads fetched from Python's data store, keyed by digest. Calls that
+  // reference a missing payload wait in pendingCalls until it arrives.
+  protected blobs: Map<string, unknown> = new Map();
+  protected awaitingBlobs: boolean = false;
+  private blobTimer: number | null = null;
+
+  // Compressed payloads are inflated asynchronously; calls after them wait
+  protected awaitingInflate: boolean = false;
+
+  // Nesting depth of call batches currently being applied
+  protected batchDepth: number = 0;
+
+  // When Python listens for perf_stats: arrival time of each call not yet
+  // applied (performance.now()), keyed by call id
+  protected callReceivedAt: Map<number, number> = new Map();
+
+  // Event delivery: events are numbered per view and stay in eventQueue
+  // until Python acknowledges them through _js_events_ack
+  protected readonly viewId: string = Math.random().toString(36).slice(2);
+  protected eventSeq: number = 0;
+  private eventTimers: Map<string, number> = new Map();
+  private heldEvents: Map<string, JsEvent[]> = new Map();
+  private lastEventSent: Map<string, number> = new Map();
+
   constructor(model: MapWidgetModel, el: HTMLElement) {
     this.model = model;
     this.el = el;
@@ -94,26 +197,272 @@ export abstract class BaseMapRenderer<TMap> {
     const onCenterChange = () => this.onCenterChange();
     const onZoomChange = () => this.onZoomChange();
     const onStyleChange = () => this.onStyleChange();
+    const onCustomMessage = (msg: CustomMessage, buffers?: (DataView | ArrayBuffer)[]) =>
+      this.onCustomMessage(msg, buffers);
+    const onEventsAck = () => this.onEventsAck();
 
     this.model.on('change:_js_calls', onJsCallsChange);
     this.model.on('change:center', onCenterChange);
     this.model.on('change:zoom', onZoomChange);
     this.model.on('change:style', onStyleChange);
+    this.model.on('msg:custom', onCustomMessage);
+    this.model.on('change:_js_events_ack', onEventsAck);
 
     this.modelListeners.push(
       () => this.model.off('change:_js_calls', onJsCallsChange),
       () => this.model.off('change:center', onCenterChange),
       () => this.model.off('change:zoom', onZoomChange),
-      () => this.model.off('change:style', onStyleChange)
+      () => this.model.off('change:style', onStyleChange),
+      () => this.model.off('msg:custom', onCustomMessage),
+      () => this.model.off('change:_js_events_ack', onEventsAck)
+    );
+
+    this.requestReplay();
+  }
+
+  /**
+   * Ask Python for the call history when acknowledged calls were already
+   * trimmed from _js_calls (e.g. the widget is displayed in a new cell).
+   */
+  protected requestReplay(): void {
+    const ack = this.model.get('_js_calls_ack') || 0;
+    if (ack <= 0 || this.lastProcessedCallId > 0 || this.awaitingReplay) return;
+
+    this.awaitingReplay = true;
+    this.model.send({ type: 'replay_request' });
+    // Without a kernel (e.g. static HTML) nobody answers; render what we have.
+    this.replayTimer = window.setTimeout(
+      () => this.finishReplay([]),
+      BaseMapRenderer.REPLAY_TIMEOUT_MS
     );
   }
 
+  /**
+   * Handle custom messages from Python.
+   */
+  protected onCustomMessage(msg: CustomMessage, buffers?: (DataView | ArrayBuffer)[]): void {
+    if (msg?.buffer_paths && buffers) {
+      putBuffers(msg as Record<string, unknown>, msg.buffer_paths, buffers);
+    }
+    if (msg?.type === 'replay') {
+      this.finishReplay(msg.calls || []);
+    } else if (msg?.type === 'request') {
+      this.handleRequest(msg);
+    } else if (msg?.type === 'blobs') {
+      this.receiveBlobs(msg.blobs || {});
+    } else if (msg?.type === 'evict') {
+      for (const digest of msg.digests || []) {
+        this.blobs.delete(digest);
+      }
+    } else if (msg?.type === 'state_patch') {
+      this.applyStatePatch(msg.ops || []);
+    }
+  }
+
+  /**
+   * Apply state changes sent by Python to the model's dict traits.
+   */
+  protected applyStatePatch(ops: StatePatchOp[]): void {
+    for (const op of ops) {
+      let state = this.model.get(op.trait) as Record<string, unknown> | null;
+      if (!state) {
+        state = {};
+        this.model.set(op.trait, state);
+      }
+      applyStatePatch(state, [op]);
+    }
+  }
+
+  /**
+   * Digests referenced by the calls that this view has not fetched yet.
+   */
+  protected missingBlobs(calls: JsCall[]): string[] {
+    const missing = new Set<string>();
+    for (const call of calls) {
+      for (const value of Object.values(call.kwargs || {})) {
+        for (const ref of blobRefsIn(value)) {
+          if (!this.blobs.has(ref.__blob__)) {
+            missing.add(ref.__blob__);
+          }
+        }
+      }
+    }
+    return [...missing];
+  }
+
+  /**
+   * Store payloads sent by Python and run the calls waiting for them.
+   */
+  protected receiveBlobs(blobs: Record<string, unknown>): void {
+    if (this.blobTimer !== null) {
+      window.clearTimeout(this.blobTimer);
+      this.blobTimer = null;
+    }
+    if (Object.values(blobs).some(isCompressed)) {
+      inflateValues(blobs).then(inflated => this.receiveBlobs(inflated));
+      return;
+    }
+    for (const [digest, data] of Object.entries(blobs)) {
+      if (data === null || data === undefined) {
+        console.error(`Data ${digest} is no longer available`);
+      }
+      this.blobs.set(digest, data ?? null);
+    }
+    if (!this.awaitingBlobs) return;
+    this.awaitingBlobs = false;
+
+    // Without a kernel nobody answers; run the calls without their data
+    for (const digest of this.missingBlobs(this.pendingCalls)) {
+      this.blobs.set(digest, null);
+    }
+    if (this.isMapReady) {
+      this.processPendingCalls();
+    }
+  }
+
+  /**
+   * Replace data store references in kwargs with the fetched payloads.
+   */
+  protected resolveBlobs(kwargs: Record<string, unknown>): Record<string, unknown> {
+    let resolved: Record<string, unknown> | null = null;
+    const resolve = (value: unknown) =>
+      isBlobRef(value) ? this.blobs.get(value.__blob__) : value;
+    for (const [key, value] of Object.entries(kwargs)) {
+      if (isBlobRef(value)) {
+        resolved = resolved || { ...kwargs };
+        resolved[key] = resolve(value);
+      } else if (blobRefsIn(value).length > 0) {
+        resolved = resolved || { ...kwargs };
+        resolved[key] = (value as unknown[]).map(item =>
+          typeof item === 'object' && item !== null && !Array.isArray(item)
+            ? Object.fromEntries(
+                Object.entries(item).map(([k, v]) => [k, resolve(v)])
+              )
+            : item
+        );
+      }
+    }
+    return resolved || kwargs;
+  }
+
+  /**
+   * Whether calls must wait for a replay or for their payloads.
+   */
+  protected isDeferringCalls(): boolean {
+    return this.awaitingReplay || this.awaitingBlobs || this.awaitingInflate;
+  }
+
+  /**
+   * Run calls, first fetching payloads they reference that this view lacks
+   * and inflating compressed kwargs.
+   */
+  protected runCalls(calls: JsCall[]): void {
+    const missing = this.missingBlobs(calls);
+    if (missing.length > 0) {
+      this.pendingCalls = [...calls, ...this.pendingCalls];
+      this.awaitingBlobs = true;
+      this.model.send({ type: 'blob_request', digests: missing });
+      this.blobTimer = window.setTimeout(
+        () => this.receiveBlobs({}),
+        BaseMapRenderer.REPLAY_TIMEOUT_MS
+      );
+      return;
+    }
+    const compressed = calls.filter(call =>
+      Object.values(call.kwargs || {}).some(isCompressed)
+    );
+    if (compressed.length > 0) {
+      this.pendingCalls = [...calls, ...this.pendingCalls];
+      this.awaitingInflate = true;
+      this.inflateCalls(compressed).then(() => {
+        this.awaitingInflate = false;
+        if (this.isMapReady) {
+          this.processPendingCalls();
+        }
+      });
+      return;
+    }
+    this.executeBatch(calls);
+  }
+
+  /**
+   * Replace pending calls with copies whose compressed kwargs are inflated.
+   */
+  protected async inflateCalls(calls: JsCall[]): Promise<void> {
+    const inflated = new Map<JsCall, JsCall>();
+    await Promise.all(
+      calls.map(async call => {
+        inflated.set(call, { ...call, kwargs: await inflateValues(call.kwargs) });
+      })
+    );
+    this.pendingCalls = this.pendingCalls.map(call => inflated.get(call) ?? call);
+  }
+
+  /**
+   * Answer a request from Python with a response carrying the same id.
+   * Requests wait until the calls queued before them have been applied.
+   */
+  protected async handleRequest(msg: CustomMessage): Promise<void> {
+    if (!this.isMapReady || this.isDeferringCalls()) {
+      this.pendingRequests.push(msg);
+      return;
+    }
+
+    const method = msg.method || '';
+    const handler = this.queryHandlers.get(method);
+    try {
+      if (!handler) {
+        throw new Error(`Unknown query: ${method}`);
+      }
+      const result = await handler(msg.args || [], decodeBinaryArrays(msg.kwargs || {}));
+      this.model.send({ type: 'response', id: msg.id, result: result ?? null });
+    } catch (error) {
+      this.model.send({ type: 'response', id: msg.id, error: String(error) });
+    }
+  }
+
+  /**
+   * Queue replayed history calls ahead of the calls received since.
+   */
+  protected finishReplay(calls: JsCall[]): void {
+    if (!this.awaitingReplay) return;
+    this.awaitingReplay = false;
+    if (this.replayTimer !== null) {
+      window.clearTimeout(this.replayTimer);
+      this.replayTimer = null;
+    }
+
+    this.snapshotReplayed = calls.length > 0;
+    if (this.restoreDeferred) {
+      this.restoreDeferred = false;
+      this.restoreState();
+    }
+
+    const missed = calls.filter(call => call.id < this.firstSeenCallId);
+    this.markReceived(missed);
+    for (const call of missed) {
+      this.lastProcessedCallId = Math.max(this.lastProcessedCallId, call.id);
+    }
+    this.pendingCalls = [...missed, ...this.pendingCalls];
+
+    if (this.isMapReady) {
+      this.processPendingCalls();
+    }
+  }
+
   /**
    * Remove model trait listeners.
    */
   protected removeModelListeners(): void {
     this.modelListeners.forEach(unsubscribe => unsubscribe());
     this.modelListeners = [];
+    this.eventTimers.forEach(timer => window.clearTimeout(timer));
+    this.eventTimers.clear();
+    this.heldEvents.clear();
+    if (this.blobTimer !== null) {
+      window.clearTimeout(this.blobTimer);
+      this.blobTimer = null;
+    }
   }
 
   /**
@@ -123,6 +472,28 @@ export abstract class BaseMapRenderer<TMap> {
     this.methodHandlers.set(name, handler);
   }
 
+  /**
+   * Register a query. It answers requests from Python directly and, when
+   * invoked as a regular method call, publishes its result through the
+   * _queried_features trait.
+   */
+  protected registerQuery(name: string, handler: QueryHandler): void {
+    this.queryHandlers.set(name, handler);
+    this.registerMethod(name, (args, kwargs) => {
+      const publish = (result: unknown) => {
+        if (result === undefined) return;
+        this.model.set('_queried_features', result as Record<string, unknown>);
+        this.model.save_changes();
+      };
+      const result = handler(args, kwargs);
+      if (result instanceof Promise) {
+        result.then(publish, error => console.error(`Error executing query ${name}:`, error));
+      } else {
+        publish(result);
+      }
+    });
+  }
+
   /**
    * Execute a method by name.
    */
@@ -130,7 +501,7 @@ export abstract class BaseMapRenderer<TMap> {
     const handler = this.methodHandlers.get(method);
     if (handler) {
       try {
-        handler(args, kwargs);
+        handler(args, decodeBinaryArrays(this.resolveBlobs(kwargs)));
       } catch (error) {
         console.error(`Error executing method ${method}:`, error);
       }
@@ -145,25 +516,118 @@ export abstract class BaseMapRenderer<TMap> {
   protected processJsCalls(): void {
     const calls = this.model.get('_js_calls') || [];
     const newCalls = calls.filter(call => call.id > this.lastProcessedCallId);
+    if (newCalls.length === 0) return;
+    this.markReceived(newCalls);
 
+    const readyCalls: JsCall[] = [];
     for (const call of newCalls) {
-      if (this.isMapReady) {
-        this.executeMethod(call.method, call.args, call.kwargs);
+      this.firstSeenCallId = Math.min(this.firstSeenCallId, call.id);
+      if (this.isMapReady && !this.isDeferringCalls()) {
+        readyCalls.push(call);
       } else {
         this.pendingCalls.push(call);
       }
       this.lastProcessedCallId = call.id;
     }
+    this.runCalls(readyCalls);
+
+    this.acknowledgeCalls();
+  }
+
+  /**
+   * Execute several calls as one batch.
+   *
+   * The calls run synchronously, after their payloads are fetched and
+   * inflated, so the map library can draw them in one frame. Subclasses
+   * defer expensive work (overlay rebuilds) while isBatching() is true and
+   * perform it, and request the repaint, once in onBatchEnd().
+   */
+  protected executeBatch(calls: JsCall[]): void {
+    if (calls.length === 0) return;
+
+    const timed = this.hasEventListener('perf_stats');
+    const timings: Array<{ id: number; queued_ms: number; apply_ms: number }> = [];
+    this.batchDepth++;
+    try {
+      for (const call of calls) {
+        if (!timed) {
+          this.executeMethod(call.method, call.args, call.kwargs);
+          continue;
+        }
+        const start = performance.now();
+        this.executeMethod(call.method, call.args, call.kwargs);
+        timings.push({
+          id: call.id,
+          queued_ms: start - (this.callReceivedAt.get(call.id) ?? start),
+          apply_ms: performance.now() - start,
+        });
+        this.callReceivedAt.delete(call.id);
+      }
+    } finally {
+      this.batchDepth--;
+      if (this.batchDepth === 0) {
+        this.onBatchEnd();
+      }
+    }
+    if (timings.length > 0) {
+      this.sendEvent('perf_stats', timings);
+    }
+  }
+
+  /**
+   * Note when calls arrived, if Python records call timings.
+   */
+  protected markReceived(calls: JsCall[]): void {
+    if (!this.hasEventListener('perf_stats')) return;
+    const now = performance.now();
+    for (const call of calls) {
+      if (!this.callReceivedAt.has(call.id)) {
+        this.callReceivedAt.set(call.id, now);
+      }
+    }
+  }
+
+  /**
+   * Whether a batch of calls is currently being applied.
+   */
+  protected isBatching(): boolean {
+    return this.batchDepth > 0;
+  }
+
+  /**
+   * Called after the outermost batch of calls has been applied.
+   */
+  protected onBatchEnd(): void {
+    // Default: nothing was deferred
+  }
+
+  /**
+   * Tell Python which calls this view has taken so it can trim _js_calls.
+   */
+  protected acknowledgeCalls(): void {
+    const ack = this.model.get('_js_calls_ack') || 0;
+    if (this.lastProcessedCallId > ack) {
+      this.model.set('_js_calls_ack', this.lastProcessedCallId);
+      this.model.save_changes();
+    }
   }
 
   /**
    * Process pending calls after map is ready.
    */
   protected processPendingCalls(): void {
-    for (const call of this.pendingCalls) {
-      this.executeMethod(call.method, call.args, call.kwargs);
-    }
+    // Replayed history must run before the calls queued after it
+    if (this.isDeferringCalls()) return;
+    const calls = this.pendingCalls;
     this.pendingCalls = [];
+    this.runCalls(calls);
+    if (this.isDeferringCalls()) return;
+
+    const requests = this.pendingRequests;
+    this.pendingRequests = [];
+    for (const request of requests) {
+      this.handleRequest(request);
+    }
   }
 
   /**
@@ -175,16 +639,127 @@ export abstract class BaseMapRenderer<TMap> {
       data,
       timestamp: Date.now(),
     };
-    this.eventQueue.push(event);
-    this.model.set('_js_events', [...this.eventQueue]);
+    const options = this.getEventOptions(type);
+
+    if (options.debounce_ms) {
+      this.holdEvent(event, options);
+      const timer = this.eventTimers.get(type);
+      if (timer !== undefined) window.clearTimeout(timer);
+      this.eventTimers.set(
+        type,
+        window.setTimeout(() => this.releaseEvents(type), options.debounce_ms)
+      );
+      return;
+    }
+
+    if (options.throttle_ms) {
+      if (this.eventTimers.has(type)) {
+        this.holdEvent(event, options);
+        return;
+      }
+      const wait = (this.lastEventSent.get(type) ?? -Infinity) + options.throttle_ms - event.timestamp;
+      if (wait > 0) {
+        this.holdEvent(event, options);
+        this.eventTimers.set(type, window.setTimeout(() => this.releaseEvents(type), wait));
+        return;
+      }
+    }
+
+    this.emitEvents([event], options);
+  }
+
+  /**
+   * Get the delivery options Python registered for an event type.
+   */
+  protected getEventOptions(type: string): EventOptions {
+    return (this.model.get('_event_options') || {})[type] || {};
+  }
+
+  /**
+   * Whether Python has a handler for an event type. High-frequency events
+   * (mouse moves, camera moves) are only sent when this is true.
+   */
+  protected hasEventListener(type: string): boolean {
+    return type in (this.model.get('_event_options') || {});
+  }
+
+  /**
+   * Keep an event until its throttle or debounce timer fires.
+   */
+  private holdEvent(event: JsEvent, options: EventOptions): void {
+    if (options.coalesce === 'last') {
+      this.heldEvents.set(event.type, [event]);
+    } else {
+      const held = this.heldEvents.get(event.type) || [];
+      held.push(event);
+      this.heldEvents.set(event.type, held);
+    }
+  }
+
+  /**
+   * Send the events held for a type when its timer fires.
+   */
+  private releaseEvents(type: string): void {
+    this.eventTimers.delete(type);
+    const held = this.heldEvents.get(type) || [];
+    this.heldEvents.delete(type);
+    if (held.length > 0) {
+      this.emitEvents(held, this.getEventOptions(type));
+    }
+  }
+
+  /**
+   * Number events, add them to the unacknowledged queue and sync it.
+   */
+  private emitEvents(events: JsEvent[], options: EventOptions): void {
+    if (options.coalesce === 'last') {
+      // Undelivered events of the same type are superseded
+      const type = events[0].type;
+      this.eventQueue = this.eventQueue.filter(queued => queued.type !== type);
+    }
+    for (const event of events) {
+      event.seq = ++this.eventSeq;
+      event.view = this.viewId;
+      this.eventQueue.push(event);
+      this.lastEventSent.set(event.type, Date.now());
+    }
+    // Keep the unacknowledged events of the other views: updates waiting to
+    // be sent are merged per trait, so a plain list would drop them
+    const acks = this.model.get('_js_events_ack') || {};
+    const pending: Record<string, JsEvent[]> = {};
+    const sent = this.model.get('_js_events') || {};
+    for (const [view, queued] of Object.entries(sent)) {
+      const unacked = queued.filter(event => (event.seq ?? 0) > (acks[view] || 0));
+      if (unacked.length > 0) {
+        pending[view] = unacked;
+      }
+    }
+    pending[this.viewId] = [...this.eventQueue];
+    this.model.set('_js_events', pending);
     this.model.save_changes();
   }
 
+  /**
+   * Drop events Python has acknowledged from the queue.
+   */
+  protected onEventsAck(): void {
+    const ack = (this.model.get('_js_events_ack') || {})[this.viewId] || 0;
+    this.eventQueue = this.eventQueue.filter(event => (event.seq ?? 0) > ack);
+  }
+
   /**
    * Restore persisted state (layers, sources, controls) from model.
-   * Called when the map is displayed in a subsequent cell.
+   * Called when the map is displayed in a subsequent cell. Skipped when
+   * Python replays its state snapshot, which recreates the same layers;
+   * the traits are the fallback when no kernel answers (e.g. saved state).
    */
   protected restoreState(): void {
+    if (this.awaitingReplay) {
+      this.restoreDeferred = true;
+      return;
+    }
+    if (this.snapshotReplayed) return;
+
     // Restore sources first
     const sources = this.model.get('_sources') || {};
     for (const [sourceId, sourceConfig] of Object.entries(sources)) {
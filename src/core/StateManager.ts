@@ -2,11 +2,47 @@
  * State manager for tracking layers, sources, and controls.
  */
 
-import type { MapWidgetModel, LayerState, SourceState, ControlState } from '../types/anywidget';
+import type {
+  MapWidgetModel,
+  LayerState,
+  SourceState,
+  ControlState,
+  StatePatchOp,
+} from '../types/anywidget';
 import type { LayerConfig, SourceConfig } from '../types/maplibre';
 
+/**
+ * Apply state patch operations to a dict trait value in place.
+ *
+ * Mirrors ``_apply_state_op`` in Python; every operation is idempotent, so
+ * views sharing a model can all apply the same patch.
+ */
+export function applyStatePatch(state: Record<string, unknown>, ops: StatePatchOp[]): void {
+  for (const { op, key, value } of ops) {
+    if (op === 'set') {
+      state[key] = value;
+    } else if (op === 'merge') {
+      state[key] = { ...(state[key] as Record<string, unknown>), ...(value as object) };
+    } else if (op === 'delete') {
+      delete state[key];
+    } else if (op === 'append') {
+      const items = (state[key] as unknown[]) || (state[key] = []);
+      if (!items.includes(value)) items.push(value);
+    } else if (op === 'discard') {
+      const items = (state[key] as unknown[]) || [];
+      const index = items.indexOf(value);
+      if (index >= 0) items.splice(index, 1);
+      if (items.length === 0) delete state[key];
+    }
+  }
+}
+
 /**
  * Manages map state for persistence across cells and HTML export.
+ *
+ * Changes are applied to the model's trait values in place and sent to
+ * Python as ``state_patch`` messages, so each update costs the size of the
+ * change rather than of the whole dict.
  */
 export class StateManager {
   private model: MapWidgetModel;
@@ -19,7 +55,6 @@ export class StateManager {
    * Add a layer to the state.
    */
   addLayer(layerId: string, config: LayerConfig): void {
-    const layers = this.model.get('_layers') || {};
     const layerState: LayerState = {
       id: config.id,
       type: config.type,
@@ -29,29 +64,22 @@ export class StateManager {
       visible: true,
       opacity: 1,
     };
-    this.model.set('_layers', { ...layers, [layerId]: layerState });
-    this.model.save_changes();
+    this.patch({ trait: '_layers', op: 'set', key: layerId, value: layerState });
   }
 
   /**
    * Remove a layer from the state.
    */
   removeLayer(layerId: string): void {
-    const layers = { ...this.model.get('_layers') };
-    delete layers[layerId];
-    this.model.set('_layers', layers);
-    this.model.save_changes();
+    this.patch({ trait: '_layers', op: 'delete', key: layerId });
   }
 
   /**
    * Update layer visibility.
    */
   setLayerVisibility(layerId: string, visible: boolean): void {
-    const layers = { ...this.model.get('_layers') };
-    if (layers[layerId]) {
-      layers[layerId] = { ...layers[layerId], visible };
-      this.model.set('_layers', layers);
-      this.model.save_changes();
+    if (this.getLayer(layerId)) {
+      this.patch({ trait: '_layers', op: 'merge', key: layerId, value: { visible } });
     }
   }
 
@@ -59,11 +87,8 @@ export class StateManager {
    * Update layer opacity.
    */
   setLayerOpacity(layerId: string, opacity: number): void {
-    const layers = { ...this.model.get('_layers') };
-    if (layers[layerId]) {
-      layers[layerId] = { ...layers[layerId], opacity };
-      this.model.set('_layers', layers);
-      this.model.save_changes();
+    if (this.getLayer(layerId)) {
+      this.patch({ trait: '_layers', op: 'merge', key: layerId, value: { opacity } });
     }
   }
 
@@ -71,12 +96,11 @@ export class StateManager {
    * Update layer filter.
    */
   setLayerFilter(layerId: string, filter: unknown[] | null): void {
-    const layers = { ...this.model.get('_layers') };
-    if (layers[layerId]) {
-      const { filter: _oldFilter, ...rest } = layers[layerId];
-      layers[layerId] = filter ? { ...rest, filter } : { ...rest };
-      this.model.set('_layers', layers);
-      this.model.save_changes();
+    const layer = this.getLayer(layerId);
+    if (layer) {
+      const { filter: _oldFilter, ...rest } = layer;
+      const value = filter ? { ...rest, filter } : rest;
+      this.patch({ trait: '_layers', op: 'set', key: layerId, value });
     }
   }
 
@@ -98,7 +122,6 @@ export class StateManager {
    * Add a source to the state.
    */
   addSource(sourceId: string, config: SourceConfig): void {
-    const sources = this.model.get('_sources') || {};
     const sourceState: SourceState = {
       type: config.type,
       data: config.data,
@@ -109,18 +132,14 @@ export class StateManager {
       attribution: config.attribution,
       coordinates: config.coordinates,
     };
-    this.model.set('_sources', { ...sources, [sourceId]: sourceState });
-    this.model.save_changes();
+    this.patch({ trait: '_sources', op: 'set', key: sourceId, value: sourceState });
   }
 
   /**
    * Remove a source from the state.
    */
   removeSource(sourceId: string): void {
-    const sources = { ...this.model.get('_sources') };
-    delete sources[sourceId];
-    this.model.set('_sources', sources);
-    this.model.save_changes();
+    this.patch({ trait: '_sources', op: 'delete', key: sourceId });
   }
 
   /**
@@ -141,24 +160,19 @@ export class StateManager {
    * Add a control to the state.
    */
   addControl(controlId: string, type: string, position: string, options?: Record<string, unknown>): void {
-    const controls = this.model.get('_controls') || {};
     const controlState: ControlState = {
       type,
       position,
       options,
     };
-    this.model.set('_controls', { ...controls, [controlId]: controlState });
-    this.model.save_changes();
+    this.patch({ trait: '_controls', op: 'set', key: controlId, value: controlState });
   }
 
   /**
    * Remove a control from the state.
    */
   removeControl(controlId: string): void {
-    const controls = { ...this.model.get('_controls') };
-    delete controls[controlId];
-    this.model.set('_controls', controls);
-    this.model.save_changes();
+    this.patch({ trait: '_controls', op: 'delete', key: controlId });
   }
 
   /**
@@ -174,4 +188,20 @@ export class StateManager {
   getControls(): Record<string, ControlState> {
     return this.model.get('_controls') || {};
   }
+
+  /**
+   * Apply a change locally and send it to Python.
+   *
+   * The trait value is mutated rather than replaced: model.set() would mark
+   * the whole dict dirty and the next save_changes() would send it in full.
+   */
+  private patch(op: StatePatchOp): void {
+    let state = this.model.get(op.trait) as Record<string, unknown> | null;
+    if (!state) {
+      state = {};
+      this.model.set(op.trait, state);
+    }
+    applyStatePatch(state, [op]);
+    this.model.send({ type: 'state_patch', ops: [op] });
+  }
 }
@@ -20,6 +20,12 @@ import { toProj4 } from 'geotiff-geokeys-to-proj4';
 import { MapLibreRenderer } from '../maplibre/MapLibreRenderer';
 import type { MapWidgetModel } from '../types/anywidget';
 import type { DeckGLLayerConfig, COGLayerProps } from '../types/deckgl';
+import {
+  geoArrowPositionFormat,
+  geoArrowToGeoJSON,
+  geoArrowToRows,
+  isGeoArrowTable,
+} from '../utils/geoarrow';
 
 /**
  * Parse GeoKeys to proj4 definition for COG reprojection.
@@ -142,6 +148,7 @@ export class DeckGLRenderer extends MapLibreRenderer {
    * Update deck.gl layers.
    */
   protected override updateDeckOverlay(): void {
+    if (this.deferDeckOverlayUpdate()) return;
     if (this.deckOverlay) {
       const layers = Array.from(this.deckLayers.values()) as (false | null | undefined)[];
       this.deckOverlay.setProps({ layers });
@@ -269,7 +276,8 @@ export class DeckGLRenderer extends MapLibreRenderer {
 
   protected override handleAddScatterplotLayer(args: unknown[], kwargs: Record<string, unknown>): void {
     const id = kwargs.id as string || `scatterplot-${Date.now()}`;
-    const data = kwargs.data as unknown[];
+    const arrow = isGeoArrowTable(kwargs.data) ? kwargs.data : null;
+    const data = arrow ? geoArrowToRows(arrow, 'coordinates') : (kwargs.data as unknown[]);
 
     const layer = new ScatterplotLayer({
       id,
@@ -318,11 +326,13 @@ export class DeckGLRenderer extends MapLibreRenderer {
 
   protected override handleAddPathLayer(args: unknown[], kwargs: Record<string, unknown>): void {
     const id = kwargs.id as string || `path-${Date.now()}`;
-    const data = kwargs.data as unknown[];
+    const arrow = isGeoArrowTable(kwargs.data) ? kwargs.data : null;
+    const data = arrow ? geoArrowToRows(arrow, 'path') : (kwargs.data as unknown[]);
 
     const layer = new PathLayer({
       id,
       data,
+      ...(arrow && { positionFormat: geoArrowPositionFormat(arrow) }),
       pickable: kwargs.pickable !== false,
       opacity: kwargs.opacity as number ?? 0.8,
       widthScale: kwargs.widthScale as number ?? 1,
@@ -338,11 +348,13 @@ export class DeckGLRenderer extends MapLibreRenderer {
 
   protected override handleAddPolygonLayer(args: unknown[], kwargs: Record<string, unknown>): void {
     const id = kwargs.id as string || `polygon-${Date.now()}`;
-    const data = kwargs.data as unknown[];
+    const arrow = isGeoArrowTable(kwargs.data) ? kwargs.data : null;
+    const data = arrow ? geoArrowToRows(arrow, 'polygon') : (kwargs.data as unknown[]);
 
     const layer = new PolygonLayer({
       id,
       data,
+      ...(arrow && { positionFormat: geoArrowPositionFormat(arrow) }),
       pickable: kwargs.pickable !== false,
       opacity: kwargs.opacity as number ?? 0.5,
       stroked: kwargs.stroked !== false,
@@ -508,7 +520,7 @@ export class DeckGLRenderer extends MapLibreRenderer {
 
   protected override handleAddGeoJsonLayer(args: unknown[], kwargs: Record<string, unknown>): void {
     const id = kwargs.id as string || `geojson-${Date.now()}`;
-    const data = kwargs.data;
+    const data = isGeoArrowTable(kwargs.data) ? geoArrowToGeoJSON(kwargs.data) : kwargs.data;
 
     const layer = new GeoJsonLayer({
       id,
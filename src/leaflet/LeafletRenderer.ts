@@ -16,10 +16,45 @@ type GeoJSON = L.GeoJSON;
 type Control = L.Control;
 type LatLngBounds = L.LatLngBounds;
 import { BaseMapRenderer, MethodHandler } from '../core/BaseMapRenderer';
+import type { CustomMessage } from '../core/BaseMapRenderer';
 import { StateManager } from '../core/StateManager';
 import type { MapWidgetModel } from '../types/anywidget';
 import type { ControlPosition, FlyToOptions, FitBoundsOptions } from '../types/leaflet';
 import type { Feature, FeatureCollection } from 'geojson';
+import { decodeBinaryArrays, putBuffers } from '../utils/binary';
+
+// Grid size of kernel canvas tiles, drawn 256 pixels wide
+const TILE_EXTENT = 4096;
+
+/**
+ * Marker clusters of every zoom level, computed in Python.
+ */
+interface ClusterHierarchy {
+  // Lowest zoom at which each point is shown on its own
+  solo: Uint8Array;
+  // Start of each zoom level's clusters, from minZoom up
+  offsets: Int32Array;
+  lngLat: Float32Array;
+  counts: Uint32Array;
+  // Zoom at which each cluster splits
+  expand: Uint8Array;
+  minZoom: number;
+  maxZoom: number;
+}
+
+/**
+ * A tile of a kernel canvas tile source, as flat arrays.
+ */
+interface CanvasTile {
+  ids: Int32Array;
+  // 1 point, 2 line, 3 polygon
+  types: Uint8Array;
+  // Offsets of each feature's rings, and of each ring's vertices
+  features: Int32Array;
+  rings: Int32Array;
+  coords: Int16Array;
+  properties: Array<Record<string, unknown>>;
+}
 
 /**
  * Leaflet map renderer.
@@ -33,6 +68,12 @@ export class LeafletRenderer extends BaseMapRenderer<LeafletMap> {
   private layerControl: L.Control.Layers | null = null;
   private resizeObserver: ResizeObserver | null = null;
   private resizeDebounceTimer: number | null = null;
+  // Tile requests awaiting an answer from Python, keyed by request id
+  private tileRequests: globalThis.Map<
+    number,
+    { resolve: (tile: CanvasTile) => void; reject: (error: Error) => void }
+  > = new globalThis.Map();
+  private tileRequestId = 0;
 
   constructor(model: MapWidgetModel, el: HTMLElement) {
     super(model, el);
@@ -134,6 +175,21 @@ export class LeafletRenderer extends BaseMapRenderer<LeafletMap> {
       if (!this.map) return;
       this.sendEvent('zoomend', { zoom: this.map.getZoom() });
     });
+
+    // High-frequency events are only sent when Python listens for them
+    this.map.on('mousemove', (e: L.LeafletMouseEvent) => {
+      if (!this.hasEventListener('mousemove')) return;
+      this.sendEvent('mousemove', {
+        lngLat: [e.latlng.lng, e.latlng.lat],
+        point: [e.containerPoint.x, e.containerPoint.y],
+      });
+    });
+
+    this.map.on('move', () => {
+      if (!this.map || !this.hasEventListener('move')) return;
+      const center = this.map.getCenter();
+      this.sendEvent('move', { center: [center.lng, center.lat], zoom: this.map.getZoom() });
+    });
   }
 
   private registerMethods(): void {
@@ -153,6 +209,7 @@ export class LeafletRenderer extends BaseMapRenderer<LeafletMap> {
 
     // GeoJSON
     this.registerMethod('addGeoJSON', this.handleAddGeoJSON.bind(this));
+    this.registerMethod('addCanvasTileLayer', this.handleAddCanvasTileLayer.bind(this));
     this.registerMethod('removeGeoJSON', this.handleRemoveGeoJSON.bind(this));
 
     // Layers
@@ -425,6 +482,260 @@ export class LeafletRenderer extends BaseMapRenderer<LeafletMap> {
     }
   }
 
+  /**
+   * Add vector data drawn on canvas tiles cut by Python on request.
+   * Popups and tooltips are found by hit-testing the loaded tiles.
+   */
+  private handleAddCanvasTileLayer(args: unknown[], kwargs: Record<string, unknown>): void {
+    if (!this.map) return;
+    const map = this.map;
+    const name = kwargs.name as string;
+    const sourceId = kwargs.source as string;
+    const style = kwargs.style as Record<string, unknown>;
+    const maxNativeZoom = (kwargs.maxNativeZoom as number) ?? 14;
+    const popupProperties = kwargs.popupProperties as string[] | boolean | undefined;
+    const tooltipProperty = kwargs.tooltipProperty as string | undefined;
+
+    // Tiles are cut up to maxNativeZoom; deeper zooms draw part of a parent
+    // tile at full resolution
+    const tiles: globalThis.Map<string, CanvasTile> = new globalThis.Map();
+    const requests: globalThis.Map<string, Promise<CanvasTile>> = new globalThis.Map();
+    const sourceTile = (x: number, y: number, z: number) => {
+      const zoom = Math.min(z, maxNativeZoom);
+      const dz = z - zoom;
+      const tx = x >> dz;
+      const ty = y >> dz;
+      return {
+        key: `${zoom}/${tx}/${ty}`,
+        zoom,
+        tx,
+        ty,
+        // Tile grid units to pixels of the requested tile
+        scale: (256 * 2 ** dz) / TILE_EXTENT,
+        offsetX: (x - (tx << dz)) * 256,
+        offsetY: (y - (ty << dz)) * 256,
+      };
+    };
+
+    const renderer = this;
+    const CanvasTileLayer = L.GridLayer.extend({
+      createTile(coords: L.Coords, done: L.DoneCallback): HTMLElement {
+        const canvas = document.createElement('canvas');
+        const ratio = window.devicePixelRatio || 1;
+        canvas.width = canvas.height = 256 * ratio;
+        const source = sourceTile(coords.x, coords.y, coords.z);
+        // Overzoomed tiles share one request for their parent tile
+        let loaded = requests.get(source.key);
+        if (!loaded) {
+          loaded = renderer.requestCanvasTile(sourceId, source.zoom, source.tx, source.ty);
+          requests.set(source.key, loaded);
+          loaded.then(
+            (tile) => tiles.set(source.key, tile),
+            () => requests.delete(source.key)
+          );
+        }
+        loaded
+          .then((tile) => {
+            const ctx = canvas.getContext('2d')!;
+            ctx.scale(ratio, ratio);
+            renderer.drawCanvasTile(ctx, tile, style, source);
+            done(undefined, canvas);
+          })
+          .catch((error: Error) => done(error, canvas));
+        return canvas;
+      },
+    });
+    const layer = new CanvasTileLayer({ pane: 'overlayPane' }) as L.GridLayer;
+
+    const hitTest = (latlng: L.LatLng): Record<string, unknown> | null => {
+      const z = Math.round(map.getZoom());
+      const point = map.project(latlng, z);
+      const x = Math.floor(point.x / 256);
+      const y = Math.floor(point.y / 256);
+      const source = sourceTile(x, y, z);
+      const tile = tiles.get(source.key);
+      if (!tile) return null;
+      const index = this.hitCanvasTile(
+        tile,
+        style,
+        (point.x - x * 256 + source.offsetX) / source.scale,
+        (point.y - y * 256 + source.offsetY) / source.scale,
+        source.scale
+      );
+      return index === null ? null : tile.properties[index] || {};
+    };
+
+    const onClick = (e: L.LeafletMouseEvent) => {
+      if (!popupProperties) return;
+      const props = hitTest(e.latlng);
+      if (!props) return;
+      let html = '<div class="anymap-popup">';
+      const keys = popupProperties === true ? Object.keys(props) : popupProperties;
+      for (const key of keys) {
+        if (props[key] !== undefined && props[key] !== null) {
+          html += `<b>${key}:</b> ${props[key]}<br>`;
+        }
+      }
+      html += '</div>';
+      L.popup().setLatLng(e.latlng).setContent(html).openOn(map);
+    };
+
+    const tooltip = L.tooltip({ sticky: true });
+    const onMouseMove = (e: L.LeafletMouseEvent) => {
+      const props = hitTest(e.latlng);
+      const text = tooltipProperty ? props?.[tooltipProperty] : undefined;
+      map.getContainer().style.cursor = props && popupProperties ? 'pointer' : '';
+      if (text === undefined || text === null) {
+        tooltip.remove();
+      } else {
+        tooltip.setLatLng(e.latlng).setContent(String(text)).addTo(map);
+      }
+    };
+
+    // Forget tiles that left the view; Python keeps them in its cache
+    layer.on('tileunload', (e: L.TileEvent) => {
+      if (e.coords.z > maxNativeZoom) return;
+      const key = `${e.coords.z}/${e.coords.x}/${e.coords.y}`;
+      tiles.delete(key);
+      requests.delete(key);
+    });
+    layer.on('add', () => {
+      map.on('click', onClick);
+      if (tooltipProperty || popupProperties) map.on('mousemove', onMouseMove);
+    });
+    layer.on('remove', () => {
+      map.off('click', onClick);
+      map.off('mousemove', onMouseMove);
+      tooltip.remove();
+      map.getContainer().style.cursor = '';
+    });
+
+    layer.addTo(map);
+    this.layersMap.set(name, layer);
+
+    if (this.layerControl) {
+      this.layerControl.addOverlay(layer, name);
+    }
+
+    if (kwargs.fitBounds !== false && kwargs.bounds) {
+      const bounds = kwargs.bounds as [number, number, number, number];
+      map.fitBounds(L.latLngBounds([bounds[1], bounds[0]], [bounds[3], bounds[2]]), {
+        padding: [50, 50],
+      });
+    }
+  }
+
+  /**
+   * Trace the rings of one canvas tile feature as a path in tile grid units.
+   */
+  private canvasTilePath(tile: CanvasTile, feature: number, radius: number): Path2D {
+    const path = new Path2D();
+    const { coords, rings } = tile;
+    for (let r = tile.features[feature]; r < tile.features[feature + 1]; r++) {
+      const start = rings[r];
+      const end = rings[r + 1];
+      if (tile.types[feature] === 1) {
+        path.moveTo(coords[2 * start] + radius, coords[2 * start + 1]);
+        path.arc(coords[2 * start], coords[2 * start + 1], radius, 0, 2 * Math.PI);
+        continue;
+      }
+      path.moveTo(coords[2 * start], coords[2 * start + 1]);
+      for (let v = start + 1; v < end; v++) {
+        path.lineTo(coords[2 * v], coords[2 * v + 1]);
+      }
+      if (tile.types[feature] === 3) path.closePath();
+    }
+    return path;
+  }
+
+  /**
+   * Draw the features of a canvas tile with a Leaflet path style.
+   */
+  private drawCanvasTile(
+    ctx: CanvasRenderingContext2D,
+    tile: CanvasTile,
+    style: Record<string, unknown>,
+    source: { scale: number; offsetX: number; offsetY: number }
+  ): void {
+    const color = (style.color as string) || '#3388ff';
+    const weight = (style.weight as number) ?? 3;
+    const fillColor = (style.fillColor as string) || color;
+    ctx.lineJoin = 'round';
+    ctx.lineCap = 'round';
+    ctx.translate(-source.offsetX, -source.offsetY);
+    ctx.scale(source.scale, source.scale);
+    ctx.lineWidth = weight / source.scale;
+    ctx.strokeStyle = color;
+    ctx.fillStyle = fillColor;
+    const radius = ((style.radius as number) ?? 8) / source.scale;
+
+    for (let i = 0; i < tile.ids.length; i++) {
+      const path = this.canvasTilePath(tile, i, radius);
+      if (tile.types[i] !== 2 && style.fill !== false) {
+        ctx.globalAlpha = (style.fillOpacity as number) ?? 0.2;
+        ctx.fill(path, 'evenodd');
+      }
+      if (style.stroke !== false && weight > 0) {
+        ctx.globalAlpha = (style.opacity as number) ?? 1;
+        ctx.stroke(path);
+      }
+    }
+  }
+
+  /**
+   * Find the topmost feature of a canvas tile under a point in tile grid
+   * units, or null if there is none.
+   */
+  private hitCanvasTile(
+    tile: CanvasTile,
+    style: Record<string, unknown>,
+    x: number,
+    y: number,
+    scale: number
+  ): number | null {
+    const ctx = document.createElement('canvas').getContext('2d')!;
+    // A few pixels of slack around lines and point outlines
+    ctx.lineWidth = (((style.weight as number) ?? 3) + 6) / scale;
+    const radius = ((style.radius as number) ?? 8) / scale;
+    for (let i = tile.ids.length - 1; i >= 0; i--) {
+      const path = this.canvasTilePath(tile, i, radius);
+      if (tile.types[i] !== 2 && ctx.isPointInPath(path, x, y, 'evenodd')) return i;
+      if (ctx.isPointInStroke(path, x, y)) return i;
+    }
+    return null;
+  }
+
+  /**
+   * Ask Python for a tile of a kernel canvas tile source.
+   */
+  private requestCanvasTile(sourceId: string, z: number, x: number, y: number): Promise<CanvasTile> {
+    return new Promise((resolve, reject) => {
+      const id = ++this.tileRequestId;
+      this.tileRequests.set(id, { resolve, reject });
+      this.model.send({ type: 'tile_request', id, view: this.viewId, source: sourceId, z, x, y });
+    });
+  }
+
+  protected onCustomMessage(msg: CustomMessage, buffers?: (DataView | ArrayBuffer)[]): void {
+    if (msg?.type !== 'tile') {
+      super.onCustomMessage(msg, buffers);
+      return;
+    }
+    if (msg.buffer_paths && buffers) {
+      putBuffers(msg as Record<string, unknown>, msg.buffer_paths, buffers);
+    }
+    // Tile replies go to every view; request ids are only unique per view
+    if (msg.view !== this.viewId) return;
+    const request = this.tileRequests.get(msg.id as number);
+    if (!request) return;
+    this.tileRequests.delete(msg.id as number);
+    if (msg.error) {
+      request.reject(new Error(msg.error));
+    } else {
+      request.resolve(decodeBinaryArrays(msg.data) as CanvasTile);
+    }
+  }
+
   private handleRemoveGeoJSON(args: unknown[], kwargs: Record<string, unknown>): void {
     if (!this.map) return;
     const [name] = args as [string];
@@ -617,11 +928,39 @@ export class LeafletRenderer extends BaseMapRenderer<LeafletMap> {
 
   private handleAddMarkers(args: unknown[], kwargs: Record<string, unknown>): void {
     if (!this.map) return;
-    const data = kwargs.data as Array<Record<string, unknown>>;
     const name = (kwargs.name as string) || `markers-${Date.now()}`;
-
     const markerGroup = L.layerGroup();
 
+    // Parallel arrays: flat [lng, lat, ...] positions and per-marker labels
+    const lngLat = kwargs.lngLat as Float64Array | undefined;
+    if (lngLat) {
+      const popups = kwargs.popups as Array<string | null> | null;
+      const tooltips = kwargs.tooltips as Array<string | null> | null;
+      // Circle markers share one canvas instead of an SVG path each
+      const circle = kwargs.circle as L.CircleMarkerOptions | undefined;
+      const renderer = circle ? L.canvas() : undefined;
+      const createMarker = (i: number): L.Layer => {
+        const latlng: L.LatLngExpression = [lngLat[2 * i + 1], lngLat[2 * i]];
+        const marker = circle ? L.circleMarker(latlng, { ...circle, renderer }) : L.marker(latlng);
+        const popup = popups?.[i];
+        const tooltip = tooltips?.[i];
+        if (popup) marker.bindPopup(popup);
+        if (tooltip) marker.bindTooltip(tooltip);
+        return marker;
+      };
+
+      const clusters = kwargs.clusters as ClusterHierarchy | undefined;
+      if (clusters) {
+        this.clusterMarkers(markerGroup, lngLat, clusters, createMarker);
+      } else {
+        for (let i = 0; i < lngLat.length / 2; i++) {
+          markerGroup.addLayer(createMarker(i));
+        }
+      }
+    }
+
+    // Marker dicts with custom icons
+    const data = (kwargs.data as Array<Record<string, unknown>>) || [];
     for (const item of data) {
       const lng = item.lng as number;
       const lat = item.lat as number;
@@ -654,6 +993,90 @@ export class LeafletRenderer extends BaseMapRenderer<LeafletMap> {
     }
   }
 
+  /**
+   * Show the markers and clusters of a precomputed hierarchy that are in
+   * view, updating the group after every move while it is on the map.
+   */
+  private clusterMarkers(
+    group: L.LayerGroup,
+    lngLat: Float64Array,
+    clusters: ClusterHierarchy,
+    createMarker: (i: number) => L.Layer
+  ): void {
+    const { solo, offsets, counts, expand, minZoom, maxZoom } = clusters;
+    // Layers shown now, keyed by point index or zoom and cluster index
+    const shown: globalThis.Map<string, L.Layer> = new globalThis.Map();
+    const markers: globalThis.Map<number, L.Layer> = new globalThis.Map();
+
+    const createCluster = (j: number): L.Layer => {
+      const count = counts[j];
+      const size = count < 10 ? 30 : count < 100 ? 36 : count < 1000 ? 42 : 48;
+      const color = count < 10 ? '#6ecc39' : count < 100 ? '#f0c20c' : '#f18017';
+      const label = count < 10000 ? String(count) : `${Math.round(count / 1000)}k`;
+      const latlng = L.latLng(clusters.lngLat[2 * j + 1], clusters.lngLat[2 * j]);
+      const marker = L.marker(latlng, {
+        icon: L.divIcon({
+          html:
+            `<div style="width:${size}px;height:${size}px;line-height:${size}px;border-radius:50%;` +
+            `background:${color};opacity:0.85;color:#000;text-align:center;font:12px sans-serif;` +
+            `box-shadow:0 0 0 5px ${color}66">${label}</div>`,
+          className: 'anymap-marker-cluster',
+          iconSize: L.point(size, size),
+        }),
+      });
+      marker.on('click', () => this.map?.setView(latlng, expand[j]));
+      return marker;
+    };
+
+    const render = () => {
+      if (!this.map) return;
+      const z = Math.max(minZoom, Math.min(Math.round(this.map.getZoom()), maxZoom + 1));
+      const bounds = this.map.getBounds().pad(0.25);
+      const visible: globalThis.Map<string, () => L.Layer> = new globalThis.Map();
+
+      for (let i = 0; i < solo.length; i++) {
+        if (solo[i] <= z && bounds.contains([lngLat[2 * i + 1], lngLat[2 * i]])) {
+          visible.set(`p${i}`, () => {
+            let marker = markers.get(i);
+            if (!marker) {
+              marker = createMarker(i);
+              markers.set(i, marker);
+            }
+            return marker;
+          });
+        }
+      }
+      if (z <= maxZoom) {
+        for (let j = offsets[z - minZoom]; j < offsets[z - minZoom + 1]; j++) {
+          if (bounds.contains([clusters.lngLat[2 * j + 1], clusters.lngLat[2 * j]])) {
+            visible.set(`c${z}:${j}`, () => createCluster(j));
+          }
+        }
+      }
+
+      // Only changed layers are touched, so open popups stay open
+      shown.forEach((layer, key) => {
+        if (!visible.has(key)) {
+          group.removeLayer(layer);
+          shown.delete(key);
+        }
+      });
+      visible.forEach((create, key) => {
+        if (!shown.has(key)) {
+          const layer = create();
+          group.addLayer(layer);
+          shown.set(key, layer);
+        }
+      });
+    };
+
+    group.on('add', () => {
+      this.map?.on('moveend', render);
+      render();
+    });
+    group.on('remove', () => this.map?.off('moveend', render));
+  }
+
   private handleRemoveMarker(args: unknown[], kwargs: Record<string, unknown>): void {
     if (!this.map) return;
     const [id] = args as [string];
@@ -886,7 +1309,8 @@ export class LeafletRenderer extends BaseMapRenderer<LeafletMap> {
 
   private handleAddHeatmap(args: unknown[], kwargs: Record<string, unknown>): void {
     if (!this.map) return;
-    const data = kwargs.data as number[][];
+    const points = kwargs.points as Float32Array | undefined;
+    const data = (kwargs.data as number[][]) || [];
     const name = (kwargs.name as string) || `heatmap-${Date.now()}`;
     const radius = (kwargs.radius as number) || 25;
     const blur = (kwargs.blur as number) || 15;
@@ -896,12 +1320,21 @@ export class LeafletRenderer extends BaseMapRenderer<LeafletMap> {
     const gradient = kwargs.gradient as Record<string, string> | undefined;
 
     // leaflet.heat expects [lat, lng, intensity] arrays
-    const heatData = data.map((point) => {
-      if (point.length >= 3) {
-        return [point[1], point[0], point[2]];
+    let heatData: number[][];
+    if (points) {
+      // Flat [lng, lat, intensity, ...] triples
+      heatData = new Array(points.length / 3);
+      for (let i = 0; i < heatData.length; i++) {
+        heatData[i] = [points[3 * i + 1], points[3 * i], points[3 * i + 2]];
       }
-      return [point[1], point[0]];
-    });
+    } else {
+      heatData = data.map((point) => {
+        if (point.length >= 3) {
+          return [point[1], point[0], point[2]];
+        }
+        return [point[1], point[0]];
+      });
+    }
 
     const options: Record<string, unknown> = {
       radius,
@@ -1173,6 +1606,7 @@ export class LeafletRenderer extends BaseMapRenderer<LeafletMap> {
 
     this.markersMap.forEach((marker) => marker.remove());
     this.markersMap.clear();
+    this.tileRequests.clear();
 
     this.popupsMap.forEach((popup) => popup.remove());
     this.popupsMap.clear();
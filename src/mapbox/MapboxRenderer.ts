@@ -56,6 +56,14 @@ import type {
   SourceConfig,
 } from '../types/mapbox';
 import type { Feature, FeatureCollection } from 'geojson';
+import { pickZoomLevel } from '../utils/geo';
+import {
+  geoArrowPositionFormat,
+  geoArrowToGeoJSON,
+  geoArrowToRows,
+  isGeoArrowTable,
+} from '../utils/geoarrow';
+import type { ZoomLevel } from '../utils/geo';
 import { LidarControl } from 'maplibre-gl-lidar';
 import type { LidarControlOptions, LidarColorScheme } from '../types/lidar';
 import {
@@ -104,10 +112,14 @@ export class MapboxRenderer extends BaseMapRenderer<MapboxMap> {
   // Deck.gl overlay for COG layers
   protected deckOverlay: MapboxOverlay | null = null;
   protected deckLayers: globalThis.Map<string, unknown> = new globalThis.Map();
+  // Deck.gl overlay updates deferred while a call batch is applied
+  private deckOverlayDirty = false;
 
   // Sentinel layer ID used as ordering anchor for deck.gl layers in interleaved mode.
   private static readonly DECK_SENTINEL_ID = '__deck-overlay-anchor';
   private userOverlayLayerIds: string[] = [];
+  // Zoom listeners swapping GeoJSON sources between simplified versions
+  private zoomLevelHandlers: globalThis.Map<string, () => void> = new globalThis.Map();
 
   // Zarr layers
   protected zarrLayers: globalThis.Map<string, ZarrLayer> = new globalThis.Map();
@@ -338,6 +350,21 @@ export class MapboxRenderer extends BaseMapRenderer<MapboxMap> {
       if (!this.map) return;
       this.sendEvent('zoomend', { zoom: this.map.getZoom() });
     });
+
+    // High-frequency events are only sent when Python listens for them
+    this.map.on('mousemove', (e) => {
+      if (!this.hasEventListener('mousemove')) return;
+      this.sendEvent('mousemove', {
+        lngLat: [e.lngLat.lng, e.lngLat.lat],
+        point: [e.point.x, e.point.y],
+      });
+    });
+
+    this.map.on('move', () => {
+      if (!this.map || !this.hasEventListener('move')) return;
+      const center = this.map.getCenter();
+      this.sendEvent('move', { center: [center.lng, center.lat], zoom: this.map.getZoom() });
+    });
   }
 
   /**
@@ -456,8 +483,8 @@ export class MapboxRenderer extends BaseMapRenderer<MapboxMap> {
     this.registerMethod('removeOpacitySlider', this.handleRemoveOpacitySlider.bind(this));
     this.registerMethod('addStyleSwitcher', this.handleAddStyleSwitcher.bind(this));
     this.registerMethod('removeStyleSwitcher', this.handleRemoveStyleSwitcher.bind(this));
-    this.registerMethod('getVisibleFeatures', this.handleGetVisibleFeatures.bind(this));
-    this.registerMethod('getLayerData', this.handleGetLayerData.bind(this));
+    this.registerQuery('getVisibleFeatures', this.handleGetVisibleFeatures.bind(this));
+    this.registerQuery('getLayerData', this.handleGetLayerData.bind(this));
 
     // LiDAR layers (maplibre-gl-lidar)
     this.registerMethod('addLidarControl', this.handleAddLidarControl.bind(this));
@@ -498,8 +525,8 @@ export class MapboxRenderer extends BaseMapRenderer<MapboxMap> {
 
     // Feature Query/Filter
     this.registerMethod('setFilter', this.handleSetFilter.bind(this));
-    this.registerMethod('queryRenderedFeatures', this.handleQueryRenderedFeatures.bind(this));
-    this.registerMethod('querySourceFeatures', this.handleQuerySourceFeatures.bind(this));
+    this.registerQuery('queryRenderedFeatures', this.handleQueryRenderedFeatures.bind(this));
+    this.registerQuery('querySourceFeatures', this.handleQuerySourceFeatures.bind(this));
 
     // Video Layer
     this.registerMethod('addVideoLayer', this.handleAddVideoLayer.bind(this));
@@ -765,20 +792,27 @@ export class MapboxRenderer extends BaseMapRenderer<MapboxMap> {
   private handleAddGeoJSON(args: unknown[], kwargs: Record<string, unknown>): void {
     if (!this.map) return;
 
-    const geojson = kwargs.data as FeatureCollection | Feature;
+    const geojson = isGeoArrowTable(kwargs.data)
+      ? geoArrowToGeoJSON(kwargs.data)
+      : (kwargs.data as FeatureCollection | Feature);
     const name = kwargs.name as string;
     const layerType = kwargs.layerType as string;
     const paint = kwargs.paint as Record<string, unknown> | undefined;
     const fitBounds = kwargs.fitBounds !== false;
+    const levels = kwargs.levels as ZoomLevel[] | undefined;
 
     const sourceId = `${name}-source`;
     const layerId = name;
 
     if (!this.map.getSource(sourceId)) {
+      const data = levels?.length ? pickZoomLevel(levels, this.map.getZoom(), geojson) : geojson;
       this.map.addSource(sourceId, {
         type: 'geojson',
-        data: geojson as GeoJSON.GeoJSON,
+        data: data as GeoJSON.GeoJSON,
       });
+      if (levels?.length) {
+        this.watchZoomLevels(sourceId, levels, geojson);
+      }
     }
 
     let type = layerType;
@@ -816,6 +850,38 @@ export class MapboxRenderer extends BaseMapRenderer<MapboxMap> {
     }
   }
 
+  /**
+   * Swap a GeoJSON source between simplified versions of its data as the
+   * zoom changes, so the worker never tiles detail it cannot display.
+   */
+  private watchZoomLevels(sourceId: string, levels: ZoomLevel[], full: unknown): void {
+    if (!this.map) return;
+    this.unwatchZoomLevels(sourceId);
+    let current = pickZoomLevel(levels, this.map.getZoom(), full);
+    const onZoom = () => {
+      const source = this.map?.getSource(sourceId) as mapboxgl.GeoJSONSource | undefined;
+      if (!source) {
+        this.unwatchZoomLevels(sourceId);
+        return;
+      }
+      const data = pickZoomLevel(levels, this.map!.getZoom(), full);
+      if (data !== current) {
+        current = data;
+        source.setData(data as GeoJSON.GeoJSON);
+      }
+    };
+    this.map.on('zoomend', onZoom);
+    this.zoomLevelHandlers.set(sourceId, onZoom);
+  }
+
+  private unwatchZoomLevels(sourceId: string): void {
+    const onZoom = this.zoomLevelHandlers.get(sourceId);
+    if (onZoom) {
+      this.map?.off('zoomend', onZoom);
+      this.zoomLevelHandlers.delete(sourceId);
+    }
+  }
+
   private inferLayerType(geometryType: string): string {
     switch (geometryType) {
       case 'Point':
@@ -1152,14 +1218,49 @@ export class MapboxRenderer extends BaseMapRenderer<MapboxMap> {
   private handleAddMarkers(args: unknown[], kwargs: Record<string, unknown>): void {
     if (!this.map) return;
     const id = (kwargs.id as string) || `markers-${Date.now()}`;
-    const markers = kwargs.markers as Array<{ lngLat: [number, number]; popup?: string; tooltip?: string }>;
+    // Parallel arrays: flat [lng, lat, ...] positions and per-marker labels
+    const lngLat = kwargs.lngLat as Float64Array;
+    const popups = kwargs.popups as Array<string | null> | null;
     const color = (kwargs.color as string) || '#3388ff';
-    if (!markers || !Array.isArray(markers)) return;
-    for (let i = 0; i < markers.length; i++) {
-      const m = markers[i];
+    if (!lngLat) return;
+    if (kwargs.asLayer) {
+      // Large groups are drawn as one circle layer; clicks are picked by feature id
+      const features: Feature[] = [];
+      for (let i = 0; i < lngLat.length / 2; i++) {
+        features.push({
+          type: 'Feature',
+          id: i,
+          geometry: { type: 'Point', coordinates: [lngLat[2 * i], lngLat[2 * i + 1]] },
+          properties: {},
+        });
+      }
+      this.map.addSource(`${id}-source`, { type: 'geojson', data: { type: 'FeatureCollection', features } });
+      this.map.addLayer({
+        id,
+        type: 'circle',
+        source: `${id}-source`,
+        paint: {
+          'circle-color': color,
+          'circle-radius': 6 * ((kwargs.scale as number) ?? 1.0),
+          'circle-stroke-color': '#ffffff',
+          'circle-stroke-width': 1.5,
+        },
+      });
+      this.map.on('click', id, (e) => {
+        const index = e.features?.[0]?.id as number | undefined;
+        const popup = index === undefined ? null : popups?.[index];
+        if (!popup) return;
+        new Popup().setLngLat([lngLat[2 * index!], lngLat[2 * index! + 1]]).setHTML(popup).addTo(this.map!);
+      });
+      this.map.on('mouseenter', id, () => { if (this.map) this.map.getCanvas().style.cursor = 'pointer'; });
+      this.map.on('mouseleave', id, () => { if (this.map) this.map.getCanvas().style.cursor = ''; });
+      return;
+    }
+    for (let i = 0; i < lngLat.length / 2; i++) {
       const markerId = `${id}-${i}`;
-      const marker = new Marker({ color }).setLngLat(m.lngLat);
-      if (m.popup) marker.setPopup(new Popup().setHTML(m.popup));
+      const marker = new Marker({ color }).setLngLat([lngLat[2 * i], lngLat[2 * i + 1]]);
+      const popup = popups?.[i];
+      if (popup) marker.setPopup(new Popup().setHTML(popup));
       marker.addTo(this.map);
       this.markersMap.set(markerId, marker);
     }
@@ -1167,6 +1268,11 @@ export class MapboxRenderer extends BaseMapRenderer<MapboxMap> {
 
   private handleRemoveMarker(args: unknown[], kwargs: Record<string, unknown>): void {
     const [id] = args as [string];
+    if (this.map?.getSource(`${id}-source`)) {
+      if (this.map.getLayer(id)) this.map.removeLayer(id);
+      this.map.removeSource(`${id}-source`);
+      return;
+    }
     const marker = this.markersMap.get(id);
     if (marker) {
       marker.remove();
@@ -1320,6 +1426,10 @@ export class MapboxRenderer extends BaseMapRenderer<MapboxMap> {
    * Update deck.gl overlay with current layers.
    */
   private updateDeckOverlay(): void {
+    if (this.isBatching()) {
+      this.deckOverlayDirty = true;
+      return;
+    }
     if (!this.deckOverlay) return;
 
     const sentinelId = MapboxRenderer.DECK_SENTINEL_ID;
@@ -1338,6 +1448,19 @@ export class MapboxRenderer extends BaseMapRenderer<MapboxMap> {
     this.deckOverlay.setProps({ layers });
   }
 
+  /**
+   * Rebuild the deck.gl overlay once after a batch of calls, then request a
+   * single repaint. Mapbox folds the repaint requests made while the batch
+   * ran into the same animation frame, so the batch is drawn at once.
+   */
+  protected override onBatchEnd(): void {
+    if (this.deckOverlayDirty) {
+      this.deckOverlayDirty = false;
+      this.updateDeckOverlay();
+    }
+    this.map?.triggerRepaint();
+  }
+
   private handleAddCOGLayer(args: unknown[], kwargs: Record<string, unknown>): void {
     if (!this.map) return;
 
@@ -1552,7 +1675,8 @@ export class MapboxRenderer extends BaseMapRenderer<MapboxMap> {
     if (!this.map) return;
     this.initializeDeckOverlay();
     const id = (kwargs.id as string) || `scatterplot-${Date.now()}`;
-    const data = kwargs.data as unknown[];
+    const arrow = isGeoArrowTable(kwargs.data) ? kwargs.data : null;
+    const data = arrow ? geoArrowToRows(arrow, 'coordinates') : (kwargs.data as unknown[]);
     const layer = new ScatterplotLayer({
       id,
       data,
@@ -1570,10 +1694,12 @@ export class MapboxRenderer extends BaseMapRenderer<MapboxMap> {
     if (!this.map) return;
     this.initializeDeckOverlay();
     const id = (kwargs.id as string) || `path-${Date.now()}`;
-    const data = kwargs.data as unknown[];
+    const arrow = isGeoArrowTable(kwargs.data) ? kwargs.data : null;
+    const data = arrow ? geoArrowToRows(arrow, 'path') : (kwargs.data as unknown[]);
     const layer = new PathLayer({
       id,
       data,
+      ...(arrow && { positionFormat: geoArrowPositionFormat(arrow) }),
       getPath: (kwargs.getPath as (d: unknown) => [number, number][]) ?? ((d: any) => d.path || d.coordinates),
       getColor: (kwargs.getColor as [number, number, number, number]) ?? [51, 136, 255, 200],
       getWidth: (kwargs.getWidth as number) ?? 1,
@@ -1586,10 +1712,12 @@ export class MapboxRenderer extends BaseMapRenderer<MapboxMap> {
     if (!this.map) return;
     this.initializeDeckOverlay();
     const id = (kwargs.id as string) || `polygon-${Date.now()}`;
-    const data = kwargs.data as unknown[];
+    const arrow = isGeoArrowTable(kwargs.data) ? kwargs.data : null;
+    const data = arrow ? geoArrowToRows(arrow, 'polygon') : (kwargs.data as unknown[]);
     const layer = new PolygonLayer({
       id,
       data,
+      ...(arrow && { positionFormat: geoArrowPositionFormat(arrow) }),
       getPolygon: (kwargs.getPolygon as (d: unknown) => number[][][]) ?? ((d: any) => d.polygon || d.coordinates),
       getFillColor: (kwargs.getFillColor as [number, number, number, number]) ?? [51, 136, 255, 128],
     } as any);
@@ -1679,7 +1807,7 @@ export class MapboxRenderer extends BaseMapRenderer<MapboxMap> {
     if (!this.map) return;
     this.initializeDeckOverlay();
     const id = (kwargs.id as string) || `geojson-${Date.now()}`;
-    const data = kwargs.data as unknown;
+    const data = isGeoArrowTable(kwargs.data) ? geoArrowToGeoJSON(kwargs.data) : kwargs.data;
     const layer = new GeoJsonLayer({
       id,
       data,
@@ -1873,7 +2001,10 @@ export class MapboxRenderer extends BaseMapRenderer<MapboxMap> {
     if (!source && !sourceId.endsWith('-source')) {
       source = this.map.getSource(sourceId + '-source') as mapboxgl.GeoJSONSource;
     }
-    if (source?.setData) source.setData(data as GeoJSON.GeoJSON);
+    if (source?.setData) {
+      this.unwatchZoomLevels(source.id);
+      source.setData(data as GeoJSON.GeoJSON);
+    }
   }
 
   private handleAddMapImage(args: unknown[], kwargs: Record<string, unknown>): void {
@@ -2099,7 +2230,7 @@ export class MapboxRenderer extends BaseMapRenderer<MapboxMap> {
     }
   }
 
-  private handleGetVisibleFeatures(args: unknown[], kwargs: Record<string, unknown>): void {
+  private handleGetVisibleFeatures(args: unknown[], kwargs: Record<string, unknown>): Record<string, unknown> | undefined {
     if (!this.map) return;
     const layers = kwargs.layers as string[] | undefined;
     const canvas = this.map.getCanvas();
@@ -2113,11 +2244,10 @@ export class MapboxRenderer extends BaseMapRenderer<MapboxMap> {
       type: 'FeatureCollection',
       features: features.map((f) => ({ type: 'Feature' as const, geometry: f.geometry, properties: f.properties })),
     };
-    this.model.set('_queried_features', { type: 'visible_features', data: geojson });
-    this.model.save_changes();
+    return { type: 'visible_features', data: geojson };
   }
 
-  private handleGetLayerData(args: unknown[], kwargs: Record<string, unknown>): void {
+  private handleGetLayerData(args: unknown[], kwargs: Record<string, unknown>): Record<string, unknown> | undefined {
     if (!this.map) return;
     const sourceId = kwargs.sourceId as string;
     if (!sourceId) return;
@@ -2135,8 +2265,7 @@ export class MapboxRenderer extends BaseMapRenderer<MapboxMap> {
       type: 'FeatureCollection',
       features: features.map((f) => ({ type: 'Feature' as const, geometry: f.geometry, properties: f.properties })),
     };
-    this.model.set('_queried_features', { type: 'layer_data', sourceId, data: geojson });
-    this.model.save_changes();
+    return { type: 'layer_data', sourceId, data: geojson };
   }
 
   // -------------------------------------------------------------------------
@@ -3121,7 +3250,7 @@ export class MapboxRenderer extends BaseMapRenderer<MapboxMap> {
     }
   }
 
-  private handleQueryRenderedFeatures(args: unknown[], kwargs: Record<string, unknown>): void {
+  private handleQueryRenderedFeatures(args: unknown[], kwargs: Record<string, unknown>): Record<string, unknown> | undefined {
     if (!this.map) return;
     const geometry = kwargs.geometry as mapboxgl.PointLike | [mapboxgl.PointLike, mapboxgl.PointLike] | undefined;
     const layers = kwargs.layers as string[] | undefined;
@@ -3132,23 +3261,21 @@ export class MapboxRenderer extends BaseMapRenderer<MapboxMap> {
     const features = geometry
       ? this.map.queryRenderedFeatures(geometry, { layers })
       : this.map.queryRenderedFeatures(bbox, { layers });
-    this.model.set('_queried_features', {
+    return {
       type: 'FeatureCollection',
       features: features.map((f) => ({ type: 'Feature' as const, geometry: f.geometry, properties: f.properties, id: f.id })),
-    });
-    this.model.save_changes();
+    };
   }
 
-  private handleQuerySourceFeatures(args: unknown[], kwargs: Record<string, unknown>): void {
+  private handleQuerySourceFeatures(args: unknown[], kwargs: Record<string, unknown>): Record<string, unknown> | undefined {
     if (!this.map) return;
     const sourceId = kwargs.sourceId as string;
     if (!sourceId) return;
     const features = this.map.querySourceFeatures(sourceId);
-    this.model.set('_queried_features', {
+    return {
       type: 'FeatureCollection',
       features: features.map((f) => ({ type: 'Feature' as const, geometry: f.geometry, properties: f.properties, id: f.id })),
-    });
-    this.model.save_changes();
+    };
   }
 
   // -------------------------------------------------------------------------
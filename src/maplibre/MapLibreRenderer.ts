@@ -45,6 +45,7 @@ import { COGLayerWithOpacity as COGLayer } from './layers/COGLayerWithOpacity';
 import { toProj4 } from 'geotiff-geokeys-to-proj4';
 import { ZarrLayer } from '@carbonplan/zarr-layer';
 import { BaseMapRenderer, MethodHandler } from '../core/BaseMapRenderer';
+import type { CustomMessage } from '../core/BaseMapRenderer';
 import { StateManager } from '../core/StateManager';
 import type { MapWidgetModel } from '../types/anywidget';
 import type {
@@ -58,6 +59,15 @@ import type {
   inferLayerType,
 } from '../types/maplibre';
 import type { Feature, FeatureCollection } from 'geojson';
+import { pickZoomLevel } from '../utils/geo';
+import {
+  geoArrowPositionFormat,
+  geoArrowToGeoJSON,
+  geoArrowToRows,
+  isGeoArrowTable,
+} from '../utils/geoarrow';
+import { putBuffers } from '../utils/binary';
+import type { ZoomLevel } from '../utils/geo';
 
 import { GeoEditorPlugin } from './plugins/GeoEditorPlugin';
 import { LayerControlPlugin } from './plugins/LayerControlPlugin';
@@ -108,6 +118,8 @@ async function geoKeysParser(
 export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
   private stateManager: StateManager;
   private markersMap: globalThis.Map<string, Marker> = new globalThis.Map();
+  // Cleanup functions for marker groups drawn as a circle layer
+  private markerLayersMap: globalThis.Map<string, () => void> = new globalThis.Map();
   private popupsMap: globalThis.Map<string, Popup> = new globalThis.Map();
   private controlsMap: globalThis.Map<string, maplibregl.IControl> = new globalThis.Map();
   private legendsMap: globalThis.Map<string, HTMLElement> = new globalThis.Map();
@@ -120,12 +132,27 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
   // Deck.gl overlay for COG layers
   protected deckOverlay: MapboxOverlay | null = null;
   protected deckLayers: globalThis.Map<string, unknown> = new globalThis.Map();
+  // Deck.gl overlay updates deferred while a call batch is applied
+  private deckOverlayDirty = false;
+  private deckOverlayReanchor = false;
 
   // Sentinel layer ID used as ordering anchor for deck.gl layers in interleaved mode.
   // Deck.gl layers render below this sentinel; native MapLibre layers render above it.
   protected static readonly DECK_SENTINEL_ID = '__deck-overlay-anchor';
   // Track user-added native MapLibre overlay layer IDs (for sentinel positioning)
   private userOverlayLayerIds: string[] = [];
+  // Zoom listeners swapping GeoJSON sources between simplified versions
+  private zoomLevelHandlers: globalThis.Map<string, () => void> = new globalThis.Map();
+
+  // Views serving kernel vector tiles through the anymap:// protocol, keyed
+  // by view id; the protocol is global, the tiles belong to one widget
+  private static tileViews: globalThis.Map<string, MapLibreRenderer> = new globalThis.Map();
+  // Tile requests awaiting an answer from Python, keyed by request id
+  private tileRequests: globalThis.Map<
+    number,
+    { resolve: (data: ArrayBuffer) => void; reject: (error: Error) => void }
+  > = new globalThis.Map();
+  private tileRequestId = 0;
 
   // Zarr layers
   protected zarrLayers: globalThis.Map<string, ZarrLayer> = new globalThis.Map();
@@ -358,6 +385,21 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
       if (!this.map) return;
       this.sendEvent('zoomend', { zoom: this.map.getZoom() });
     });
+
+    // High-frequency events are only sent when Python listens for them
+    this.map.on('mousemove', (e) => {
+      if (!this.hasEventListener('mousemove')) return;
+      this.sendEvent('mousemove', {
+        lngLat: [e.lngLat.lng, e.lngLat.lat],
+        point: [e.point.x, e.point.y],
+      });
+    });
+
+    this.map.on('move', () => {
+      if (!this.map || !this.hasEventListener('move')) return;
+      const center = this.map.getCenter();
+      this.sendEvent('move', { center: [center.lng, center.lat], zoom: this.map.getZoom() });
+    });
   }
 
   /**
@@ -387,6 +429,8 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
 
     // Vector data
     this.registerMethod('addGeoJSON', this.handleAddGeoJSON.bind(this));
+    this.registerMethod('appendGeoJSON', this.handleAppendGeoJSON.bind(this));
+    this.registerMethod('addKernelTileLayer', this.handleAddKernelTileLayer.bind(this));
 
     // Raster data
     this.registerMethod('addTileLayer', this.handleAddTileLayer.bind(this));
@@ -485,8 +529,8 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
     this.registerMethod('removeStyleSwitcher', this.handleRemoveStyleSwitcher.bind(this));
 
     // Data export
-    this.registerMethod('getVisibleFeatures', this.handleGetVisibleFeatures.bind(this));
-    this.registerMethod('getLayerData', this.handleGetLayerData.bind(this));
+    this.registerQuery('getVisibleFeatures', this.handleGetVisibleFeatures.bind(this));
+    this.registerQuery('getLayerData', this.handleGetLayerData.bind(this));
 
     // LiDAR layers (maplibre-gl-lidar)
     this.registerMethod('addLidarControl', this.handleAddLidarControl.bind(this));
@@ -533,8 +577,8 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
 
     // Feature Query/Filter
     this.registerMethod('setFilter', this.handleSetFilter.bind(this));
-    this.registerMethod('queryRenderedFeatures', this.handleQueryRenderedFeatures.bind(this));
-    this.registerMethod('querySourceFeatures', this.handleQuerySourceFeatures.bind(this));
+    this.registerQuery('queryRenderedFeatures', this.handleQueryRenderedFeatures.bind(this));
+    this.registerQuery('querySourceFeatures', this.handleQuerySourceFeatures.bind(this));
 
     // Video Layer
     this.registerMethod('addVideoLayer', this.handleAddVideoLayer.bind(this));
@@ -839,11 +883,14 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
   private handleAddGeoJSON(args: unknown[], kwargs: Record<string, unknown>): void {
     if (!this.map) return;
 
-    const geojson = kwargs.data as FeatureCollection | Feature;
+    const geojson = isGeoArrowTable(kwargs.data)
+      ? geoArrowToGeoJSON(kwargs.data)
+      : (kwargs.data as FeatureCollection | Feature);
     const name = kwargs.name as string;
     const layerType = kwargs.layerType as string;
     const paint = kwargs.paint as Record<string, unknown> | undefined;
     const fitBounds = kwargs.fitBounds !== false;
+    const levels = kwargs.levels as ZoomLevel[] | undefined;
 
     const sourceId = `${name}-source`;
     const layerId = name;
@@ -868,7 +915,13 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
         type: 'geojson' as const,
         data: geojson,
       };
-      this.map.addSource(sourceId, sourceConfig);
+      if (levels?.length) {
+        const data = pickZoomLevel(levels, this.map.getZoom(), geojson);
+        this.map.addSource(sourceId, { ...sourceConfig, data: data as typeof geojson });
+        this.watchZoomLevels(sourceId, levels, geojson);
+      } else {
+        this.map.addSource(sourceId, sourceConfig);
+      }
       // Persist source state for multi-cell rendering
       this.stateManager.addSource(sourceId, sourceConfig as unknown as SourceConfig);
     }
@@ -901,6 +954,176 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
     }
   }
 
+  /**
+   * Add a batch of features to a GeoJSON source created by addGeoJSON.
+   * Only the new features are sent to the worker.
+   */
+  private handleAppendGeoJSON(args: unknown[], kwargs: Record<string, unknown>): void {
+    if (!this.map) return;
+    const source = this.map.getSource(`${kwargs.name}-source`) as maplibregl.GeoJSONSource | undefined;
+    if (!source || typeof source.updateData !== 'function') return;
+    const data = isGeoArrowTable(kwargs.data)
+      ? geoArrowToGeoJSON(kwargs.data)
+      : (kwargs.data as FeatureCollection);
+    source.updateData({ add: data.features });
+  }
+
+  /**
+   * Swap a GeoJSON source between simplified versions of its data as the
+   * zoom changes, so the worker never tiles detail it cannot display.
+   */
+  private watchZoomLevels(sourceId: string, levels: ZoomLevel[], full: unknown): void {
+    if (!this.map) return;
+    this.unwatchZoomLevels(sourceId);
+    let current = pickZoomLevel(levels, this.map.getZoom(), full);
+    const onZoom = () => {
+      const source = this.map?.getSource(sourceId) as maplibregl.GeoJSONSource | undefined;
+      if (!source) {
+        this.unwatchZoomLevels(sourceId);
+        return;
+      }
+      const data = pickZoomLevel(levels, this.map!.getZoom(), full);
+      if (data !== current) {
+        current = data;
+        source.setData(data as FeatureCollection);
+      }
+    };
+    this.map.on('zoomend', onZoom);
+    this.zoomLevelHandlers.set(sourceId, onZoom);
+  }
+
+  private unwatchZoomLevels(sourceId: string): void {
+    const onZoom = this.zoomLevelHandlers.get(sourceId);
+    if (onZoom) {
+      this.map?.off('zoomend', onZoom);
+      this.zoomLevelHandlers.delete(sourceId);
+    }
+  }
+
+  /**
+   * Add a vector tile layer whose tiles are cut by Python on request.
+   */
+  private handleAddKernelTileLayer(args: unknown[], kwargs: Record<string, unknown>): void {
+    if (!this.map) return;
+
+    const name = kwargs.name as string;
+    const type = (kwargs.layerType as string) || 'circle';
+    const paint = (kwargs.paint as Record<string, unknown>) || this.getDefaultPaint(type);
+    const sourceId = `${name}-source`;
+
+    MapLibreRenderer.tileViews.set(this.viewId, this);
+
+    if (!this.map.getSource(sourceId)) {
+      const sourceConfig = {
+        type: 'vector' as const,
+        tiles: [`anymap://${this.viewId}/${encodeURIComponent(sourceId)}/{z}/{x}/{y}`],
+        maxzoom: (kwargs.maxzoom as number) ?? 14,
+        ...(kwargs.bounds ? { bounds: kwargs.bounds as [number, number, number, number] } : {}),
+      };
+      this.map.addSource(sourceId, sourceConfig);
+      this.stateManager.addSource(sourceId, sourceConfig as unknown as SourceConfig);
+    }
+
+    if (!this.map.getLayer(name)) {
+      const layerConfig = {
+        id: name,
+        type: type as maplibregl.LayerSpecification['type'],
+        source: sourceId,
+        'source-layer': kwargs.sourceLayer as string,
+        paint,
+      };
+      this.map.addLayer(layerConfig as maplibregl.AddLayerObject);
+      this.stateManager.addLayer(name, layerConfig as unknown as LayerConfig);
+      this.userOverlayLayerIds.push(name);
+    }
+
+    if (kwargs.fitBounds !== false && kwargs.bounds) {
+      const bounds = kwargs.bounds as [number, number, number, number];
+      this.map.fitBounds(
+        [
+          [bounds[0], bounds[1]],
+          [bounds[2], bounds[3]],
+        ],
+        { padding: 50 }
+      );
+    }
+  }
+
+  /**
+   * Load an anymap://<view>/<source>/<z>/<x>/<y> tile from the kernel.
+   * Registered with maplibregl.addProtocol.
+   */
+  static async loadKernelTile(
+    params: maplibregl.RequestParameters,
+    abortController: AbortController
+  ): Promise<maplibregl.GetResourceResponse<ArrayBuffer>> {
+    const [viewId, sourceId, z, x, y] = params.url.slice('anymap://'.length).split('/');
+    const renderer = MapLibreRenderer.tileViews.get(viewId);
+    if (!renderer) {
+      throw new Error(`No map view serves ${params.url}`);
+    }
+    const data = await renderer.requestTile(
+      decodeURIComponent(sourceId),
+      Number(z),
+      Number(x),
+      Number(y),
+      abortController.signal
+    );
+    return { data };
+  }
+
+  /**
+   * Ask Python for a tile of a kernel tile source.
+   */
+  private requestTile(
+    sourceId: string,
+    z: number,
+    x: number,
+    y: number,
+    signal: AbortSignal
+  ): Promise<ArrayBuffer> {
+    return new Promise((resolve, reject) => {
+      const id = ++this.tileRequestId;
+      this.tileRequests.set(id, { resolve, reject });
+      // MapLibre cancels requests for tiles that left the viewport; Python
+      // still cuts them, and keeps them in its cache
+      signal.addEventListener('abort', () => {
+        this.tileRequests.delete(id);
+        reject(new DOMException('Tile request aborted', 'AbortError'));
+      });
+      this.model.send({ type: 'tile_request', id, view: this.viewId, source: sourceId, z, x, y });
+    });
+  }
+
+  protected onCustomMessage(msg: CustomMessage, buffers?: (DataView | ArrayBuffer)[]): void {
+    if (msg?.type !== 'tile') {
+      super.onCustomMessage(msg, buffers);
+      return;
+    }
+    if (msg.buffer_paths && buffers) {
+      putBuffers(msg as Record<string, unknown>, msg.buffer_paths, buffers);
+    }
+    // Tile replies go to every view; request ids are only unique per view
+    if (msg.view !== this.viewId) return;
+    const request = this.tileRequests.get(msg.id as number);
+    if (!request) return;
+    this.tileRequests.delete(msg.id as number);
+    if (msg.error) {
+      request.reject(new Error(msg.error));
+      return;
+    }
+    const view = msg.data as DataView | ArrayBuffer | undefined;
+    if (!view) {
+      request.resolve(new ArrayBuffer(0));
+    } else if (view instanceof ArrayBuffer) {
+      request.resolve(view);
+    } else {
+      request.resolve(
+        view.buffer.slice(view.byteOffset, view.byteOffset + view.byteLength) as ArrayBuffer
+      );
+    }
+  }
+
   private inferLayerType(geometryType: string): string {
     switch (geometryType) {
       case 'Point':
@@ -1315,6 +1538,13 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
   private handleRemoveMarker(args: unknown[], kwargs: Record<string, unknown>): void {
     const [id] = args as [string];
 
+    const removeLayer = this.markerLayersMap.get(id);
+    if (removeLayer) {
+      removeLayer();
+      this.markerLayersMap.delete(id);
+      return;
+    }
+
     // Remove via group tracking (handles both single markers and marker groups)
     const group = this.markerGroupsMap.get(id);
     if (group) {
@@ -1350,42 +1580,45 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
   private handleAddMarkers(args: unknown[], kwargs: Record<string, unknown>): void {
     if (!this.map) return;
     const id = (kwargs.id as string) || `markers-${Date.now()}`;
-    const markers = kwargs.markers as Array<{
-      lngLat: [number, number];
-      popup?: string;
-      tooltip?: string;
-      scale?: number;
-      popupMaxWidth?: string;
-      tooltipMaxWidth?: string;
-    }>;
+    // Parallel arrays: flat [lng, lat, ...] positions and per-marker labels
+    const lngLat = kwargs.lngLat as Float64Array;
+    const popups = kwargs.popups as Array<string | null> | null;
+    const tooltips = kwargs.tooltips as Array<string | null> | null;
     const color = (kwargs.color as string) || '#3388ff';
-    const defaultScale = (kwargs.scale as number) ?? 1.0;
-    const defaultPopupMaxWidth = (kwargs.popupMaxWidth as string) || '240px';
-    const defaultTooltipMaxWidth = (kwargs.tooltipMaxWidth as string) || '240px';
+    const scale = (kwargs.scale as number) ?? 1.0;
+    const popupMaxWidth = (kwargs.popupMaxWidth as string) || '240px';
+    const tooltipMaxWidth = (kwargs.tooltipMaxWidth as string) || '240px';
     const draggable = (kwargs.draggable as boolean) || false;
 
-    if (!markers || !Array.isArray(markers)) {
-      console.error('addMarkers requires markers array');
+    if (!lngLat) {
+      console.error('addMarkers requires lngLat array');
+      return;
+    }
+
+    if (kwargs.asLayer) {
+      this.addMarkerLayer(id, lngLat, popups, tooltips, {
+        color, scale, popupMaxWidth, tooltipMaxWidth, draggable,
+      });
       return;
     }
 
     const groupMarkers: Marker[] = [];
 
-    for (let i = 0; i < markers.length; i++) {
-      const markerData = markers[i];
+    for (let i = 0; i < lngLat.length / 2; i++) {
       const markerId = `${id}-${i}`;
-      const scale = markerData.scale ?? defaultScale;
-      const popupMaxWidth = markerData.popupMaxWidth || defaultPopupMaxWidth;
-      const tooltipMaxWidth = markerData.tooltipMaxWidth || defaultTooltipMaxWidth;
+      const lng = lngLat[2 * i];
+      const lat = lngLat[2 * i + 1];
+      const popup = popups?.[i];
+      const tooltip = tooltips?.[i];
 
-      const marker = new Marker({ color, scale, draggable }).setLngLat(markerData.lngLat);
+      const marker = new Marker({ color, scale, draggable }).setLngLat([lng, lat]);
 
-      if (markerData.popup) {
-        marker.setPopup(new Popup({ maxWidth: popupMaxWidth }).setHTML(this.wrapWithContrastStyle(markerData.popup)));
+      if (popup) {
+        marker.setPopup(new Popup({ maxWidth: popupMaxWidth }).setHTML(this.wrapWithContrastStyle(popup)));
       }
 
       // Add tooltip (shown on hover)
-      if (markerData.tooltip) {
+      if (tooltip) {
         const tooltipPopup = new Popup({
           closeButton: false,
           closeOnClick: false,
@@ -1393,10 +1626,9 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
           offset: [0, -30 * scale], // Offset above the marker based on scale
           anchor: 'bottom',
         });
-        tooltipPopup.setHTML(this.wrapWithContrastStyle(markerData.tooltip));
+        tooltipPopup.setHTML(this.wrapWithContrastStyle(tooltip));
 
         const markerElement = marker.getElement();
-        const [lng, lat] = markerData.lngLat;
         let isHovering = false;
 
         markerElement.addEventListener('mouseenter', () => {
@@ -1431,6 +1663,137 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
     }
   }
 
+  /**
+   * Draw a large marker group as one circle layer instead of DOM markers.
+   * Popups, tooltips and dragging are handled by picking the feature
+   * under the pointer, whose id indexes the popup and tooltip arrays.
+   */
+  private addMarkerLayer(
+    id: string,
+    lngLat: Float64Array,
+    popups: Array<string | null> | null,
+    tooltips: Array<string | null> | null,
+    options: {
+      color: string;
+      scale: number;
+      popupMaxWidth: string;
+      tooltipMaxWidth: string;
+      draggable: boolean;
+    },
+  ): void {
+    if (!this.map) return;
+    const map = this.map;
+    const sourceId = `${id}-source`;
+
+    const features: Feature[] = [];
+    for (let i = 0; i < lngLat.length / 2; i++) {
+      features.push({
+        type: 'Feature',
+        id: i,
+        geometry: { type: 'Point', coordinates: [lngLat[2 * i], lngLat[2 * i + 1]] },
+        properties: {},
+      });
+    }
+
+    map.addSource(sourceId, { type: 'geojson', data: { type: 'FeatureCollection', features } });
+    map.addLayer({
+      id,
+      type: 'circle',
+      source: sourceId,
+      paint: {
+        'circle-color': options.color,
+        'circle-radius': 6 * options.scale,
+        'circle-stroke-color': '#ffffff',
+        'circle-stroke-width': 1.5,
+      },
+    });
+
+    const tooltipPopup = new Popup({
+      closeButton: false,
+      closeOnClick: false,
+      maxWidth: options.tooltipMaxWidth,
+      offset: 8 * options.scale,
+      anchor: 'bottom',
+    });
+    let dragIndex: number | null = null;
+
+    const onClick = (e: maplibregl.MapLayerMouseEvent): void => {
+      const index = e.features?.[0]?.id as number | undefined;
+      const popup = index === undefined ? null : popups?.[index];
+      if (!popup) return;
+      new Popup({ maxWidth: options.popupMaxWidth })
+        .setLngLat([lngLat[2 * index!], lngLat[2 * index! + 1]])
+        .setHTML(this.wrapWithContrastStyle(popup))
+        .addTo(map);
+    };
+
+    const onHover = (e: maplibregl.MapLayerMouseEvent): void => {
+      if (dragIndex !== null) return;
+      map.getCanvas().style.cursor = options.draggable ? 'move' : 'pointer';
+      const index = e.features?.[0]?.id as number | undefined;
+      const tooltip = index === undefined ? null : tooltips?.[index];
+      if (!tooltip) {
+        tooltipPopup.remove();
+        return;
+      }
+      tooltipPopup
+        .setLngLat([lngLat[2 * index!], lngLat[2 * index! + 1]])
+        .setHTML(this.wrapWithContrastStyle(tooltip))
+        .addTo(map);
+    };
+
+    const onLeave = (): void => {
+      if (dragIndex !== null) return;
+      map.getCanvas().style.cursor = '';
+      tooltipPopup.remove();
+    };
+
+    const onDragStart = (e: maplibregl.MapLayerMouseEvent): void => {
+      const index = e.features?.[0]?.id;
+      if (index === undefined) return;
+      // Keep the map from panning while the marker is dragged
+      e.preventDefault();
+      dragIndex = index as number;
+      tooltipPopup.remove();
+      map.on('mousemove', onDrag);
+      map.once('mouseup', onDragEnd);
+    };
+
+    const onDrag = (e: maplibregl.MapMouseEvent): void => {
+      if (dragIndex === null) return;
+      lngLat[2 * dragIndex] = e.lngLat.lng;
+      lngLat[2 * dragIndex + 1] = e.lngLat.lat;
+      const source = map.getSource(sourceId) as maplibregl.GeoJSONSource | undefined;
+      source?.updateData({
+        update: [{ id: dragIndex, newGeometry: { type: 'Point', coordinates: [e.lngLat.lng, e.lngLat.lat] } }],
+      });
+    };
+
+    const onDragEnd = (): void => {
+      map.off('mousemove', onDrag);
+      dragIndex = null;
+      map.getCanvas().style.cursor = '';
+    };
+
+    map.on('click', id, onClick);
+    map.on('mousemove', id, onHover);
+    map.on('mouseleave', id, onLeave);
+    if (options.draggable) {
+      map.on('mousedown', id, onDragStart);
+    }
+
+    this.markerLayersMap.set(id, () => {
+      map.off('click', id, onClick);
+      map.off('mousemove', id, onHover);
+      map.off('mouseleave', id, onLeave);
+      map.off('mousedown', id, onDragStart);
+      map.off('mousemove', onDrag);
+      tooltipPopup.remove();
+      if (map.getLayer(id)) map.removeLayer(id);
+      if (map.getSource(sourceId)) map.removeSource(sourceId);
+    });
+  }
+
   private handleAddPopup(args: unknown[], kwargs: Record<string, unknown>): void {
     if (!this.map) return;
     const layerId = kwargs.layerId as string;
@@ -1742,6 +2105,7 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
    * so they render below native MapLibre layers in interleaved mode.
    */
   protected updateDeckOverlay(forceReanchor = false): void {
+    if (this.deferDeckOverlayUpdate(forceReanchor)) return;
     if (!this.deckOverlay) return;
 
     const sentinelId = MapLibreRenderer.DECK_SENTINEL_ID;
@@ -1766,6 +2130,32 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
     this.scheduleLayerControlOrderSync();
   }
 
+  /**
+   * Postpone a deck.gl overlay update until the current call batch ends.
+   * Returns true if the update was deferred.
+   */
+  protected deferDeckOverlayUpdate(forceReanchor = false): boolean {
+    if (!this.isBatching()) return false;
+    this.deckOverlayDirty = true;
+    this.deckOverlayReanchor = this.deckOverlayReanchor || forceReanchor;
+    return true;
+  }
+
+  /**
+   * Rebuild the deck.gl overlay once after a batch of calls, then request a
+   * single repaint. MapLibre folds the repaint requests made while the batch
+   * ran into the same animation frame, so the batch is drawn at once.
+   */
+  protected override onBatchEnd(): void {
+    if (this.deckOverlayDirty) {
+      const forceReanchor = this.deckOverlayReanchor;
+      this.deckOverlayDirty = false;
+      this.deckOverlayReanchor = false;
+      this.updateDeckOverlay(forceReanchor);
+    }
+    this.map?.triggerRepaint();
+  }
+
   private handleLayerControlReorder(layerOrder: string[]): void {
     if (!this.map || this.deckLayers.size === 0) {
       return;
@@ -2123,7 +2513,8 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
     this.initializeDeckOverlay();
 
     const id = kwargs.id as string || `scatterplot-${Date.now()}`;
-    const data = kwargs.data as unknown[];
+    const arrow = isGeoArrowTable(kwargs.data) ? kwargs.data : null;
+    const data = arrow ? geoArrowToRows(arrow, 'coordinates') : (kwargs.data as unknown[]);
 
     const layer = new ScatterplotLayer({
       id,
@@ -2159,11 +2550,13 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
     this.initializeDeckOverlay();
 
     const id = kwargs.id as string || `path-${Date.now()}`;
-    const data = kwargs.data as unknown[];
+    const arrow = isGeoArrowTable(kwargs.data) ? kwargs.data : null;
+    const data = arrow ? geoArrowToRows(arrow, 'path') : (kwargs.data as unknown[]);
 
     const layer = new PathLayer({
       id,
       data,
+      ...(arrow && { positionFormat: geoArrowPositionFormat(arrow) }),
       pickable: kwargs.pickable !== false,
       opacity: kwargs.opacity as number ?? 0.8,
       widthScale: kwargs.widthScale as number ?? 1,
@@ -2186,11 +2579,13 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
     this.initializeDeckOverlay();
 
     const id = kwargs.id as string || `polygon-${Date.now()}`;
-    const data = kwargs.data as unknown[];
+    const arrow = isGeoArrowTable(kwargs.data) ? kwargs.data : null;
+    const data = arrow ? geoArrowToRows(arrow, 'polygon') : (kwargs.data as unknown[]);
 
     const layer = new PolygonLayer({
       id,
       data,
+      ...(arrow && { positionFormat: geoArrowPositionFormat(arrow) }),
       pickable: kwargs.pickable !== false,
       opacity: kwargs.opacity as number ?? 0.5,
       stroked: kwargs.stroked !== false,
@@ -2398,7 +2793,7 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
     this.initializeDeckOverlay();
 
     const id = kwargs.id as string || `geojson-${Date.now()}`;
-    const data = kwargs.data as unknown;
+    const data = isGeoArrowTable(kwargs.data) ? geoArrowToGeoJSON(kwargs.data) : kwargs.data;
 
     const layer = new GeoJsonLayer({
       id,
@@ -2810,6 +3205,7 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
       source = this.map.getSource(sourceId + '-source') as maplibregl.GeoJSONSource;
     }
     if (source && typeof source.setData === 'function') {
+      this.unwatchZoomLevels(source.id);
       source.setData(data as any);
     }
   }
@@ -3282,38 +3678,30 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
   // Data Export handlers (Section 7)
   // -------------------------------------------------------------------------
 
-  protected handleGetVisibleFeatures(args: unknown[], kwargs: Record<string, unknown>): void {
+  protected handleGetVisibleFeatures(args: unknown[], kwargs: Record<string, unknown>): Record<string, unknown> | undefined {
     if (!this.map) return;
     const layers = kwargs.layers as string[] | undefined;
 
-    try {
-      const features = layers
-        ? this.map.queryRenderedFeatures(undefined, { layers })
-        : this.map.queryRenderedFeatures();
+    const features = layers
+      ? this.map.queryRenderedFeatures(undefined, { layers })
+      : this.map.queryRenderedFeatures();
 
-      const geojson: FeatureCollection = {
-        type: 'FeatureCollection',
-        features: features.map(f => ({
-          type: 'Feature' as const,
-          geometry: f.geometry,
-          properties: f.properties,
-        })),
-      };
+    const geojson: FeatureCollection = {
+      type: 'FeatureCollection',
+      features: features.map(f => ({
+        type: 'Feature' as const,
+        geometry: f.geometry,
+        properties: f.properties,
+      })),
+    };
 
-      // Send back via model
-      if (this.model) {
-        this.model.set('_queried_features', {
-          type: 'visible_features',
-          data: geojson,
-        });
-        this.model.save_changes();
-      }
-    } catch (err) {
-      console.warn('Error getting visible features:', err);
-    }
+    return {
+      type: 'visible_features',
+      data: geojson,
+    };
   }
 
-  protected handleGetLayerData(args: unknown[], kwargs: Record<string, unknown>): void {
+  protected handleGetLayerData(args: unknown[], kwargs: Record<string, unknown>): Record<string, unknown> | undefined {
     if (!this.map) return;
     const sourceId = kwargs.sourceId as string;
     if (!sourceId) return;
@@ -3352,14 +3740,11 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
       })),
     };
 
-    if (this.model) {
-      this.model.set('_queried_features', {
-        type: 'layer_data',
-        sourceId: resolvedSourceId,
-        data: geojson,
-      });
-      this.model.save_changes();
-    }
+    return {
+      type: 'layer_data',
+      sourceId: resolvedSourceId,
+      data: geojson,
+    };
   }
 
   // -------------------------------------------------------------------------
@@ -5338,7 +5723,7 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
     this.stateManager.setLayerFilter(layerId, filter);
   }
 
-  private handleQueryRenderedFeatures(args: unknown[], kwargs: Record<string, unknown>): void {
+  private handleQueryRenderedFeatures(args: unknown[], kwargs: Record<string, unknown>): Record<string, unknown> | undefined {
     if (!this.map) return;
     const geometry = kwargs.geometry as { x: number; y: number } | [[number, number], [number, number]] | undefined;
     const layers = kwargs.layers as string[] | undefined;
@@ -5364,11 +5749,10 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
       })),
     };
 
-    this.model.set('_queried_features', result);
-    this.model.save_changes();
+    return result;
   }
 
-  private handleQuerySourceFeatures(args: unknown[], kwargs: Record<string, unknown>): void {
+  private handleQuerySourceFeatures(args: unknown[], kwargs: Record<string, unknown>): Record<string, unknown> | undefined {
     if (!this.map) return;
     const sourceId = kwargs.sourceId as string;
     const sourceLayer = kwargs.sourceLayer as string | undefined;
@@ -5395,8 +5779,7 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
       })),
     };
 
-    this.model.set('_queried_features', result);
-    this.model.save_changes();
+    return result;
   }
 
   // -------------------------------------------------------------------------
@@ -6372,6 +6755,13 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
   }
 
   destroy(): void {
+    // Stop serving kernel tiles
+    if (MapLibreRenderer.tileViews.get(this.viewId) === this) {
+      MapLibreRenderer.tileViews.delete(this.viewId);
+    }
+    this.tileRequests.forEach(request => request.reject(new Error('Map destroyed')));
+    this.tileRequests.clear();
+
     // Clean up plugins
     this.pluginInstances.forEach((_instance, name) => {
       this.handleRemovePlugin([name], {});
@@ -6496,6 +6886,7 @@ export class MapLibreRenderer extends BaseMapRenderer<MapLibreMap> {
     this.markersMap.forEach((marker) => marker.remove());
     this.markersMap.clear();
     this.markerGroupsMap.clear();
+    this.markerLayersMap.clear();
     this.markerAdapter = null;
 
     // Remove popups
@@ -25,6 +25,9 @@ import '../styles/maplibre.css';
 const pmtilesProtocol = new Protocol();
 addProtocol('pmtiles', pmtilesProtocol.tile);
 
+// Register the protocol of vector tiles cut by the kernel (add_vector(tiled=True))
+addProtocol('anymap', MapLibreRenderer.loadKernelTile);
+
 /**
  * Store renderer reference on element for cleanup and multi-cell support.
  */
@@ -29,6 +29,22 @@ export interface JsEvent {
   data: unknown;
   /** Event timestamp */
   timestamp: number;
+  /** Sequence number within the sending view */
+  seq?: number;
+  /** Id of the sending view */
+  view?: string;
+}
+
+/**
+ * Per-event-type delivery options set by Python's on_map_event().
+ */
+export interface EventOptions {
+  /** Send at most one event per interval (leading and trailing edge) */
+  throttle_ms?: number;
+  /** Send only after no event arrived for this long */
+  debounce_ms?: number;
+  /** 'last' keeps only the newest undelivered event, 'all' keeps every one */
+  coalesce?: 'last' | 'all';
 }
 
 /**
@@ -77,6 +93,20 @@ export interface ControlState {
   options?: Record<string, unknown>;
 }
 
+/**
+ * Incremental change to a state dict trait (``_layers``, ``_sources``, ...).
+ */
+export interface StatePatchOp {
+  /** Name of the dict trait */
+  trait: string;
+  /** 'set', 'merge' or 'delete' an entry, 'append' or 'discard' a list item */
+  op: 'set' | 'merge' | 'delete' | 'append' | 'discard';
+  /** Entry key, e.g. the layer id */
+  key: string;
+  /** New entry, fields to merge, or list item */
+  value?: unknown;
+}
+
 /**
  * Plugin descriptor for dynamic plugin loading.
  */
@@ -104,7 +134,10 @@ export interface MapWidgetModel extends AnyModel {
   get(key: 'bearing'): number;
   get(key: 'pitch'): number;
   get(key: '_js_calls'): JsCall[];
-  get(key: '_js_events'): JsEvent[];
+  get(key: '_js_calls_ack'): number;
+  get(key: '_js_events'): Record<string, JsEvent[]>;
+  get(key: '_js_events_ack'): Record<string, number>;
+  get(key: '_event_options'): Record<string, EventOptions>;
   get(key: '_layers'): Record<string, LayerState>;
   get(key: '_sources'): Record<string, SourceState>;
   get(key: '_controls'): Record<string, ControlState>;
@@ -119,7 +152,8 @@ export interface MapWidgetModel extends AnyModel {
   set(key: 'center', value: [number, number]): void;
   set(key: 'zoom', value: number): void;
   set(key: 'clicked', value: ClickedPoint): void;
-  set(key: '_js_events', value: JsEvent[]): void;
+  set(key: '_js_events', value: Record<string, JsEvent[]>): void;
+  set(key: '_js_calls_ack', value: number): void;
   set(key: '_draw_data', value: FeatureCollection): void;
   set(key: '_queried_features', value: Record<string, unknown>): void;
   set(key: 'current_bounds', value: [number, number, number, number]): void;
@@ -129,6 +163,7 @@ export interface MapWidgetModel extends AnyModel {
 
   // Methods
   save_changes(): void;
+  send(content: unknown, callbacks?: unknown, buffers?: ArrayBuffer[] | ArrayBufferView[]): void;
   on(event: string, callback: (...args: any[]) => void): void;
   off(event: string, callback?: (...args: any[]) => void): void;
 }
@@ -0,0 +1,202 @@
+/**
+ * Binary array utilities.
+ *
+ * Python sends NumPy arrays as widget buffers wrapped in a marker object
+ * ({ __ndarray__: true, dtype, shape, buffer }). In exported HTML the
+ * buffer is a base64 string instead.
+ *
+ * Stored JSON payloads arrive as their encoding, zlib-compressed when large
+ * ({ __compressed__: 'deflate' | 'identity', buffer }), and are decoded
+ * asynchronously.
+ */
+
+type TypedArray =
+  | Int8Array
+  | Uint8Array
+  | Int16Array
+  | Uint16Array
+  | Int32Array
+  | Uint32Array
+  | Float32Array
+  | Float64Array;
+
+type TypedArrayConstructor = {
+  new (buffer: ArrayBufferLike, byteOffset?: number, length?: number): TypedArray;
+  BYTES_PER_ELEMENT: number;
+};
+
+const TYPED_ARRAYS: Record<string, TypedArrayConstructor> = {
+  int8: Int8Array,
+  uint8: Uint8Array,
+  int16: Int16Array,
+  uint16: Uint16Array,
+  int32: Int32Array,
+  uint32: Uint32Array,
+  float32: Float32Array,
+  float64: Float64Array,
+};
+
+// Markers sit in kwargs.data.attributes.<accessor>.value at most
+const MAX_DEPTH = 4;
+
+interface BinaryArrayMarker {
+  __ndarray__: true;
+  dtype: string;
+  shape?: number[];
+  buffer: DataView | ArrayBuffer | string;
+}
+
+function isMarker(value: unknown): value is BinaryArrayMarker {
+  return (
+    typeof value === 'object' &&
+    value !== null &&
+    (value as Record<string, unknown>).__ndarray__ === true
+  );
+}
+
+function isPlainObject(value: unknown): value is Record<string, unknown> {
+  return (
+    typeof value === 'object' &&
+    value !== null &&
+    !Array.isArray(value) &&
+    !ArrayBuffer.isView(value) &&
+    !(value instanceof ArrayBuffer)
+  );
+}
+
+function base64ToBytes(data: string): Uint8Array {
+  const binary = atob(data);
+  const bytes = new Uint8Array(binary.length);
+  for (let i = 0; i < binary.length; i++) {
+    bytes[i] = binary.charCodeAt(i);
+  }
+  return bytes;
+}
+
+function toBytes(buffer: DataView | ArrayBuffer | string): Uint8Array {
+  if (typeof buffer === 'string') {
+    return base64ToBytes(buffer);
+  }
+  if (buffer instanceof ArrayBuffer) {
+    return new Uint8Array(buffer);
+  }
+  return new Uint8Array(buffer.buffer, buffer.byteOffset, buffer.byteLength);
+}
+
+/**
+ * Convert a binary array marker to a typed array, without copying when
+ * the buffer is suitably aligned.
+ */
+export function toTypedArray(marker: BinaryArrayMarker): TypedArray {
+  const ArrayType = TYPED_ARRAYS[marker.dtype];
+  if (!ArrayType) {
+    throw new Error(`Unsupported binary array dtype: ${marker.dtype}`);
+  }
+
+  let bytes = toBytes(marker.buffer);
+
+  if (bytes.byteOffset % ArrayType.BYTES_PER_ELEMENT !== 0) {
+    bytes = bytes.slice();
+  }
+  return new ArrayType(
+    bytes.buffer,
+    bytes.byteOffset,
+    bytes.byteLength / ArrayType.BYTES_PER_ELEMENT
+  );
+}
+
+/**
+ * Replace binary array markers in method kwargs with typed arrays.
+ * Only plain objects are searched; JSON arrays are left untouched.
+ */
+export function decodeBinaryArrays<T>(value: T, depth: number = 0): T {
+  if (isMarker(value)) {
+    return toTypedArray(value) as unknown as T;
+  }
+  if (!isPlainObject(value) || depth > MAX_DEPTH) {
+    return value;
+  }
+
+  let result: Record<string, unknown> | null = null;
+  for (const [key, item] of Object.entries(value)) {
+    const decoded = decodeBinaryArrays(item, depth + 1);
+    if (decoded !== item) {
+      result = result || { ...value };
+      result[key] = decoded;
+    }
+  }
+  return (result || value) as T;
+}
+
+/**
+ * Put binary buffers of a custom message back at their paths.
+ */
+export function putBuffers(
+  obj: Record<string, unknown>,
+  bufferPaths: (string | number)[][],
+  buffers: (DataView | ArrayBuffer)[]
+): void {
+  bufferPaths.forEach((path, i) => {
+    let target = obj as Record<string | number, unknown>;
+    for (const key of path.slice(0, -1)) {
+      target = target[key] as Record<string | number, unknown>;
+    }
+    const buffer = buffers[i];
+    target[path[path.length - 1]] =
+      buffer instanceof ArrayBuffer ? new DataView(buffer) : buffer;
+  });
+}
+
+interface CompressedPayload {
+  __compressed__: 'deflate' | 'identity';
+  buffer: DataView | ArrayBuffer | string;
+}
+
+/**
+ * Check whether a value is a compressed payload marker.
+ */
+export function isCompressed(value: unknown): value is CompressedPayload {
+  return (
+    typeof value === 'object' &&
+    value !== null &&
+    ['deflate', 'identity'].includes(
+      (value as Record<string, unknown>).__compressed__ as string
+    )
+  );
+}
+
+/**
+ * Inflate a compressed payload and parse its JSON.
+ */
+export async function inflatePayload(value: CompressedPayload): Promise<unknown> {
+  if (value.__compressed__ === 'identity') {
+    return JSON.parse(new TextDecoder().decode(toBytes(value.buffer)));
+  }
+  const stream = new DecompressionStream('deflate');
+  const writer = stream.writable.getWriter();
+  // Corrupt data is reported by the readable side
+  writer.write(toBytes(value.buffer) as BufferSource).catch(() => undefined);
+  writer.close().catch(() => undefined);
+  return JSON.parse(await new Response(stream.readable).text());
+}
+
+/**
+ * Inflate the compressed values of a record. Values that fail to inflate
+ * are replaced by null.
+ */
+export async function inflateValues(
+  values: Record<string, unknown>
+): Promise<Record<string, unknown>> {
+  const entries = await Promise.all(
+    Object.entries(values).map(async ([key, value]): Promise<[string, unknown]> => {
+      if (!isCompressed(value)) return [key, value];
+      try {
+        return [key, await inflatePayload(value)];
+      } catch (error) {
+        console.error(`Failed to inflate ${key}:`, error);
+        return [key, null];
+      }
+    })
+  );
+  return Object.fromEntries(entries);
+}
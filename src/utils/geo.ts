@@ -34,3 +34,21 @@ export function inferGeometryType(geometryType: string): string {
       return 'point';
   }
 }
+
+/**
+ * Simplified version of vector data shown in a zoom band.
+ */
+export interface ZoomLevel {
+  minzoom: number;
+  maxzoom: number;
+  data: unknown;
+}
+
+/**
+ * Pick the data to show at a zoom: the level whose band contains it, else
+ * the full-resolution data.
+ */
+export function pickZoomLevel(levels: ZoomLevel[], zoom: number, full: unknown): unknown {
+  const level = levels.find(l => zoom >= l.minzoom && zoom < l.maxzoom);
+  return level ? level.data : full;
+}
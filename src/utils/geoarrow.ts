@@ -0,0 +1,173 @@
+/**
+ * GeoArrow utilities.
+ *
+ * Python sends Arrow and GeoParquet data as GeoArrow buffers: a flat
+ * coordinate array plus one offsets array per nesting level, innermost
+ * first ({ __geoarrow__: 'polygon', coords, offsets: { 0: ring offsets,
+ * 1: geometry offsets }, ... }). Layer data is built from the typed arrays
+ * directly, without a GeoJSON or JSON parsing step.
+ */
+
+import type { Feature, FeatureCollection, Geometry } from 'geojson';
+
+/**
+ * GeoArrow geometry column and its property columns.
+ */
+export interface GeoArrowTable {
+  __geoarrow__: string;
+  length: number;
+  dims: number;
+  coords: Float64Array;
+  offsets: Record<string, Int32Array>;
+  properties: Record<string, ArrayLike<unknown>>;
+  bounds?: [number, number, number, number] | null;
+}
+
+const GEOJSON_TYPES: Record<string, Geometry['type']> = {
+  point: 'Point',
+  linestring: 'LineString',
+  polygon: 'Polygon',
+  multipoint: 'MultiPoint',
+  multilinestring: 'MultiLineString',
+  multipolygon: 'MultiPolygon',
+};
+
+// Offsets level that delimits single geometries (points have none)
+const SINGLE_LEVELS: Record<string, number> = {
+  point: -1,
+  linestring: 0,
+  polygon: 1,
+};
+
+/**
+ * Check whether a value is a GeoArrow table sent from Python.
+ */
+export function isGeoArrowTable(value: unknown): value is GeoArrowTable {
+  return (
+    typeof value === 'object' &&
+    value !== null &&
+    typeof (value as Record<string, unknown>).__geoarrow__ === 'string'
+  );
+}
+
+function levels(table: GeoArrowTable): number {
+  return Object.keys(table.offsets).length;
+}
+
+function position(table: GeoArrowTable, index: number): number[] {
+  const { coords, dims } = table;
+  return Array.from(coords.subarray(index * dims, (index + 1) * dims));
+}
+
+/**
+ * Nested coordinate arrays of the items start..end of an offsets level.
+ * Level -1 is the coordinates themselves.
+ */
+function nest(table: GeoArrowTable, level: number, start: number, end: number): unknown[] {
+  const result: unknown[] = [];
+  if (level < 0) {
+    for (let i = start; i < end; i++) {
+      result.push(position(table, i));
+    }
+    return result;
+  }
+  const offsets = table.offsets[level];
+  for (let i = start; i < end; i++) {
+    result.push(nest(table, level - 1, offsets[i], offsets[i + 1]));
+  }
+  return result;
+}
+
+function geometry(table: GeoArrowTable, index: number): Geometry | null {
+  const type = GEOJSON_TYPES[table.__geoarrow__];
+  const top = levels(table) - 1;
+  if (top < 0) {
+    const coordinates = position(table, index);
+    // Empty points are stored as NaN coordinates
+    return Number.isNaN(coordinates[0]) ? null : ({ type, coordinates } as Geometry);
+  }
+  const offsets = table.offsets[top];
+  if (offsets[index] === offsets[index + 1]) return null;
+  const coordinates = nest(table, top - 1, offsets[index], offsets[index + 1]);
+  return { type, coordinates } as Geometry;
+}
+
+function properties(table: GeoArrowTable, index: number): Record<string, unknown> {
+  const result: Record<string, unknown> = {};
+  for (const [name, values] of Object.entries(table.properties)) {
+    const value = values[index];
+    result[name] = typeof value === 'number' && Number.isNaN(value) ? null : value;
+  }
+  return result;
+}
+
+/**
+ * Convert a GeoArrow table to a GeoJSON FeatureCollection.
+ */
+export function geoArrowToGeoJSON(table: GeoArrowTable): FeatureCollection {
+  const features: Feature[] = [];
+  for (let i = 0; i < table.length; i++) {
+    features.push({
+      id: String(i),
+      type: 'Feature',
+      properties: properties(table, i),
+      geometry: geometry(table, i) as Geometry,
+    });
+  }
+  return { type: 'FeatureCollection', features };
+}
+
+/**
+ * Convert a GeoArrow table to deck.gl row objects, one per single geometry
+ * (multi-geometries are exploded), with the geometry under ``key``.
+ *
+ * Points become [x, y(, z)] subarrays. Lines become flat coordinate
+ * subarrays and polygons { positions, holeIndices } objects, so layers
+ * must set ``positionFormat`` to 'XY' or 'XYZ' from ``table.dims``.
+ */
+export function geoArrowToRows(table: GeoArrowTable, key: string): Record<string, unknown>[] {
+  const { coords, dims, offsets } = table;
+  const type = table.__geoarrow__;
+  const multi = type.startsWith('multi');
+  const single = SINGLE_LEVELS[multi ? type.slice(5) : type] ?? -1;
+  const parts = multi ? offsets[single + 1] : null;
+
+  const rows: Record<string, unknown>[] = [];
+  for (let i = 0; i < table.length; i++) {
+    const props = properties(table, i);
+    const start = parts ? parts[i] : i;
+    const end = parts ? parts[i + 1] : i + 1;
+    for (let part = start; part < end; part++) {
+      let value: unknown;
+      if (single < 0) {
+        value = coords.subarray(part * dims, (part + 1) * dims);
+        if (Number.isNaN((value as Float64Array)[0])) continue;
+      } else if (single === 0) {
+        value = coords.subarray(offsets[0][part] * dims, offsets[0][part + 1] * dims);
+      } else {
+        const rings = offsets[0];
+        const first = offsets[1][part];
+        const last = offsets[1][part + 1];
+        if (first === last) continue;
+        const base = rings[first];
+        const holeIndices: number[] = [];
+        for (let ring = first + 1; ring < last; ring++) {
+          holeIndices.push((rings[ring] - base) * dims);
+        }
+        value = {
+          positions: coords.subarray(base * dims, rings[last] * dims),
+          holeIndices,
+        };
+      }
+      rows.push({ ...props, [key]: value });
+    }
+  }
+  return rows;
+}
+
+/**
+ * deck.gl ``positionFormat`` of a GeoArrow table.
+ */
+export function geoArrowPositionFormat(table: GeoArrowTable): 'XY' | 'XYZ' {
+  return table.dims === 3 ? 'XYZ' : 'XY';
+}
@@ -3,4 +3,20 @@
  */
 
 export { parseColor, hexToRgba } from './colors';
-export { toLngLat, toLatLng, inferGeometryType } from './geo';
+export { toLngLat, toLatLng, inferGeometryType, pickZoomLevel } from './geo';
+export type { ZoomLevel } from './geo';
+export {
+  decodeBinaryArrays,
+  inflatePayload,
+  inflateValues,
+  isCompressed,
+  putBuffers,
+  toTypedArray,
+} from './binary';
+export {
+  geoArrowPositionFormat,
+  geoArrowToGeoJSON,
+  geoArrowToRows,
+  isGeoArrowTable,
+} from './geoarrow';
+export type { GeoArrowTable } from './geoarrow';
@@ -1,9 +1,14 @@
 """Tests for the MapWidget base class."""
 
+import asyncio
+import threading
+
+import numpy as np
 import pytest
 from unittest.mock import MagicMock, patch
 
 from anymap_ts.base import MapWidget
+from anymap_ts.utils import decompress_payload
 
 
 class _TestWidget(MapWidget):
@@ -48,7 +53,7 @@ class TestMapWidgetInit:
     def test_empty_initial_state(self):
         w = _TestWidget()
         assert w._js_calls == []
-        assert w._js_events == []
+        assert w._js_events == {}
         assert w._layers == {}
         assert w._sources == {}
         assert w._controls == {}
@@ -94,6 +99,675 @@ class TestCallJsMethod:
         assert len(w._js_calls) == 3
 
 
+class TestCallLogCompaction:
+    """Tests for call acknowledgement and compaction of the call log."""
+
+    def test_ack_trims_pending_calls(self):
+        w = _TestWidget()
+        w.call_js_method("a")
+        w.call_js_method("b")
+        w.call_js_method("c")
+        w._js_calls_ack = 2
+        assert [c["id"] for c in w._js_calls] == [3]
+
+    def test_ack_keeps_history(self):
+        w = _TestWidget()
+        w.call_js_method("a")
+        w.call_js_method("b")
+        w._js_calls_ack = 2
+        assert w._js_calls == []
+        assert [c["method"] for c in w._js_call_history()] == ["a", "b"]
+
+    def test_repeated_paint_property_collapsed(self):
+        w = _TestWidget()
+        w.call_js_method("setPaintProperty", "layer", "fill-color", "red")
+        w.call_js_method("setPaintProperty", "layer", "fill-opacity", 0.5)
+        w.call_js_method("setPaintProperty", "layer", "fill-color", "blue")
+        pending = [c["args"] for c in w._js_calls]
+        assert pending == [
+            ["layer", "fill-opacity", 0.5],
+            ["layer", "fill-color", "blue"],
+        ]
+        assert len(w._js_call_history()) == 2
+
+    def test_removed_layer_dropped_from_history(self):
+        w = _TestWidget()
+        w.call_js_method("addGeoJSON", data={}, name="roads")
+        w.call_js_method("setPaintProperty", "roads", "line-color", "red")
+        w.call_js_method("addGeoJSON", data={}, name="rivers")
+        w.call_js_method("removeLayer", "roads")
+        history = w._js_call_history()
+        assert [c["method"] for c in history] == ["addGeoJSON"]
+        assert history[0]["kwargs"]["name"] == "rivers"
+
+    def test_removal_kept_in_pending(self):
+        w = _TestWidget()
+        w.call_js_method("addGeoJSON", data={}, name="roads")
+        w.call_js_method("removeLayer", "roads")
+        assert [c["method"] for c in w._js_calls] == ["removeLayer"]
+
+    def test_removal_without_add_kept_in_history(self):
+        w = _TestWidget()
+        w.call_js_method("removeLayer", "style-layer")
+        assert [c["method"] for c in w._js_call_history()] == ["removeLayer"]
+
+    def test_view_calls_collapsed(self):
+        w = _TestWidget()
+        w.fly_to(0, 0)
+        w.fit_bounds([0, 0, 1, 1])
+        assert [c["method"] for c in w._js_calls] == ["fitBounds"]
+
+    def test_center_and_zoom_kept_apart(self):
+        w = _TestWidget()
+        w.call_js_method("setCenter", 0, 0)
+        w.call_js_method("setZoom", 3)
+        w.call_js_method("setCenter", 1, 1)
+        history = w._js_call_history()
+        assert [c["method"] for c in history] == ["setZoom", "setCenter"]
+        assert history[1]["args"] == [1, 1]
+
+    def test_full_view_call_replaces_partial_ones(self):
+        w = _TestWidget()
+        w.call_js_method("setCenter", 0, 0)
+        w.call_js_method("setZoom", 3)
+        w.fly_to(1, 1)
+        w.call_js_method("setZoom", 5)
+        history = w._js_call_history()
+        assert [c["method"] for c in history] == ["flyTo", "setZoom"]
+
+    def test_log_stays_bounded(self):
+        w = _TestWidget()
+        for i in range(100):
+            w.call_js_method("addGeoJSON", data={}, name=f"layer-{i}")
+            w.call_js_method("removeLayer", f"layer-{i}")
+            w._js_calls_ack = w._js_method_counter
+        assert w._js_calls == []
+        assert w._js_call_history() == []
+
+    def test_replay_request(self):
+        w = _TestWidget()
+        w.call_js_method("a")
+        with patch.object(w, "send") as send:
+            w._handle_custom_msg(w, {"type": "replay_request"}, [])
+        send.assert_called_once()
+        content = send.call_args[0][0]
+        assert content["type"] == "replay"
+        assert [c["method"] for c in content["calls"]] == ["a"]
+
+    def test_replay_sends_binary_buffers(self):
+        w = _TestWidget()
+        w.call_js_method("addLayer", data=None, getPosition=np.zeros((4, 2)))
+        with patch.object(w, "send") as send:
+            w._handle_custom_msg(w, {"type": "replay_request"}, [])
+        content, buffers = send.call_args[0]
+        assert content["buffer_paths"] == [
+            [
+                "calls",
+                0,
+                "kwargs",
+                "data",
+                "attributes",
+                "getPosition",
+                "value",
+                "buffer",
+            ]
+        ]
+        assert len(buffers) == 1
+        assert buffers[0].nbytes == 64
+
+
+class TestStateSnapshot:
+    """Tests for the replay history as a snapshot of the current map state."""
+
+    def test_paint_folded_into_layer(self):
+        w = _TestWidget()
+        w.call_js_method("addGeoJSON", data={}, name="roads", paint={"w": 1})
+        for width in range(20):
+            w.call_js_method("setPaintProperty", "roads", "line-width", width)
+        w.call_js_method("setLayoutProperty", "roads", "visibility", "none")
+        history = w._js_call_history()
+        assert [c["method"] for c in history] == ["addGeoJSON", "setLayoutProperty"]
+        assert history[0]["kwargs"]["paint"] == {"w": 1, "line-width": 19}
+
+    def test_folding_leaves_pending_calls_alone(self):
+        w = _TestWidget()
+        w.call_js_method("addLayer", id="roads", paint={}, layout={})
+        w.call_js_method("setLayoutProperty", "roads", "visibility", "none")
+        assert [c["method"] for c in w._js_calls] == ["addLayer", "setLayoutProperty"]
+        assert w._js_calls[0]["kwargs"]["layout"] == {}
+        assert w._js_call_history()[0]["kwargs"]["layout"] == {"visibility": "none"}
+
+    def test_setter_without_creator_kept(self):
+        w = _TestWidget()
+        w.call_js_method("setPaintProperty", "style-layer", "fill-color", "red")
+        assert len(w._js_call_history()) == 1
+
+    def test_source_updates_collapsed(self):
+        w = _TestWidget()
+        for i in range(10):
+            w.call_js_method("updateGeoJSONSource", sourceId="s", data={"i": i})
+        history = w._js_call_history()
+        assert len(history) == 1
+        assert history[0]["kwargs"]["data"] == {"i": 9}
+
+    def test_map_wide_setters_collapsed(self):
+        w = _TestWidget()
+        w.call_js_method("setProjection", projection="globe")
+        w.call_js_method("setProjection", projection="mercator")
+        history = w._js_call_history()
+        assert [c["kwargs"]["projection"] for c in history] == ["mercator"]
+
+    def test_queries_not_replayed(self):
+        w = _TestWidget()
+        w.call_js_method("queryRenderedFeatures", layers=["roads"])
+        assert [c["method"] for c in w._js_calls] == ["queryRenderedFeatures"]
+        assert w._js_call_history() == []
+
+    def test_history_size_tracks_current_layers(self):
+        w = _TestWidget()
+        for i in range(50):
+            w.call_js_method("addGeoJSON", data={}, name=f"layer-{i}", paint={})
+            w.call_js_method("setPaintProperty", f"layer-{i}", "fill-color", "red")
+            if i % 2:
+                w.call_js_method("removeLayer", f"layer-{i}")
+        assert len(w._js_call_history()) == 25
+
+
+def _big_geojson(n=50, offset=0.0):
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [i + offset, i]},
+                "properties": {"name": f"feature-{i}"},
+            }
+            for i in range(n)
+        ],
+    }
+
+
+class TestDataStore:
+    """Tests for the content-addressed data store."""
+
+    def test_small_data_inline(self):
+        w = _TestWidget()
+        data = {"type": "FeatureCollection", "features": []}
+        assert w._store_data(data) is data
+        assert len(w._data_store) == 0
+
+    def test_non_json_data_inline(self):
+        w = _TestWidget()
+        data = {"values": np.zeros(1000)}
+        assert w._store_data(data) is data
+
+    def test_identical_data_stored_once(self):
+        w = _TestWidget()
+        first = w._store_data(_big_geojson())
+        second = w._store_data(_big_geojson())
+        assert first == second
+        assert set(first) == {"__blob__"}
+        assert len(w._data_store) == 1
+
+    def test_blob_request(self):
+        w = _TestWidget()
+        data = _big_geojson()
+        ref = w._store_data(data)
+        w.call_js_method("addGeoJSON", data=ref, name="a")
+        with patch.object(w, "send") as send:
+            w._handle_custom_msg(
+                w, {"type": "blob_request", "digests": [ref["__blob__"]]}, []
+            )
+        content, buffers = send.call_args[0]
+        assert content["type"] == "blobs"
+        blob = content["blobs"][ref["__blob__"]]
+        assert blob["__compressed__"] == "identity"
+        assert decompress_payload({**blob, "buffer": buffers[0]}) == data
+
+    def test_evicted_when_unreferenced(self):
+        w = _TestWidget()
+        ref = w._store_data(_big_geojson())
+        w.call_js_method("addGeoJSON", data=ref, name="a")
+        w.call_js_method("addGeoJSON", data=ref, name="b")
+        w.call_js_method("removeLayer", "a")
+        w._js_calls_ack = w._js_method_counter
+        assert ref["__blob__"] in w._data_store
+
+        with patch.object(w, "send") as send:
+            w.call_js_method("removeLayer", "b")
+            w._js_calls_ack = w._js_method_counter
+        assert ref["__blob__"] not in w._data_store
+        send.assert_called_once_with({"type": "evict", "digests": [ref["__blob__"]]})
+
+    def test_kept_until_acknowledged(self):
+        w = _TestWidget()
+        ref = w._store_data(_big_geojson())
+        w.call_js_method("addGeoJSON", data=ref, name="a")
+        assert ref["__blob__"] in w._data_store
+        w._js_calls_ack = w._js_method_counter
+        # Still in the replay history
+        assert ref["__blob__"] in w._data_store
+
+    def test_cancelled_call_evicts(self):
+        w = _TestWidget()
+        ref = w._store_data(_big_geojson())
+        w.call_js_method("addGeoJSON", data=ref, name="a")
+        with patch.object(w, "send") as send:
+            w.call_js_method("removeLayer", "a")
+        assert ref["__blob__"] not in w._data_store
+        send.assert_called_once_with({"type": "evict", "digests": [ref["__blob__"]]})
+
+    def test_refs_in_list_kwarg(self):
+        w = _TestWidget()
+        data = _big_geojson()
+        ref = w._store_data(data)
+        levels = [{"minzoom": 0, "maxzoom": 4, "data": ref}]
+        w.call_js_method("addGeoJSON", data={}, levels=levels, name="a")
+        history = w._js_call_history(resolve_data=True)
+        assert history[0]["kwargs"]["levels"] == [
+            {"minzoom": 0, "maxzoom": 4, "data": data}
+        ]
+        w.call_js_method("removeLayer", "a")
+        assert ref["__blob__"] not in w._data_store
+
+    def test_history_resolves_data(self):
+        w = _TestWidget()
+        data = _big_geojson()
+        w.call_js_method("addGeoJSON", data=w._store_data(data), name="a")
+        assert w._js_call_history()[0]["kwargs"]["data"] != data
+        assert w._js_call_history(resolve_data=True)[0]["kwargs"]["data"] == data
+
+
+class TestCompression:
+    """Tests for compression of large call payloads."""
+
+    def test_small_kwargs_not_compressed(self):
+        w = _TestWidget()
+        w.call_js_method("addGeoJSON", data=_big_geojson(), name="a")
+        assert w._js_calls[0]["kwargs"]["data"] == _big_geojson()
+
+    def test_large_kwargs_compressed(self):
+        w = _TestWidget()
+        w.compression_threshold = 1024
+        w.call_js_method("addGeoJSON", data=_big_geojson(), name="a")
+        kwargs = w._js_calls[0]["kwargs"]
+        assert kwargs["name"] == "a"
+        assert kwargs["data"]["__compressed__"] == "deflate"
+        assert decompress_payload(kwargs["data"]) == _big_geojson()
+
+    def test_disabled(self):
+        w = _TestWidget()
+        w.compression_threshold = None
+        w.call_js_method("addGeoJSON", data=_big_geojson(500), name="a")
+        assert w._js_calls[0]["kwargs"]["data"] == _big_geojson(500)
+
+    def test_nan_payload_not_compressed(self):
+        w = _TestWidget()
+        w.compression_threshold = 0
+        w.call_js_method("addGeoJSON", data={"values": [float("nan")]})
+        assert "__compressed__" not in w._js_calls[0]["kwargs"]["data"]
+
+    def test_sent_as_buffer(self):
+        w = _TestWidget()
+        w.compression_threshold = 1024
+        w.call_js_method("addGeoJSON", data=_big_geojson(), name="a")
+        with patch.object(w, "send") as send:
+            w._handle_custom_msg(w, {"type": "replay_request"}, [])
+        content, buffers = send.call_args[0]
+        assert content["buffer_paths"] == [["calls", 0, "kwargs", "data", "buffer"]]
+        assert len(buffers) == 1
+
+    def test_stored_blob_sent_compressed(self):
+        w = _TestWidget()
+        w.compression_threshold = 1024
+        data = _big_geojson()
+        ref = w._store_data(data)
+        w.call_js_method("addGeoJSON", data=ref, name="a")
+        assert w._js_calls[0]["kwargs"]["data"] == ref
+        with patch.object(w, "send") as send:
+            w._handle_custom_msg(
+                w, {"type": "blob_request", "digests": [ref["__blob__"]]}, []
+            )
+        content, buffers = send.call_args[0]
+        assert content["blobs"][ref["__blob__"]]["__compressed__"] == "deflate"
+        assert len(buffers) == 1
+        assert w._data_store.get(ref["__blob__"]) == data
+
+    def test_history_inflates_data(self):
+        w = _TestWidget()
+        w.compression_threshold = 1024
+        w.call_js_method("addGeoJSON", data=_big_geojson(), name="a")
+        call = w._js_call_history(resolve_data=True)[0]
+        assert call["kwargs"]["data"] == _big_geojson()
+
+
+class TestBatch:
+    """Tests for the batch context manager."""
+
+    def test_calls_deferred_until_exit(self):
+        w = _TestWidget()
+        with w.batch():
+            w.call_js_method("a")
+            w.call_js_method("b")
+            assert w._js_calls == []
+        assert [c["method"] for c in w._js_calls] == ["a", "b"]
+
+    def test_nested_batches_flush_once(self):
+        w = _TestWidget()
+        with w.batch():
+            with w.batch():
+                w.call_js_method("a")
+            assert w._js_calls == []
+        assert len(w._js_calls) == 1
+
+    def test_single_sync_message(self):
+        w = _TestWidget()
+        w.comm = MagicMock()
+        with w.batch():
+            for i in range(10):
+                w.call_js_method("addGeoJSON", data={}, name=f"layer-{i}")
+                w._layers = {**w._layers, f"layer-{i}": {"id": f"layer-{i}"}}
+        assert w.comm.send.call_count == 1
+        assert len(w._js_calls) == 10
+        assert len(w._layers) == 10
+
+    def test_flushes_on_exception(self):
+        w = _TestWidget()
+        with pytest.raises(RuntimeError):
+            with w.batch():
+                w.call_js_method("a")
+                raise RuntimeError("boom")
+        assert len(w._js_calls) == 1
+
+    def test_batch_compacts_calls(self):
+        w = _TestWidget()
+        with w.batch():
+            for value in range(50):
+                w.call_js_method("setPaintProperty", "layer", "fill-opacity", value)
+        assert len(w._js_calls) == 1
+        assert w._js_calls[0]["args"][2] == 49
+
+
+class TestStatePatches:
+    """Tests for incremental sync of the state dict traits."""
+
+    def test_set_sends_only_the_change(self):
+        w = _TestWidget()
+        layers = w._layers
+        with patch.object(w, "send") as send:
+            w._set_state("_layers", "a", {"id": "a"})
+        assert w._layers is layers
+        assert w._layers == {"a": {"id": "a"}}
+        send.assert_called_once()
+        content = send.call_args[0][0]
+        assert content["type"] == "state_patch"
+        assert content["ops"] == [
+            {"trait": "_layers", "op": "set", "key": "a", "value": {"id": "a"}}
+        ]
+
+    def test_update_and_remove_skip_missing_keys(self):
+        w = _TestWidget()
+        w._set_state("_controls", "legend", {"title": "A", "opacity": 1})
+        with patch.object(w, "send") as send:
+            w._update_state("_controls", "missing", {"title": "B"})
+            w._remove_state("_controls", "missing")
+            send.assert_not_called()
+            w._update_state("_controls", "legend", {"title": "B"})
+        assert w._controls["legend"] == {"title": "B", "opacity": 1}
+
+    def test_list_entries(self):
+        w = _TestWidget()
+        w._append_state("_controls", "group", "a")
+        w._append_state("_controls", "group", "a")
+        w._append_state("_controls", "group", "b")
+        assert w._controls["group"] == ["a", "b"]
+        w._discard_state("_controls", "group", "a")
+        w._discard_state("_controls", "group", "b")
+        assert "group" not in w._controls
+
+    def test_list_index_follows_replaced_entries(self):
+        w = _TestWidget()
+        w._append_state("_controls", "group", "a")
+        w._set_state("_controls", "group", ["b"])
+        w._append_state("_controls", "group", "a")
+        w._append_state("_controls", "group", "b")
+        assert w._controls["group"] == ["b", "a"]
+        w._controls = {}
+        w._discard_state("_controls", "group", "a")
+        w._append_state("_controls", "group", "a")
+        assert w._controls == {"group": ["a"]}
+
+    def test_batch_sends_patches_together(self):
+        w = _TestWidget()
+        with patch.object(w, "send") as send:
+            with w.batch():
+                for i in range(10):
+                    w._set_state("_layers", f"layer-{i}", {"id": f"layer-{i}"})
+                send.assert_not_called()
+        send.assert_called_once()
+        assert len(send.call_args[0][0]["ops"]) == 10
+        assert len(w._layers) == 10
+
+    def test_frontend_patches_are_applied(self):
+        w = _TestWidget()
+        w._set_state("_layers", "a", {"id": "a", "visible": True})
+        ops = [
+            {
+                "trait": "_layers",
+                "op": "merge",
+                "key": "a",
+                "value": {"visible": False},
+            },
+            {
+                "trait": "_sources",
+                "op": "set",
+                "key": "s",
+                "value": {"type": "geojson"},
+            },
+            {"trait": "_js_calls", "op": "set", "key": "x", "value": 1},
+        ]
+        with patch.object(w, "send") as send:
+            w._handle_custom_msg(w, {"type": "state_patch", "ops": ops}, [])
+        send.assert_not_called()
+        assert w._layers["a"]["visible"] is False
+        assert w._sources == {"s": {"type": "geojson"}}
+        assert w._js_calls == []
+
+
+class TestRequests:
+    """Tests for request/response queries."""
+
+    @staticmethod
+    def _answer(w, result=None, error=None, request_id=None):
+        """Simulate the frontend answering the last request."""
+        content = w.send.call_args[0][0]
+        response = {"type": "response", "id": request_id or content["id"]}
+        if error:
+            response["error"] = error
+        else:
+            response["result"] = result
+        w._handle_custom_msg(w, response, [])
+
+    def test_send_request(self):
+        w = _TestWidget()
+        with patch.object(w, "send") as send:
+            future = w.send_request("queryRenderedFeatures", layers=["a"])
+            content = send.call_args[0][0]
+            assert content["type"] == "request"
+            assert content["method"] == "queryRenderedFeatures"
+            assert content["kwargs"] == {"layers": ["a"]}
+            assert not future.done()
+            self._answer(w, {"type": "FeatureCollection", "features": []})
+        assert future.result() == {"type": "FeatureCollection", "features": []}
+        assert w._pending_requests == {}
+        assert w._js_calls == []
+
+    def test_results_are_separate(self):
+        w = _TestWidget()
+        with patch.object(w, "send"):
+            first = w.send_request("q", n=1)
+            first_id = w.send.call_args[0][0]["id"]
+            second = w.send_request("q", n=2)
+            self._answer(w, 2)
+            self._answer(w, 1, request_id=first_id)
+        assert first.result() == 1
+        assert second.result() == 2
+
+    def test_first_response_wins(self):
+        w = _TestWidget()
+        with patch.object(w, "send"):
+            future = w.send_request("q")
+            self._answer(w, "first view")
+            self._answer(w, "second view")
+        assert future.result() == "first view"
+
+    def test_error_response(self):
+        w = _TestWidget()
+        with patch.object(w, "send"):
+            future = w.send_request("q")
+            self._answer(w, error="Error: boom")
+        with pytest.raises(RuntimeError, match="boom"):
+            future.result()
+
+    def test_blocking_request(self):
+        w = _TestWidget()
+
+        def answer(content, buffers=None):
+            threading.Timer(
+                0.01,
+                w._handle_custom_msg,
+                (w, {"type": "response", "id": content["id"], "result": 42}, []),
+            ).start()
+
+        with patch.object(w, "send", side_effect=answer):
+            assert w.request("q", timeout=5) == 42
+
+    def test_request_timeout(self):
+        w = _TestWidget()
+        with patch.object(w, "send"):
+            with pytest.raises(TimeoutError):
+                w.request("q", timeout=0.01)
+        assert w._pending_requests == {}
+
+    def test_request_on_kernel_thread_raises(self):
+        w = _TestWidget()
+        with patch("anymap_ts.base._on_kernel_thread", return_value=True):
+            with patch.object(w, "send") as send:
+                with pytest.raises(RuntimeError, match="main thread"):
+                    w.request("q", timeout=5)
+        send.assert_not_called()
+        assert w._pending_requests == {}
+
+    def test_cancelled_request_forgotten(self):
+        w = _TestWidget()
+        with patch.object(w, "send"):
+            future = w.send_request("q")
+        assert len(w._pending_requests) == 1
+        future.cancel()
+        assert w._pending_requests == {}
+
+    def test_request_async_timeout(self):
+        w = _TestWidget()
+
+        async def run():
+            with patch.object(w, "send"):
+                await w.request_async("q", timeout=0.01)
+
+        with pytest.raises(TimeoutError):
+            asyncio.run(run())
+        assert w._pending_requests == {}
+
+    def test_request_async(self):
+        w = _TestWidget()
+
+        async def run():
+            loop = asyncio.get_running_loop()
+
+            def answer(content, buffers=None):
+                response = {"type": "response", "id": content["id"], "result": "ok"}
+                loop.call_soon(w._handle_custom_msg, w, response, [])
+
+            with patch.object(w, "send", side_effect=answer):
+                return await w.request_async("q", timeout=5)
+
+        assert asyncio.run(run()) == "ok"
+
+    def test_request_inside_batch_raises(self):
+        w = _TestWidget()
+        with w.batch():
+            with pytest.raises(RuntimeError):
+                w.send_request("q")
+
+
+class TestPerfStats:
+    """Tests for per-call transport instrumentation."""
+
+    @staticmethod
+    def _report(w, timings, seq=1):
+        w._handle_js_events(
+            {"new": {"v": [{"type": "perf_stats", "data": timings, "seq": seq}]}}
+        )
+
+    def test_disabled_by_default(self):
+        w = _TestWidget()
+        w.call_js_method("addGeoJSON", data=_big_geojson())
+        assert len(w.perf_stats()) == 0
+        assert "perf_stats" not in w._event_options
+
+    def test_records_python_side(self):
+        w = _TestWidget()
+        w.enable_perf_stats()
+        assert "perf_stats" in w._event_options
+        w.call_js_method("addGeoJSON", data=_big_geojson(), name="a")
+        record = w.perf_stats().iloc[0]
+        assert record["method"] == "addGeoJSON"
+        assert record["bytes"] > 1000
+        assert record["serialize_ms"] >= 0
+        assert record["apply_ms"] is None
+
+    def test_counts_binary_buffers(self):
+        w = _TestWidget()
+        w.enable_perf_stats()
+        w.call_js_method("addScatterplotLayer", data=np.zeros((1000, 2)))
+        assert w.perf_stats().iloc[0]["bytes"] > 8000
+
+    def test_merges_frontend_timings_and_calls_hook(self):
+        w = _TestWidget()
+        hook = MagicMock()
+        w.enable_perf_stats(callback=hook)
+        w.call_js_method("setZoom", 5)
+        self._report(w, [{"id": 1, "queued_ms": 12.5, "apply_ms": 0.5}])
+        record = w.perf_stats().iloc[0]
+        assert record["queued_ms"] == 12.5
+        assert record["apply_ms"] == 0.5
+        hook.assert_called_once()
+        assert hook.call_args[0][0]["method"] == "setZoom"
+
+    def test_limit(self):
+        w = _TestWidget()
+        w.enable_perf_stats()
+        with patch("anymap_ts.base.PERF_STATS_LIMIT", 3):
+            for zoom in range(5):
+                w.call_js_method("setZoom", zoom)
+        assert list(w.perf_stats()["id"]) == [3, 4, 5]
+
+    def test_disable_clears(self):
+        w = _TestWidget()
+        w.enable_perf_stats()
+        w.call_js_method("setZoom", 5)
+        w.enable_perf_stats(False)
+        assert len(w.perf_stats()) == 0
+        assert "perf_stats" not in w._event_options
+
+    def test_list_without_pandas(self):
+        w = _TestWidget()
+        w.enable_perf_stats()
+        w.call_js_method("setZoom", 5)
+        with patch.dict("sys.modules", {"pandas": None}):
+            rows = w.perf_stats()
+        assert rows[0]["method"] == "setZoom"
+
+
 class TestSetCenter:
     """Tests for set_center."""
 
@@ -212,14 +886,14 @@ class TestEventHandlers:
         handler = MagicMock()
         w.on_map_event("click", handler)
         w._handle_js_events(
-            {"new": [{"type": "click", "data": {"lng": 10, "lat": 20}}]}
+            {"new": {"a": [{"type": "click", "data": {"lng": 10, "lat": 20}}]}}
         )
         handler.assert_called_once_with({"lng": 10, "lat": 20})
-        assert w._js_events == []
+        assert w._js_events == {}
 
     def test_handle_unregistered_event(self):
         w = _TestWidget()
-        w._handle_js_events({"new": [{"type": "moveend", "data": {}}]})
+        w._handle_js_events({"new": {"a": [{"type": "moveend", "data": {}}]}})
 
     def test_handler_exception_does_not_crash(self, capsys):
         w = _TestWidget()
@@ -228,10 +902,74 @@ class TestEventHandlers:
             raise RuntimeError("boom")
 
         w.on_map_event("click", bad_handler)
-        w._handle_js_events({"new": [{"type": "click", "data": {}}]})
+        w._handle_js_events({"new": {"a": [{"type": "click", "data": {}}]}})
         captured = capsys.readouterr()
         assert "boom" in captured.out
 
+    def test_resent_events_are_skipped(self):
+        w = _TestWidget()
+        handler = MagicMock()
+        w.on_map_event("click", handler)
+        first = {"type": "click", "data": 1, "seq": 1, "view": "a"}
+        second = {"type": "click", "data": 2, "seq": 2, "view": "a"}
+        w._handle_js_events({"new": {"a": [first]}})
+        w._handle_js_events({"new": {"a": [first, second]}})
+        assert [c.args[0] for c in handler.call_args_list] == [1, 2]
+        assert w._js_events_ack == {"a": 2}
+
+    def test_views_have_separate_cursors(self):
+        w = _TestWidget()
+        handler = MagicMock()
+        w.on_map_event("click", handler)
+        w._handle_js_events({"new": {"a": [{"type": "click", "seq": 1, "view": "a"}]}})
+        w._handle_js_events({"new": {"b": [{"type": "click", "seq": 1, "view": "b"}]}})
+        assert handler.call_count == 2
+        assert w._js_events_ack == {"a": 1, "b": 1}
+
+    def test_views_do_not_overwrite_each_other(self):
+        w = _TestWidget()
+        handler = MagicMock()
+        w.on_map_event("click", handler)
+        # Two views' updates merged into one sync message
+        w._js_events = {
+            "a": [{"type": "click", "data": "a1", "seq": 1, "view": "a"}],
+            "b": [{"type": "click", "data": "b1", "seq": 1, "view": "b"}],
+        }
+        w._js_events = {
+            "a": [{"type": "click", "data": "a1", "seq": 1, "view": "a"}],
+            "b": [
+                {"type": "click", "data": "b1", "seq": 1, "view": "b"},
+                {"type": "click", "data": "b2", "seq": 2, "view": "b"},
+            ],
+        }
+        assert [c.args[0] for c in handler.call_args_list] == ["a1", "b1", "b2"]
+        assert w._js_events_ack == {"a": 1, "b": 2}
+
+    def test_event_options(self):
+        w = _TestWidget()
+        w.on_map_event("click", MagicMock())
+        w.on_map_event("mousemove", MagicMock(), throttle_ms=100)
+        w.on_map_event("move", MagicMock(), debounce_ms=200, coalesce="all")
+        assert w._event_options == {
+            "click": {},
+            "mousemove": {"throttle_ms": 100, "coalesce": "last"},
+            "move": {"debounce_ms": 200, "coalesce": "all"},
+        }
+
+    def test_off_removes_event_options(self):
+        w = _TestWidget()
+        handler = MagicMock()
+        w.on_map_event("mousemove", handler, throttle_ms=100)
+        w.off_map_event("mousemove", handler)
+        assert "mousemove" not in w._event_options
+
+    def test_invalid_event_options(self):
+        w = _TestWidget()
+        with pytest.raises(ValueError):
+            w.on_map_event("move", MagicMock(), throttle_ms=10, debounce_ms=10)
+        with pytest.raises(ValueError):
+            w.on_map_event("move", MagicMock(), coalesce="first")
+
 
 class TestToHtml:
     """Tests for to_html."""
@@ -127,6 +127,23 @@ class TestCesiumGeoJSON:
         assert "cesium-geo" in m._layers
         assert m._layers["cesium-geo"]["type"] == "geojson"
 
+    def test_large_geojson_sent_as_plain_json(self):
+        features = [
+            {
+                "type": "Feature",
+                "properties": {"i": i},
+                "geometry": {"type": "Point", "coordinates": [i * 0.001, 0.5]},
+            }
+            for i in range(500)
+        ]
+        data = {"type": "FeatureCollection", "features": features}
+        m = CesiumMap()
+        m.compression_threshold = 100
+        m.add_geojson(data, name="big")
+        kwargs = m._js_calls[-1]["kwargs"]
+        assert kwargs["data"]["features"][-1]["properties"] == {"i": 499}
+        assert "__compressed__" not in m.to_html()
+
 
 class TestCesiumNavigation:
     """Tests for navigation methods."""
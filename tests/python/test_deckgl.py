@@ -1,5 +1,8 @@
 """Tests for DeckGLMap widget."""
 
+from unittest.mock import patch
+
+import numpy as np
 import pytest
 
 from anymap_ts.deckgl import DeckGLMap
@@ -50,6 +53,66 @@ class TestDeckGLScatterplot:
         calls = [c for c in m._js_calls if c["method"] == "addScatterplotLayer"]
         assert len(calls) >= 1
 
+    def test_add_scatterplot_numpy_binary(self):
+        m = DeckGLMap(controls={})
+        positions = np.random.default_rng(0).uniform(-50, 50, (1000, 2))
+        colors = np.zeros((1000, 4), dtype=np.int64)
+        m.add_scatterplot_layer(
+            None,
+            name="binary",
+            get_position=positions,
+            get_fill_color=colors,
+        )
+        call = [c for c in m._js_calls if c["method"] == "addScatterplotLayer"][-1]
+        kwargs = call["kwargs"]
+        assert "getPosition" not in kwargs
+        assert "getFillColor" not in kwargs
+        assert kwargs["data"]["length"] == 1000
+        position = kwargs["data"]["attributes"]["getPosition"]
+        assert position["size"] == 2
+        assert position["value"]["dtype"] == "float64"
+        assert isinstance(position["value"]["buffer"], memoryview)
+        color = kwargs["data"]["attributes"]["getFillColor"]
+        assert color["value"]["dtype"] == "uint8"
+        assert color["size"] == 4
+
+    def test_binary_layer_exports_html(self):
+        m = DeckGLMap(controls={})
+        m.add_scatterplot_layer(
+            None, name="binary", get_position=np.array([[1.0, 2.0], [3.0, 4.0]])
+        )
+        html = m.to_html()
+        assert '"__ndarray__": true' in html
+
+    def test_geoarrow_layers_export_html(self):
+        gpd = pytest.importorskip("geopandas")
+        import shapely.geometry
+
+        from anymap_ts.utils import to_geoarrow
+
+        gdf = gpd.GeoDataFrame(
+            {"value": [1, 2]},
+            geometry=[
+                shapely.geometry.MultiPoint([(1, 2), (3, 4)]),
+                shapely.geometry.MultiPoint([(5, 6)]),
+            ],
+            crs="EPSG:4326",
+        )
+        m = DeckGLMap(controls={})
+        m.call_js_method("addScatterplotLayer", id="points", data=to_geoarrow(gdf))
+        m.call_js_method("addGeoJsonLayer", id="geojson", data=to_geoarrow(gdf))
+        points, geojson = [c["kwargs"]["data"] for c in m._js_call_history(True)]
+        assert points == [
+            {"value": 1, "coordinates": [1.0, 2.0]},
+            {"value": 1, "coordinates": [3.0, 4.0]},
+            {"value": 2, "coordinates": [5.0, 6.0]},
+        ]
+        assert geojson["features"][1]["geometry"] == {
+            "type": "MultiPoint",
+            "coordinates": [[5.0, 6.0]],
+        }
+        assert "__geoarrow__" not in m.to_html()
+
 
 class TestDeckGLArcLayer:
     """Tests for add_arc_layer."""
@@ -122,6 +185,29 @@ class TestDeckGLPolygon:
         assert "polygons" in m._deck_layers
 
 
+class TestDeckGLPrecision:
+    """Tests for coordinate precision of deck.gl layer data."""
+
+    def test_geojson_layer_precision(self, geojson_point):
+        m = DeckGLMap(controls={})
+        m.add_geojson_layer(geojson_point, name="points", precision=1)
+        data = m._js_calls[-1]["kwargs"]["data"]
+        assert data["geometry"]["coordinates"] == [-122.4, 37.8]
+        m.add_geojson_layer(
+            {**geojson_point, "geometry": {"type": "Point", "coordinates": [1.26, 2]}},
+            name="rounded",
+            precision=1,
+        )
+        data = m._js_calls[-1]["kwargs"]["data"]
+        assert data["geometry"]["coordinates"] == [1.3, 2.0]
+
+    def test_records_unchanged(self):
+        m = DeckGLMap(controls={})
+        data = [{"coordinates": [-122.123456789, 37.8]}]
+        m.add_scatterplot_layer(data, name="points", precision=1)
+        assert m._js_calls[-1]["kwargs"]["data"] == data
+
+
 class TestDeckGLGrid:
     """Tests for add_grid_layer."""
 
@@ -152,6 +238,22 @@ class TestDeckGLRemoveLayer:
         m.remove_deck_layer("rm-scatter")
         assert "rm-scatter" not in m._deck_layers
 
+    def test_deck_layers_sent_as_patches(self):
+        m = DeckGLMap(controls={})
+        deck_layers = m._deck_layers
+        with patch.object(m, "send") as send:
+            m.add_scatterplot_layer([{"coordinates": [0, 0]}], name="a")
+            m.remove_deck_layer("a")
+        assert m._deck_layers is deck_layers
+        ops = [
+            op
+            for call in send.call_args_list
+            if call[0][0].get("type") == "state_patch"
+            for op in call[0][0]["ops"]
+            if op["trait"] == "_deck_layers"
+        ]
+        assert [op["op"] for op in ops] == ["set", "delete"]
+
     def test_remove_nonexistent_deck_layer(self):
         m = DeckGLMap(controls={})
         m.remove_deck_layer("nonexistent")
@@ -0,0 +1,219 @@
+"""Tests for the on-disk HTTP cache."""
+
+import gzip
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import URLError
+
+import pytest
+
+from anymap_ts import http_cache
+from anymap_ts.http_cache import HTTPCache, http_get
+from anymap_ts.utils import fetch_geojson, load_vectors
+
+GEOJSON = {"type": "FeatureCollection", "features": []}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves ``server.files`` with an ETag and answers 304 when it matches."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        self.server.clients.add(self.client_address)
+        time.sleep(self.server.delay)
+        if self.path in self.server.redirects:
+            self.send_response(302)
+            self.send_header("Location", self.server.redirects[self.path])
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = self.server.files.get(self.path.split("?")[0])
+        if self.server.status is not None:
+            self.send_error(self.server.status)
+            return
+        if body is None:
+            self.send_error(404)
+            return
+        etag = f'"{len(body)}-{hash(body)}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.files = {"/data.geojson": json.dumps(GEOJSON).encode()}
+    httpd.requests = []
+    httpd.clients = set()
+    httpd.redirects = {}
+    httpd.delay = 0
+    httpd.status = None
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestHTTPCache:
+    """Tests for HTTPCache."""
+
+    def test_revalidates_with_etag(self, server, tmp_path):
+        cache = HTTPCache(tmp_path)
+        url = f"{server.url}/data.geojson"
+        assert json.loads(cache.fetch(url)) == GEOJSON
+        assert json.loads(cache.fetch(url)) == GEOJSON
+        assert "If-None-Match" not in server.requests[0]
+        assert server.requests[1]["If-None-Match"].startswith('"')
+
+    def test_changed_file_downloaded(self, server, tmp_path):
+        cache = HTTPCache(tmp_path)
+        url = f"{server.url}/data.geojson"
+        cache.fetch(url)
+        server.files["/data.geojson"] = b'{"type": "Feature"}'
+        assert cache.fetch(url) == b'{"type": "Feature"}'
+        assert cache.fetch(url) == b'{"type": "Feature"}'
+
+    def test_offline_uses_cached_copy(self, server, tmp_path):
+        cache = HTTPCache(tmp_path)
+        url = f"{server.url}/data.geojson"
+        cache.fetch(url)
+        server.shutdown()
+        server.server_close()
+        assert json.loads(cache.fetch(url, timeout=2)) == GEOJSON
+
+    def test_server_error_uses_cached_copy(self, server, tmp_path):
+        cache = HTTPCache(tmp_path)
+        url = f"{server.url}/data.geojson"
+        cache.fetch(url)
+        server.status = 503
+        assert json.loads(cache.fetch(url)) == GEOJSON
+        with pytest.raises(URLError):
+            cache.fetch(f"{server.url}/other.geojson")
+        server.status = 404
+        with pytest.raises(URLError):
+            cache.fetch(url)
+
+    def test_missing_url_raises(self, server, tmp_path):
+        with pytest.raises(URLError):
+            HTTPCache(tmp_path).fetch(f"{server.url}/missing.geojson")
+
+    def test_lru_eviction(self, server, tmp_path):
+        server.files = {f"/{name}": name.encode() * 100 for name in "abc"}
+        cache = HTTPCache(tmp_path, max_size=250)
+        cache.fetch(f"{server.url}/a")
+        cache.fetch(f"{server.url}/b")
+        body_a, _ = cache._paths(f"{server.url}/a")
+        body_b, _ = cache._paths(f"{server.url}/b")
+        # Use "a" after "b", so "b" is the least recently used entry
+        os.utime(body_b, (1, 1))
+        cache.fetch(f"{server.url}/a")
+        cache.fetch(f"{server.url}/c")
+        assert body_a.exists() and not body_b.exists()
+        assert cache.size() <= 250
+
+    def test_clear(self, server, tmp_path):
+        cache = HTTPCache(tmp_path)
+        cache.fetch(f"{server.url}/data.geojson")
+        cache.clear()
+        assert cache.size() == 0
+
+
+class TestHttpGet:
+    """Tests for the pooled HTTP client."""
+
+    def test_reuses_connection(self, server):
+        for _ in range(3):
+            body, _ = http_get(f"{server.url}/data.geojson")
+            assert json.loads(body) == GEOJSON
+        assert len(server.requests) == 3
+        assert len(server.clients) == 1
+
+    def test_follows_redirect(self, server):
+        server.redirects["/old"] = "/data.geojson"
+        body, _ = http_get(f"{server.url}/old")
+        assert json.loads(body) == GEOJSON
+
+    def test_reconnects_stale_connection(self, server):
+        http_get(f"{server.url}/data.geojson")
+        # A kept-alive connection that died while idle is replaced
+        for conn in http_cache._local.connections.values():
+            conn.sock.close()
+        body, _ = http_get(f"{server.url}/data.geojson")
+        assert json.loads(body) == GEOJSON
+        assert len(server.clients) == 2
+
+
+class TestLoadVectors:
+    """Tests for load_vectors."""
+
+    def test_fetches_concurrently(self, server, tmp_path, monkeypatch):
+        monkeypatch.setattr(http_cache, "_cache", HTTPCache(tmp_path))
+        monkeypatch.setattr(http_cache, "_cache_configured", True)
+        server.delay = 0.3
+        urls = [f"{server.url}/data.geojson?{i}" for i in range(8)]
+        start = time.monotonic()
+        result = load_vectors([*urls, GEOJSON])
+        assert time.monotonic() - start < 0.3 * 4
+        assert result == [GEOJSON] * 9
+
+    def test_reads_local_files(self, tmp_path):
+        gpd = pytest.importorskip("geopandas")
+        path = tmp_path / "data.geojson"
+        path.write_text(json.dumps(GEOJSON))
+        result = load_vectors([path])
+        assert isinstance(result[0], gpd.GeoDataFrame)
+
+    def test_fetch_error(self, server):
+        with pytest.raises(ValueError, match="Failed to fetch"):
+            load_vectors([f"{server.url}/missing.geojson", GEOJSON])
+
+
+class TestFetchGeojsonCache:
+    """Tests for fetch_geojson going through the cache."""
+
+    def test_uses_configured_cache(self, server, tmp_path, monkeypatch):
+        monkeypatch.setattr(http_cache, "_cache", HTTPCache(tmp_path))
+        monkeypatch.setattr(http_cache, "_cache_configured", True)
+        url = f"{server.url}/data.geojson"
+        assert fetch_geojson(url) == GEOJSON
+        assert fetch_geojson(url) == GEOJSON
+        assert len(list(tmp_path.glob("*.body"))) == 1
+        assert "If-None-Match" in server.requests[1]
+
+    def test_cache_disabled(self, server, monkeypatch):
+        monkeypatch.setattr(http_cache, "_cache", None)
+        monkeypatch.setattr(http_cache, "_cache_configured", True)
+        url = f"{server.url}/data.geojson"
+        fetch_geojson(url)
+        fetch_geojson(url)
+        assert all("If-None-Match" not in r for r in server.requests)
+
+    def test_disabled_by_empty_env(self, monkeypatch):
+        monkeypatch.setattr(http_cache, "_cache_configured", False)
+        monkeypatch.setattr(http_cache, "_cache", None)
+        monkeypatch.setenv("ANYMAP_TS_CACHE_DIR", "")
+        assert http_cache.get_http_cache() is None
+
+    def test_default_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("ANYMAP_TS_CACHE_DIR", str(tmp_path))
+        assert http_cache.default_cache_dir() == tmp_path
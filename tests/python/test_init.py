@@ -1,5 +1,11 @@
 """Tests for the anymap_ts package initialization and exports."""
 
+import json
+import subprocess
+import sys
+
+import pytest
+
 import anymap_ts
 from anymap_ts import (
     Map,
@@ -111,3 +117,49 @@ class TestWidgetInheritance:
         ]
         for w in widgets:
             assert hasattr(w, "set_center")
+
+
+def _fresh_import(code):
+    """Run code in a new interpreter and return the JSON it prints."""
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout)
+
+
+class TestLazyImports:
+    """Tests that importing anymap_ts stays cheap."""
+
+    HEAVY_MODULES = ("geopandas", "shapely", "matplotlib", "pandas")
+
+    def test_cold_import_time(self):
+        elapsed = _fresh_import(
+            "import json, time; start = time.perf_counter(); import anymap_ts; "
+            "print(json.dumps(time.perf_counter() - start))"
+        )
+        assert elapsed < 0.5
+
+    def test_import_loads_no_backend(self):
+        modules = _fresh_import(
+            "import json, sys, anymap_ts; print(json.dumps(list(sys.modules)))"
+        )
+        assert "anymap_ts.maplibre" not in modules
+        assert "anymap_ts.base" not in modules
+
+    def test_one_backend_loads_only_its_dependencies(self):
+        modules = _fresh_import(
+            "import json, sys; from anymap_ts import LeafletMap; "
+            "print(json.dumps(list(sys.modules)))"
+        )
+        assert "anymap_ts.leaflet" in modules
+        for name in ("maplibre", "mapbox", "deckgl", "cesium", "keplergl"):
+            assert f"anymap_ts.{name}" not in modules
+        for name in self.HEAVY_MODULES:
+            assert name not in modules
+
+    def test_unknown_attribute(self):
+        with pytest.raises(AttributeError):
+            anymap_ts.NotAMap
+
+    def test_dir_lists_lazy_classes(self):
+        assert "DeckGLMap" in dir(anymap_ts)
@@ -256,6 +256,36 @@ class TestLeafletMarker:
         calls = [c for c in m._js_calls if c["method"] == "addMarkers"]
         assert len(calls) == 1
 
+        kwargs = calls[0]["kwargs"]
+        assert kwargs["lngLat"]["shape"] == [4]
+        assert kwargs["popups"] == ["SF", "Oakland"]
+
+    def test_add_markers_with_icons(self):
+        m = LeafletMap(controls={})
+        markers = [{"lng": -122.4, "lat": 37.8, "iconUrl": "pin.png"}]
+        m.add_markers(markers, name="pins")
+        calls = [c for c in m._js_calls if c["method"] == "addMarkers"]
+        assert calls[-1]["kwargs"]["data"] == markers
+
+    def test_add_markers_cluster(self):
+        m = LeafletMap(controls={})
+        markers = [{"lng": -122.4, "lat": 37.8}, {"lng": -122.4001, "lat": 37.8}]
+        m.add_markers(markers, name="cities", cluster=True, cluster_max_zoom=12)
+        clusters = m._js_calls[-1]["kwargs"]["clusters"]
+        assert clusters["maxZoom"] == 12
+        assert clusters["solo"]["shape"] == [2]
+        assert clusters["offsets"]["shape"] == [14]
+
+    def test_add_markers_cluster_icons_raises(self):
+        m = LeafletMap(controls={})
+        with pytest.raises(ValueError, match="custom icons"):
+            m.add_markers([{"lng": 0, "lat": 0, "iconUrl": "pin.png"}], cluster=True)
+
+    def test_add_markers_to_html(self):
+        m = LeafletMap(controls={})
+        m.add_markers([{"lng": -122.4, "lat": 37.8}], name="cities")
+        assert "__ndarray__" in m.to_html()
+
 
 class TestLeafletShapes:
     """Tests for circle markers, circles, polylines, polygons, rectangles."""
@@ -268,6 +298,18 @@ class TestLeafletShapes:
         assert len(calls) == 1
         assert calls[0]["kwargs"]["radius"] == 15
 
+    def test_add_circle_markers(self):
+        m = LeafletMap(controls={})
+        m.add_circle_markers(
+            [{"lng": -122.4, "lat": 37.8, "popup": "SF"}], radius=4, cluster=True
+        )
+        kwargs = m._js_calls[-1]["kwargs"]
+        assert kwargs["circle"]["radius"] == 4
+        assert kwargs["circle"]["fillColor"] == "#3388ff"
+        assert kwargs["popups"] == ["SF"]
+        assert "clusters" in kwargs
+        assert m._layers[kwargs["name"]]["type"] == "circle_markers"
+
     def test_add_circle(self):
         m = LeafletMap(controls={})
         m.add_circle(-122.4, 37.8, radius=5000, name="c")
@@ -369,6 +411,44 @@ class TestLeafletHeatmap:
         calls = [c for c in m._js_calls if c["method"] == "addHeatmap"]
         assert "gradient" in calls[-1]["kwargs"]
 
+    def test_heatmap_sent_as_flat_array(self):
+        m = LeafletMap(controls={})
+        m.add_heatmap([[-122.4, 37.8], [-122.3, 37.7, 0.5]], name="heat-flat")
+        points = m._js_calls[-1]["kwargs"]["points"]
+        assert points["dtype"] == "float32"
+        assert points["shape"] == [6]
+
+    def test_normalize_dataframe(self):
+        pd = pytest.importorskip("pandas")
+        df = pd.DataFrame(
+            {"lng": [-122.4, None, -74.0], "lat": [37.8, 1.0, 40.7], "v": [2, 3, None]}
+        )
+        points = LeafletMap._normalize_heatmap_data(df, value_column="v")
+        assert points.tolist() == [[-122.4, 37.8, 2.0], [-74.0, 40.7, 1.0]]
+
+    def test_normalize_geodataframe(self):
+        gpd = pytest.importorskip("geopandas")
+        gdf = gpd.GeoDataFrame(
+            {"v": [1.0, 2.0]},
+            geometry=gpd.points_from_xy([-122.4, -74.0], [37.8, 40.7]),
+        )
+        points = LeafletMap._normalize_heatmap_data(gdf, value_column="v")
+        assert points.tolist() == [[-122.4, 37.8, 1.0], [-74.0, 40.7, 2.0]]
+
+    def test_normalize_geojson_missing_value(self):
+        data = {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "geometry": {"type": "Point", "coordinates": [-122.4, 37.8]},
+                    "properties": {},
+                },
+            ],
+        }
+        points = LeafletMap._normalize_heatmap_data(data, value_column="v")
+        assert points.tolist() == [[-122.4, 37.8, 1.0]]
+
 
 class TestLeafletChoropleth:
     """Tests for choropleth layer."""
@@ -83,6 +83,16 @@ class TestLayerDictHelpers:
         m = MapLibreMap(controls={})
         m._remove_from_layer_dict("nonexistent")
 
+    def test_layer_in_several_categories(self):
+        m = MapLibreMap()
+        m._add_to_layer_dict("layer-1", "Vector")
+        m._add_to_layer_dict("layer-1", "Overlays")
+        m._add_to_layer_dict("layer-2", "Vector")
+        m._remove_from_layer_dict("layer-1")
+        assert m._layer_dict["Vector"] == ["layer-2"]
+        assert "Overlays" not in m._layer_dict
+        assert "layer-1" not in m._layer_categories
+
 
 class TestValidation:
     """Tests for validation helpers."""
@@ -154,6 +164,172 @@ class TestAddVector:
         m.add_vector(geojson_point, paint=paint, name="test-paint")
         assert m._layers["test-paint"]["paint"] == paint
 
+    def test_add_vector_precision(self, geojson_point):
+        geojson_point["geometry"]["coordinates"] = [-122.123456789012, 37.8]
+        m = MapLibreMap(controls={})
+        m.add_vector(geojson_point, name="default")
+        m.add_vector(geojson_point, name="rounded", precision=3)
+        default, rounded = [c["kwargs"]["data"] for c in m._js_calls[-2:]]
+        assert default["geometry"]["coordinates"] == [-122.123457, 37.8]
+        assert rounded["geometry"]["coordinates"] == [-122.123, 37.8]
+
+    def test_default_precision_follows_max_zoom(self, geojson_point):
+        geojson_point["geometry"]["coordinates"] = [-122.123456789012, 37.8]
+        m = MapLibreMap(controls={}, max_zoom=10)
+        m.add_vector(geojson_point, name="coarse")
+        data = m._js_calls[-1]["kwargs"]["data"]
+        assert data["geometry"]["coordinates"] == [-122.123, 37.8]
+
+    def test_add_vector_simplify(self, geojson_polygon):
+        m = MapLibreMap(controls={})
+        m.add_vector(geojson_polygon, name="plain")
+        assert "levels" not in m._js_calls[-1]["kwargs"]
+        m.add_vector(geojson_polygon, name="pyramid", simplify=[5, 10])
+        levels = m._js_calls[-1]["kwargs"]["levels"]
+        assert [(l["minzoom"], l["maxzoom"]) for l in levels] == [(0, 5), (5, 10)]
+
+    def test_add_vector_simplify_stores_levels(self):
+        import geopandas as gpd
+        import shapely
+
+        gdf = gpd.GeoDataFrame(
+            {"name": [f"circle-{i}" for i in range(20)]},
+            geometry=[shapely.Point(i, 0).buffer(0.4) for i in range(20)],
+            crs="EPSG:4326",
+        )
+        m = MapLibreMap(controls={})
+        m.add_vector(gdf, name="pyramid", simplify=[5, 10])
+        levels = m._js_calls[-1]["kwargs"]["levels"]
+        assert all(set(level["data"]) == {"__blob__"} for level in levels)
+        resolved = m._js_call_history(resolve_data=True)[-1]["kwargs"]["levels"]
+        features = resolved[-1]["data"]["features"]
+        assert [f["id"] for f in features] == [str(i) for i in range(20)]
+        assert features[0]["properties"] == {"name": "circle-0"}
+
+    def test_add_vector_geoparquet(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        import geopandas as gpd
+        import shapely.geometry
+
+        path = tmp_path / "points.parquet"
+        gpd.GeoDataFrame(
+            {"value": [1, 2]},
+            geometry=[shapely.geometry.Point(0, 0), shapely.geometry.Point(1, 1)],
+            crs="EPSG:4326",
+        ).to_parquet(path)
+        m = MapLibreMap(controls={})
+        m.add_vector(path, name="arrow")
+        kwargs = m._js_calls[-1]["kwargs"]
+        assert kwargs["data"]["__geoarrow__"] == "point"
+        assert kwargs["layerType"] == "circle"
+        assert kwargs["bounds"] == [0.0, 0.0, 1.0, 1.0]
+        with pytest.raises(ValueError):
+            m.add_vector(path, name="pyramid", simplify=[4])
+
+    def _stream_file(self, tmp_path):
+        import geopandas as gpd
+        import numpy as np
+
+        path = tmp_path / "points.gpkg"
+        gpd.GeoDataFrame(
+            {"value": np.arange(25)},
+            geometry=gpd.points_from_xy(np.arange(25), np.arange(25)),
+            crs="EPSG:4326",
+        ).to_file(path)
+        return path
+
+    def test_add_vector_stream(self, tmp_path):
+        m = MapLibreMap(controls={})
+        m.add_vector(
+            self._stream_file(tmp_path), name="stream", stream=True, batch_size=10
+        )
+        assert "stream" not in m._streams
+
+        calls = m._js_call_history(resolve_data=True)
+        first = next(c for c in calls if c["method"] == "addGeoJSON")
+        assert len(first["kwargs"]["data"]["features"]) == 10
+        assert first["kwargs"]["bounds"] == [0.0, 0.0, 24.0, 24.0]
+        # Batches go to the open views but stay out of the replay history
+        assert "appendGeoJSON" not in [c["method"] for c in calls]
+        appends = [c for c in m._js_calls if c["method"] == "appendGeoJSON"]
+        assert len(appends) == 2
+
+        # The exported map adds the layer from the whole file
+        html = m.to_html()
+        assert "appendGeoJSON" not in html
+        assert '"id": "24"' in html
+
+        m.remove_layer("stream")
+        assert "stream" not in m._streamed_files
+
+    def test_stream_batches_released_after_ack(self, tmp_path):
+        m = MapLibreMap(controls={})
+        m.add_vector(
+            self._stream_file(tmp_path), name="stream", stream=True, batch_size=10
+        )
+        stored = len(m._data_store)
+        m._js_calls_ack = m._js_method_counter
+        assert m._js_calls == []
+        # Only the first batch, which the replay history holds, is kept
+        assert len(m._data_store) == 1 < stored
+
+    def test_stream_sent_from_event_loop(self, tmp_path):
+        import asyncio
+        import threading
+
+        path = self._stream_file(tmp_path)
+        m = MapLibreMap(controls={})
+        senders = []
+        call_js_method = m.call_js_method
+
+        def record(method, *args, **kwargs):
+            if method == "appendGeoJSON":
+                senders.append(threading.current_thread())
+            call_js_method(method, *args, **kwargs)
+
+        m.call_js_method = record
+
+        async def main():
+            m.add_vector(path, name="stream", stream=True, batch_size=10)
+            for _ in range(3000):
+                if "stream" not in m._streams:
+                    break
+                await asyncio.sleep(0.01)
+
+        asyncio.run(main())
+        assert senders == [threading.main_thread()] * 2
+        assert "stream" not in m._streams
+
+    def test_add_vector_stream_requires_path(self, geojson_point):
+        m = MapLibreMap(controls={})
+        with pytest.raises(ValueError):
+            m.add_vector(geojson_point, stream=True)
+
+    def test_add_vectors(self, geojson_point, geojson_polygon):
+        m = MapLibreMap(controls={})
+        with patch("anymap_ts.utils.fetch_geojson", return_value=geojson_point):
+            m.add_vectors(
+                ["https://example.com/point.geojson", geojson_polygon],
+                names=["point", "polygon"],
+            )
+        assert "point" in m._layers and "polygon" in m._layers
+        methods = [c["method"] for c in m._js_calls]
+        assert methods[-3:] == ["addGeoJSON", "addGeoJSON", "fitBounds"]
+        assert m._js_calls[-1]["args"][0] == [-122.5, 37.7, -122.3, 37.9]
+
+    def test_add_vectors_names_length(self, geojson_point):
+        m = MapLibreMap(controls={})
+        with pytest.raises(ValueError):
+            m.add_vectors([geojson_point], names=["a", "b"])
+
+    def test_coordinate_precision_attribute(self, geojson_point):
+        geojson_point["geometry"]["coordinates"] = [-122.456, 37.8]
+        m = MapLibreMap(controls={})
+        m.coordinate_precision = 1
+        m.add_vector(geojson_point, name="rounded")
+        data = m._js_calls[-1]["kwargs"]["data"]
+        assert data["geometry"]["coordinates"] == [-122.5, 37.8]
+
     def test_add_vector_auto_name(self, geojson_point):
         m = MapLibreMap(controls={})
         m.add_vector(geojson_point)
@@ -247,6 +423,21 @@ class TestAddMarkers:
         layer_id = m.add_markers(fc, popup_column="name")
         assert m._layers[layer_id]["count"] == 2
 
+    def test_add_markers_from_geodataframe(self):
+        import geopandas as gpd
+
+        gdf = gpd.GeoDataFrame(
+            {"name": ["SF", "NYC"]},
+            geometry=gpd.points_from_xy([-122.4, -74.0], [37.8, 40.7]),
+        )
+        m = MapLibreMap(controls={})
+        layer_id = m.add_markers(gdf, popup_column="name")
+        kwargs = m._js_calls[-1]["kwargs"]
+        assert kwargs["lngLat"]["shape"] == [4]
+        assert kwargs["popups"] == ["SF", "NYC"]
+        assert kwargs["tooltips"] is None
+        assert m._layers[layer_id]["count"] == 2
+
     def test_add_markers_empty_raises(self):
         m = MapLibreMap(controls={})
         with pytest.raises(ValueError, match="No valid point data"):
@@ -265,6 +456,21 @@ class TestAddMarkers:
         layer_id = m.add_markers(data, lng_column="x_coord", lat_column="y_coord")
         assert m._layers[layer_id]["count"] == 1
 
+    def test_add_markers_as_layer_above_threshold(self):
+        m = MapLibreMap(controls={})
+        m.marker_layer_threshold = 2
+        m.add_markers([{"lng": 0, "lat": 0}] * 2, name="few")
+        assert m._js_calls[-1]["kwargs"]["asLayer"] is False
+        m.add_markers([{"lng": 0, "lat": 0}] * 3, name="many")
+        assert m._js_calls[-1]["kwargs"]["asLayer"] is True
+        assert "many" in m._layer_dict["Markers"]
+
+    def test_add_markers_threshold_none(self):
+        m = MapLibreMap(controls={})
+        m.marker_layer_threshold = None
+        m.add_markers([{"lng": 0, "lat": 0}] * 5000)
+        assert m._js_calls[-1]["kwargs"]["asLayer"] is False
+
 
 class TestRemoveMarker:
     """Tests for remove_marker."""
@@ -386,6 +592,59 @@ class TestAddControl:
         assert len(calls) >= 1
 
 
+class TestDataStoreIntegration:
+    """Tests for sending large payloads through the data store."""
+
+    def test_same_data_sent_once(self):
+        m = MapLibreMap(controls={})
+        data = {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "geometry": {"type": "Point", "coordinates": [i, i / 2]},
+                    "properties": {"id": i},
+                }
+                for i in range(100)
+            ],
+        }
+        m.add_vector(data, name="fill")
+        m.add_vector(data, name="outline", layer_type="circle")
+        calls = [c for c in m._js_calls if c["method"] == "addGeoJSON"]
+        assert calls[0]["kwargs"]["data"] == calls[1]["kwargs"]["data"]
+        assert "__blob__" in calls[0]["kwargs"]["data"]
+        assert len(m._data_store) == 1
+        assert '"id": 99' in m.to_html()
+
+
+class TestFeatureQueries:
+    """Tests for feature queries and data export."""
+
+    def test_query_without_timeout_uses_trait(self):
+        m = MapLibreMap(controls={})
+        m.query_rendered_features(layers=["a"])
+        calls = [c for c in m._js_calls if c["method"] == "queryRenderedFeatures"]
+        assert calls[0]["kwargs"] == {"layers": ["a"]}
+
+    def test_query_with_timeout_waits_for_response(self):
+        m = MapLibreMap(controls={})
+        result = {"type": "FeatureCollection", "features": []}
+        with patch.object(m, "request", return_value=result) as request:
+            assert m.query_rendered_features(layers=["a"], timeout=2) == result
+        request.assert_called_once_with(
+            "queryRenderedFeatures", timeout=2, layers=["a"]
+        )
+        assert not [c for c in m._js_calls if c["method"] == "queryRenderedFeatures"]
+
+    def test_to_geojson_with_timeout(self):
+        m = MapLibreMap(controls={})
+        data = {"type": "FeatureCollection", "features": []}
+        response = {"type": "layer_data", "sourceId": "pts-source", "data": data}
+        with patch.object(m, "request", return_value=response) as request:
+            assert m.to_geojson("pts", timeout=2) == data
+        request.assert_called_once_with("getLayerData", timeout=2, sourceId="pts")
+
+
 class TestMapLibreHtmlExport:
     """Tests for HTML export."""
 
@@ -129,6 +129,14 @@ class TestOpenLayersNavigation:
         m.set_zoom(15.0)
         assert m.zoom == 15.0
 
+    def test_set_center_then_zoom_keeps_both(self):
+        m = OpenLayersMap(controls={})
+        m.set_center(-122.4, 37.8)
+        m.set_zoom(15.0)
+        methods = [c["method"] for c in m._js_call_history()]
+        assert "setCenter" in methods
+        assert "setZoom" in methods
+
     def test_fly_to(self):
         m = OpenLayersMap(controls={})
         m.fly_to(-122.4, 37.8, zoom=12)
@@ -1,7 +1,11 @@
 """Extended tests for utility functions - choropleth, GeoDataFrame, shapely."""
 
+import json
+
 import pytest
 import geopandas as gpd
+import numpy as np
+import pandas as pd
 import shapely.geometry
 
 from anymap_ts.utils import (
@@ -12,7 +16,20 @@ from anymap_ts.utils import (
     get_choropleth_colors,
     compute_breaks,
     build_step_expression,
+    json_default,
+    pack_binary_attributes,
+    to_binary_array,
     _rgb_to_hex,
+    quantize_geojson,
+    simplify_pyramid,
+    zoom_precision,
+    is_arrow_data,
+    to_geoarrow,
+    read_vector_batches,
+    vector_file_bounds,
+    marker_columns,
+    cluster_hierarchy,
+    split_buffers,
 )
 
 
@@ -103,6 +120,68 @@ class TestComputeBreaks:
         with pytest.raises(ValueError, match="Unknown classification"):
             compute_breaks([1, 2, 3], "xyz", 2)
 
+    def test_array_with_nan(self):
+        values = np.array([np.nan, 0.0, 25.0, 50.0, 75.0, 100.0])
+        assert compute_breaks(values, "equal_interval", 2) == [0.0, 50.0, 100.0]
+
+    def test_no_values_raises(self):
+        with pytest.raises(ValueError, match="No values"):
+            compute_breaks([np.nan], "quantile", 3)
+
+    def test_natural_breaks(self):
+        values = [1, 2, 3, 10, 11, 12, 50, 51, 52]
+        assert compute_breaks(values, "natural_breaks", 3) == [1, 3, 12, 52]
+
+    def test_natural_breaks_matches_brute_force(self):
+        values = np.sort(np.random.default_rng(0).normal(size=9))
+
+        def cost(breaks):
+            classes = np.split(values, np.searchsorted(values, breaks[1:-1], "right"))
+            return sum(((c - c.mean()) ** 2).sum() for c in classes)
+
+        best = min(
+            cost([values[0], values[a - 1], values[b - 1], values[-1]])
+            for a in range(1, 9)
+            for b in range(a + 1, 9)
+        )
+        assert cost(compute_breaks(values, "natural_breaks", 3)) == pytest.approx(best)
+
+    def test_natural_breaks_sampled(self):
+        values = np.concatenate([np.full(5000, 1.0), np.full(5000, 100.0)])
+        breaks = compute_breaks(values, "natural_breaks", 2, sample_size=100)
+        assert breaks == [1.0, 1.0, 100.0]
+
+    def test_std_mean(self):
+        values = [0, 10, 20, 30, 40]
+        breaks = compute_breaks(values, "std_mean", 2)
+        assert breaks == [0, 20, 40]
+
+    def test_std_mean_skewed(self):
+        values = np.random.default_rng(0).exponential(size=1000)
+        breaks = compute_breaks(values, "std_mean", 8)
+        assert breaks[0] == values.min() and breaks[-1] == values.max()
+        assert all(a < b for a, b in zip(breaks, breaks[1:]))
+        assert len(breaks) < 9
+
+    def test_head_tail(self):
+        values = [1] * 80 + [10] * 15 + [100] * 4 + [1000]
+        breaks = compute_breaks(values, "head_tail", 5)
+        assert breaks[0] == 1 and breaks[-1] == 1000
+        assert breaks == sorted(breaks)
+        assert len(breaks) <= 6
+
+    def test_geometric(self):
+        breaks = compute_breaks([1, 10, 100, 1000], "geometric", 3)
+        assert breaks == pytest.approx([1, 10, 100, 1000])
+
+    def test_geometric_non_positive_raises(self):
+        with pytest.raises(ValueError, match="positive"):
+            compute_breaks([0, 10], "geometric", 3)
+
+    def test_pretty(self):
+        breaks = compute_breaks([3, 47, 98], "pretty", 5)
+        assert breaks == [0, 20, 40, 60, 80, 100]
+
 
 class TestBuildStepExpression:
     """Tests for build_step_expression."""
@@ -145,6 +224,208 @@ class TestToGeojsonGeoDataFrame:
         result = to_geojson(gdf)
         assert result["type"] == "FeatureCollection"
 
+    def test_matches_to_json(self):
+        geometries = [
+            shapely.geometry.Point(1, 2),
+            shapely.geometry.Point(1, 2, 3),
+            shapely.geometry.LineString([(0, 0), (1, 1)]),
+            shapely.geometry.box(0, 0, 1, 1).difference(
+                shapely.geometry.box(0.2, 0.2, 0.4, 0.4)
+            ),
+            shapely.geometry.MultiPoint([(0, 0), (1, 1)]),
+            shapely.geometry.MultiLineString([[(0, 0), (1, 1)], [(2, 2), (3, 3)]]),
+            shapely.geometry.MultiPolygon(
+                [shapely.geometry.box(0, 0, 1, 1), shapely.geometry.box(2, 2, 3, 3)]
+            ),
+            shapely.geometry.GeometryCollection([shapely.geometry.Point(0, 0)]),
+            shapely.geometry.Point(),
+            None,
+        ]
+        gdf = gpd.GeoDataFrame(
+            {
+                "n": range(10),
+                "value": [1.5, np.nan] * 5,
+                "name": list("abcdefghij"),
+                "flag": [True, False] * 5,
+            },
+            geometry=geometries,
+            index=[f"f{i}" for i in range(10)],
+            crs="EPSG:4326",
+        )
+        assert to_geojson(gdf) == json.loads(gdf.to_json())
+
+    def test_datetime_properties(self):
+        gdf = gpd.GeoDataFrame(
+            {"date": pd.to_datetime(["2024-01-02", None])},
+            geometry=[shapely.geometry.Point(0, 0)] * 2,
+            crs="EPSG:4326",
+        )
+        features = to_geojson(gdf)["features"]
+        assert features[0]["properties"]["date"] == "2024-01-02T00:00:00"
+        assert features[1]["properties"]["date"] is None
+
+
+class TestQuantizeGeojson:
+    """Tests for coordinate precision control."""
+
+    def test_zoom_precision(self):
+        assert zoom_precision(0) == 0
+        assert zoom_precision(18) == 6
+        assert zoom_precision(25.5) == 8
+
+    def test_rounds_ragged_coordinates(self):
+        polygon = {
+            "type": "Polygon",
+            "coordinates": [
+                [[0.123456, 0.0], [1.0, 0.0], [1.0, 1.0], [0.123456, 0.0]],
+                [[0.51, 0.51], [0.6, 0.5], [0.51, 0.51]],
+            ],
+        }
+        result = quantize_geojson(
+            {"type": "Feature", "properties": {}, "geometry": polygon}, 1
+        )
+        assert result["geometry"]["coordinates"] == [
+            [[0.1, 0.0], [1.0, 0.0], [1.0, 1.0], [0.1, 0.0]],
+            [[0.5, 0.5], [0.6, 0.5], [0.5, 0.5]],
+        ]
+        assert polygon["coordinates"][0][0] == [0.123456, 0.0]
+
+    def test_feature_collection(self, feature_collection):
+        result = quantize_geojson(feature_collection, 0)
+        assert result["features"][0]["geometry"]["coordinates"] == [-122.0, 38.0]
+        assert result["features"][0]["properties"] == {"name": "Test Point"}
+
+    def test_integer_coordinates_unchanged(self):
+        geometry = {"type": "LineString", "coordinates": [[1, 2], [3, 4]]}
+        result = quantize_geojson(geometry, 1)
+        assert result["coordinates"] == [[1, 2], [3, 4]]
+        assert all(isinstance(v, int) for v in result["coordinates"][0])
+
+    def test_rounds_mixed_types_and_dimensions(self):
+        collection = {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "properties": {},
+                    "geometry": {"type": "Point", "coordinates": [0.123, 1.987]},
+                },
+                {
+                    "type": "Feature",
+                    "properties": {},
+                    "geometry": {
+                        "type": "LineString",
+                        "coordinates": [[0.14, 0.16, 10.123], [1.0, 1.0]],
+                    },
+                },
+                {
+                    "type": "Feature",
+                    "properties": {},
+                    "geometry": {"type": "Point", "coordinates": [2.54, 3.04]},
+                },
+                {"type": "Feature", "properties": {}, "geometry": None},
+            ],
+        }
+        features = quantize_geojson(collection, 1)["features"]
+        assert features[0]["geometry"]["coordinates"] == [0.1, 2.0]
+        assert features[1]["geometry"]["coordinates"] == [
+            [0.1, 0.2, 10.1],
+            [1.0, 1.0],
+        ]
+        assert features[2]["geometry"]["coordinates"] == [2.5, 3.0]
+        assert features[3]["geometry"] is None
+
+    def test_non_geojson_unchanged(self):
+        config = {"type": "image", "coordinates": [[0.123, 0.456]]}
+        assert quantize_geojson(config, 1) == config
+
+    def test_geodataframe_precision(self):
+        gdf = gpd.GeoDataFrame(
+            geometry=[shapely.geometry.LineString([(0.123456, 1.987654), (2, 3)])],
+            crs="EPSG:4326",
+        )
+        geometry = to_geojson(gdf, precision=2)["features"][0]["geometry"]
+        assert geometry["coordinates"] == [[0.12, 1.99], [2.0, 3.0]]
+
+
+class TestSimplifyPyramid:
+    """Tests for zoom-dependent simplification."""
+
+    def _circles(self):
+        return gpd.GeoDataFrame(
+            {"name": ["a", "b"]},
+            geometry=[
+                shapely.geometry.Point(0, 0).buffer(1, quad_segs=64),
+                shapely.geometry.Point(10, 0).buffer(0.001, quad_segs=64),
+            ],
+            crs="EPSG:4326",
+        )
+
+    def test_levels_per_zoom_band(self):
+        levels = simplify_pyramid(to_geojson(self._circles()), [2, 6])
+        assert [(l["minzoom"], l["maxzoom"]) for l in levels] == [(0, 2), (2, 6)]
+        coarse, fine = [l["data"]["features"] for l in levels]
+        ring = lambda f: f["geometry"]["coordinates"][0]
+        assert len(ring(coarse[0])) < len(ring(fine[0])) < 258
+        assert coarse[0]["properties"] == {"name": "a"}
+
+    def test_collapsed_features_dropped(self):
+        levels = simplify_pyramid(self._circles(), [2])
+        names = [f["properties"]["name"] for f in levels[0]["data"]["features"]]
+        assert names == ["a"]
+
+    def test_geodataframe_matches_geojson(self):
+        gdf = self._circles()
+        assert simplify_pyramid(gdf, [4], precision=6) == simplify_pyramid(
+            to_geojson(gdf), [4], precision=6
+        )
+
+
+class TestReadVectorBatches:
+    """Tests for reading vector files in batches."""
+
+    def _file(self, tmp_path, n=25):
+        path = tmp_path / "points.gpkg"
+        gpd.GeoDataFrame(
+            {"value": np.arange(n)},
+            geometry=gpd.points_from_xy(np.arange(n) * 1000.0, np.zeros(n)),
+            crs="EPSG:3857",
+        ).to_file(path)
+        return path
+
+    def test_batches(self, tmp_path):
+        batches = list(read_vector_batches(self._file(tmp_path), batch_size=10))
+        assert [len(b) for b in batches] == [10, 10, 5]
+        assert list(batches[2].index) == list(range(20, 25))
+        assert batches[2]["value"].tolist() == list(range(20, 25))
+
+    def test_reprojected(self, tmp_path):
+        path = self._file(tmp_path)
+        [batch] = read_vector_batches(path, batch_size=100, to_crs="EPSG:4326")
+        assert batch.crs.equals("EPSG:4326")
+        west, south, east, north = vector_file_bounds(path)
+        assert west == 0 and south == 0 and east == pytest.approx(0.2156, abs=1e-4)
+
+    def test_arrow_stream_matches_offsets(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        import pyogrio
+
+        from anymap_ts.utils import _read_arrow_batches, _read_offset_batches
+
+        path = self._file(tmp_path)
+        arrow = list(_read_arrow_batches(pyogrio, path, 10, None))
+        offsets = list(_read_offset_batches(pyogrio, path, 10, None))
+        assert [len(b) for b in arrow] == [10, 10, 5]
+        for a, b in zip(arrow, offsets):
+            assert list(a.index) == list(b.index)
+            assert a["value"].tolist() == b["value"].tolist()
+            assert a.geometry.equals(b.geometry).all()
+            assert a.crs.equals(b.crs)
+
+    def test_invalid_batch_size(self, tmp_path):
+        with pytest.raises(ValueError):
+            next(read_vector_batches(self._file(tmp_path), batch_size=0))
+
 
 class TestToGeojsonShapely:
     """Tests for to_geojson with shapely geometry objects."""
@@ -202,6 +483,29 @@ class TestGetBoundsGeoDataFrame:
         assert bounds[0] < bounds[2]
         assert bounds[1] < bounds[3]
 
+    def test_projected_gdf_bounds(self):
+        gdf = gpd.GeoDataFrame(
+            geometry=[
+                shapely.geometry.Point(-122.4, 37.8),
+                shapely.geometry.Point(-74.0, 40.7),
+            ],
+            crs="EPSG:4326",
+        )
+        bounds = get_bounds(gdf.to_crs("EPSG:3857"))
+        assert bounds == pytest.approx([-122.4, 37.8, -74.0, 40.7])
+
+    def test_add_vector_reads_gdf_bounds(self, monkeypatch):
+        from anymap_ts import MapLibreMap
+        from anymap_ts import utils
+
+        gdf = gpd.GeoDataFrame(
+            geometry=[shapely.geometry.Point(-122.4, 37.8)], crs="EPSG:4326"
+        )
+        monkeypatch.setattr(utils, "_get_geojson_bounds_shapely", None)
+        m = MapLibreMap()
+        m.add_vector(gdf, name="points")
+        assert m._js_calls[-1]["kwargs"]["bounds"] == [-122.4, 37.8, -122.4, 37.8]
+
 
 class TestGetBoundsNone:
     """Tests for get_bounds edge cases."""
@@ -259,3 +563,347 @@ class TestGetDefaultPaintExtended:
     def test_heatmap(self):
         paint = get_default_paint("heatmap")
         assert "heatmap-opacity" in paint
+
+
+class TestBinaryArrays:
+    """Tests for binary NumPy array transport."""
+
+    def test_to_binary_array(self):
+        encoded = to_binary_array(np.arange(6, dtype=np.float32).reshape(3, 2))
+        assert encoded["__ndarray__"] is True
+        assert encoded["dtype"] == "float32"
+        assert encoded["shape"] == [3, 2]
+        assert encoded["buffer"].nbytes == 24
+
+    def test_int64_downcast(self):
+        assert to_binary_array(np.arange(3))["dtype"] == "int32"
+        assert to_binary_array(np.array([2**40]))["dtype"] == "float64"
+        assert to_binary_array(np.array([True, False]))["dtype"] == "uint8"
+
+    def test_no_arrays_unchanged(self):
+        kwargs = {"id": "a", "data": [{"x": 1}], "getPosition": "x"}
+        assert pack_binary_attributes(kwargs) is kwargs
+
+    def test_pack_array_accessors(self):
+        packed = pack_binary_attributes(
+            {
+                "id": "a",
+                "data": None,
+                "getPosition": np.zeros((5, 3)),
+                "getRadius": np.ones(5),
+                "radiusScale": 2,
+            }
+        )
+        assert packed["radiusScale"] == 2
+        assert "getPosition" not in packed
+        attributes = packed["data"]["attributes"]
+        assert packed["data"]["length"] == 5
+        assert attributes["getPosition"]["size"] == 3
+        assert attributes["getPosition"]["value"]["dtype"] == "float64"
+        assert attributes["getRadius"]["size"] == 1
+        assert attributes["getRadius"]["value"]["dtype"] == "float32"
+
+    def test_pack_dataframe_columns(self):
+        df = pd.DataFrame({"weight": [1.0, 2.0, 3.0]})
+        packed = pack_binary_attributes({"data": df, "getWeight": "weight"})
+        assert packed["data"]["length"] == 3
+        assert "getWeight" in packed["data"]["attributes"]
+
+    def test_pack_paths(self):
+        paths = [np.zeros((3, 2)), np.ones((2, 2))]
+        packed = pack_binary_attributes({"data": None, "getPath": paths})
+        table = packed["data"]
+        assert table["length"] == 2
+        assert table["attributes"]["getPath"]["value"]["shape"] == [10]
+        start = np.frombuffer(table["startIndices"]["buffer"], dtype=np.uint32)
+        assert start.tolist() == [0, 3]
+
+    def test_length_mismatch(self):
+        with pytest.raises(ValueError):
+            pack_binary_attributes(
+                {"getPosition": np.zeros((3, 2)), "getRadius": np.zeros(4)}
+            )
+
+    def test_json_default(self):
+        encoded = to_binary_array(np.array([1, 2], dtype=np.uint8))
+        assert json_default(encoded["buffer"]) == "AQI="
+        assert json_default(np.float32(1.5)) == 1.5
+        with pytest.raises(TypeError):
+            json_default(object())
+
+
+class TestSplitBuffers:
+    """Tests for split_buffers."""
+
+    def test_nested_buffers(self):
+        array = np.arange(3, dtype=np.float32)
+        message = {
+            "type": "tile",
+            "data": b"abc",
+            "calls": [{"kwargs": {"value": {"buffer": memoryview(array)}}}, 1],
+            "items": [bytearray(b"x"), "y"],
+        }
+        result, paths, buffers = split_buffers(message)
+        assert result == {
+            "type": "tile",
+            "calls": [{"kwargs": {"value": {}}}, 1],
+            "items": [None, "y"],
+        }
+        assert paths == [
+            ["data"],
+            ["calls", 0, "kwargs", "value", "buffer"],
+            ["items", 0],
+        ]
+        assert bytes(buffers[0]) == b"abc"
+        assert bytes(buffers[1]) == array.tobytes()
+        # The input is left untouched
+        assert message["data"] == b"abc"
+        assert "buffer" in message["calls"][0]["kwargs"]["value"]
+
+    def test_no_buffers_shares_containers(self):
+        message = {"popups": ["a", "b"], "n": 1}
+        result, paths, buffers = split_buffers(message)
+        assert result is message
+        assert paths == [] and buffers == []
+
+
+class TestClusterHierarchy:
+    """Tests for cluster_hierarchy."""
+
+    def test_nearby_points_merge(self):
+        points = [[0, 0], [0.0001, 0.0001], [10, 10], [-120, 40]]
+        h = cluster_hierarchy(points, max_zoom=16)
+        # The close pair stays clustered up to max_zoom
+        assert h["solo"].tolist()[:2] == [17, 17]
+        assert h["solo"][3] < h["solo"][2] <= 16
+        assert len(h["offsets"]) == 18
+        # Every zoom has the pair; zoom 0 holds the first three points
+        level = slice(h["offsets"][0], h["offsets"][1])
+        assert h["counts"][level].tolist() == [3]
+        assert h["expand"][level].tolist() == [h["solo"][2]]
+        assert h["counts"][h["offsets"][16] :].tolist() == [2]
+        assert h["expand"][h["offsets"][16] :].tolist() == [17]
+
+    def test_counts_cover_all_points(self):
+        rng = np.random.default_rng(0)
+        points = np.column_stack([rng.uniform(-10, 10, 500), rng.uniform(-5, 5, 500)])
+        h = cluster_hierarchy(points, radius=40, max_zoom=10)
+        for z in range(11):
+            level = slice(h["offsets"][z], h["offsets"][z + 1])
+            assert h["counts"][level].sum() + (h["solo"] <= z).sum() == 500
+
+    def test_cluster_center(self):
+        h = cluster_hierarchy([[1, 0], [3, 0]], max_zoom=2)
+        lng, lat = h["lngLat"][:2]
+        assert lng == pytest.approx(2)
+        assert lat == pytest.approx(0, abs=1e-9)
+
+    def test_empty(self):
+        h = cluster_hierarchy(np.empty((0, 2)))
+        assert len(h["solo"]) == 0
+        assert h["offsets"][-1] == 0
+
+
+class TestMarkerColumns:
+    """Tests for marker_columns."""
+
+    def test_geodataframe(self):
+        gdf = gpd.GeoDataFrame(
+            {"name": ["a", "b", "c", "d"], "value": [1, 2, 3, 4]},
+            geometry=[
+                shapely.geometry.Point(1, 2),
+                None,
+                shapely.geometry.LineString([(0, 0), (1, 1)]),
+                shapely.geometry.Point(3, 4),
+            ],
+        )
+        columns = marker_columns(gdf, popup_column="name", tooltip_column="value")
+        np.testing.assert_array_equal(columns["lngLat"], [[1, 2], [3, 4]])
+        assert columns["popup"] == ["a", "d"]
+        assert columns["tooltip"] == ["1", "4"]
+
+    def test_dataframe(self):
+        df = pd.DataFrame({"lon": [1.0, np.nan], "lat": [2.0, 3.0], "name": ["a", "b"]})
+        columns = marker_columns(df, popup_column="name", tooltip_column="missing")
+        np.testing.assert_array_equal(columns["lngLat"], [[1, 2]])
+        assert columns["popup"] == ["a"]
+        assert columns["tooltip"] is None
+
+    def test_list_with_mixed_keys(self):
+        rows = [
+            {"lng": 1, "lat": 2, "name": "a"},
+            {"longitude": 3, "latitude": 4},
+            {"lng": 5},
+            "not a dict",
+        ]
+        columns = marker_columns(rows, popup_column="name")
+        np.testing.assert_array_equal(columns["lngLat"], [[1, 2], [3, 4]])
+        assert columns["popup"] == ["a", None]
+
+    def test_custom_columns(self):
+        columns = marker_columns([{"px": 1, "py": 2}], lng_column="px", lat_column="py")
+        np.testing.assert_array_equal(columns["lngLat"], [[1, 2]])
+
+    def test_feature_collection(self):
+        fc = {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "geometry": {"type": "Point", "coordinates": [1, 2]},
+                    "properties": {"name": "a"},
+                },
+                {
+                    "type": "Feature",
+                    "geometry": {"type": "LineString", "coordinates": [[0, 0], [1, 1]]},
+                    "properties": {"name": "b"},
+                },
+            ],
+        }
+        columns = marker_columns(fc, popup_column="name")
+        np.testing.assert_array_equal(columns["lngLat"], [[1, 2]])
+        assert columns["popup"] == ["a"]
+
+    def test_empty(self):
+        assert marker_columns([])["lngLat"].shape == (0, 2)
+
+
+class TestGeoArrow:
+    """Tests for the GeoArrow ingest path."""
+
+    def _gdf(self):
+        return gpd.GeoDataFrame(
+            {"value": [1.5, np.nan], "name": ["a", "b"]},
+            geometry=[
+                shapely.geometry.box(0, 0, 1, 1),
+                shapely.geometry.MultiPolygon(
+                    [shapely.geometry.box(2, 2, 3, 3), shapely.geometry.box(4, 4, 5, 5)]
+                ),
+            ],
+            crs="EPSG:4326",
+        )
+
+    def test_is_arrow_data(self):
+        assert is_arrow_data("data/parcels.parquet")
+        assert is_arrow_data("parcels.GeoParquet")
+        assert not is_arrow_data("https://example.com/parcels.parquet")
+        assert not is_arrow_data("parcels.geojson")
+        assert not is_arrow_data(self._gdf())
+
+    def test_buffers(self):
+        table = to_geoarrow(self._gdf())
+        assert table["__geoarrow__"] == "multipolygon"
+        assert table["length"] == 2 and table["dims"] == 2
+        assert table["bounds"] == [0.0, 0.0, 5.0, 5.0]
+        polygons = np.frombuffer(table["offsets"]["2"]["buffer"], dtype=np.int32)
+        assert polygons.tolist() == [0, 1, 3]
+        assert table["coords"]["shape"] == [15, 2]
+        assert table["properties"]["value"]["__ndarray__"]
+        assert table["properties"]["name"] == ["a", "b"]
+
+    def test_precision(self):
+        gdf = gpd.GeoDataFrame(
+            geometry=[shapely.geometry.Point(1.23456, 2.34567)], crs="EPSG:4326"
+        )
+        table = to_geoarrow(gdf, precision=2)
+        coords = np.frombuffer(table["coords"]["buffer"], dtype=np.float64)
+        assert coords.tolist() == [1.23, 2.35]
+        assert table["offsets"] == {}
+
+    def _mixed_gdf(self):
+        return gpd.GeoDataFrame(
+            {"name": ["a", "b"]},
+            geometry=[shapely.geometry.Point(1, 2), shapely.geometry.box(0, 0, 1, 1)],
+            crs="EPSG:4326",
+        )
+
+    def test_mixed_geometry_types_fall_back_to_geojson(self):
+        geojson = to_geoarrow(self._mixed_gdf())
+        assert "__geoarrow__" not in geojson
+        assert geojson == to_geojson(self._mixed_gdf())
+        types = [f["geometry"]["type"] for f in geojson["features"]]
+        assert types == ["Point", "Polygon"]
+
+    def test_layer_type_and_bounds(self):
+        table = to_geoarrow(self._gdf())
+        assert infer_layer_type(table) == "fill"
+        assert get_bounds(table) == table["bounds"]
+
+    def test_coords_to_lng_lat(self):
+        from anymap_ts.utils import _coords_to_lng_lat
+
+        coords = np.array([[0.0, 0.0, 5.0], [111319.49079327357, 0.0, 6.0]])
+        assert _coords_to_lng_lat(coords, None) is coords
+        assert _coords_to_lng_lat(coords, "OGC:CRS84") is coords
+        np.testing.assert_allclose(
+            _coords_to_lng_lat(coords, "EPSG:3857"),
+            [[0.0, 0.0, 5.0], [1.0, 0.0, 6.0]],
+            atol=1e-9,
+        )
+
+
+class TestGeoArrowPyarrow:
+    """Tests for Arrow tables and GeoParquet files."""
+
+    @pytest.fixture(autouse=True)
+    def _pyarrow(self):
+        pytest.importorskip("pyarrow")
+
+    def _gdf(self):
+        return TestGeoArrow()._gdf()
+
+    def test_geoparquet_to_geojson(self, tmp_path):
+        path = tmp_path / "data.parquet"
+        self._gdf().to_parquet(path)
+        geojson = to_geojson(path)
+        assert geojson == to_geojson(self._gdf())
+
+    def test_mixed_geoparquet(self, tmp_path):
+        gdf = TestGeoArrow()._mixed_gdf()
+        path = tmp_path / "mixed.parquet"
+        gdf.to_parquet(path)
+        assert to_geojson(path) == to_geojson(gdf)
+        assert to_geoarrow(path) == to_geojson(gdf)
+
+    def test_projected_mixed_geoparquet(self, tmp_path):
+        gdf = TestGeoArrow()._mixed_gdf()
+        path = tmp_path / "mixed.parquet"
+        gdf.to_crs(epsg=3857).to_parquet(path)
+        assert to_geojson(path, precision=6) == to_geojson(gdf, precision=6)
+
+    def test_geoparquet_column_projection(self, tmp_path):
+        path = tmp_path / "data.parquet"
+        self._gdf().to_parquet(path)
+        table = to_geoarrow(path, columns=["name"])
+        assert list(table["properties"]) == ["name"]
+        assert table["__geoarrow__"] == "multipolygon"
+
+    def test_projected_geoparquet(self, tmp_path):
+        path = tmp_path / "data.parquet"
+        self._gdf().to_crs(epsg=3857).to_parquet(path)
+        table = to_geoarrow(path)
+        np.testing.assert_allclose(table["bounds"], [0, 0, 5, 5], atol=1e-6)
+        geojson = to_geojson(path, precision=6)
+        assert geojson == to_geojson(self._gdf(), precision=6)
+
+    def test_native_geoarrow_table(self):
+        import pyarrow as pa
+
+        points = pa.array(
+            [{"x": 1.0, "y": 2.0}, {"x": 3.0, "y": 4.0}],
+            type=pa.struct([("x", pa.float64()), ("y", pa.float64())]),
+        )
+        field = pa.field(
+            "geometry",
+            points.type,
+            metadata={"ARROW:extension:name": "geoarrow.point"},
+        )
+        data = pa.Table.from_arrays(
+            [points, pa.array([7, 8])],
+            schema=pa.schema([field, pa.field("id", pa.int64())]),
+        )
+        table = to_geoarrow(data)
+        assert table["__geoarrow__"] == "point"
+        coords = np.frombuffer(table["coords"]["buffer"], dtype=np.float64)
+        assert coords.tolist() == [1.0, 2.0, 3.0, 4.0]
+        assert table["bounds"] == [1.0, 2.0, 3.0, 4.0]
@@ -0,0 +1,351 @@
+"""Tests for kernel vector tiles."""
+
+from concurrent.futures import Future
+from unittest.mock import patch
+
+import geopandas as gpd
+import numpy as np
+import shapely.geometry
+
+from anymap_ts import LeafletMap, MapLibreMap
+from anymap_ts.vector_tiles import CanvasTileSource, KernelTileSource, encode_tile
+
+
+def _varint(buf, i):
+    value = shift = 0
+    while True:
+        byte = buf[i]
+        i += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if byte < 0x80:
+            return value, i
+
+
+def _fields(buf):
+    """Decode the fields of a protobuf message as (number, value) pairs."""
+    i = 0
+    while i < len(buf):
+        key, i = _varint(buf, i)
+        if key & 7 == 0:
+            value, i = _varint(buf, i)
+        elif key & 7 == 1:
+            value, i = buf[i : i + 8], i + 8
+        else:
+            size, i = _varint(buf, i)
+            value, i = buf[i : i + size], i + size
+        yield key >> 3, value
+
+
+def _packed(buf):
+    i, values = 0, []
+    while i < len(buf):
+        value, i = _varint(buf, i)
+        values.append(value)
+    return values
+
+
+def _features(tile):
+    """Decode the features of each layer as (id, type, commands) tuples."""
+    layers = {}
+    for _, layer in _fields(tile):
+        fields = list(_fields(layer))
+        name = next(v for n, v in fields if n == 1).decode()
+        layers[name] = []
+        for number, feature in fields:
+            if number == 2:
+                values = dict(_fields(feature))
+                layers[name].append((values[1], values[3], _packed(values[4])))
+    return layers
+
+
+def _unzigzag(value):
+    return (value >> 1) ^ -(value & 1)
+
+
+def _rings(commands):
+    """Decode polygon commands into rings of absolute tile coordinates."""
+    rings, x, y, i = [], 0, 0, 0
+    while i < len(commands):
+        command, count = commands[i] & 7, commands[i] >> 3
+        i += 1
+        if command == 1:
+            rings.append([])
+        for _ in range(count if command != 7 else 0):
+            x += _unzigzag(commands[i])
+            y += _unzigzag(commands[i + 1])
+            rings[-1].append((x, y))
+            i += 2
+    return rings
+
+
+def _area(ring):
+    return sum(
+        x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1])
+    )
+
+
+class TestEncodeTile:
+    """Tests for the MVT encoder."""
+
+    def test_point(self):
+        tile = encode_tile({"points": [(7, shapely.geometry.Point(25, 17), {})]})
+        # Example from the Mapbox Vector Tile specification
+        assert _features(tile) == {"points": [(7, 1, [9, 50, 34])]}
+
+    def test_polygon_winding(self):
+        # Counter-clockwise on screen (y down), with a clockwise hole
+        polygon = shapely.geometry.Polygon(
+            [(0, 0), (0, 10), (10, 10), (10, 0)],
+            [[(2, 2), (4, 2), (4, 4), (2, 4)]],
+        )
+        [(_, geometry_type, commands)] = _features(
+            encode_tile({"l": [(0, polygon, {})]})
+        )["l"]
+        assert geometry_type == 3
+        exterior, interior = _rings(commands)
+        assert len(exterior) == 4
+        assert _area(exterior) > 0
+        assert _area(interior) < 0
+
+    def test_degenerate_geometry_skipped(self):
+        line = shapely.geometry.LineString([(5, 5), (5, 5)])
+        assert encode_tile({"l": [(0, line, {})]}) == b""
+
+    def test_properties(self):
+        point = shapely.geometry.Point(1, 1)
+        props = {"name": "a", "count": -3, "ok": True, "score": 0.5, "none": None}
+        tile = encode_tile({"l": [(0, point, props)]})
+        layer = next(v for _, v in _fields(tile))
+        keys = [v.decode() for n, v in _fields(layer) if n == 3]
+        assert keys == ["name", "count", "ok", "score"]
+
+
+class TestKernelTileSource:
+    """Tests for on-demand tile cutting."""
+
+    def _points(self, n=1000):
+        rng = np.random.default_rng(0)
+        return gpd.GeoDataFrame(
+            {"value": np.arange(n)},
+            geometry=gpd.points_from_xy(
+                rng.uniform(-10, 10, n), rng.uniform(40, 50, n)
+            ),
+            crs="EPSG:4326",
+        )
+
+    def test_tile_contains_features(self):
+        source = KernelTileSource(self._points())
+        layer = _features(source.tile(0, 0, 0))["data"]
+        assert 0 < len(layer) <= 1000
+        assert {f[1] for f in layer} == {1}
+
+    def test_maxzoom_keeps_every_point(self):
+        gdf = self._points(50)
+        source = KernelTileSource(gdf, maxzoom=0)
+        assert len(_features(source.tile(0, 0, 0))["data"]) == 50
+
+    def test_empty_tile(self):
+        source = KernelTileSource(self._points())
+        assert source.tile(5, 0, 0) == b""
+
+    def test_bounds_and_type(self):
+        source = KernelTileSource(self._points())
+        assert source.geometry_type == "Point"
+        west, south, east, north = source.bounds
+        assert -10 <= west < east <= 10 and 40 <= south < north <= 50
+
+    def test_polygon_clipped_to_tile(self):
+        polygon = shapely.geometry.box(-60, -30, 60, 30)
+        source = KernelTileSource(gpd.GeoDataFrame(geometry=[polygon], crs=4326))
+        [(_, geometry_type, _)] = _features(source.tile(1, 0, 0))["data"]
+        assert geometry_type == 3
+
+    def test_geojson_input(self, geojson_polygon):
+        source = KernelTileSource(geojson_polygon)
+        assert source.geometry_type == "Polygon"
+
+    def test_to_geojson(self):
+        gdf = self._points(3)
+        geojson = KernelTileSource(gdf).to_geojson(precision=6)
+        assert [f["properties"] for f in geojson["features"]] == [
+            {"value": 0},
+            {"value": 1},
+            {"value": 2},
+        ]
+        coords = [f["geometry"]["coordinates"] for f in geojson["features"]]
+        np.testing.assert_allclose(coords, gdf.get_coordinates().values, atol=1e-6)
+
+    def test_lru_cache(self):
+        source = KernelTileSource(self._points(), cache_size=1)
+        first = source.tile(0, 0, 0)
+        assert source.tile(0, 0, 0) is first
+        source.tile(1, 0, 0)
+        assert list(source._cache) == [(1, 0, 0)]
+
+    def test_submit(self):
+        source = KernelTileSource(self._points())
+        assert source.submit(0, 0, 0).result(timeout=30) == source.tile(0, 0, 0)
+
+
+class TestTileRequests:
+    """Tests for serving tiles over the widget comm."""
+
+    def test_add_vector_tiled(self):
+        m = MapLibreMap()
+        gdf = TestKernelTileSource()._points()
+        m.add_vector(gdf, name="points", tiled=True)
+        call = m._js_calls[-1]
+        assert call["method"] == "addKernelTileLayer"
+        assert call["kwargs"]["layerType"] == "circle"
+        assert call["kwargs"]["sourceLayer"] == "data"
+        assert "points-source" in m._tile_sources
+        assert m._layers["points"]["source"] == "points-source"
+
+        m.remove_layer("points")
+        assert "points-source" not in m._tile_sources
+
+    def test_tile_request(self):
+        m = MapLibreMap()
+        m.add_vector(TestKernelTileSource()._points(), name="points", tiled=True)
+        with (
+            patch.object(m, "send") as send,
+            patch.object(
+                KernelTileSource,
+                "submit",
+                lambda self, z, x, y: _done(self.tile(z, x, y)),
+            ),
+        ):
+            m._handle_custom_msg(
+                m,
+                {
+                    "type": "tile_request",
+                    "id": 3,
+                    "view": "view-a",
+                    "source": "points-source",
+                    "z": 0,
+                    "x": 0,
+                    "y": 0,
+                },
+                [],
+            )
+        content, buffers = send.call_args[0]
+        assert content["type"] == "tile" and content["id"] == 3
+        assert content["view"] == "view-a"
+        assert content["buffer_paths"] == [["data"]]
+        assert "data" in _features(bytes(buffers[0]))
+
+    def test_to_html_inlines_tiles(self):
+        m = MapLibreMap()
+        m.add_vector(TestKernelTileSource()._points(5), name="points", tiled=True)
+        html = m.to_html()
+        assert "addKernelTileLayer" not in html
+        assert '"method": "addGeoJSON"' in html
+        assert '"value": 4' in html
+
+    def test_unknown_source(self):
+        m = MapLibreMap()
+        with patch.object(m, "send") as send:
+            m._handle_custom_msg(
+                m,
+                {
+                    "type": "tile_request",
+                    "id": 1,
+                    "source": "x",
+                    "z": 0,
+                    "x": 0,
+                    "y": 0,
+                },
+                [],
+            )
+        content = send.call_args[0][0]
+        assert content["id"] == 1
+        assert "Unknown tile source" in content["error"]
+
+
+def _array(value):
+    return np.frombuffer(value["buffer"], dtype=value["dtype"])
+
+
+class TestCanvasTileSource:
+    """Tests for tiles cut into flat arrays."""
+
+    def test_mixed_geometries(self):
+        polygon = shapely.geometry.box(-60, -30, 60, 30).difference(
+            shapely.geometry.box(-10, -10, 10, 10)
+        )
+        line = shapely.geometry.LineString([(0, 0), (50, 50)])
+        points = shapely.geometry.MultiPoint([(1, 1), (100, 10)])
+        gdf = gpd.GeoDataFrame(
+            {"name": ["a", "b", "c"], "value": [1, 2, 3]},
+            geometry=[polygon, line, points],
+            crs=4326,
+        )
+        tile = CanvasTileSource(gdf, properties=["name"]).tile(0, 0, 0)
+        assert _array(tile["ids"]).tolist() == [0, 1, 2]
+        assert _array(tile["types"]).tolist() == [3, 2, 1]
+        # Exterior and hole, one line, two points
+        assert _array(tile["features"]).tolist() == [0, 2, 3, 5]
+        rings = _array(tile["rings"])
+        assert np.diff(rings).tolist() == [5, 5, 2, 1, 1]
+        assert len(_array(tile["coords"])) == 2 * rings[-1]
+        assert tile["properties"] == [{"name": "a"}, {"name": "b"}, {"name": "c"}]
+
+    def test_empty_tile(self):
+        source = CanvasTileSource(TestKernelTileSource()._points())
+        tile = source.tile(5, 0, 0)
+        assert tile["ids"]["shape"] == [0]
+        assert _array(tile["features"]).tolist() == [0]
+
+    def test_leaflet_add_vector_tiled(self):
+        m = LeafletMap(controls={})
+        gdf = TestKernelTileSource()._points()
+        m.add_vector(gdf, name="points", tiled=True, tooltip_property="value")
+        call = m._js_calls[-1]
+        assert call["method"] == "addCanvasTileLayer"
+        assert call["kwargs"]["source"] == "points-source"
+        assert "radius" in call["kwargs"]["style"]
+        source = m._tile_sources["points-source"]
+        assert source.properties[0] == {"value": 0}
+
+        with (
+            patch.object(m, "send") as send,
+            patch.object(
+                CanvasTileSource,
+                "submit",
+                lambda self, z, x, y: _done(self.tile(z, x, y)),
+            ),
+        ):
+            m._handle_custom_msg(
+                m,
+                {
+                    "type": "tile_request",
+                    "id": 2,
+                    "source": "points-source",
+                    "z": 0,
+                    "x": 0,
+                    "y": 0,
+                },
+                [],
+            )
+        content, buffers = send.call_args[0]
+        assert ["data", "coords", "buffer"] in content["buffer_paths"]
+        assert len(content["data"]["properties"]) == content["data"]["ids"]["shape"][0]
+
+        m.remove_layer("points")
+        assert "points-source" not in m._tile_sources
+
+    def test_leaflet_to_html_inlines_tiles(self):
+        m = LeafletMap(controls={})
+        gdf = TestKernelTileSource()._points(5)
+        m.add_vector(gdf, name="points", tiled=True, tooltip_property="value")
+        html = m.to_html()
+        assert "addCanvasTileLayer" not in html
+        assert '"method": "addGeoJSON"' in html
+        assert '"tooltipProperty": "value"' in html
+
+
+def _done(result):
+    future = Future()
+    future.set_result(result)
+    return future
@@ -5,8 +5,10 @@
  * to test the shared functionality.
  */
 
+import { deflateSync } from 'zlib';
 import { describe, it, expect, vi, beforeEach } from 'vitest';
 import { BaseMapRenderer } from '../../src/core/BaseMapRenderer';
+import { StateManager } from '../../src/core/StateManager';
 import { createMockModel, MockModel } from './helpers/mockModel';
 
 /** Minimal concrete renderer for testing the abstract base class. */
@@ -65,10 +67,22 @@ class TestRenderer extends BaseMapRenderer<Record<string, unknown>> {
     this.executeMethod(method, args, kwargs);
   }
 
+  public testRegisterQuery(name: string, handler: (args: unknown[], kwargs: Record<string, unknown>) => unknown) {
+    this.registerQuery(name, handler);
+  }
+
+  public testOnCustomMessage(msg: Record<string, unknown>) {
+    this.onCustomMessage(msg);
+  }
+
   public testProcessJsCalls() {
     this.processJsCalls();
   }
 
+  public testRestoreState() {
+    this.restoreState();
+  }
+
   public testSendEvent(type: string, data: unknown) {
     this.sendEvent(type, data);
   }
@@ -88,6 +102,21 @@ class TestRenderer extends BaseMapRenderer<Record<string, unknown>> {
   public getPendingCalls() {
     return this.pendingCalls;
   }
+
+  public testProcessPendingCalls() {
+    this.processPendingCalls();
+  }
+
+  public batchEnds = 0;
+  public batchingDuringCall: boolean[] = [];
+
+  public testIsBatching() {
+    return this.isBatching();
+  }
+
+  protected onBatchEnd(): void {
+    this.batchEnds++;
+  }
 }
 
 describe('BaseMapRenderer', () => {
@@ -164,6 +193,39 @@ describe('BaseMapRenderer', () => {
       expect(errorSpy).toHaveBeenCalled();
       errorSpy.mockRestore();
     });
+
+    it('decodes binary arrays before calling the handler', () => {
+      const handler = vi.fn();
+      renderer.testRegisterMethod('addLayer', handler);
+      const values = new Float32Array([1, 2, 3, 4]);
+      renderer.testExecuteMethod('addLayer', [], {
+        data: {
+          length: 2,
+          attributes: {
+            getPosition: {
+              value: { __ndarray__: true, dtype: 'float32', shape: [4], buffer: new DataView(values.buffer) },
+              size: 2,
+            },
+          },
+        },
+      });
+
+      const kwargs = handler.mock.calls[0][1];
+      const decoded = kwargs.data.attributes.getPosition.value;
+      expect(decoded).toBeInstanceOf(Float32Array);
+      expect(Array.from(decoded)).toEqual([1, 2, 3, 4]);
+      expect(decoded.buffer).toBe(values.buffer);
+    });
+
+    it('decodes base64 binary arrays from exported HTML', () => {
+      const handler = vi.fn();
+      renderer.testRegisterMethod('addLayer', handler);
+      renderer.testExecuteMethod('addLayer', [], {
+        getRadius: { __ndarray__: true, dtype: 'uint8', shape: [2], buffer: 'AQI=' },
+      });
+
+      expect(Array.from(handler.mock.calls[0][1].getRadius)).toEqual([1, 2]);
+    });
   });
 
   describe('processJsCalls', () => {
@@ -219,6 +281,365 @@ describe('BaseMapRenderer', () => {
     });
   });
 
+  describe('batched execution', () => {
+    it('applies all new calls in one batch', () => {
+      renderer.testRegisterMethod('m', () => {
+        renderer.batchingDuringCall.push(renderer.testIsBatching());
+      });
+      renderer.setIsReady(true);
+
+      model.set('_js_calls', [
+        { id: 1, method: 'm', args: [], kwargs: {} },
+        { id: 2, method: 'm', args: [], kwargs: {} },
+        { id: 3, method: 'm', args: [], kwargs: {} },
+      ]);
+      renderer.testProcessJsCalls();
+
+      expect(renderer.batchingDuringCall).toEqual([true, true, true]);
+      expect(renderer.batchEnds).toBe(1);
+      expect(renderer.testIsBatching()).toBe(false);
+    });
+
+    it('applies pending calls in one batch once ready', () => {
+      const handler = vi.fn();
+      renderer.testRegisterMethod('m', handler);
+      renderer.setIsReady(false);
+      model.set('_js_calls', [
+        { id: 1, method: 'm', args: [], kwargs: {} },
+        { id: 2, method: 'm', args: [], kwargs: {} },
+      ]);
+      renderer.testProcessJsCalls();
+      expect(renderer.batchEnds).toBe(0);
+
+      renderer.setIsReady(true);
+      renderer.testProcessPendingCalls();
+      expect(handler).toHaveBeenCalledTimes(2);
+      expect(renderer.batchEnds).toBe(1);
+      expect(renderer.getPendingCalls()).toHaveLength(0);
+    });
+  });
+
+  describe('call acknowledgement', () => {
+    it('acknowledges the highest processed call id', () => {
+      renderer.testRegisterMethod('m', vi.fn());
+      renderer.setIsReady(true);
+
+      model.set('_js_calls', [
+        { id: 1, method: 'm', args: [], kwargs: {} },
+        { id: 2, method: 'm', args: [], kwargs: {} },
+      ]);
+      renderer.testProcessJsCalls();
+
+      expect(model.get('_js_calls_ack')).toBe(2);
+      expect(model.save_changes).toHaveBeenCalled();
+    });
+
+    it('acknowledges queued calls before the map is ready', () => {
+      renderer.setIsReady(false);
+      model.set('_js_calls', [{ id: 3, method: 'm', args: [], kwargs: {} }]);
+      renderer.testProcessJsCalls();
+
+      expect(model.get('_js_calls_ack')).toBe(3);
+    });
+
+    it('does not save when there is nothing new to acknowledge', () => {
+      renderer.setIsReady(true);
+      renderer.testProcessJsCalls();
+
+      expect(model.save_changes).not.toHaveBeenCalled();
+    });
+  });
+
+  describe('history replay', () => {
+    it('does not request a replay when nothing was trimmed', async () => {
+      await renderer.initialize();
+
+      expect(model.send).not.toHaveBeenCalled();
+    });
+
+    it('requests a replay and runs history before newer calls', async () => {
+      const trimmed = createMockModel({
+        _js_calls: [{ id: 3, method: 'm', args: ['new'], kwargs: {} }],
+        _js_calls_ack: 2,
+      });
+      const replayRenderer = new TestRenderer(trimmed, el);
+      const handler = vi.fn();
+      replayRenderer.testRegisterMethod('m', handler);
+
+      await replayRenderer.initialize();
+      replayRenderer.testProcessJsCalls();
+      expect(trimmed.send).toHaveBeenCalledWith({ type: 'replay_request' });
+      expect(handler).not.toHaveBeenCalled();
+
+      trimmed.trigger('msg:custom', {
+        type: 'replay',
+        calls: [
+          { id: 1, method: 'm', args: ['old'], kwargs: {} },
+          { id: 3, method: 'm', args: ['new'], kwargs: {} },
+        ],
+      });
+
+      expect(handler).toHaveBeenCalledTimes(2);
+      expect(handler.mock.calls[0][0]).toEqual(['old']);
+      expect(handler.mock.calls[1][0]).toEqual(['new']);
+    });
+
+    it('builds from the replayed snapshot instead of the persisted traits', async () => {
+      const trimmed = createMockModel({
+        _js_calls: [],
+        _js_calls_ack: 1,
+        _sources: { 'a-source': { type: 'geojson', data: {} } },
+      });
+      const replayRenderer = new TestRenderer(trimmed, el);
+      const addSource = vi.fn();
+      const handler = vi.fn();
+      replayRenderer.testRegisterMethod('addSource', addSource);
+      replayRenderer.testRegisterMethod('m', handler);
+      await replayRenderer.initialize();
+
+      replayRenderer.testRestoreState();
+      trimmed.trigger('msg:custom', { type: 'replay', calls: [{ id: 1, method: 'm', args: [], kwargs: {} }] });
+
+      expect(addSource).not.toHaveBeenCalled();
+      expect(handler).toHaveBeenCalledTimes(1);
+    });
+
+    it('restores the persisted traits when no snapshot arrives', async () => {
+      const trimmed = createMockModel({
+        _js_calls: [],
+        _js_calls_ack: 1,
+        _sources: { 'a-source': { type: 'geojson', data: {} } },
+      });
+      const replayRenderer = new TestRenderer(trimmed, el);
+      const addSource = vi.fn();
+      replayRenderer.testRegisterMethod('addSource', addSource);
+      await replayRenderer.initialize();
+
+      replayRenderer.testRestoreState();
+      expect(addSource).not.toHaveBeenCalled();
+      trimmed.trigger('msg:custom', { type: 'replay', calls: [] });
+
+      expect(addSource).toHaveBeenCalledWith(['a-source'], { type: 'geojson', data: {} });
+    });
+
+    it('restores binary buffers of replayed calls', async () => {
+      const trimmed = createMockModel({ _js_calls: [], _js_calls_ack: 1 });
+      const replayRenderer = new TestRenderer(trimmed, el);
+      const handler = vi.fn();
+      replayRenderer.testRegisterMethod('m', handler);
+      await replayRenderer.initialize();
+
+      const values = new Uint8Array([7, 8]);
+      trimmed.trigger(
+        'msg:custom',
+        {
+          type: 'replay',
+          calls: [
+            {
+              id: 1,
+              method: 'm',
+              args: [],
+              kwargs: { getRadius: { __ndarray__: true, dtype: 'uint8', shape: [2] } },
+            },
+          ],
+          buffer_paths: [['calls', 0, 'kwargs', 'getRadius', 'buffer']],
+        },
+        [new DataView(values.buffer)]
+      );
+
+      expect(Array.from(handler.mock.calls[0][1].getRadius)).toEqual([7, 8]);
+    });
+  });
+
+  describe('data store', () => {
+    it('fetches missing payloads once before running the calls', async () => {
+      await renderer.initialize();
+      const handler = vi.fn();
+      renderer.testRegisterMethod('addGeoJSON', handler);
+      const ref = { __blob__: 'abc' };
+
+      model.set('_js_calls', [
+        { id: 1, method: 'addGeoJSON', args: [], kwargs: { data: ref, name: 'fill' } },
+        { id: 2, method: 'addGeoJSON', args: [], kwargs: { data: ref, name: 'line' } },
+      ]);
+      renderer.testProcessJsCalls();
+      expect(model.send).toHaveBeenCalledWith({ type: 'blob_request', digests: ['abc'] });
+      expect(handler).not.toHaveBeenCalled();
+
+      model.trigger('msg:custom', { type: 'blobs', blobs: { abc: { type: 'FeatureCollection' } } });
+      expect(handler).toHaveBeenCalledTimes(2);
+      expect(handler.mock.calls[1][1]).toEqual({ data: { type: 'FeatureCollection' }, name: 'line' });
+
+      model.set('_js_calls', [
+        { id: 3, method: 'addGeoJSON', args: [], kwargs: { data: ref, name: 'again' } },
+      ]);
+      renderer.testProcessJsCalls();
+      expect(model.send).toHaveBeenCalledTimes(1);
+      expect(handler).toHaveBeenCalledTimes(3);
+    });
+
+    it('forgets evicted payloads', async () => {
+      await renderer.initialize();
+      model.trigger('msg:custom', { type: 'blobs', blobs: { abc: [1, 2] } });
+      model.trigger('msg:custom', { type: 'evict', digests: ['abc'] });
+
+      model.set('_js_calls', [{ id: 1, method: 'm', args: [], kwargs: { data: { __blob__: 'abc' } } }]);
+      renderer.testProcessJsCalls();
+      expect(model.send).toHaveBeenCalledWith({ type: 'blob_request', digests: ['abc'] });
+    });
+  });
+
+  describe('compression', () => {
+    const deflate = (data: unknown) => {
+      const bytes = deflateSync(JSON.stringify(data));
+      return new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+    };
+
+    it('inflates compressed kwargs before running calls in order', async () => {
+      await renderer.initialize();
+      const handler = vi.fn();
+      renderer.testRegisterMethod('addGeoJSON', handler);
+
+      model.set('_js_calls', [
+        {
+          id: 1,
+          method: 'addGeoJSON',
+          args: [],
+          kwargs: { data: { __compressed__: 'deflate', buffer: deflate({ n: 1 }) }, name: 'a' },
+        },
+      ]);
+      renderer.testProcessJsCalls();
+      model.set('_js_calls', [{ id: 2, method: 'addGeoJSON', args: [], kwargs: { data: 2, name: 'b' } }]);
+      renderer.testProcessJsCalls();
+      expect(handler).not.toHaveBeenCalled();
+
+      await vi.waitFor(() => expect(handler).toHaveBeenCalledTimes(2));
+      expect(handler.mock.calls[0][1]).toEqual({ data: { n: 1 }, name: 'a' });
+      expect(handler.mock.calls[1][1]).toEqual({ data: 2, name: 'b' });
+    });
+
+    it('inflates compressed payloads from the data store', async () => {
+      await renderer.initialize();
+      const handler = vi.fn();
+      renderer.testRegisterMethod('addGeoJSON', handler);
+
+      model.set('_js_calls', [{ id: 1, method: 'addGeoJSON', args: [], kwargs: { data: { __blob__: 'abc' } } }]);
+      renderer.testProcessJsCalls();
+      renderer.testOnCustomMessage({
+        type: 'blobs',
+        blobs: { abc: { __compressed__: 'deflate', buffer: deflate([1, 2]) } },
+      });
+
+      await vi.waitFor(() => expect(handler).toHaveBeenCalledTimes(1));
+      expect(handler.mock.calls[0][1]).toEqual({ data: [1, 2] });
+    });
+  });
+
+  describe('perf stats', () => {
+    it('reports call timings only when Python listens for them', async () => {
+      await renderer.initialize();
+      renderer.testRegisterMethod('setZoom', vi.fn());
+
+      model.set('_js_calls', [{ id: 1, method: 'setZoom', args: [3], kwargs: {} }]);
+      renderer.testProcessJsCalls();
+      expect(model.get('_js_events')).toEqual([]);
+
+      model.set('_event_options', { perf_stats: {} });
+      model.set('_js_calls', [{ id: 2, method: 'setZoom', args: [4], kwargs: {} }]);
+      renderer.testProcessJsCalls();
+
+      const [event] = model.get('_js_events');
+      expect(event.type).toBe('perf_stats');
+      expect(event.data).toEqual([
+        { id: 2, queued_ms: expect.any(Number), apply_ms: expect.any(Number) },
+      ]);
+    });
+  });
+
+  describe('state patches', () => {
+    it('applies patches from Python in place', async () => {
+      await renderer.initialize();
+      const layers = model.get('_layers');
+      model.trigger('msg:custom', {
+        type: 'state_patch',
+        ops: [
+          { trait: '_layers', op: 'set', key: 'a', value: { id: 'a', type: 'fill', source: 'a' } },
+          { trait: '_layers', op: 'merge', key: 'a', value: { visible: false } },
+          { trait: '_controls', op: 'set', key: 'nav', value: { type: 'navigation', position: 'top-right' } },
+          { trait: '_controls', op: 'delete', key: 'nav' },
+        ],
+      });
+      expect(model.get('_layers')).toBe(layers);
+      expect(layers.a).toEqual({ id: 'a', type: 'fill', source: 'a', visible: false });
+      expect(model.get('_controls')).toEqual({});
+    });
+
+    it('sends frontend changes as patches instead of the whole dict', () => {
+      const state = new StateManager(model);
+      state.addLayer('a', { id: 'a', type: 'fill', source: 'a' });
+      state.setLayerOpacity('a', 0.5);
+      state.removeLayer('missing');
+
+      expect(model.get('_layers').a.opacity).toBe(0.5);
+      expect(model.save_changes).not.toHaveBeenCalled();
+      expect(model.send).toHaveBeenCalledWith({
+        type: 'state_patch',
+        ops: [{ trait: '_layers', op: 'merge', key: 'a', value: { opacity: 0.5 } }],
+      });
+    });
+  });
+
+  describe('requests', () => {
+    it('answers a request with the query result and its id', async () => {
+      await renderer.initialize();
+      renderer.testRegisterQuery('count', (args, kwargs) => ({ n: kwargs.n }));
+
+      model.trigger('msg:custom', { type: 'request', id: 7, method: 'count', args: [], kwargs: { n: 3 } });
+      await Promise.resolve();
+
+      expect(model.send).toHaveBeenCalledWith({ type: 'response', id: 7, result: { n: 3 } });
+      expect(model.get('_queried_features')).toEqual({});
+    });
+
+    it('reports errors and unknown queries', async () => {
+      await renderer.initialize();
+      renderer.testRegisterQuery('fail', () => {
+        throw new Error('boom');
+      });
+
+      model.trigger('msg:custom', { type: 'request', id: 1, method: 'fail' });
+      model.trigger('msg:custom', { type: 'request', id: 2, method: 'missing' });
+      await Promise.resolve();
+
+      expect(model.send).toHaveBeenCalledWith({ type: 'response', id: 1, error: 'Error: boom' });
+      expect(model.send).toHaveBeenCalledWith({
+        type: 'response',
+        id: 2,
+        error: 'Error: Unknown query: missing',
+      });
+    });
+
+    it('defers requests until the map is ready', async () => {
+      renderer.testRegisterQuery('ping', () => 'pong');
+      renderer.testOnCustomMessage({ type: 'request', id: 1, method: 'ping' });
+      expect(model.send).not.toHaveBeenCalled();
+
+      renderer.setIsReady(true);
+      renderer.testProcessPendingCalls();
+      await Promise.resolve();
+      expect(model.send).toHaveBeenCalledWith({ type: 'response', id: 1, result: 'pong' });
+    });
+
+    it('publishes query results through the trait for regular calls', async () => {
+      await renderer.initialize();
+      renderer.testRegisterQuery('count', () => ({ n: 1 }));
+      renderer.testExecuteMethod('count', [], {});
+
+      expect(model.get('_queried_features')).toEqual({ n: 1 });
+      expect(model.save_changes).toHaveBeenCalled();
+    });
+  });
+
   describe('sendEvent', () => {
     it('sets _js_events on model and calls save_changes', () => {
       renderer.testSendEvent('click', { lng: 10, lat: 20 });
@@ -238,6 +659,51 @@ describe('BaseMapRenderer', () => {
       const events = model.get('_js_events');
       expect(events).toHaveLength(2);
     });
+
+    it('numbers events and drops acknowledged ones', async () => {
+      await renderer.initialize();
+      renderer.testSendEvent('click', { x: 1 });
+      renderer.testSendEvent('click', { x: 2 });
+      const [first, second] = model.get('_js_events');
+      expect(second.seq).toBe(first.seq! + 1);
+      expect(second.view).toBe(first.view);
+
+      model.set('_js_events_ack', { [first.view!]: first.seq! });
+      model.trigger('change:_js_events_ack');
+      renderer.testSendEvent('click', { x: 3 });
+
+      expect(model.get('_js_events').map(e => e.data)).toEqual([{ x: 2 }, { x: 3 }]);
+    });
+
+    it('throttles events per type and keeps the last held one', () => {
+      vi.useFakeTimers();
+      model.set('_event_options', { mousemove: { throttle_ms: 100, coalesce: 'last' } });
+
+      renderer.testSendEvent('mousemove', { i: 1 });
+      renderer.testSendEvent('mousemove', { i: 2 });
+      renderer.testSendEvent('mousemove', { i: 3 });
+      expect(model.get('_js_events').map(e => e.data)).toEqual([{ i: 1 }]);
+
+      vi.advanceTimersByTime(100);
+      expect(model.get('_js_events').map(e => e.data)).toEqual([{ i: 3 }]);
+      vi.useRealTimers();
+    });
+
+    it('debounces events and can deliver all of them in one batch', () => {
+      vi.useFakeTimers();
+      model.set('_event_options', { move: { debounce_ms: 50, coalesce: 'all' } });
+
+      renderer.testSendEvent('move', { i: 1 });
+      vi.advanceTimersByTime(30);
+      renderer.testSendEvent('move', { i: 2 });
+      vi.advanceTimersByTime(30);
+      expect(model.get('_js_events')).toEqual([]);
+
+      vi.advanceTimersByTime(20);
+      expect(model.get('_js_events').map(e => e.data)).toEqual([{ i: 1 }, { i: 2 }]);
+      expect(model.save_changes).toHaveBeenCalledTimes(1);
+      vi.useRealTimers();
+    });
   });
 
   describe('model listeners', () => {
@@ -0,0 +1,84 @@
+/**
+ * Tests for building layer data from GeoArrow buffers.
+ */
+
+import { describe, it, expect } from 'vitest';
+import {
+  geoArrowPositionFormat,
+  geoArrowToGeoJSON,
+  geoArrowToRows,
+  isGeoArrowTable,
+} from '../../src/utils/geoarrow';
+import type { GeoArrowTable } from '../../src/utils/geoarrow';
+
+/** A square with a hole, and a multipolygon of two triangles. */
+function polygons(): GeoArrowTable {
+  return {
+    __geoarrow__: 'multipolygon',
+    length: 2,
+    dims: 2,
+    coords: new Float64Array([
+      0, 0, 4, 0, 4, 4, 0, 4, 0, 0,
+      1, 1, 2, 1, 2, 2, 1, 1,
+      5, 5, 6, 5, 6, 6, 5, 5,
+      7, 7, 8, 7, 8, 8, 7, 7,
+    ]),
+    offsets: {
+      0: new Int32Array([0, 5, 9, 13, 17]),
+      1: new Int32Array([0, 2, 3, 4]),
+      2: new Int32Array([0, 1, 3]),
+    },
+    properties: { value: new Float64Array([1.5, NaN]), name: ['a', 'b'] },
+  };
+}
+
+describe('GeoArrow', () => {
+  it('detects GeoArrow tables', () => {
+    expect(isGeoArrowTable(polygons())).toBe(true);
+    expect(isGeoArrowTable({ type: 'FeatureCollection' })).toBe(false);
+    expect(isGeoArrowTable(null)).toBe(false);
+  });
+
+  it('builds GeoJSON features', () => {
+    const { features } = geoArrowToGeoJSON(polygons());
+    expect(features).toHaveLength(2);
+    expect(features[0].geometry).toEqual({
+      type: 'MultiPolygon',
+      coordinates: [
+        [
+          [[0, 0], [4, 0], [4, 4], [0, 4], [0, 0]],
+          [[1, 1], [2, 1], [2, 2], [1, 1]],
+        ],
+      ],
+    });
+    expect(features[1].properties).toEqual({ value: null, name: 'b' });
+  });
+
+  it('explodes multi-geometries into deck.gl rows', () => {
+    const rows = geoArrowToRows(polygons(), 'polygon');
+    expect(rows).toHaveLength(3);
+    const first = rows[0].polygon as { positions: Float64Array; holeIndices: number[] };
+    expect(first.positions).toHaveLength(18);
+    expect(first.holeIndices).toEqual([10]);
+    expect(rows[2].name).toBe('b');
+    expect(geoArrowPositionFormat(polygons())).toBe('XY');
+  });
+
+  it('builds point rows without offsets', () => {
+    const table: GeoArrowTable = {
+      __geoarrow__: 'point',
+      length: 2,
+      dims: 2,
+      coords: new Float64Array([1, 2, 3, 4]),
+      offsets: {},
+      properties: { id: new Int32Array([7, 8]) },
+    };
+    const rows = geoArrowToRows(table, 'coordinates');
+    expect(Array.from(rows[1].coordinates as Float64Array)).toEqual([3, 4]);
+    expect(rows[1].id).toBe(8);
+    expect(geoArrowToGeoJSON(table).features[0].geometry).toEqual({
+      type: 'Point',
+      coordinates: [1, 2],
+    });
+  });
+});
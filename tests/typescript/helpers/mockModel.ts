@@ -17,6 +17,7 @@ interface MockModelOptions {
   bearing?: number;
   pitch?: number;
   _js_calls?: JsCall[];
+  _js_calls_ack?: number;
   _layers?: Record<string, LayerState>;
   _sources?: Record<string, SourceState>;
   _controls?: Record<string, ControlState>;
@@ -43,6 +44,7 @@ export function createMockModel(options: MockModelOptions = {}): MockModel {
   store.set('pitch', options.pitch ?? 0);
   store.set('max_pitch', 85);
   store.set('_js_calls', options._js_calls ?? []);
+  store.set('_js_calls_ack', options._js_calls_ack ?? 0);
   store.set('_js_events', []);
   store.set('_layers', options._layers ?? {});
   store.set('_sources', options._sources ?? {});
@@ -65,6 +67,8 @@ export function createMockModel(options: MockModelOptions = {}): MockModel {
 
     save_changes: vi.fn(),
 
+    send: vi.fn(),
+
     on(event: string, callback: (...args: any[]) => void): void {
       if (!listeners.has(event)) {
         listeners.set(event, []);
@@ -8,6 +8,7 @@ import { createMockModel, MockModel } from './helpers/mockModel';
 // Mock the MapLibreRenderer as a class so `new MapLibreRenderer()` works
 vi.mock('../../src/maplibre/MapLibreRenderer', () => {
   class MockMapLibreRenderer {
+    static loadKernelTile = vi.fn();
     public model: any;
     public el: any;
     private container: HTMLDivElement;